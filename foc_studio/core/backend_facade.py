@@ -1,23 +1,32 @@
-from typing import Any
+import os
+from typing import TYPE_CHECKING, Any
 
-from PySide6.QtCore import QObject, Property, QTimer, Signal, Slot
+from PySide6.QtCore import QObject, Property, QTimer, QUrl, Signal, SignalInstance, Slot
 
 from core.command.motor_command import build_motor_control
 from core.command.motor_type_command import build_query_motor_type
 from core.command.pc_heartbeat_command import build_pc_heartbeat
 from core.command.software_version_command import build_query_software_version
-from core.command.tune_params_command import (
-    build_query_current_loop_params,
-    build_query_motor_limits,
-    build_query_speed_loop_params,
-    build_set_current_loop_params,
-    build_set_motor_limits,
-    build_set_speed_loop_params,
-)
+from core.service.baud_negotiator import BaudRateNegotiator
 from core.service.data_processor import DataProcessor
 from core.service.frame_dispatcher import FrameDispatcher
-from core.service.serial_statistics_service import SerialStatisticsService
+from core.service.latency_tracer import LatencyTracer
+from core.service.log_search import LogSearch
+from core.service.log_store import LogStore
+from core.service.reconnect_manager import ReconnectManager
+from core.service.serial_statistics_service import INTERVAL_BUCKET_LABELS, SerialStatisticsService
+from core.service.telemetry_fanout import TelemetryFanOut
+from core.service.telemetry_history import HISTORY_CHANNELS, HistoryConfig, TelemetryHistory
+from core.transport.port_discovery import PortDiscoveryService
+from core.transport.network_address import is_network_port_name
 from core.transport.serial import mySerial
+from core.transport.stall_keepalive import StallKeepalive
+
+if TYPE_CHECKING:
+    from core.service.chart_data_provider import ChartDataProvider
+    from core.service.session_recorder import SessionRecorder, SessionRecorderWriter
+    from core.service.telemetry_archive import TelemetryArchive
+    from core.transport.network_transport import NetworkTransport
 
 
 DEFAULT_MCU_VERSION = "0.0.0.0"
@@ -31,6 +40,9 @@ TUNE_PARAM_STATUS_APPLYING = "正在应用参数并读回校验"
 TUNE_PARAM_STATUS_SYNCED = "参数已同步"
 TUNE_PARAM_STATUS_APPLY_TIMEOUT = "应用参数后读回超时"
 TUNE_PARAM_STATUS_READ_TIMEOUT = "读取参数超时"
+# SYS 页链路健康火花线：显示最近 2 分钟的每秒采样
+SPARKLINE_POINTS = 120
+SPARKLINE_SERIES: tuple[str, ...] = ("rxBytesPerSec", "linkUtilization", "rxCrcErrors", "rxInvalidFrames")
 
 
 def _default_control_params() -> dict[str, dict[str, float]]:
@@ -55,6 +67,8 @@ class BackendFacade(QObject):
     connectionStatusChanged = Signal(bool, str)
     isConnectedChanged = Signal()
     portsListChanged = Signal(list)
+    isReconnectingChanged = Signal()
+    baudRateChanged = Signal()
 
     # 转发来自 FrameDispatcher 的遥测信号
     speedUpdated = Signal(int, float)                         # 当前转速 rpm, pc_timestamp_ms
@@ -70,27 +84,70 @@ class BackendFacade(QObject):
     hallTelemetryUpdated = Signal(int, int, int, int, int, float)  # Hall A/B/C、hall_state、电气扇区、pc_ts
     hallTelemetryChanged = Signal()
 
-    txFrameCountTotalChanged = Signal()
-    rxFrameCountTotalChanged = Signal()
-    txBytesTotalChanged = Signal()
-    rxBytesTotalChanged = Signal()
-    txBytesPerSecChanged = Signal()
-    rxBytesPerSecChanged = Signal()
-    rxCrcErrorCountChanged = Signal()
-    rxInvalidFrameCountChanged = Signal()
+    statisticsChanged = Signal("QVariantMap")          # 串口统计快照（转发自 SerialStatisticsService）
+    statisticsPublishIntervalChanged = Signal()
+    statisticsHistoryChanged = Signal()
+    latencyTracingEnabledChanged = Signal()
+    latencyStatsChanged = Signal()
+    archiveStatsChanged = Signal()
+    sessionRecorderChanged = Signal()
+    sessionRecorderStatsChanged = Signal()
     controlParamsChanged = Signal()
     controlParamsAvailableChanged = Signal()
     controlParamsBusyChanged = Signal()
     controlParamsLastStatusChanged = Signal()
     logMessageReceived = Signal(int, str)              # level, message（转发自 FrameDispatcher）
 
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        parent=None,
+        port_discovery: PortDiscoveryService | None = None,
+        rate_tick: SignalInstance | None = None,
+    ) -> None:
+        """创建单设备流水线。
+
+        多设备场景下由 SessionManager 传入共享的串口发现服务与统计节拍信号；
+        单设备运行时两者均为空，各模块自行创建。
+        """
+        super().__init__(parent)
         # 统一纳入 Qt 对象树，避免未来重建门面对象时出现悬挂 QObject。
-        self._serial = mySerial(self)
+        self._serial = mySerial(self, port_discovery)
+        # 网络串口桥：端口名为 tcp:// 或 udp:// 时改用套接字传输，接口与 mySerial 一致。
+        # 首次连接网络地址时才创建，启动阶段不加载 QtNetwork
+        self._network: "NetworkTransport | None" = None
+        # 当前生效的传输对象，所有发送与连接状态查询都经由它完成
+        self._transport: "mySerial | NetworkTransport" = self._serial
         self._processor = DataProcessor(self)
         self._dispatcher = FrameDispatcher(self)
-        self._serial_stats = SerialStatisticsService(self)
+        self._serial_stats = SerialStatisticsService(self, use_internal_timer=rate_tick is None)
+        if rate_tick is not None:
+            # 共享节拍：多个设备的速率统计在同一时刻刷新，减少定时器数量
+            rate_tick.connect(self._serial_stats.onRateTick)
+        self._reconnect = ReconnectManager(self)
+        self._baud_negotiator = BaudRateNegotiator(self)
+        # CHT/QD 波形样本缓存在 Python 侧环形缓冲，页面按刷新节拍批量取用；
+        # 图表页首次访问 chartData 时才创建，此前不加载 QtGraphs 绑定、也不缓存样本
+        self._chart_data: "ChartDataProvider | None" = None
+        # 长时间遥测历史（原始环 + 多级聚合），从创建起持续记录，图表页回看时按像素列查询
+        self._history = TelemetryHistory(HistoryConfig.from_env(os.environ, len(HISTORY_CHANNELS)), self)
+        # 历史、归档、运行记录共用一个扇出，分发器的遥测信号只连接一次
+        self._telemetry_fanout = TelemetryFanOut(self)
+        # MCU 日志存放在 Python 侧环形缓冲，LOG 页面按刷新节拍批量刷新两个分级视图
+        self._log_store = LogStore(self)
+        # 日志检索：到达的日志按秒增量建倒排索引，检索在后台线程执行（启用归档时同时覆盖归档文件）
+        self._log_search = LogSearch(self)
+        # 遥测与日志的持久化归档为可选功能，由 SessionManager 按配置的目录启用
+        self._archive: "TelemetryArchive | None" = None
+        # 测试台运行记录（SQLite）同样可选，由 SessionManager 按配置的数据库路径启用
+        self._session_recorder: "SessionRecorder | None" = None
+        # 端到端延迟追踪默认关闭，开启时才把 tracer 注入各层
+        self._latency_tracer = LatencyTracer(self)
+        self._latency_tracing_enabled = False
+        self._latency_tracer.statsChanged.connect(self.latencyStatsChanged)
+
+        # 串口波特率：base 为用户选择的安全波特率，current 为协商后的实际波特率
+        self._base_baud_rate: int = 0
+        self._baud_rate: int = 0
 
         # 电机控制目标，用于 500ms 周期保活发送 CMD 0x01
         self._motor_enable: int = 0
@@ -127,6 +184,10 @@ class BackendFacade(QObject):
         self._heartbeat_timer = QTimer(self)
         self._heartbeat_timer.setInterval(1000)
         self._heartbeat_timer.timeout.connect(self._send_heartbeat)
+        # GUI 卡顿保活：由 SessionManager 的事件循环看门狗线程在卡顿期间代发心跳/电机控制帧
+        self._stall_keepalive = StallKeepalive()
+        # 串口关闭前同步撤下代发目标：链路中断时串口先于 linkLost 关闭，不能等 _on_link_lost 停止心跳
+        self._serial.aboutToClosePort.connect(self._on_serial_about_to_close)
 
         # 版本查询轮询定时器：连接后若版本仍是 0.0.0.0，每 1 秒发送一次 CMD 0x03
         self._version_query_timer = QTimer(self)
@@ -144,10 +205,8 @@ class BackendFacade(QObject):
         self._tune_param_timeout_timer.setInterval(TUNE_PARAM_READ_TIMEOUT_MS)
         self._tune_param_timeout_timer.timeout.connect(self._on_tune_param_timeout)
 
-        # Transport -> Service
-        self._serial.dataReceived.connect(self._processor.process_data)
-        self._serial.dataReceived.connect(self._serial_stats.onDataReceived)
-        self._serial.dataWritten.connect(self._serial_stats.onDataWritten)
+        # Transport -> Service：串口与网络传输接到同一条处理流水线，DataProcessor 看到相同字节流
+        self._wire_transport(self._serial)
         self._processor.telemetryUpdated.connect(self._dispatcher.dispatch)
         self._processor.telemetryUpdated.connect(self._serial_stats.onFrameParsed)
         self._processor.crcErrorDetected.connect(self._serial_stats.onCrcErrorDetected)
@@ -168,30 +227,76 @@ class BackendFacade(QObject):
         self._dispatcher.currentLoopParamsUpdated.connect(self._on_current_loop_params_updated)
         self._dispatcher.motorLimitsUpdated.connect(self._on_motor_limits_updated)
         self._dispatcher.logMessageReceived.connect(self.logMessageReceived)
-        self._serial_stats.txFrameCountTotalChanged.connect(self.txFrameCountTotalChanged)
-        self._serial_stats.rxFrameCountTotalChanged.connect(self.rxFrameCountTotalChanged)
-        self._serial_stats.txBytesTotalChanged.connect(self.txBytesTotalChanged)
-        self._serial_stats.rxBytesTotalChanged.connect(self.rxBytesTotalChanged)
-        self._serial_stats.txBytesPerSecChanged.connect(self.txBytesPerSecChanged)
-        self._serial_stats.rxBytesPerSecChanged.connect(self.rxBytesPerSecChanged)
-        self._serial_stats.rxCrcErrorCountChanged.connect(self.rxCrcErrorCountChanged)
-        self._serial_stats.rxInvalidFrameCountChanged.connect(self.rxInvalidFrameCountChanged)
-
-        # 将串口层状态信号转发给 QML
-        self._serial.connectionStatusChanged.connect(self._on_connection_status_changed)
-        self._serial.isConnectedChanged.connect(self.isConnectedChanged)
+        self._dispatcher.logMessageReceived.connect(self._log_store.onLogMessageReceived)
+        self._dispatcher.logMessageReceived.connect(self._log_search.onLogMessageReceived)
+        self._serial_stats.statisticsChanged.connect(self.statisticsChanged)
+        self._serial_stats.historyChanged.connect(self.statisticsHistoryChanged)
+
+        # Dispatcher -> FanOut -> History：与图表页是否打开无关，会话期间始终记录
+        self._telemetry_fanout.connect_dispatcher(self._dispatcher)
+        self._telemetry_fanout.add_sink(self._history.append_sample)
+
+        # 将传输层状态信号转发给 QML
         self._serial.portsListChanged.connect(self.portsListChanged)
+        # 波特率协商：Dispatcher 解码应答交给协商服务，协商服务经门面请求发送与切换
+        self._dispatcher.supportedBaudRatesUpdated.connect(self._baud_negotiator.onSupportedBaudRates)
+        self._dispatcher.baudRateAckReceived.connect(self._baud_negotiator.onBaudRateAck)
+        self._dispatcher.baudProbeEchoed.connect(self._baud_negotiator.onProbeEchoed)
+        self._processor.crcErrorDetected.connect(self._baud_negotiator.onCrcErrorDetected)
+        self._baud_negotiator.sendRequested.connect(self._on_send_requested)
+        self._baud_negotiator.baudRateChangeRequested.connect(self._on_baud_rate_change_requested)
+        self._baud_negotiator.negotiationFinished.connect(self._on_baud_negotiation_finished)
+
+        # 重连请求只发给当前生效的传输对象
+        self._reconnect.linkResetRequested.connect(self._on_link_reset_requested)
+        self._reconnect.reopenRequested.connect(self._on_reopen_requested)
+        self._reconnect.reconnectingChanged.connect(self.isReconnectingChanged)
 
     @Property(bool, notify=isConnectedChanged)  # type: ignore
     def isConnected(self) -> bool:
         """QML 只读属性：当前串口是否已连接。"""
-        return self._serial.isConnected  # type: ignore[return-value]
+        return self._transport.isConnected  # type: ignore[return-value]
 
     @Property(list, notify=portsListChanged)  # type: ignore
     def portsList(self) -> list:
         """QML 只读属性：当前可用串口列表。"""
         return self._serial.portsList  # type: ignore[return-value]
 
+    @property
+    def portName(self) -> str:
+        """返回当前会话使用的串口名，未连接时为空字符串。"""
+        return self._transport.portName
+
+    @property
+    def pipelineBusyTimeSec(self) -> float:
+        """返回接收流水线（解析 + 分发）累计耗时（秒），用于估算单设备 CPU 占用。"""
+        return self._processor.busyTimeSec
+
+    @property
+    def pipelineChunkCount(self) -> int:
+        """返回接收流水线累计处理的数据块数量。"""
+        return self._processor.chunkCount
+
+    @property
+    def latestTelemetry(self) -> dict[str, float]:
+        """返回最近一次收到的遥测值（字段名 → 工程单位数值）。"""
+        return self._dispatcher.latestTelemetry
+
+    @Property(int, notify=baudRateChanged)  # type: ignore
+    def baudRate(self) -> int:
+        """QML 只读属性：当前串口实际波特率（协商后），网络传输或未连接时为 0。"""
+        return self._baud_rate
+
+    @property
+    def isBaudNegotiating(self) -> bool:
+        """返回连接后的波特率协商是否仍在进行（期间不宜发起参数读写）。"""
+        return self._baud_negotiator.isNegotiating
+
+    @Property(bool, notify=isReconnectingChanged)  # type: ignore
+    def isReconnecting(self) -> bool:
+        """QML 只读属性：链路意外中断后是否正在自动重连。"""
+        return self._reconnect.isReconnecting
+
     @Property(str, notify=mcuSoftwareVersionUpdated)  # type: ignore
     def mcuSoftwareVersion(self) -> str:
         """QML 只读属性：下位机软件版本。"""
@@ -232,45 +337,150 @@ class BackendFacade(QObject):
         """QML 只读属性：是否收到过有效的 HALL 遥测。"""
         return self._hall_telemetry_available
 
-    @Property(int, notify=txFrameCountTotalChanged)  # type: ignore
-    def txFrameCountTotal(self) -> int:
-        """QML 只读属性：当前会话累计发送完整帧数。"""
-        return self._serial_stats.txFrameCountTotal
-
-    @Property(int, notify=rxFrameCountTotalChanged)  # type: ignore
-    def rxFrameCountTotal(self) -> int:
-        """QML 只读属性：当前会话累计接收有效帧数。"""
-        return self._serial_stats.rxFrameCountTotal
-
-    @Property(int, notify=txBytesTotalChanged)  # type: ignore
-    def txBytesTotal(self) -> int:
-        """QML 只读属性：当前会话累计发送字节数。"""
-        return self._serial_stats.txBytesTotal
-
-    @Property(int, notify=rxBytesTotalChanged)  # type: ignore
-    def rxBytesTotal(self) -> int:
-        """QML 只读属性：当前会话累计接收原始字节数。"""
-        return self._serial_stats.rxBytesTotal
-
-    @Property(int, notify=txBytesPerSecChanged)  # type: ignore
-    def txBytesPerSec(self) -> int:
-        """QML 只读属性：最近 1 秒发送字节速率。"""
-        return self._serial_stats.txBytesPerSec
-
-    @Property(int, notify=rxBytesPerSecChanged)  # type: ignore
-    def rxBytesPerSec(self) -> int:
-        """QML 只读属性：最近 1 秒接收字节速率。"""
-        return self._serial_stats.rxBytesPerSec
-
-    @Property(int, notify=rxCrcErrorCountChanged)  # type: ignore
-    def rxCrcErrorCount(self) -> int:
-        """QML 只读属性：当前会话累计 CRC 错误次数。"""
-        return self._serial_stats.rxCrcErrorCount
-
-    @Property(int, notify=rxInvalidFrameCountChanged)  # type: ignore
-    def rxInvalidFrameCount(self) -> int:
-        """QML 只读属性：当前会话累计无效帧恢复次数。"""
-        return self._serial_stats.rxInvalidFrameCount
+    @Property("QVariantMap", notify=statisticsChanged)  # type: ignore
+    def statistics(self) -> dict:
+        """QML 只读属性：串口统计快照。
+
+        字段：tx/rxFrameCountTotal、tx/rxBytesTotal、tx/rxBytesPerSec、tx/rxFramesPerSec、
+        tx/rxPeakBytesPerSec、linkUtilization、rxCrcErrorCount、rxInvalidFrameCount、commandStats。
+        """
+        return self._serial_stats.statistics
+
+    @Property(int, notify=statisticsPublishIntervalChanged)  # type: ignore
+    def statisticsPublishIntervalMs(self) -> int:
+        """QML 只读属性：统计快照发布周期（毫秒）。"""
+        return self._serial_stats.publishIntervalMs
+
+    @Slot(int)
+    def setStatisticsPublishInterval(self, interval_ms: int) -> None:
+        """调整统计快照发布周期（单设备模式下生效；多设备由 SessionManager 共享节拍决定）。"""
+        if interval_ms == self._serial_stats.publishIntervalMs:
+            return
+        self._serial_stats.setPublishIntervalMs(interval_ms)
+        self.statisticsPublishIntervalChanged.emit()
+
+    @Property("QVariantMap", notify=statisticsHistoryChanged)  # type: ignore
+    def statisticsSparklines(self) -> dict[str, list[float]]:
+        """QML 只读属性：最近 SPARKLINE_POINTS 秒的链路健康序列，仅在读取时生成。"""
+        history = self._serial_stats.history
+        return {name: history.series(name, SPARKLINE_POINTS) for name in SPARKLINE_SERIES}
+
+    @Slot(str, result=bool)
+    def exportStatisticsHistory(self, file_url: str) -> bool:
+        """把统计历史导出为 CSV；参数可以是本地路径或 FileDialog 返回的 file:// URL。"""
+        path = QUrl(file_url).toLocalFile() if file_url.startswith("file:") else file_url
+        if not path:
+            return False
+        return self._serial_stats.exportHistoryCsv(path)
+
+    @Slot()
+    def clearStatisticsHistory(self) -> None:
+        """清空统计历史。"""
+        self._serial_stats.clearHistory()
+
+    @Property(bool, notify=latencyTracingEnabledChanged)  # type: ignore
+    def latencyTracingEnabled(self) -> bool:
+        """QML 只读属性：端到端延迟追踪是否开启；图表页据此决定是否回报渲染时刻。"""
+        return self._latency_tracing_enabled
+
+    @Slot(bool)
+    def setLatencyTracingEnabled(self, enabled: bool) -> None:
+        """开启或关闭端到端延迟追踪。"""
+        if enabled == self._latency_tracing_enabled:
+            return
+        self._latency_tracing_enabled = enabled
+        tracer = self._latency_tracer if enabled else None
+        for component in (self._serial, self._network, self._processor, self._dispatcher, self._chart_data):
+            if component is not None:
+                component.setLatencyTracer(tracer)
+        if enabled:
+            self._latency_tracer.start()
+        else:
+            self._latency_tracer.stop()
+        self.latencyTracingEnabledChanged.emit()
+
+    @Property("QVariantMap", notify=latencyStatsChanged)  # type: ignore
+    def latencyStats(self) -> dict[str, dict[str, float]]:
+        """QML 只读属性：各阶段延迟分位数（毫秒），字段 p50/p90/p99/max/count。"""
+        return self._latency_tracer.stats
+
+    @Property(QObject, constant=True)  # type: ignore
+    def chartData(self) -> "ChartDataProvider":
+        """QML 只读属性：CHT/QD 波形数据提供者，首次访问时创建并接入遥测信号。"""
+        if self._chart_data is None:
+            from core.service.chart_data_provider import ChartDataProvider
+
+            self._chart_data = ChartDataProvider(self)
+            self._chart_data.setHistory(self._history)
+            self._dispatcher.speedUpdated.connect(self._chart_data.onSpeedUpdated)
+            self._dispatcher.motorCurrentUpdated.connect(self._chart_data.onMotorCurrentUpdated)
+            self._dispatcher.dqComponentsUpdated.connect(self._chart_data.onDqComponentsUpdated)
+            if self._latency_tracing_enabled:
+                self._chart_data.setLatencyTracer(self._latency_tracer)
+        return self._chart_data
+
+    @Property(QObject, constant=True)  # type: ignore
+    def telemetryHistory(self) -> TelemetryHistory:
+        """QML 只读属性：长时间遥测历史，支持按时间范围与像素列数查询。"""
+        return self._history
+
+    @Property(QObject, constant=True)  # type: ignore
+    def logStore(self) -> LogStore:
+        """QML 只读属性：MCU 日志存储，提供 INFO 与 WARN / ERROR 两个列表模型。"""
+        return self._log_store
+
+    @Property(QObject, constant=True)  # type: ignore
+    def logSearch(self) -> LogSearch:
+        """QML 只读属性：MCU 日志检索（级别 / 时间范围过滤，子串或正则），结果分页提供。"""
+        return self._log_search
+
+    @Property("QVariantMap", notify=archiveStatsChanged)  # type: ignore
+    def archiveStats(self) -> dict:
+        """QML 只读属性：归档写入/丢弃样本数与当前文件；未启用归档时为空。"""
+        return self._archive.stats if self._archive is not None else {}
+
+    def startArchive(self, directory: str) -> None:
+        """启用遥测与日志归档，写入 directory 下的滚动文件（重复调用无效）。"""
+        if self._archive is not None:
+            return
+        from core.service.telemetry_archive import TelemetryArchive
+
+        self._archive = TelemetryArchive(directory, self)
+        self._archive.statsChanged.connect(self.archiveStatsChanged)
+        self._telemetry_fanout.add_sink(self._archive.append_sample)
+        self._dispatcher.logMessageReceived.connect(self._archive.onLogMessageReceived)
+        self._log_search.setArchiveDirectory(directory)
+
+    @Property(QObject, notify=sessionRecorderChanged)  # type: ignore
+    def sessionRecorder(self) -> "SessionRecorder | None":
+        """QML 只读属性：运行记录器（查询历史运行与通道数据）；未启用时为 null。"""
+        return self._session_recorder
+
+    @Property("QVariantMap", notify=sessionRecorderStatsChanged)  # type: ignore
+    def sessionRecorderStats(self) -> dict:
+        """QML 只读属性：运行记录写库统计；未启用时为空。"""
+        return self._session_recorder.stats if self._session_recorder is not None else {}
+
+    def startSessionRecorder(self, writer: "SessionRecorderWriter", device: str) -> None:
+        """启用运行记录：每次串口连接经共用的写库线程在其数据库中记录一次运行（重复调用无效）。"""
+        if self._session_recorder is not None:
+            return
+        from core.service.session_recorder import SessionRecorder
+
+        self._session_recorder = SessionRecorder(writer, device, self)
+        self._session_recorder.statsChanged.connect(self.sessionRecorderStatsChanged)
+        self._telemetry_fanout.add_sink(self._session_recorder.append_sample)
+        self._dispatcher.errorCodeUpdated.connect(self._session_recorder.onErrorCodeUpdated)
+        self.mcuSoftwareVersionUpdated.connect(self._on_recorder_mcu_version_updated)
+        self.connectionStatusChanged.connect(self._on_recorder_connection_status_changed)
+        if self._transport.isConnected:
+            self._session_recorder.begin_run(self.portName)
+        self.sessionRecorderChanged.emit()
+
+    @Property(list, constant=True)  # type: ignore
+    def commandIntervalBucketLabels(self) -> list:
+        """QML 只读属性：到达间隔直方图各桶的标签（毫秒）。"""
+        return list(INTERVAL_BUCKET_LABELS)
 
     @Property("QVariantMap", notify=controlParamsChanged)  # type: ignore
     def controlParams(self) -> dict[str, dict[str, float]]:
@@ -298,8 +508,14 @@ class BackendFacade(QObject):
 
     @Slot(str, int)
     def connectSerial(self, port_name: str, baud_rate: int = 9600) -> None:
-        """打开串口连接。"""
-        self._serial.openPort(port_name, baud_rate)
+        """打开串口连接；端口名为 tcp:// 或 udp:// 地址时改走网络串口桥。"""
+        transport = self._ensure_network_transport() if is_network_port_name(port_name) else self._serial
+        if transport is not self._transport:
+            # 切换传输方式前先关闭旧连接，保证同一时刻只有一条链路
+            self._transport.closePort()
+            self._transport = transport
+        self._base_baud_rate = baud_rate
+        self._transport.openPort(port_name, baud_rate)
 
     @Slot()
     def disconnectSerial(self) -> None:
@@ -309,7 +525,7 @@ class BackendFacade(QObject):
         self._stop_motor_type_query_loop()
         self._reset_mcu_version()
         self._reset_mcu_motor_type()
-        self._serial.closePort()
+        self._transport.closePort()
 
     @Slot()
     def scanPorts(self) -> None:
@@ -321,6 +537,24 @@ class BackendFacade(QObject):
         """手动添加串口名到列表。"""
         self._serial.addManualPort(port_name)
 
+    @property
+    def stallKeepalive(self) -> StallKeepalive:
+        """返回卡顿保活发送器，供事件循环看门狗注册。"""
+        return self._stall_keepalive
+
+    @Slot()
+    def shutdown(self) -> None:
+        """应用退出前释放后台线程等资源。"""
+        self._stall_keepalive.set_target(None)
+        self._serial.shutdown()
+        if self._network is not None:
+            self._network.shutdown()
+        self._log_search.shutdown()
+        if self._archive is not None:
+            self._archive.stop()
+        if self._session_recorder is not None:
+            self._session_recorder.stop()
+
     @Slot(int, int)
     def setMotorControl(self, enable: int, speed_rpm: int) -> None:
         """设置电机使能与目标转速，并立即发送一次控制帧。"""
@@ -333,6 +567,7 @@ class BackendFacade(QObject):
                 self._motor_cmd_timer.start()
         else:
             self._motor_cmd_timer.stop()
+        self._refresh_stall_keepalive()
 
     @Slot()
     def stopMotor(self) -> None:
@@ -341,6 +576,7 @@ class BackendFacade(QObject):
         self._motor_enable = 0
         self._motor_target_speed = 0
         self._send_motor_cmd()
+        self._refresh_stall_keepalive()
 
     @Slot()
     def queryMcuSoftwareVersion(self) -> None:
@@ -362,51 +598,90 @@ class BackendFacade(QObject):
     @Slot(dict)
     def applyControlParams(self, params: dict[str, Any]) -> None:
         """接收 QML 聚合参数并下发到 MCU 当前运行态。"""
-        if not self._serial.isConnected:
+        if not self._transport.isConnected:
             self._set_control_params_last_status("串口未连接，无法应用参数")
             return
         if self._control_params_busy:
             self._set_control_params_last_status("参数同步中，请稍后再试")
             return
 
+        from core.command.tune_params_command import (
+            build_set_current_loop_params,
+            build_set_motor_limits,
+            build_set_speed_loop_params,
+        )
+
         try:
             speed_loop = self._extract_loop_params(params, "speedLoop")
             current_loop = self._extract_loop_params(params, "currentLoop")
             motor_limits = self._extract_motor_limits(params)
-            self._serial.sendData(build_set_speed_loop_params(*speed_loop))
-            self._serial.sendData(build_set_current_loop_params(*current_loop))
-            self._serial.sendData(build_set_motor_limits(*motor_limits))
+            self._transport.sendData(build_set_speed_loop_params(*speed_loop))
+            self._transport.sendData(build_set_current_loop_params(*current_loop))
+            self._transport.sendData(build_set_motor_limits(*motor_limits))
         except (KeyError, TypeError, ValueError) as error:
             self._set_control_params_last_status(f"参数校验失败: {error}")
             return
 
         self._start_tune_param_refresh(post_write_readback=True)
 
+    def _wire_transport(self, transport: "mySerial | NetworkTransport") -> None:
+        """把传输对象接入处理流水线、连接状态转发与链路恢复；串口与网络传输共用。"""
+        transport.dataReceived.connect(self._processor.process_data)
+        transport.dataReceived.connect(self._serial_stats.onDataReceived)
+        transport.dataWritten.connect(self._serial_stats.onDataWritten)
+        transport.connectionStatusChanged.connect(self._on_connection_status_changed)
+        transport.isConnectedChanged.connect(self.isConnectedChanged)
+
+        # 链路恢复：Transport 报告中断/恢复，ReconnectManager 负责静默检测与退避重连
+        transport.connectionStatusChanged.connect(self._reconnect.onConnectionStatusChanged)
+        transport.dataReceived.connect(self._reconnect.onDataReceived)
+        transport.linkLost.connect(self._reconnect.onLinkLost)
+        transport.linkRestored.connect(self._reconnect.onLinkRestored)
+        transport.reopenFailed.connect(self._reconnect.onReopenFailed)
+        transport.linkLost.connect(self._on_link_lost)
+        transport.linkRestored.connect(self._on_link_restored)
+
+    def _ensure_network_transport(self) -> "NetworkTransport":
+        """首次连接网络地址时创建网络传输对象并接入流水线。"""
+        if self._network is None:
+            from core.transport.network_transport import NetworkTransport
+
+            self._network = NetworkTransport(self)
+            self._wire_transport(self._network)
+            if self._latency_tracing_enabled:
+                self._network.setLatencyTracer(self._latency_tracer)
+        return self._network
+
     def _send_motor_cmd(self) -> None:
         """编码并发送 CMD 0x01 电机控制帧。"""
-        self._serial.sendData(build_motor_control(self._motor_enable, self._motor_target_speed))
+        self._transport.sendData(build_motor_control(self._motor_enable, self._motor_target_speed))
 
     def _send_heartbeat(self) -> None:
         """编码并发送 CMD 0x02 心跳帧。"""
-        self._serial.sendData(build_pc_heartbeat())
+        self._transport.sendData(build_pc_heartbeat())
 
     def _send_version_query_once(self) -> None:
         """连接状态下发送一次 CMD 0x03 版本查询帧。"""
-        if self._serial.isConnected:
-            self._serial.sendData(build_query_software_version())
+        if self._transport.isConnected:
+            self._transport.sendData(build_query_software_version())
 
     def _send_motor_type_query_once(self) -> None:
         """连接状态下发送一次 CMD 0x04 电机类型查询帧。"""
-        if self._serial.isConnected:
-            self._serial.sendData(build_query_motor_type())
+        if self._transport.isConnected:
+            self._transport.sendData(build_query_motor_type())
 
     def _start_tune_param_refresh(self, post_write_readback: bool) -> None:
         """启动一轮 TUNE 页面参数读取或写后读回流程。"""
-        if not self._serial.isConnected:
+        if not self._transport.isConnected:
             self._set_control_params_last_status("串口未连接，无法读取参数")
             return
         if self._control_params_busy:
             return
+        from core.command.tune_params_command import (
+            build_query_current_loop_params,
+            build_query_motor_limits,
+            build_query_speed_loop_params,
+        )
 
         self._pending_param_loops = {"speedLoop", "currentLoop", "motorLimits"}
         self._post_write_readback_pending = post_write_readback
@@ -416,9 +691,9 @@ class BackendFacade(QObject):
             TUNE_PARAM_STATUS_APPLYING if post_write_readback else TUNE_PARAM_STATUS_READING
         )
         # TUNE 参数读取顺序固定为速度环、电流环、限幅参数，便于和页面展示顺序保持一致
-        self._serial.sendData(build_query_speed_loop_params())
-        self._serial.sendData(build_query_current_loop_params())
-        self._serial.sendData(build_query_motor_limits())
+        self._transport.sendData(build_query_speed_loop_params())
+        self._transport.sendData(build_query_current_loop_params())
+        self._transport.sendData(build_query_motor_limits())
         self._tune_param_timeout_timer.setInterval(TUNE_PARAM_READ_TIMEOUT_MS)
         self._tune_param_timeout_timer.start()
 
@@ -514,6 +789,9 @@ class BackendFacade(QObject):
         self._set_control_params_available(True)
         self._set_control_params_last_status(TUNE_PARAM_STATUS_SYNCED)
         self._post_write_readback_pending = False
+        if self._session_recorder is not None:
+            # 三组参数全部回读后才是一组一致的参数（写入后的读回同样经过这里）
+            self._session_recorder.record_control_params(self.controlParams)
 
     def _set_control_params_available(self, available: bool) -> None:
         """更新参数可用态，并在变化时通知 QML。"""
@@ -537,11 +815,32 @@ class BackendFacade(QObject):
         """启动 PC 心跳定时器。"""
         if not self._heartbeat_timer.isActive():
             self._heartbeat_timer.start()
+        self._refresh_stall_keepalive()
 
     def _stop_heartbeat(self) -> None:
         """停止 PC 心跳定时器。"""
         if self._heartbeat_timer.isActive():
             self._heartbeat_timer.stop()
+        self._refresh_stall_keepalive()
+
+    @Slot()
+    def _on_serial_about_to_close(self) -> None:
+        """串口即将关闭：停止卡顿代发，看门狗线程不再写入即将失效（可能被复用）的 fd。"""
+        self._stall_keepalive.set_target(None)
+
+    def _refresh_stall_keepalive(self) -> None:
+        """按当前心跳与电机保活状态更新卡顿期间的代发帧与目标串口。
+
+        仅串口传输且心跳运行时代发；断开前心跳先停止，保证串口关闭后不再写入旧 fd。
+        """
+        frames: tuple[bytes, ...] = ()
+        if self._heartbeat_timer.isActive():
+            frames = (build_pc_heartbeat(),)
+            if self._motor_cmd_timer.isActive():
+                frames += (build_motor_control(self._motor_enable, self._motor_target_speed),)
+        self._stall_keepalive.set_frames(frames)
+        fd = self._serial.nativeHandle() if frames and self._transport is self._serial else None
+        self._stall_keepalive.set_target(fd)
 
     def _start_version_query_loop(self) -> None:
         """启动 1 秒版本查询轮询。"""
@@ -565,7 +864,7 @@ class BackendFacade(QObject):
 
     def _on_version_query_timer(self) -> None:
         """定时轮询：仅在版本仍为默认值时继续发送查询。"""
-        if not self._serial.isConnected:
+        if not self._transport.isConnected:
             self._stop_version_query_loop()
             return
         if self._mcu_version_text == DEFAULT_MCU_VERSION:
@@ -576,7 +875,7 @@ class BackendFacade(QObject):
 
     def _on_motor_type_query_timer(self) -> None:
         """定时轮询：仅在电机类型仍为未知值时继续发送查询。"""
-        if not self._serial.isConnected:
+        if not self._transport.isConnected:
             self._stop_motor_type_query_loop()
             return
         if self._mcu_motor_type == DEFAULT_MOTOR_TYPE:
@@ -592,7 +891,7 @@ class BackendFacade(QObject):
         self.mcuSoftwareVersionUpdated.emit(version_text)
 
         if version_text == DEFAULT_MCU_VERSION:
-            if self._serial.isConnected:
+            if self._transport.isConnected:
                 self._start_version_query_loop()
         else:
             self._stop_version_query_loop()
@@ -614,7 +913,7 @@ class BackendFacade(QObject):
             self._reset_hall_telemetry()
 
         if valid_motor_type == DEFAULT_MOTOR_TYPE:
-            if self._serial.isConnected:
+            if self._transport.isConnected:
                 self._start_motor_type_query_loop()
         else:
             self._stop_motor_type_query_loop()
@@ -713,6 +1012,92 @@ class BackendFacade(QObject):
         )
         self._post_write_readback_pending = False
 
+    @Slot(str)
+    def _on_link_reset_requested(self, reason: str) -> None:
+        """接收静默超时：请求当前传输对象复位链路。"""
+        self._transport.dropLink(reason)
+
+    @Slot()
+    def _on_reopen_requested(self) -> None:
+        """退避结束：请求当前传输对象按原参数重连。"""
+        self._transport.reopenPort()
+
+    @Slot(bytes)
+    def _on_send_requested(self, frame: bytes) -> None:
+        """服务层请求发送的协议帧（如波特率协商），经当前传输对象发出。"""
+        self._transport.sendData(frame)
+
+    @Slot(int)
+    def _on_baud_rate_change_requested(self, baud_rate: int) -> None:
+        """协商服务请求切换 PC 侧波特率：切换后清空解析缓冲，丢弃切换瞬间的乱码。"""
+        if self._transport is self._serial:
+            self._serial.setBaudRate(baud_rate)
+            self._processor.reset()
+
+    @Slot(int, bool)
+    def _on_baud_negotiation_finished(self, baud_rate: int, _upgraded: bool) -> None:
+        """协商结束，记录最终波特率供 QML 显示。"""
+        self._set_baud_rate(baud_rate)
+
+    def _set_baud_rate(self, baud_rate: int) -> None:
+        """更新当前波特率，并在变化时通知 QML。"""
+        if self._baud_rate != baud_rate:
+            self._baud_rate = baud_rate
+            self._serial_stats.setBaudRate(baud_rate)
+            self.baudRateChanged.emit()
+
+    def _start_baud_negotiation(self) -> None:
+        """仅串口传输需要协商：先以安全波特率通讯，再尝试升级到高速档。"""
+        if self._transport is self._serial:
+            self._set_baud_rate(self._base_baud_rate)
+            self._baud_negotiator.start(self._base_baud_rate)
+        else:
+            self._set_baud_rate(0)
+
+    @Slot(str)
+    def _on_link_lost(self, reason: str) -> None:
+        """链路意外中断：停止周期发送，保留版本/电机类型/TUNE 参数等会话缓存。"""
+        self._baud_negotiator.cancel()
+        if self._transport is self._serial and self._baud_rate != self._base_baud_rate:
+            # MCU 心跳超时后会回到安全波特率（协议约定），重连统一从安全波特率开始再协商
+            self._serial.setBaudRate(self._base_baud_rate)
+        self._stop_heartbeat()
+        self._stop_version_query_loop()
+        self._stop_motor_type_query_loop()
+        # 安全考虑：链路中断期间 MCU 会超时停机，恢复后不自动重新使能电机
+        self._motor_cmd_timer.stop()
+        self._motor_enable = 0
+        self._motor_target_speed = 0
+        self._processor.reset()
+
+    @Slot(str)
+    def _on_link_restored(self, port_name: str) -> None:
+        """链路自动恢复：沿用会话缓存与时钟偏移，仅重启心跳和尚未完成的查询。"""
+        self._processor.reset()
+        self._dispatcher.verify_clock_sync()
+        self._start_heartbeat()
+        self._start_baud_negotiation()
+        if self._mcu_version_text == DEFAULT_MCU_VERSION:
+            self._send_version_query_once()
+            self._start_version_query_loop()
+        if self._mcu_motor_type == DEFAULT_MOTOR_TYPE:
+            self._send_motor_type_query_once()
+            self._start_motor_type_query_loop()
+
+    @Slot(bool, str)
+    def _on_recorder_connection_status_changed(self, connected: bool, _message: str) -> None:
+        """每次串口连接对应一次运行记录。"""
+        if connected:
+            self._session_recorder.begin_run(self.portName)
+        else:
+            self._session_recorder.end_run()
+
+    @Slot(str)
+    def _on_recorder_mcu_version_updated(self, version_text: str) -> None:
+        # 断开时复位的默认版本不是 MCU 上报值，不记录
+        if version_text != DEFAULT_MCU_VERSION:
+            self._session_recorder.onMcuVersionUpdated(version_text)
+
     @Slot(bool, str)
     def _on_connection_status_changed(self, connected: bool, message: str) -> None:
         """连接建立时启动心跳与查询轮询；断开时停止并复位状态。"""
@@ -721,6 +1106,7 @@ class BackendFacade(QObject):
             self._processor.reset()
             self._serial_stats.reset()
             self._start_heartbeat()
+            self._start_baud_negotiation()
             if self._mcu_version_text == DEFAULT_MCU_VERSION:
                 self._send_version_query_once()
                 self._start_version_query_loop()
@@ -728,6 +1114,8 @@ class BackendFacade(QObject):
                 self._send_motor_type_query_once()
                 self._start_motor_type_query_loop()
         else:
+            self._baud_negotiator.cancel()
+            self._set_baud_rate(0)
             self._stop_heartbeat()
             self._stop_version_query_loop()
             self._stop_motor_type_query_loop()
@@ -1,25 +1,39 @@
-from core.command.motor_command import build_motor_control
-from core.command.motor_type_command import build_query_motor_type
-from core.command.pc_heartbeat_command import build_pc_heartbeat
-from core.command.software_version_command import build_query_software_version
-from core.command.tune_params_command import (
-    build_query_current_loop_params,
-    build_query_motor_limits,
-    build_query_speed_loop_params,
-    build_set_current_loop_params,
-    build_set_motor_limits,
-    build_set_speed_loop_params,
-)
-
-__all__ = [
-    "build_motor_control",
-    "build_query_motor_type",
-    "build_pc_heartbeat",
-    "build_query_software_version",
-    "build_query_current_loop_params",
-    "build_query_motor_limits",
-    "build_query_speed_loop_params",
-    "build_set_current_loop_params",
-    "build_set_motor_limits",
-    "build_set_speed_loop_params",
-]
+"""Command 层：各业务指令的帧构造函数。
+
+子模块按需导入：包级名称通过 __getattr__ 延迟加载，导入单个子模块（如心跳指令）时
+不会连带加载调参、波特率协商等首帧用不到的指令构造器。
+"""
+
+import importlib
+
+_BUILDER_MODULES = {
+    "build_baud_probe": "baud_rate_command",
+    "build_commit_baud_rate": "baud_rate_command",
+    "build_query_baud_rates": "baud_rate_command",
+    "build_set_baud_rate": "baud_rate_command",
+    "build_motor_control": "motor_command",
+    "build_query_motor_type": "motor_type_command",
+    "build_pc_heartbeat": "pc_heartbeat_command",
+    "build_query_software_version": "software_version_command",
+    "build_query_current_loop_params": "tune_params_command",
+    "build_query_motor_limits": "tune_params_command",
+    "build_query_speed_loop_params": "tune_params_command",
+    "build_set_current_loop_params": "tune_params_command",
+    "build_set_motor_limits": "tune_params_command",
+    "build_set_speed_loop_params": "tune_params_command",
+}
+
+__all__ = list(_BUILDER_MODULES)
+
+
+def __getattr__(name: str):
+    module_name = _BUILDER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
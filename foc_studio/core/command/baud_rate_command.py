@@ -0,0 +1,58 @@
+"""
+Command 层：波特率协商命令构造
+
+职责：
+    - 定义波特率查询 / 切换 / 探测 / 确认命令字
+    - 生成探测帧固定负载，供服务层校验 MCU 回显
+
+约束（layer-contracts）：
+    - 纯函数，无状态，无副作用
+    - 不访问 Transport / UI
+    - 不使用 QObject / Qt 信号
+"""
+
+import struct
+
+from core.protocol.protocol_frame import pack_frame
+
+# ── 命令字常量 ─────────────────────────────────────────────────────────────────
+CMD_QUERY_BAUD_RATES: int = 0x0D    # PC → MCU：查询 MCU 支持的波特率列表，无 payload
+CMD_SET_BAUD_RATE: int = 0x0E       # PC → MCU：请求切换到指定波特率
+CMD_BAUD_PROBE: int = 0x0F          # PC → MCU：新波特率下的探测帧，MCU 原样回显
+CMD_COMMIT_BAUD_RATE: int = 0x10    # PC → MCU：探测通过，确认保持新波特率
+
+# 探测帧固定图样：包含帧头字节、全 0 / 全 1 与交替位，覆盖高速链路最易出错的位模式
+BAUD_PROBE_PATTERN: bytes = bytes([
+    0xAA, 0xBB, 0x55, 0x00, 0xFF, 0x0F, 0xF0, 0x33,
+    0xCC, 0x5A, 0xA5, 0x01, 0x80, 0x7E, 0x81, 0xE7,
+]) * 2
+
+
+def baud_probe_payload(seq: int) -> bytes:
+    """返回序号为 seq 的探测帧 payload：uint16 序号 + 固定图样。"""
+    return struct.pack('>H', seq & 0xFFFF) + BAUD_PROBE_PATTERN
+
+
+def build_query_baud_rates() -> bytes:
+    """构造 CMD 0x0D 波特率查询帧（无 payload）。"""
+    return pack_frame(CMD_QUERY_BAUD_RATES)
+
+
+def build_set_baud_rate(baud_rate: int) -> bytes:
+    """
+    构造 CMD 0x0E 切换波特率帧。
+
+    Payload 格式（DATA_LEN = 4）：
+        Offset 0  4 bytes uint32  目标波特率，Big-Endian
+    """
+    return pack_frame(CMD_SET_BAUD_RATE, struct.pack('>I', baud_rate))
+
+
+def build_baud_probe(seq: int) -> bytes:
+    """构造 CMD 0x0F 探测帧，payload 见 baud_probe_payload。"""
+    return pack_frame(CMD_BAUD_PROBE, baud_probe_payload(seq))
+
+
+def build_commit_baud_rate(baud_rate: int) -> bytes:
+    """构造 CMD 0x10 确认帧，payload 为最终保持的 uint32 波特率。"""
+    return pack_frame(CMD_COMMIT_BAUD_RATE, struct.pack('>I', baud_rate))
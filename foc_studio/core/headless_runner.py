@@ -0,0 +1,287 @@
+"""HeadlessRunner - 无界面运行模式（main.py --headless）。
+
+在 QCoreApplication 下直接构建 BackendFacade，不创建 QML 引擎：
+  - 连接串口（或 tcp:// / udp:// 网络串口桥）后按帧全速记录解码后的遥测，
+    输出为 CSV 或紧凑二进制，写入文件或标准输出
+  - 可脚本化执行 TUNE 参数读取（--tune-read）与应用并读回校验（--tune-apply）
+
+二进制格式：文件头 b"FOCT" + 版本字节，其后为定长记录
+  <d B 4f>  pc_timestamp_ms, 通道序号（TELEMETRY_CHANNELS 下标）, 最多 4 个数值（不足补 0）
+
+退出码：0 成功；1 参数读写失败或超时；2 命令行参数错误（与 argparse 一致）；3 连接失败。
+"""
+
+import argparse
+import json
+import signal
+import struct
+import sys
+import time
+from typing import BinaryIO, TextIO
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+
+from core.backend_facade import TUNE_PARAM_STATUS_SYNCED, BackendFacade
+
+# 遥测通道与各自的数值字段，二进制记录中以下标表示通道
+TELEMETRY_CHANNELS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("speed", ("speed_rpm",)),
+    ("dq", ("iq", "id", "uq", "ud")),
+    ("motorCurrent", ("current",)),
+    ("motorTemp", ("celsius",)),
+    ("mosTemp", ("celsius",)),
+    ("enableState", ("enabled",)),
+    ("errorCode", ("code",)),
+    ("hall", ("hall_state", "electric_sector", "hall_bits")),
+)
+BINARY_MAGIC = b"FOCT\x01"
+BINARY_RECORD = struct.Struct("<dB4f")
+CSV_HEADER = "pc_timestamp_ms,channel,v1,v2,v3,v4\n"
+
+HEADLESS_DEFAULT_BAUD_RATE = 460800
+HEADLESS_CONNECT_TIMEOUT_MS = 3000
+HEADLESS_READY_POLL_MS = 50
+HEADLESS_FLUSH_INTERVAL_MS = 1000     # 周期刷新输出缓冲，便于 tail -f 跟踪
+HEADLESS_OUTPUT_BUFFER_BYTES = 1 << 20
+
+EXIT_OK = 0
+EXIT_TUNE_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CONNECT_FAILED = 3
+
+
+class CsvTelemetryWriter:
+    """长表 CSV：每帧一行，数值列固定 4 列，不足留空。"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._channel_names = [name for name, _fields in TELEMETRY_CHANNELS]
+        stream.write(CSV_HEADER)
+
+    def write(self, timestamp_ms: float, channel: int, values: tuple) -> None:
+        padding = "," * (4 - len(values))
+        self._stream.write(
+            f"{timestamp_ms:.3f},{self._channel_names[channel]},{','.join(f'{v:g}' for v in values)}{padding}\n"
+        )
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+class BinaryTelemetryWriter:
+    """定长二进制记录，单条 25 字节，适合长时间全速记录。"""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._pack = BINARY_RECORD.pack
+        stream.write(BINARY_MAGIC)
+
+    def write(self, timestamp_ms: float, channel: int, values: tuple) -> None:
+        padded = values + (0.0,) * (4 - len(values))
+        self._stream.write(self._pack(timestamp_ms, channel, *padded))
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def _now_ms() -> float:
+    """无 MCU 时间戳的遥测使用 PC 墙钟毫秒，与 FrameDispatcher 的 pc_ts 同一时基。"""
+    return time.time() * 1000.0
+
+
+class HeadlessRunner(QObject):
+    """无界面流程编排：连接 → 等待波特率协商结束 → 可选 TUNE 读写 → 记录遥测直到时长耗尽或中断。"""
+
+    def __init__(
+        self,
+        backend: BackendFacade,
+        writer: CsvTelemetryWriter | BinaryTelemetryWriter | None,
+        duration_s: float,
+        tune_read: bool,
+        tune_apply_params: dict | None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self._backend = backend
+        self._writer = writer
+        self._duration_s = duration_s
+        self._tune_read = tune_read
+        self._tune_apply_params = tune_apply_params
+        self._tune_pending = False
+        self.exitCode = EXIT_OK
+
+        self._connect_timer = QTimer(self)
+        self._connect_timer.setSingleShot(True)
+        self._connect_timer.setInterval(HEADLESS_CONNECT_TIMEOUT_MS)
+        self._connect_timer.timeout.connect(lambda: self._finish(EXIT_CONNECT_FAILED, "connect timeout"))
+        self._ready_timer = QTimer(self)
+        self._ready_timer.setInterval(HEADLESS_READY_POLL_MS)
+        self._ready_timer.timeout.connect(self._on_ready_poll)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(HEADLESS_FLUSH_INTERVAL_MS)
+
+        backend.connectionStatusChanged.connect(self._on_connection_status_changed)
+        # 门面先复位 busy 再更新状态文案，因此以状态文案变化作为参数流程结束的判据
+        backend.controlParamsLastStatusChanged.connect(self._check_tune_result)
+        if writer is not None:
+            self._connect_telemetry(writer)
+            self._flush_timer.timeout.connect(writer.flush)
+
+    def start(self, port_name: str, baud_rate: int) -> None:
+        """发起连接；结果经 connectionStatusChanged 异步返回。"""
+        self._connect_timer.start()
+        self._backend.connectSerial(port_name, baud_rate)
+
+    def stop(self) -> None:
+        """中断（Ctrl+C）或时长耗尽：刷新输出并退出事件循环。"""
+        self._finish(self.exitCode, "")
+
+    def _connect_telemetry(self, writer: CsvTelemetryWriter | BinaryTelemetryWriter) -> None:
+        """直接连接门面遥测信号，每帧一条记录，不做任何降采样。"""
+        write = writer.write
+        backend = self._backend
+        backend.speedUpdated.connect(lambda rpm, ts: write(ts, 0, (rpm,)))
+        backend.dqComponentsUpdated.connect(lambda iq, id_, uq, ud, ts: write(ts, 1, (iq, id_, uq, ud)))
+        backend.motorCurrentUpdated.connect(lambda current, ts: write(ts, 2, (current,)))
+        backend.motorTempUpdated.connect(lambda celsius: write(_now_ms(), 3, (celsius,)))
+        backend.mosTempUpdated.connect(lambda celsius: write(_now_ms(), 4, (celsius,)))
+        backend.enableStateUpdated.connect(lambda enabled: write(_now_ms(), 5, (enabled,)))
+        backend.errorCodeUpdated.connect(lambda code: write(_now_ms(), 6, (code,)))
+        backend.hallTelemetryUpdated.connect(
+            lambda a, b, c, state, sector, ts: write(ts, 7, (state, sector, a << 2 | b << 1 | c))
+        )
+
+    def _on_connection_status_changed(self, connected: bool, message: str) -> None:
+        if connected:
+            self._connect_timer.stop()
+            print(f"[HeadlessRunner] connected: {message}", file=sys.stderr, flush=True)
+            self._ready_timer.start()
+        elif self._connect_timer.isActive():
+            self._finish(EXIT_CONNECT_FAILED, message)
+
+    def _on_ready_poll(self) -> None:
+        """等待波特率协商结束后再开始参数读写与计时，避免与切换过程交错。"""
+        if self._backend.isBaudNegotiating:
+            return
+        self._ready_timer.stop()
+        print(f"[HeadlessRunner] link ready at {self._backend.baudRate} baud", file=sys.stderr, flush=True)
+        if self._writer is not None:
+            self._flush_timer.start()
+        if self._duration_s > 0:
+            QTimer.singleShot(int(self._duration_s * 1000), self.stop)
+        if self._tune_apply_params is not None:
+            self._tune_pending = True
+            self._backend.applyControlParams(self._tune_apply_params)
+        elif self._tune_read:
+            self._tune_pending = True
+            self._backend.requestTuneParamsRefresh()
+        self._check_tune_result()
+
+    def _check_tune_result(self) -> None:
+        """参数流程结束（不再 busy）时输出 JSON 结果；无需记录遥测则随即退出。
+
+        结果写到 stdout，遥测占用 stdout 时 stdout 已改道到 stderr，两者不会混在一起。
+        """
+        if not self._tune_pending or self._backend.controlParamsBusy:
+            return
+        self._tune_pending = False
+        status = self._backend.controlParamsLastStatus
+        synced = status == TUNE_PARAM_STATUS_SYNCED
+        print(json.dumps({
+            "status": status,
+            "synced": synced,
+            "params": self._backend.controlParams,
+        }, ensure_ascii=False), flush=True)
+        if not synced:
+            self._finish(EXIT_TUNE_FAILED, status)
+        elif self._writer is None:
+            self._finish(EXIT_OK, "")
+
+    def _finish(self, exit_code: int, reason: str) -> None:
+        if reason:
+            print(f"[HeadlessRunner] {reason}", file=sys.stderr, flush=True)
+        self.exitCode = exit_code
+        self._connect_timer.stop()
+        self._ready_timer.stop()
+        self._flush_timer.stop()
+        if self._writer is not None:
+            self._writer.flush()
+        QCoreApplication.quit()
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="FOC Studio 无界面模式：记录遥测、脚本化 TUNE 参数读写。",
+    )
+    parser.add_argument("--headless", action="store_true", help="以无界面模式运行")
+    parser.add_argument("--port", required=True, help="串口名，或 tcp://host:port / udp://host:port")
+    parser.add_argument("--baud", type=int, default=HEADLESS_DEFAULT_BAUD_RATE, help="安全波特率（连接后自动协商）")
+    parser.add_argument("--output", help="遥测输出文件，- 为标准输出；未指定且无 TUNE 操作时默认为 -")
+    parser.add_argument("--format", choices=("csv", "binary"), default="csv", help="遥测输出格式")
+    parser.add_argument("--duration", type=float, default=0.0, help="记录时长（秒），0 表示直到 Ctrl+C")
+    parser.add_argument("--tune-read", action="store_true", help="读取 TUNE 参数并输出 JSON 结果")
+    parser.add_argument(
+        "--tune-apply", metavar="JSON",
+        help="应用 TUNE 参数并读回校验；取值为 JSON 文件路径或 JSON 文本（结构同 controlParams）",
+    )
+    return parser
+
+
+def _load_tune_params(value: str) -> dict:
+    """--tune-apply 既接受 JSON 文本也接受文件路径。"""
+    if value.lstrip().startswith("{"):
+        return json.loads(value)
+    with open(value, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main(argv: list[str]) -> int:
+    """无界面模式入口，返回进程退出码。"""
+    args = build_argument_parser().parse_args(argv)
+    try:
+        tune_apply_params = _load_tune_params(args.tune_apply) if args.tune_apply else None
+    except (OSError, ValueError) as exc:
+        print(f"Invalid --tune-apply: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+
+    output = args.output
+    if output is None and not (args.tune_read or tune_apply_params is not None):
+        output = "-"
+
+    app = QCoreApplication(sys.argv[:1])
+    output_file = None
+    writer = None
+    if output == "-":
+        # 各层日志默认打印到 stdout，遥测占用 stdout 时把日志改道到 stderr
+        data_stream = sys.stdout
+        sys.stdout = sys.stderr
+        writer = (
+            BinaryTelemetryWriter(data_stream.buffer) if args.format == "binary"
+            else CsvTelemetryWriter(data_stream)
+        )
+    elif output is not None:
+        if args.format == "binary":
+            output_file = open(output, "wb", buffering=HEADLESS_OUTPUT_BUFFER_BYTES)
+            writer = BinaryTelemetryWriter(output_file)
+        else:
+            output_file = open(output, "w", encoding="utf-8", newline="", buffering=HEADLESS_OUTPUT_BUFFER_BYTES)
+            writer = CsvTelemetryWriter(output_file)
+
+    backend = BackendFacade()
+    runner = HeadlessRunner(backend, writer, args.duration, args.tune_read, tune_apply_params)
+    # Qt 事件循环中 Python 信号处理函数只有在解释器获得执行机会时才运行，定时器保证 Ctrl+C 及时生效
+    signal.signal(signal.SIGINT, lambda *_args: runner.stop())
+    interrupt_timer = QTimer()
+    interrupt_timer.start(200)
+    interrupt_timer.timeout.connect(lambda: None)
+
+    # 连接失败会同步回调并请求退出，必须在事件循环启动后再发起
+    QTimer.singleShot(0, lambda: runner.start(args.port, args.baud))
+    app.exec()
+
+    backend.disconnectSerial()
+    backend.shutdown()
+    if output_file is not None:
+        output_file.close()
+    return runner.exitCode
@@ -0,0 +1,124 @@
+"""ImportProfiler - 启动阶段逐模块导入耗时统计。
+
+与 python -X importtime 口径一致（自身耗时 / 含子模块的累计耗时），但结果保存在进程内，
+首帧呈现后打印耗时最高的模块，并可写出完整 CSV 供不同版本、不同电脑之间对比。
+
+通过环境变量 FOC_STUDIO_PROFILE_IMPORTS 开启：取值为 1 只打印汇总，取值为 .csv 路径时同时写出明细。
+该模块只依赖标准库，须在 main.py 中先于 PySide6 与 core 其余模块导入并安装。
+"""
+
+import importlib.abc
+import sys
+import threading
+import time
+
+IMPORT_PROFILE_ENV = "FOC_STUDIO_PROFILE_IMPORTS"
+IMPORT_PROFILE_TOP_N = 15
+
+
+class _TimedLoader:
+    """包装原 loader，记录 create_module + exec_module 耗时；其余属性透传给原 loader。"""
+
+    def __init__(self, loader, profiler: "ImportProfiler", name: str) -> None:
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        self._profiler._enter()
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._profiler._leave(self._name)
+
+    def exec_module(self, module) -> None:
+        self._profiler._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(self._name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """插在 sys.meta_path 最前面的计时 finder：自身不查找模块，只包装其余 finder 找到的 loader。"""
+
+    def __init__(self) -> None:
+        # name -> [自身耗时 s, 累计耗时 s, 导入顺序]
+        self._records: dict[str, list[float]] = {}
+        # 每层导入的 [开始时刻, 子模块累计耗时]
+        self._stack: list[list[float]] = []
+        self._resolving = False
+        # 只统计主线程导入：后台线程中的导入不影响启动路径，也会打乱计时栈
+        self._thread_id = threading.get_ident()
+
+    @classmethod
+    def install_from_env(cls, environ) -> "ImportProfiler | None":
+        """环境变量开启时安装并返回实例，否则返回 None。"""
+        if not environ.get(IMPORT_PROFILE_ENV, "").strip():
+            return None
+        profiler = cls()
+        sys.meta_path.insert(0, profiler)
+        return profiler
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if self._resolving or threading.get_ident() != self._thread_id:
+            return None
+        self._resolving = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._resolving = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def _enter(self) -> None:
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _leave(self, name: str) -> None:
+        """结束一层计时；create_module 与 exec_module 分别计时后累加到同一模块。"""
+        started_at, children_s = self._stack.pop()
+        elapsed_s = time.perf_counter() - started_at
+        record = self._records.setdefault(name, [0.0, 0.0, float(len(self._records))])
+        record[0] += elapsed_s - children_s
+        record[1] += elapsed_s
+        if self._stack:
+            self._stack[-1][1] += elapsed_s
+
+    def records(self) -> list[tuple[str, float, float]]:
+        """返回 (模块名, 自身耗时 ms, 累计耗时 ms)，按导入顺序排列。"""
+        ordered = sorted(self._records.items(), key=lambda item: item[1][2])
+        return [(name, self_s * 1000.0, total_s * 1000.0) for name, (self_s, total_s, _order) in ordered]
+
+    def report(self, csv_path: str | None = None) -> None:
+        """打印自身耗时最高的模块；给出 csv_path 时写出全部明细。"""
+        records = self.records()
+        total_ms = sum(self_ms for _name, self_ms, _cumulative_ms in records)
+        print(f"[ImportProfiler] {len(records)} modules, {total_ms:.1f} ms total; slowest (self / cumulative):",
+              flush=True)
+        for name, self_ms, cumulative_ms in sorted(records, key=lambda r: r[1], reverse=True)[:IMPORT_PROFILE_TOP_N]:
+            print(f"  {self_ms:8.2f} ms / {cumulative_ms:8.2f} ms  {name}", flush=True)
+        if csv_path:
+            try:
+                with open(csv_path, "w", encoding="utf-8") as stream:
+                    stream.write("module,self_ms,cumulative_ms\n")
+                    for name, self_ms, cumulative_ms in records:
+                        stream.write(f"{name},{self_ms:.3f},{cumulative_ms:.3f}\n")
+            except OSError as exc:
+                print(f"[ImportProfiler] failed to write {csv_path}: {exc}", flush=True)
+                return
+            print(f"[ImportProfiler] wrote {csv_path}", flush=True)
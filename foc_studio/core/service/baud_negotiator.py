@@ -0,0 +1,243 @@
+"""BaudRateNegotiator - 波特率协商服务。
+流程：
+  1. 以安全波特率连接后发送 CMD 0x0D 查询 MCU 支持的波特率
+  2. 从高到低依次尝试：CMD 0x0E 请求切换，收到 CMD 0x76 应答后 PC 侧同步切换
+  3. 在新波特率下连续发送 CMD 0x0F 探测帧，要求 MCU 全部 CRC 正确地原样回显（CMD 0x77）
+  4. 探测通过发送 CMD 0x10 确认；任何超时、CRC 错误或回显不符都回退到安全波特率，
+     等待 MCU 未收到确认自动回退后再尝试下一档
+"""
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from core.command.baud_rate_command import (
+    baud_probe_payload,
+    build_baud_probe,
+    build_commit_baud_rate,
+    build_query_baud_rates,
+    build_set_baud_rate,
+)
+
+# PC 侧 USB 转串口常见可用的高速档位，与 MCU 上报列表取交集
+PC_SUPPORTED_BAUD_RATES: tuple[int, ...] = (
+    3000000, 2000000, 1500000, 1000000, 921600, 460800, 230400, 115200,
+)
+BAUD_QUERY_TIMEOUT_MS = 300      # 等待 CMD 0x75；超时视为固件不支持协商
+BAUD_ACK_TIMEOUT_MS = 300        # 等待 CMD 0x76 切换应答
+BAUD_SETTLE_MS = 20              # 双方切换后等待线路稳定再发探测帧
+BAUD_PROBE_TIMEOUT_MS = 300      # 等待全部探测回显
+BAUD_PROBE_FRAME_COUNT = 8       # 探测帧数量，需全部正确回显才算通过
+# MCU 切换后若在该时间内未收到 CMD 0x10 确认，会自动回退到原波特率（协议约定）
+MCU_BAUD_REVERT_TIMEOUT_MS = 1000
+BAUD_REVERT_MARGIN_MS = 200      # 回退等待的额外裕量
+
+_STATE_IDLE = "idle"
+_STATE_QUERYING = "querying"
+_STATE_WAIT_ACK = "wait_ack"
+_STATE_SETTLING = "settling"
+_STATE_PROBING = "probing"
+_STATE_REVERT_WAIT = "revert_wait"
+
+
+class BaudRateNegotiator(QObject):
+    """波特率协商状态机：只通过信号请求发送与切换，不直接访问传输层。"""
+
+    sendRequested = Signal(bytes)               # 请求上层经当前传输对象发送一帧
+    baudRateChangeRequested = Signal(int)       # 请求上层切换 PC 侧串口波特率
+    negotiationFinished = Signal(int, bool)     # 协商结束：最终波特率, 是否升级成功
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._state = _STATE_IDLE
+        self._base_baud_rate = 0
+        self._candidates: list[int] = []
+        self._candidate_baud_rate = 0
+        self._pending_probe_seqs: set[int] = set()
+        self._timeout_timer = QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.timeout.connect(self._on_timeout)
+
+    @property
+    def isNegotiating(self) -> bool:
+        """返回协商流程是否正在进行。"""
+        return self._state != _STATE_IDLE
+
+    @Slot(int)
+    def start(self, base_baud_rate: int) -> None:
+        """以 base_baud_rate 为安全波特率开始一轮协商。"""
+        self.cancel()
+        self._base_baud_rate = base_baud_rate
+        self._enter(_STATE_QUERYING, BAUD_QUERY_TIMEOUT_MS)
+        self.sendRequested.emit(build_query_baud_rates())
+
+    @Slot()
+    def cancel(self) -> None:
+        """中止协商（断开或链路中断时调用），不发出任何切换请求。"""
+        self._timeout_timer.stop()
+        self._state = _STATE_IDLE
+        self._candidates = []
+        self._pending_probe_seqs.clear()
+
+    @Slot(list)
+    def onSupportedBaudRates(self, baud_rates: list) -> None:
+        """收到 MCU 支持列表：筛选出高于安全波特率且 PC 支持的档位，从高到低尝试。"""
+        if self._state != _STATE_QUERYING:
+            return
+        self._candidates = sorted(
+            {rate for rate in baud_rates if rate > self._base_baud_rate and rate in PC_SUPPORTED_BAUD_RATES},
+            reverse=True,
+        )
+        self._try_next_candidate()
+
+    @Slot(int, bool)
+    def onBaudRateAck(self, baud_rate: int, accepted: bool) -> None:
+        """收到切换应答：接受则 PC 侧同步切换，拒绝则直接尝试下一档。"""
+        if self._state != _STATE_WAIT_ACK or baud_rate != self._candidate_baud_rate:
+            return
+        if not accepted:
+            self._try_next_candidate()
+            return
+        # MCU 在发完应答后切换，PC 此时切换即可对齐；稍等线路稳定后再发探测
+        self.baudRateChangeRequested.emit(baud_rate)
+        self._enter(_STATE_SETTLING, BAUD_SETTLE_MS)
+
+    @Slot(bytes)
+    def onProbeEchoed(self, payload: bytes) -> None:
+        """收到探测回显：序号与图样都必须匹配，全部收齐后确认新波特率。"""
+        if self._state != _STATE_PROBING:
+            return
+        seq = int.from_bytes(payload[:2], "big") if len(payload) >= 2 else -1
+        if seq not in self._pending_probe_seqs or payload != baud_probe_payload(seq):
+            self._fail_candidate()
+            return
+        self._pending_probe_seqs.remove(seq)
+        if self._pending_probe_seqs:
+            return
+
+        self.sendRequested.emit(build_commit_baud_rate(self._candidate_baud_rate))
+        self._timeout_timer.stop()
+        self._state = _STATE_IDLE
+        print(f"[BaudRateNegotiator] switched to {self._candidate_baud_rate} baud", flush=True)
+        self.negotiationFinished.emit(self._candidate_baud_rate, True)
+
+    @Slot()
+    def onCrcErrorDetected(self) -> None:
+        """探测阶段出现 CRC 错误说明新波特率不可靠，立即回退。"""
+        if self._state == _STATE_PROBING:
+            self._fail_candidate()
+
+    def _enter(self, state: str, timeout_ms: int) -> None:
+        """切换状态并启动对应超时。"""
+        self._state = state
+        self._timeout_timer.start(timeout_ms)
+
+    def _try_next_candidate(self) -> None:
+        """取出下一档候选波特率发送切换请求；没有候选时以安全波特率结束。"""
+        if not self._candidates:
+            self._timeout_timer.stop()
+            self._state = _STATE_IDLE
+            self.negotiationFinished.emit(self._base_baud_rate, False)
+            return
+        self._candidate_baud_rate = self._candidates.pop(0)
+        self._enter(_STATE_WAIT_ACK, BAUD_ACK_TIMEOUT_MS)
+        self.sendRequested.emit(build_set_baud_rate(self._candidate_baud_rate))
+
+    def _send_probe_burst(self) -> None:
+        """在新波特率下连续发送一组探测帧。"""
+        self._pending_probe_seqs = set(range(BAUD_PROBE_FRAME_COUNT))
+        self._enter(_STATE_PROBING, BAUD_PROBE_TIMEOUT_MS)
+        for seq in range(BAUD_PROBE_FRAME_COUNT):
+            self.sendRequested.emit(build_baud_probe(seq))
+
+    def _fail_candidate(self) -> None:
+        """当前档位失败：PC 先回到安全波特率，等待 MCU 超时自动回退后再试下一档。"""
+        self._pending_probe_seqs.clear()
+        print(f"[BaudRateNegotiator] {self._candidate_baud_rate} baud failed, falling back", flush=True)
+        self.baudRateChangeRequested.emit(self._base_baud_rate)
+        self._enter(_STATE_REVERT_WAIT, MCU_BAUD_REVERT_TIMEOUT_MS + BAUD_REVERT_MARGIN_MS)
+
+    def _on_timeout(self) -> None:
+        """各阶段超时处理。"""
+        if self._state == _STATE_QUERYING:
+            # 固件未实现协商命令：保持安全波特率
+            self._state = _STATE_IDLE
+            self.negotiationFinished.emit(self._base_baud_rate, False)
+        elif self._state == _STATE_WAIT_ACK:
+            # 应答丢失时无法确定 MCU 是否已切换，按失败处理并等待其自动回退
+            self._fail_candidate()
+        elif self._state == _STATE_SETTLING:
+            self._send_probe_burst()
+        elif self._state == _STATE_PROBING:
+            self._fail_candidate()
+        elif self._state == _STATE_REVERT_WAIT:
+            self._try_next_candidate()
+
+
+# ── 自测：进程内模拟 MCU ──────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import struct
+    import sys
+
+    from PySide6.QtCore import QCoreApplication
+
+    from core.command.baud_rate_command import (
+        CMD_BAUD_PROBE,
+        CMD_COMMIT_BAUD_RATE,
+        CMD_QUERY_BAUD_RATES,
+        CMD_SET_BAUD_RATE,
+    )
+    from core.protocol.protocol_frame import unpack_frame
+
+    app = QCoreApplication(sys.argv)
+    print("=== BaudRateNegotiator 自测 ===\n")
+
+    class _SimulatedMcu:
+        """模拟 MCU：支持 115200/921600/2000000，其中 2000000 档的回显会损坏。"""
+
+        def __init__(self, negotiator: BaudRateNegotiator) -> None:
+            self.negotiator = negotiator
+            self.pc_baud = 115200
+            self.mcu_baud = 115200
+            self.committed = 0
+
+        def on_frame(self, raw: bytes) -> None:
+            frame = unpack_frame(raw)
+            assert frame is not None
+            # 双方波特率不一致时 MCU 收不到有效帧
+            if self.pc_baud != self.mcu_baud:
+                return
+            if frame.cmd == CMD_QUERY_BAUD_RATES:
+                rates = struct.pack(">III", 115200, 921600, 2000000)
+                QTimer.singleShot(1, lambda: self.negotiator.onSupportedBaudRates(list(struct.unpack(">III", rates))))
+            elif frame.cmd == CMD_SET_BAUD_RATE:
+                (baud,) = struct.unpack(">I", frame.data)
+                QTimer.singleShot(1, lambda: self.negotiator.onBaudRateAck(baud, True))
+                self.mcu_baud = baud
+                # 未确认则自动回退
+                QTimer.singleShot(MCU_BAUD_REVERT_TIMEOUT_MS, lambda: self._revert_if_uncommitted(baud))
+            elif frame.cmd == CMD_BAUD_PROBE:
+                payload = frame.data
+                if self.mcu_baud == 2000000:
+                    payload = payload[:-1] + b"\x00"
+                QTimer.singleShot(1, lambda: self.negotiator.onProbeEchoed(payload))
+            elif frame.cmd == CMD_COMMIT_BAUD_RATE:
+                (self.committed,) = struct.unpack(">I", frame.data)
+
+        def _revert_if_uncommitted(self, baud: int) -> None:
+            if self.committed != baud and self.mcu_baud == baud:
+                self.mcu_baud = 115200
+
+    negotiator = BaudRateNegotiator()
+    mcu = _SimulatedMcu(negotiator)
+    result: list[tuple[int, bool]] = []
+    negotiator.sendRequested.connect(mcu.on_frame)
+    negotiator.baudRateChangeRequested.connect(lambda baud: setattr(mcu, "pc_baud", baud))
+    negotiator.negotiationFinished.connect(lambda baud, ok: (result.append((baud, ok)), app.quit()))
+    negotiator.start(115200)
+    QTimer.singleShot(5000, app.quit)
+    app.exec()
+
+    assert result == [(921600, True)], result
+    assert mcu.committed == 921600 and mcu.pc_baud == mcu.mcu_baud == 921600
+    print(f"    协商结果: {result[0][0]} baud（2000000 档探测失败后自动回退）\n")
+    print("所有自测通过。")
@@ -0,0 +1,633 @@
+"""ChartDataProvider - CHT/QD 波形数据的 Python 侧环形缓冲。
+
+遥测样本由 FrameDispatcher 信号直接写入各通道的预分配 array('d') 环形缓冲，
+不再逐样本经 QML 信号创建 JS 对象；页面刷新定时器触发时调用 updateSeries，
+由本对象把新增样本批量追加到 QtGraphs 曲线并从头部批量移除过期点。
+
+通道：
+  speed    转速 rpm（CHT）
+  current  电机电流 A（CHT）
+  iq / id  dq 轴电流 A（QD）
+
+Y 轴自适应：每个通道用单调队列维护曲线窗口内的最小/最大值（摊还 O(1)），
+按页面原有规则加边距后经 axisRangeChanged 通知；数据超出当前坐标轴时立即扩展，
+收缩则最多每 CHART_AXIS_REFRESH_INTERVAL_MS 一次，避免坐标轴抖动。
+
+降采样：窗口内样本数超过曲线像素宽度对应的点数预算时，按绝对时间对齐的桶
+（每像素列一个桶）做 min/max 或 LTTB 抽取后整体 replace，送入场景图的点数只与
+曲线宽度有关、与遥测速率无关；min/max 模式保证尖峰可见。未超预算时仍逐点增量追加。
+
+历史回看：页面平移/缩放到实时窗口之外时调用 fillHistorySeries，由 TelemetryHistory
+的多分辨率金字塔按像素列返回 min/max，点数同样只与曲线宽度有关。
+
+高密度通道也可改用 WaveformItem（createWaveform 创建）：页面只调用 advanceWindow 推进窗口与坐标轴，
+折线由场景图直接从环形缓冲生成顶点绘制，不经 LineSeries 的逐点追加/移除。
+
+本模块导入 QtGraphs / QtQuick 绑定（约 20 ms），由 BackendFacade 在图表页首次访问 chartData 时才导入。
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import NamedTuple
+
+from PySide6.QtCore import Property, QObject, QPointF, Signal, Slot
+from PySide6.QtGraphs import QXYSeries
+from PySide6.QtQuick import QQuickItem
+
+CHART_CHANNELS: tuple[str, ...] = ("speed", "current", "iq", "id")
+# 每个通道保留的样本数：5 秒窗口下可容纳约 3 kHz 的遥测速率
+CHART_RING_CAPACITY = 16384
+# 坐标轴收缩的最短间隔（按样本时间戳计）
+CHART_AXIS_REFRESH_INTERVAL_MS = 250.0
+CHART_AXIS_PADDING_RATIO = 0.15
+# 降采样模式：none 原样显示全部样本；minmax 每桶保留最小/最大值；lttb 每桶保留一个视觉代表点
+CHART_DOWNSAMPLE_NONE = "none"
+CHART_DOWNSAMPLE_MINMAX = "minmax"
+CHART_DOWNSAMPLE_LTTB = "lttb"
+CHART_DOWNSAMPLE_MODES: tuple[str, ...] = (CHART_DOWNSAMPLE_NONE, CHART_DOWNSAMPLE_MINMAX, CHART_DOWNSAMPLE_LTTB)
+# 实时曲线的绘制方式：series 经 QtGraphs LineSeries；sceneGraph 由 WaveformItem 直接从环形缓冲绘制
+CHART_RENDERER_SERIES = "series"
+CHART_RENDERER_SCENE_GRAPH = "sceneGraph"
+CHART_RENDERERS: tuple[str, ...] = (CHART_RENDERER_SERIES, CHART_RENDERER_SCENE_GRAPH)
+# 页面尚未布局（宽度为 0）时使用的最少桶数
+CHART_MIN_BUCKETS = 100
+
+
+class ChartAxisSpec(NamedTuple):
+    """Y 轴自适应规则。
+
+    zero_centered 为 False 时（CHT）：全正或全负数据以 0 为一侧边界，跨零时以中心扩展；
+    为 True 时（QD）：始终包含 0 基线，两侧对称加边距。
+    """
+
+    channels: tuple[str, ...]
+    default_range: tuple[float, float]
+    minimum_span: float
+    minimum_padding: float
+    zero_centered: bool
+
+
+CHART_AXES: dict[str, ChartAxisSpec] = {
+    "speed": ChartAxisSpec(("speed",), (-3000.0, 3000.0), 200.0, 30.0, False),
+    "current": ChartAxisSpec(("current",), (0.0, 0.3), 0.4, 0.1, False),
+    "dq": ChartAxisSpec(("iq", "id"), (-0.5, 0.5), 0.5, 0.1, True),
+}
+
+
+def padded_axis_range(spec: ChartAxisSpec, min_value: float, max_value: float) -> tuple[float, float]:
+    """按 spec 把数据最小/最大值换算为带边距的坐标轴范围。"""
+    axis_min = min_value
+    axis_max = max_value
+    if spec.zero_centered:
+        # 0 基线始终包含在可视区内，便于观察电流符号
+        axis_min = min(axis_min, 0.0)
+        axis_max = max(axis_max, 0.0)
+        if axis_max - axis_min < spec.minimum_span:
+            center = (axis_min + axis_max) / 2.0
+            axis_min = min(center - spec.minimum_span / 2.0, 0.0)
+            axis_max = max(center + spec.minimum_span / 2.0, 0.0)
+        padding = max((axis_max - axis_min) * CHART_AXIS_PADDING_RATIO, spec.minimum_padding)
+        return axis_min - padding, axis_max + padding
+
+    if axis_min >= 0:
+        axis_min = 0.0
+    elif axis_max <= 0:
+        axis_max = 0.0
+    if axis_max - axis_min < spec.minimum_span:
+        if axis_min >= 0:
+            axis_max = axis_min + spec.minimum_span
+        elif axis_max <= 0:
+            axis_min = axis_max - spec.minimum_span
+        else:
+            center = (axis_min + axis_max) / 2.0
+            axis_min = center - spec.minimum_span / 2.0
+            axis_max = center + spec.minimum_span / 2.0
+    padding = max((axis_max - axis_min) * CHART_AXIS_PADDING_RATIO, spec.minimum_padding)
+    axis_min = max(0.0, axis_min - padding) if axis_min >= 0 else axis_min - padding
+    axis_max = min(0.0, axis_max + padding) if axis_max <= 0 else axis_max + padding
+    return axis_min, axis_max
+
+
+class _ChannelRing:
+    """单通道定长样本环：序号单调递增，序号对容量取模即为数组下标。"""
+
+    __slots__ = (
+        "timestamps", "values", "total", "rendered_from", "rendered_to", "notified", "min_seqs", "max_seqs",
+        "decimated",
+    )
+
+    def __init__(self) -> None:
+        self.timestamps = array("d", bytes(8 * CHART_RING_CAPACITY))
+        self.values = array("d", bytes(8 * CHART_RING_CAPACITY))
+        # 累计写入的样本数
+        self.total = 0
+        # 曲线当前显示窗口的样本序号区间 [rendered_from, rendered_to)；未降采样时与曲线点一一对应
+        self.rendered_from = 0
+        self.rendered_to = 0
+        # 上次刷新后是否已通知过页面有新样本
+        self.notified = False
+        # 单调队列：曲线窗口内候选最小值/最大值的样本序号，队首即窗口极值
+        self.min_seqs: deque[int] = deque()
+        self.max_seqs: deque[int] = deque()
+        # 曲线当前是否为降采样结果（与窗口样本不再一一对应，下次刷新需整体重建）
+        self.decimated = False
+
+    def append(self, timestamp_ms: float, value: float) -> None:
+        index = self.total % CHART_RING_CAPACITY
+        self.timestamps[index] = timestamp_ms
+        self.values[index] = value
+        self.total += 1
+
+    def clear(self) -> None:
+        self.total = 0
+        self.rendered_from = 0
+        self.rendered_to = 0
+        self.notified = False
+        self.min_seqs.clear()
+        self.max_seqs.clear()
+        self.decimated = False
+
+    @property
+    def oldest(self) -> int:
+        """仍保留在环中的最早样本序号。"""
+        return max(0, self.total - CHART_RING_CAPACITY)
+
+    def timestamp_at(self, seq: int) -> float:
+        return self.timestamps[seq % CHART_RING_CAPACITY]
+
+    def value_at(self, seq: int) -> float:
+        return self.values[seq % CHART_RING_CAPACITY]
+
+    def value_slice(self, start: int, stop: int) -> array:
+        """返回序号区间内的样本值（跨越环尾时拼接两段）。"""
+        begin = start % CHART_RING_CAPACITY
+        end = begin + (stop - start)
+        if end <= CHART_RING_CAPACITY:
+            return self.values[begin:end]
+        return self.values[begin:] + self.values[:end - CHART_RING_CAPACITY]
+
+    def timestamp_slice(self, start: int, stop: int) -> array:
+        """返回序号区间内的时间戳（跨越环尾时拼接两段）。"""
+        begin = start % CHART_RING_CAPACITY
+        end = begin + (stop - start)
+        if end <= CHART_RING_CAPACITY:
+            return self.timestamps[begin:end]
+        return self.timestamps[begin:] + self.timestamps[:end - CHART_RING_CAPACITY]
+
+    def points(self, start: int, stop: int, origin_ms: float) -> list[QPointF]:
+        """返回序号区间内样本对应的曲线点，X 为相对 origin_ms 的秒数。"""
+        timestamps = self.timestamps
+        values = self.values
+        return [
+            QPointF((timestamps[seq % CHART_RING_CAPACITY] - origin_ms) / 1000.0, values[seq % CHART_RING_CAPACITY])
+            for seq in range(start, stop)
+        ]
+
+    def push_extremes(self, start: int, stop: int) -> None:
+        """把新进入窗口的样本压入单调队列：队尾不优于新值的候选永远不会再成为极值。"""
+        values = self.values
+        min_seqs = self.min_seqs
+        max_seqs = self.max_seqs
+        for seq in range(start, stop):
+            value = values[seq % CHART_RING_CAPACITY]
+            while min_seqs and values[min_seqs[-1] % CHART_RING_CAPACITY] >= value:
+                min_seqs.pop()
+            min_seqs.append(seq)
+            while max_seqs and values[max_seqs[-1] % CHART_RING_CAPACITY] <= value:
+                max_seqs.pop()
+            max_seqs.append(seq)
+
+    def drop_extremes_before(self, seq: int) -> None:
+        """移除已滑出窗口的候选。"""
+        while self.min_seqs and self.min_seqs[0] < seq:
+            self.min_seqs.popleft()
+        while self.max_seqs and self.max_seqs[0] < seq:
+            self.max_seqs.popleft()
+
+
+def _bucket_end(timestamps: array, index: int, stop: int, bucket_ms: float) -> int:
+    """返回 index 所在时间桶（按绝对时间对齐）之后第一个样本的下标；时间戳单调不减。"""
+    boundary_ms = (math.floor(timestamps[index] / bucket_ms) + 1) * bucket_ms
+    return max(bisect_left(timestamps, boundary_ms, index, stop), index + 1)
+
+
+def minmax_indices(timestamps: array, values: array, bucket_ms: float) -> list[int]:
+    """按绝对时间对齐的桶抽取样本下标：每桶按时间顺序保留最小值与最大值（样本不超过 2 个时全部保留）。"""
+    count = len(timestamps)
+    kept: list[int] = []
+    index = 0
+    while index < count:
+        end = _bucket_end(timestamps, index, count, bucket_ms)
+        if end - index <= 2:
+            kept.extend(range(index, end))
+        else:
+            # 切片与 min/max/index 均在 C 层完成，Python 层循环次数与桶数（像素宽度）成正比
+            bucket = values[index:end]
+            min_index = index + bucket.index(min(bucket))
+            max_index = index + bucket.index(max(bucket))
+            if min_index == max_index:
+                kept.append(min_index)
+            else:
+                kept.extend((min(min_index, max_index), max(min_index, max_index)))
+        index = end
+    return kept
+
+
+class _AxisState:
+    """单个坐标轴当前生效的范围与上次刷新时刻。"""
+
+    __slots__ = ("axis_min", "axis_max", "refreshed_at_ms")
+
+    def __init__(self, spec: ChartAxisSpec) -> None:
+        self.axis_min, self.axis_max = spec.default_range
+        self.refreshed_at_ms = 0.0
+
+
+class ChartDataProvider(QObject):
+    """波形数据提供者：Python 侧缓存样本，QML 只负责按刷新节拍调用 updateSeries。"""
+
+    # 通道在上次刷新后首次收到新样本时发出，页面据此启动刷新定时器
+    samplesAvailable = Signal(str)
+    # 坐标轴名（CHART_AXES 的键）, 最小值, 最大值
+    axisRangeChanged = Signal(str, float, float)
+    downsampleModeChanged = Signal()
+    traceRendererChanged = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._rings = {channel: _ChannelRing() for channel in CHART_CHANNELS}
+        self._axes = {axis: _AxisState(spec) for axis, spec in CHART_AXES.items()}
+        self._latency_tracer = None
+        self._downsample_mode = CHART_DOWNSAMPLE_MINMAX
+        self._trace_renderer = CHART_RENDERER_SERIES
+        # 已创建的 WaveformItem：宿主是 QML 对象，须由这里持有 Python 包装对象，否则其属性随包装回收丢失
+        self._waveforms: list[QQuickItem] = []
+        self._history = None
+        # 历史回看时各通道可视范围内的 (最小值, 最大值)，用于计算回看时的 Y 轴
+        self._history_extremes: dict[str, tuple[float, float]] = {}
+
+    def setLatencyTracer(self, tracer) -> None:
+        """设置延迟追踪器；为 None 时曲线刷新不回报渲染时刻。"""
+        self._latency_tracer = tracer
+
+    def setHistory(self, history) -> None:
+        """设置长时间遥测历史（TelemetryHistory）；为 None 时 fillHistorySeries 只清空曲线。"""
+        self._history = history
+
+    @Slot(int, float)
+    def onSpeedUpdated(self, rpm: int, timestamp_ms: float) -> None:
+        self._append("speed", float(rpm), timestamp_ms)
+
+    @Slot(float, float)
+    def onMotorCurrentUpdated(self, amps: float, timestamp_ms: float) -> None:
+        self._append("current", amps, timestamp_ms)
+
+    @Slot(float, float, float, float, float)
+    def onDqComponentsUpdated(self, iq: float, id_: float, _uq: float, _ud: float, timestamp_ms: float) -> None:
+        self._append("iq", iq, timestamp_ms)
+        self._append("id", id_, timestamp_ms)
+
+    @Slot(str)
+    def clearChannel(self, channel: str) -> None:
+        """清空通道样本；页面重置曲线时与 series.clear() 一起调用。"""
+        self._rings[channel].clear()
+        self._history_extremes.pop(channel, None)
+        for axis, spec in CHART_AXES.items():
+            if channel in spec.channels:
+                self._axes[axis] = _AxisState(spec)
+
+    @Slot(str, result=float)
+    def firstTimestampMs(self, channel: str) -> float:
+        """返回通道中最早保留样本的时间戳；无样本时返回 0。"""
+        ring = self._rings[channel]
+        return ring.timestamp_at(ring.oldest) if ring.total else 0.0
+
+    @Slot(str, result=float)
+    def latestTimestampMs(self, channel: str) -> float:
+        """返回通道最新样本的时间戳；无样本时返回 0。"""
+        ring = self._rings[channel]
+        return ring.timestamp_at(ring.total - 1) if ring.total else 0.0
+
+    @Slot(str, result=float)
+    def latestValue(self, channel: str) -> float:
+        """返回通道最新样本值；无样本时返回 0。"""
+        ring = self._rings[channel]
+        return ring.value_at(ring.total - 1) if ring.total else 0.0
+
+    @Slot(str, result=bool)
+    def hasPendingSamples(self, channel: str) -> bool:
+        """返回通道是否有尚未追加到曲线的样本。"""
+        ring = self._rings[channel]
+        return ring.total != ring.rendered_to
+
+    @Slot(str, result=int)
+    def renderedCount(self, channel: str) -> int:
+        """返回通道当前显示窗口内的样本数（降采样时大于曲线点数）。"""
+        ring = self._rings[channel]
+        return ring.rendered_to - ring.rendered_from
+
+    @Slot(str, result=list)
+    def valueRange(self, channel: str) -> list:
+        """返回显示窗口内样本的 [最小值, 最大值]；无样本时返回空列表。"""
+        ring = self._rings[channel]
+        if not ring.min_seqs:
+            return []
+        return [ring.value_at(ring.min_seqs[0]), ring.value_at(ring.max_seqs[0])]
+
+    @Slot(str, result=list)
+    def axisRange(self, axis: str) -> list:
+        """返回坐标轴当前生效的 [最小值, 最大值]。"""
+        state = self._axes[axis]
+        return [state.axis_min, state.axis_max]
+
+    @Property(str, notify=downsampleModeChanged)  # type: ignore
+    def downsampleMode(self) -> str:
+        """QML 只读属性：当前降采样模式（none / minmax / lttb）。"""
+        return self._downsample_mode
+
+    @Slot(str)
+    def setDownsampleMode(self, mode: str) -> None:
+        """切换降采样模式；下一次刷新时各曲线整体重建。"""
+        if mode not in CHART_DOWNSAMPLE_MODES:
+            print(f"[ChartDataProvider] unknown downsample mode: {mode}", flush=True)
+            return
+        if mode == self._downsample_mode:
+            return
+        self._downsample_mode = mode
+        for ring in self._rings.values():
+            ring.decimated = True
+        self.downsampleModeChanged.emit()
+
+    @Property(str, notify=traceRendererChanged)  # type: ignore
+    def traceRenderer(self) -> str:
+        """QML 只读属性：实时曲线绘制方式（series / sceneGraph）。"""
+        return self._trace_renderer
+
+    @Slot(str)
+    def setTraceRenderer(self, renderer: str) -> None:
+        """切换实时曲线绘制方式；切回 series 时下一次刷新整体重建曲线。"""
+        if renderer not in CHART_RENDERERS:
+            print(f"[ChartDataProvider] unknown trace renderer: {renderer}", flush=True)
+            return
+        if renderer == self._trace_renderer:
+            return
+        self._trace_renderer = renderer
+        for ring in self._rings.values():
+            # sceneGraph 期间 advanceWindow 推进了窗口但曲线未同步
+            ring.decimated = True
+        self.traceRendererChanged.emit()
+
+    @Slot(str, QXYSeries, float, float, float, result=int)
+    def updateSeries(
+        self, channel: str, series: QXYSeries, origin_ms: float, window_ms: float, plot_width_px: float
+    ) -> int:
+        """把通道新增样本同步到曲线，并移除早于 (最新时间戳 - window_ms) 的点。
+
+        窗口样本数未超过 plot_width_px 对应的点数预算时逐点增量追加；超过时按像素列
+        降采样后整体 replace。曲线中的点若已被环形缓冲覆盖（页面长时间未刷新），同样整体重建。
+        随后刷新该通道所属坐标轴的自适应范围。返回窗口内的样本数。
+        """
+        ring = self._rings[channel]
+        ring.notified = False
+        total = ring.total
+        if total == 0 or total == ring.rendered_to:
+            return ring.rendered_to - ring.rendered_from
+
+        new_from, expired_count, overrun = self._advance_window(ring, window_ms)
+        bucket_count = max(int(plot_width_px), CHART_MIN_BUCKETS)
+        # min/max 每桶最多 2 个点，LTTB 每桶 1 个点；样本数不超过该预算时无需降采样
+        point_budget = bucket_count * (2 if self._downsample_mode == CHART_DOWNSAMPLE_MINMAX else 1)
+        sample_count = total - ring.rendered_from
+        if self._downsample_mode != CHART_DOWNSAMPLE_NONE and sample_count > point_budget:
+            bucket_ms = window_ms / bucket_count
+            if self._downsample_mode == CHART_DOWNSAMPLE_MINMAX:
+                series.replace(self._downsample_minmax(ring, ring.rendered_from, total, origin_ms, bucket_ms))
+            else:
+                series.replace(self._downsample_lttb(ring, ring.rendered_from, total, origin_ms, bucket_ms))
+            ring.decimated = True
+        elif overrun or ring.decimated:
+            series.replace(ring.points(ring.rendered_from, total, origin_ms))
+            ring.decimated = False
+        else:
+            series.append(ring.points(new_from, total, origin_ms))
+            if expired_count > 0:
+                series.removeMultiple(0, expired_count)
+
+        self._finish_refresh(channel, ring, new_from)
+        return total - ring.rendered_from
+
+    @Slot(str, float, result=int)
+    def advanceWindow(self, channel: str, window_ms: float) -> int:
+        """只推进通道显示窗口与坐标轴、不操作曲线，供 WaveformItem 绘制的通道使用。
+
+        WaveformItem 在下一帧直接读取环形缓冲绘制，返回窗口内的样本数。
+        """
+        ring = self._rings[channel]
+        ring.notified = False
+        if ring.total == 0 or ring.total == ring.rendered_to:
+            return ring.rendered_to - ring.rendered_from
+        new_from, _expired_count, _overrun = self._advance_window(ring, window_ms)
+        self._finish_refresh(channel, ring, new_from)
+        return ring.total - ring.rendered_from
+
+    @Slot(QQuickItem, str, result=QObject)
+    def createWaveform(self, host: QQuickItem, channel: str) -> QObject:
+        """在 host 内创建直接读取本通道环形缓冲的 WaveformItem（铺满 host），返回该对象。"""
+        from core.service.waveform_item import WaveformItem
+
+        waveform = WaveformItem(self, channel, host)
+        self._waveforms.append(waveform)
+        waveform.destroyed.connect(lambda: self._waveforms.remove(waveform))
+        return waveform
+
+    def window_slices(self, channel: str, start_ms: float, end_ms: float) -> tuple[array, array]:
+        """返回时间戳落在 [start_ms, end_ms] 内的样本（另含其前一个样本，使折线从左边缘接入）。"""
+        ring = self._rings[channel]
+        if ring.total == 0:
+            return array("d"), array("d")
+        first = bisect_left(range(ring.oldest, ring.total), start_ms, key=ring.timestamp_at) + ring.oldest
+        stop = bisect_left(range(first, ring.total), end_ms, key=ring.timestamp_at) + first
+        if stop < ring.total and ring.timestamp_at(stop) == end_ms:
+            stop += 1
+        first = max(first - 1, ring.oldest)
+        return ring.timestamp_slice(first, stop), ring.value_slice(first, stop)
+
+    def _advance_window(self, ring: _ChannelRing, window_ms: float) -> tuple[int, int, bool]:
+        """把窗口右端推进到最新样本并移除早于 (最新时间戳 - window_ms) 的样本，同步维护单调队列。
+
+        返回 (本次新进入窗口的首个序号, 从窗口头部移除的样本数, 是否因环形缓冲覆盖而重建窗口)。
+        """
+        total = ring.total
+        min_timestamp_ms = ring.timestamp_at(total - 1) - window_ms
+        new_from = ring.rendered_to
+        overrun = ring.rendered_from < ring.oldest
+        if overrun:
+            start = ring.oldest
+            while start < total and ring.timestamp_at(start) < min_timestamp_ms:
+                start += 1
+            expired_count = 0
+            ring.rendered_from = start
+            new_from = max(new_from, start)
+            ring.min_seqs.clear()
+            ring.max_seqs.clear()
+            ring.push_extremes(start, total)
+        else:
+            ring.push_extremes(ring.rendered_to, total)
+            expired_to = ring.rendered_from
+            while expired_to < total and ring.timestamp_at(expired_to) < min_timestamp_ms:
+                expired_to += 1
+            expired_count = expired_to - ring.rendered_from
+            ring.rendered_from = expired_to
+            ring.drop_extremes_before(expired_to)
+        ring.rendered_to = total
+        return new_from, expired_count, overrun
+
+    def _finish_refresh(self, channel: str, ring: _ChannelRing, new_from: int) -> None:
+        """回报新样本的渲染时刻并刷新该通道所属坐标轴。"""
+        if self._latency_tracer is not None:
+            self._latency_tracer.samples_rendered(
+                channel, [ring.timestamp_at(seq) for seq in range(new_from, ring.total)]
+            )
+        for axis, spec in CHART_AXES.items():
+            if channel in spec.channels:
+                self._refresh_axis(axis, spec)
+
+    @Slot(str, QXYSeries, float, float, float, float, result=int)
+    def fillHistorySeries(
+        self, channel: str, series: QXYSeries, start_ms: float, end_ms: float, origin_ms: float, plot_width_px: float
+    ) -> int:
+        """用历史金字塔中 [start_ms, end_ms) 的数据整体替换曲线，返回曲线点数。
+
+        每个像素列输出该列的最小值与最大值两个点（相等时一个点），并按可视范围内的极值
+        刷新该通道所属坐标轴。实时刷新期间不应调用，页面回到实时模式前需先 clearChannel。
+        """
+        if self._history is None:
+            series.clear()
+            return 0
+        columns = self._history.pyramid(channel).query(
+            start_ms, end_ms, max(int(plot_width_px), CHART_MIN_BUCKETS)
+        )
+        points: list[QPointF] = []
+        for timestamp_ms, min_value, max_value, _mean in columns:
+            x_value = (timestamp_ms - origin_ms) / 1000.0
+            points.append(QPointF(x_value, min_value))
+            if max_value != min_value:
+                points.append(QPointF(x_value, max_value))
+        series.replace(points)
+        if columns:
+            self._history_extremes[channel] = (
+                min(column[1] for column in columns), max(column[2] for column in columns)
+            )
+        else:
+            self._history_extremes.pop(channel, None)
+        for axis, spec in CHART_AXES.items():
+            if channel in spec.channels:
+                self._refresh_history_axis(axis, spec)
+        return len(points)
+
+    def _refresh_history_axis(self, axis: str, spec: ChartAxisSpec) -> None:
+        """回看模式下按各通道可视范围极值直接设定坐标轴，不做收缩节流。"""
+        extremes = [self._history_extremes[channel] for channel in spec.channels if channel in self._history_extremes]
+        if not extremes:
+            return
+        axis_min, axis_max = padded_axis_range(
+            spec, min(extreme[0] for extreme in extremes), max(extreme[1] for extreme in extremes)
+        )
+        state = self._axes[axis]
+        if axis_min == state.axis_min and axis_max == state.axis_max:
+            return
+        state.axis_min = axis_min
+        state.axis_max = axis_max
+        self.axisRangeChanged.emit(axis, axis_min, axis_max)
+
+    @staticmethod
+    def _downsample_minmax(
+        ring: _ChannelRing, start: int, stop: int, origin_ms: float, bucket_ms: float
+    ) -> list[QPointF]:
+        """每个时间桶按时间顺序保留最小值与最大值两个点，尖峰不会被抹掉。"""
+        timestamps = ring.timestamp_slice(start, stop)
+        values = ring.value_slice(start, stop)
+        return [
+            QPointF((timestamps[index] - origin_ms) / 1000.0, values[index])
+            for index in minmax_indices(timestamps, values, bucket_ms)
+        ]
+
+    @staticmethod
+    def _downsample_lttb(
+        ring: _ChannelRing, start: int, stop: int, origin_ms: float, bucket_ms: float
+    ) -> list[QPointF]:
+        """Largest-Triangle-Three-Buckets：每桶保留与前一选中点、后一桶均值构成最大三角形的点。
+
+        首尾样本原样保留；桶内逐点计算面积，耗时与窗口样本数成正比，高于 min/max 模式。
+        """
+        timestamps = ring.timestamp_slice(start, stop)
+        values = ring.value_slice(start, stop)
+        last = len(timestamps) - 1
+        buckets: list[tuple[int, int]] = []
+        index = 1
+        while index < last:
+            end = _bucket_end(timestamps, index, last, bucket_ms)
+            buckets.append((index, end))
+            index = end
+
+        selected = 0
+        points = [QPointF((timestamps[0] - origin_ms) / 1000.0, values[0])]
+        for bucket_number, (bucket_start, bucket_end) in enumerate(buckets):
+            if bucket_number + 1 < len(buckets):
+                next_start, next_end = buckets[bucket_number + 1]
+                next_count = next_end - next_start
+                next_x = sum(timestamps[next_start:next_end]) / next_count
+                next_y = sum(values[next_start:next_end]) / next_count
+            else:
+                next_x = timestamps[last]
+                next_y = values[last]
+            prev_x = timestamps[selected]
+            prev_y = values[selected]
+            best_area = -1.0
+            for candidate in range(bucket_start, bucket_end):
+                area = abs((prev_x - next_x) * (values[candidate] - prev_y)
+                           - (prev_x - timestamps[candidate]) * (next_y - prev_y))
+                if area > best_area:
+                    best_area = area
+                    selected = candidate
+            points.append(QPointF((timestamps[selected] - origin_ms) / 1000.0, values[selected]))
+        if last > 0:
+            points.append(QPointF((timestamps[last] - origin_ms) / 1000.0, values[last]))
+        return points
+
+    def _refresh_axis(self, axis: str, spec: ChartAxisSpec) -> None:
+        """数据超出当前坐标轴时立即扩展，否则按最短间隔重算；范围变化时才通知。"""
+        min_value = float("inf")
+        max_value = float("-inf")
+        latest_ms = 0.0
+        for channel in spec.channels:
+            ring = self._rings[channel]
+            if not ring.min_seqs:
+                continue
+            min_value = min(min_value, ring.value_at(ring.min_seqs[0]))
+            max_value = max(max_value, ring.value_at(ring.max_seqs[0]))
+            latest_ms = max(latest_ms, ring.timestamp_at(ring.rendered_to - 1))
+        if latest_ms <= 0.0:
+            return
+
+        state = self._axes[axis]
+        out_of_range = min_value < state.axis_min or max_value > state.axis_max
+        if (not out_of_range and state.refreshed_at_ms > 0.0
+                and latest_ms - state.refreshed_at_ms < CHART_AXIS_REFRESH_INTERVAL_MS):
+            return
+        state.refreshed_at_ms = latest_ms
+        axis_min, axis_max = padded_axis_range(spec, min_value, max_value)
+        if axis_min == state.axis_min and axis_max == state.axis_max:
+            return
+        state.axis_min = axis_min
+        state.axis_max = axis_max
+        self.axisRangeChanged.emit(axis, axis_min, axis_max)
+
+    def _append(self, channel: str, value: float, timestamp_ms: float) -> None:
+        ring = self._rings[channel]
+        ring.append(timestamp_ms, value)
+        if not ring.notified:
+            ring.notified = True
+            self.samplesAvailable.emit(channel)
@@ -1,3 +1,5 @@
+import time
+
 from PySide6.QtCore import QObject, Signal, Slot
 
 from core.protocol.protocol_frame import (
@@ -27,6 +29,24 @@ class DataProcessor(QObject):
         """初始化接收缓冲区，准备做增量解析。"""
         super().__init__(parent)
         self._buffer = bytearray()  # 接收缓冲区：持续累积来自串口的原始字节，直到凑齐完整帧
+        # 累计处理耗时（秒），包含同步连接的下游分发，用于评估单设备 CPU 占用
+        self._busy_time_s = 0.0
+        self._chunk_count = 0
+        self._latency_tracer = None  # 延迟追踪开启时由上层注入
+
+    @property
+    def busyTimeSec(self) -> float:
+        """返回自创建以来解析与分发接收数据的累计耗时（秒）。"""
+        return self._busy_time_s
+
+    @property
+    def chunkCount(self) -> int:
+        """返回自创建以来处理过的接收数据块数量。"""
+        return self._chunk_count
+
+    def setLatencyTracer(self, tracer) -> None:
+        """设置延迟追踪器（None 关闭）：每解析出一帧记录一次解析完成时刻。"""
+        self._latency_tracer = tracer
 
     @Slot()
     def reset(self) -> None:
@@ -36,6 +56,15 @@ class DataProcessor(QObject):
     @Slot(bytes)
     def process_data(self, data: bytes) -> None:
         """处理原始接收字节流，并按解析结果分类发出信号。"""
+        started_at = time.perf_counter()
+        try:
+            self._process_buffer(data)
+        finally:
+            self._busy_time_s += time.perf_counter() - started_at
+            self._chunk_count += 1
+
+    def _process_buffer(self, data: bytes) -> None:
+        """将新字节并入缓冲区，并循环解析出尽可能多的完整帧。"""
         self._buffer.extend(data)  # 将新到达的字节追加到缓冲区末尾
 
         # 循环尝试从缓冲区中解析出尽可能多的完整帧
@@ -58,4 +87,6 @@ class DataProcessor(QObject):
                 continue
 
             if result.status == PARSE_STATUS_FRAME and result.frame is not None:
+                if self._latency_tracer is not None:
+                    self._latency_tracer.frame_parsed()
                 self.telemetryUpdated.emit(result.frame)
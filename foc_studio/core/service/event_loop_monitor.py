@@ -0,0 +1,188 @@
+import sys
+import threading
+import time
+import traceback
+from array import array
+
+from PySide6.QtCore import QObject, QTimer, Slot
+
+# 探测周期：周期越短分辨率越高，100 ms 对 GUI 线程的额外负担可忽略
+EVENT_LOOP_PROBE_INTERVAL_MS = 100
+# 分位数统计窗口：最近 600 次探测（约 1 分钟）
+EVENT_LOOP_LAG_WINDOW = 600
+# 看门狗：GUI 线程超过该时长未处理探测定时器即视为卡顿，并记录一次主线程 Python 调用栈
+EVENT_LOOP_STALL_THRESHOLD_MS = 250
+EVENT_LOOP_WATCHDOG_POLL_S = 0.05
+EVENT_LOOP_STACK_DEPTH = 12
+
+
+class EventLoopLagProbe(QObject):
+    """GUI 事件循环延迟探针。
+
+    以固定周期启动精确定时器，实际触发时刻相对预期时刻的延后量即为事件循环延迟：
+    串口解析、QML 绑定或图表重绘占用主线程越久，延迟越大。
+    """
+
+    def __init__(self, parent=None, interval_ms: int = EVENT_LOOP_PROBE_INTERVAL_MS) -> None:
+        super().__init__(parent)
+        self._interval_s = interval_ms / 1000.0
+        self._last_lag_s = 0.0
+        self._max_lag_s = 0.0
+        self._lag_sum_s = 0.0
+        self._sample_count = 0
+        self._expected_at = 0.0
+        # 最近一次探测触发的时刻，看门狗线程只读该值判断 GUI 线程是否卡住
+        self.lastTickAt = time.perf_counter()
+        self._window = array("d", bytes(8 * EVENT_LOOP_LAG_WINDOW))
+        self._window_index = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_probe)
+
+    @property
+    def lastLagSec(self) -> float:
+        """返回最近一次探测到的延迟（秒）。"""
+        return self._last_lag_s
+
+    @property
+    def lagSumSec(self) -> float:
+        """返回累计延迟（秒），与 sampleCount 一起可计算平均延迟。"""
+        return self._lag_sum_s
+
+    @property
+    def sampleCount(self) -> int:
+        """返回累计探测次数。"""
+        return self._sample_count
+
+    @property
+    def isRunning(self) -> bool:
+        """返回探测是否在运行。"""
+        return self._timer.isActive()
+
+    def takeMaxLagSec(self) -> float:
+        """返回上次读取以来的最大延迟（秒），并重新开始统计。"""
+        max_lag_s = self._max_lag_s
+        self._max_lag_s = 0.0
+        return max_lag_s
+
+    def lagPercentilesMs(self) -> dict[str, float]:
+        """返回最近窗口内延迟的 p50/p90/p99/最大值（毫秒）。"""
+        count = min(self._sample_count, EVENT_LOOP_LAG_WINDOW)
+        if count == 0:
+            return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self._window[:count])
+        return {
+            "p50": round(ordered[count * 50 // 100] * 1000.0, 2),
+            "p90": round(ordered[min(count - 1, count * 90 // 100)] * 1000.0, 2),
+            "p99": round(ordered[min(count - 1, count * 99 // 100)] * 1000.0, 2),
+            "max": round(ordered[-1] * 1000.0, 2),
+        }
+
+    @Slot()
+    def start(self) -> None:
+        """开始周期探测；已在运行时不重复启动。"""
+        if self._timer.isActive():
+            return
+        # 首次访问 Qt 命名空间会构建其全部枚举（约 25 ms），推迟到探测真正启动时
+        from PySide6.QtCore import Qt
+
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.lastTickAt = time.perf_counter()
+        self._expected_at = self.lastTickAt + self._interval_s
+        self._timer.start()
+
+    @Slot()
+    def stop(self) -> None:
+        """停止探测。"""
+        self._timer.stop()
+
+    def _on_probe(self) -> None:
+        """记录本次触发相对预期时刻的延后量，并推算下一次预期时刻。"""
+        now = time.perf_counter()
+        self.lastTickAt = now
+        lag_s = max(now - self._expected_at, 0.0)
+        self._expected_at = now + self._interval_s
+        self._last_lag_s = lag_s
+        self._lag_sum_s += lag_s
+        self._sample_count += 1
+        self._window[self._window_index] = lag_s
+        self._window_index = (self._window_index + 1) % EVENT_LOOP_LAG_WINDOW
+        if lag_s > self._max_lag_s:
+            self._max_lag_s = lag_s
+
+
+class EventLoopWatchdog:
+    """GUI 线程看门狗（后台线程）。
+
+    周期检查探针最近一次触发时刻：超过阈值说明主线程被长时间占用，
+    记录一次主线程当前 Python 调用栈定位元凶，并在卡顿期间回调 stall 监听者
+    （如卡顿保活发送器）。监听者在看门狗线程中执行，不得访问 Qt 对象。
+    """
+
+    def __init__(self, probe: EventLoopLagProbe, stall_threshold_ms: int = EVENT_LOOP_STALL_THRESHOLD_MS) -> None:
+        self._probe = probe
+        self._stall_threshold_s = stall_threshold_ms / 1000.0
+        self._main_thread_id = threading.main_thread().ident
+        self._stall_listeners: list = []
+        self._stall_count = 0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def stallCount(self) -> int:
+        """返回累计检测到的卡顿次数。"""
+        return self._stall_count
+
+    def addStallListener(self, listener) -> None:
+        """注册卡顿回调 listener(stalled_s)，在看门狗线程中调用。"""
+        if listener not in self._stall_listeners:
+            # 整体替换列表，看门狗线程遍历时无需加锁
+            self._stall_listeners = self._stall_listeners + [listener]
+
+    def removeStallListener(self, listener) -> None:
+        """移除卡顿回调。"""
+        self._stall_listeners = [item for item in self._stall_listeners if item != listener]
+
+    def start(self) -> None:
+        """启动看门狗线程。"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="foc-event-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止看门狗线程。"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self) -> None:
+        """看门狗主循环：每次卡顿只记录一次调用栈，探针恢复触发后重新布防。"""
+        stall_reported = False
+        while not self._stop_event.wait(EVENT_LOOP_WATCHDOG_POLL_S):
+            if not self._probe.isRunning:
+                continue
+            stalled_s = time.perf_counter() - self._probe.lastTickAt
+            if stalled_s < self._stall_threshold_s:
+                stall_reported = False
+                continue
+            if not stall_reported:
+                stall_reported = True
+                self._stall_count += 1
+                self._report_stall(stalled_s)
+            for listener in self._stall_listeners:
+                listener(stalled_s)
+
+    def _report_stall(self, stalled_s: float) -> None:
+        """打印 GUI 线程卡顿时长与主线程当前调用栈。"""
+        frame = sys._current_frames().get(self._main_thread_id)
+        stack_text = "".join(traceback.format_stack(frame, limit=EVENT_LOOP_STACK_DEPTH)) if frame else "  <no frame>\n"
+        print(
+            f"[EventLoopWatchdog] GUI thread blocked for {stalled_s * 1000.0:.0f} ms, main thread stack:\n{stack_text}",
+            end="",
+            flush=True,
+        )
@@ -18,6 +18,9 @@
   CMD 0x72  电机限幅参数         2 * int32，按 1/1000000 还原为 float
   CMD 0x73  日志消息            uint8 + ASCII
   CMD 0x74  霍尔状态            4 * uint8 + 1 * int8 + uint32 tick_ms
+  CMD 0x75  支持的波特率列表     N * uint32
+  CMD 0x76  波特率切换应答       uint32 baud + uint8 accepted
+  CMD 0x77  波特率探测回显       原样回显 CMD 0x0F payload
 """
 
 import struct
@@ -27,6 +30,9 @@ from PySide6.QtCore import QObject, Signal, Slot
 
 from core.protocol.protocol_frame import ParsedFrame
 
+# 链路恢复后首帧校验时钟偏移的容差：超过该值说明 MCU 可能已复位，需要重新校准
+CLOCK_RESYNC_TOLERANCE_MS: float = 1000.0
+
 # 命令字常量
 CMD_SPEED_FEEDBACK: int = 0x64
 CMD_MOTOR_TEMPERATURE: int = 0x65
@@ -42,6 +48,9 @@ CMD_CURRENT_LOOP_PARAMS: int = 0x6F
 CMD_MOTOR_LIMITS: int = 0x72
 CMD_LOG_MESSAGE: int = 0x73
 CMD_HALL_SENSOR_STATE: int = 0x74
+CMD_SUPPORTED_BAUD_RATES: int = 0x75
+CMD_SET_BAUD_RATE_ACK: int = 0x76
+CMD_BAUD_PROBE_ECHO: int = 0x77
 
 
 class FrameDispatcher(QObject):
@@ -62,10 +71,19 @@ class FrameDispatcher(QObject):
     motorLimitsUpdated = Signal(float, float)                 # voltage_limit, current_limit
     logMessageReceived = Signal(int, str)                     # level(0=INFO,1=WARN,2=ERROR), message
     hallTelemetryUpdated = Signal(int, int, int, int, int, float)  # Hall A/B/C, hall_state, sector, pc_ts
+    supportedBaudRatesUpdated = Signal(list)                  # MCU 支持的波特率列表
+    baudRateAckReceived = Signal(int, bool)                   # 目标波特率, MCU 是否接受
+    baudProbeEchoed = Signal(bytes)                           # 探测帧回显 payload
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._pc_mcu_offset_ms: float | None = None
+        self._verify_clock_sync_pending = False
+        # 最近一次遥测值（字段名 → 工程单位数值），只在处理器内整体替换键值，供指标导出等旁路读取
+        self._latest_telemetry: dict[str, float] = {}
+        # 延迟追踪开启时由上层注入；_last_pc_ts_ms 记录当前帧还原出的采集时刻
+        self._latency_tracer = None
+        self._last_pc_ts_ms: float | None = None
         self._handlers = {
             CMD_SPEED_FEEDBACK: self._handle_speed_feedback,
             CMD_MOTOR_TEMPERATURE: self._handle_motor_temperature,
@@ -81,30 +99,64 @@ class FrameDispatcher(QObject):
             CMD_MOTOR_LIMITS: self._handle_motor_limits,
             CMD_LOG_MESSAGE: self._handle_log_message,
             CMD_HALL_SENSOR_STATE: self._handle_hall_sensor_state,
+            CMD_SUPPORTED_BAUD_RATES: self._handle_supported_baud_rates,
+            CMD_SET_BAUD_RATE_ACK: self._handle_set_baud_rate_ack,
+            CMD_BAUD_PROBE_ECHO: self._handle_baud_probe_echo,
         }
 
+    @property
+    def latestTelemetry(self) -> dict[str, float]:
+        """返回最近一次收到的遥测值副本。"""
+        return dict(self._latest_telemetry)
+
+    def setLatencyTracer(self, tracer) -> None:
+        """设置延迟追踪器（None 关闭）：记录各帧槽函数执行耗时，并登记遥测样本等待渲染回报。"""
+        self._latency_tracer = tracer
+
     def reset_clock_sync(self) -> None:
         """串口断开时调用，重置 PC-MCU 时钟偏移，下次连接后重新校准。"""
         self._pc_mcu_offset_ms = None
+        self._verify_clock_sync_pending = False
+
+    def verify_clock_sync(self) -> None:
+        """链路自动恢复时调用：保留原偏移，但在下一帧校验其是否仍然有效。"""
+        if self._pc_mcu_offset_ms is not None:
+            self._verify_clock_sync_pending = True
 
     def _sync_and_get_pc_ts(self, tick_ms: int) -> float:
         """首帧计算 pc_mcu_offset，后续帧用偏移还原采集时刻。"""
         if self._pc_mcu_offset_ms is None:
             self._pc_mcu_offset_ms = time.time() * 1000.0 - tick_ms
-        return tick_ms + self._pc_mcu_offset_ms
+        elif self._verify_clock_sync_pending:
+            # 仅在链路恢复后的首帧比对一次，MCU 复位导致 tick 跳变时重新校准
+            self._verify_clock_sync_pending = False
+            now_ms = time.time() * 1000.0
+            if abs(tick_ms + self._pc_mcu_offset_ms - now_ms) > CLOCK_RESYNC_TOLERANCE_MS:
+                self._pc_mcu_offset_ms = now_ms - tick_ms
+        self._last_pc_ts_ms = tick_ms + self._pc_mcu_offset_ms
+        return self._last_pc_ts_ms
 
     @Slot(object)
     def dispatch(self, frame: ParsedFrame) -> None:
         """按命令字分发帧；未知命令静默忽略。"""
         handler = self._handlers.get(frame.cmd)
-        if handler is not None:
+        if handler is None:
+            return
+        tracer = self._latency_tracer
+        if tracer is None:
             handler(frame)
+            return
+        # 同步连接下 handler 返回时各槽已执行完毕，样本已写入波形缓冲
+        self._last_pc_ts_ms = None
+        handler(frame)
+        tracer.frame_dispatched(frame.cmd, self._last_pc_ts_ms)
 
     def _handle_speed_feedback(self, frame: ParsedFrame) -> None:
         """解码 CMD 0x64：当前转速 + MCU 采集时刻。"""
         if frame.datalen != 6:
             return
         speed, tick_ms = struct.unpack_from(">hI", frame.data, 0)
+        self._latest_telemetry["speed_rpm"] = speed
         self.speedUpdated.emit(speed, self._sync_and_get_pc_ts(tick_ms))
 
     def _handle_motor_temperature(self, frame: ParsedFrame) -> None:
@@ -112,6 +164,7 @@ class FrameDispatcher(QObject):
         if frame.datalen != 2:
             return
         (raw,) = struct.unpack_from(">h", frame.data, 0)
+        self._latest_telemetry["motor_temperature_celsius"] = raw / 10.0
         self.motorTempUpdated.emit(raw / 10.0)
 
     def _handle_mos_temperature(self, frame: ParsedFrame) -> None:
@@ -119,12 +172,14 @@ class FrameDispatcher(QObject):
         if frame.datalen != 2:
             return
         (raw,) = struct.unpack_from(">h", frame.data, 0)
+        self._latest_telemetry["mos_temperature_celsius"] = raw / 10.0
         self.mosTempUpdated.emit(raw / 10.0)
 
     def _handle_motor_enable_state(self, frame: ParsedFrame) -> None:
         """解码 CMD 0x67：电机使能状态。"""
         if frame.datalen != 1:
             return
+        self._latest_telemetry["motor_enabled"] = frame.data[0]
         self.enableStateUpdated.emit(frame.data[0])
 
     def _handle_software_version(self, frame: ParsedFrame) -> None:
@@ -143,6 +198,7 @@ class FrameDispatcher(QObject):
         if frame.datalen != 2:
             return
         (code,) = struct.unpack_from(">H", frame.data, 0)
+        self._latest_telemetry["error_code"] = code
         self.errorCodeUpdated.emit(code)
 
     def _handle_dq_components(self, frame: ParsedFrame) -> None:
@@ -150,6 +206,11 @@ class FrameDispatcher(QObject):
         if frame.datalen != 12:
             return
         raw_iq, raw_id, raw_uq, raw_ud, tick_ms = struct.unpack_from(">hhhhI", frame.data, 0)
+        latest = self._latest_telemetry
+        latest["iq_amperes"] = raw_iq / 1000.0
+        latest["id_amperes"] = raw_id / 1000.0
+        latest["uq_volts"] = raw_uq / 1000.0
+        latest["ud_volts"] = raw_ud / 1000.0
         self.dqComponentsUpdated.emit(
             raw_iq / 1000.0,
             raw_id / 1000.0,
@@ -163,6 +224,7 @@ class FrameDispatcher(QObject):
         if frame.datalen != 6:
             return
         raw, tick_ms = struct.unpack_from(">hI", frame.data, 0)
+        self._latest_telemetry["motor_current_amperes"] = raw / 1000.0
         self.motorCurrentUpdated.emit(raw / 1000.0, self._sync_and_get_pc_ts(tick_ms))
 
     def _handle_motor_type(self, frame: ParsedFrame) -> None:
@@ -231,3 +293,21 @@ class FrameDispatcher(QObject):
             electric_sector,
             self._sync_and_get_pc_ts(tick_ms),
         )
+
+    def _handle_supported_baud_rates(self, frame: ParsedFrame) -> None:
+        """解码 CMD 0x75：MCU 支持的波特率列表，每项 uint32。"""
+        if frame.datalen == 0 or frame.datalen % 4 != 0:
+            return
+        baud_rates = list(struct.unpack_from(f">{frame.datalen // 4}I", frame.data, 0))
+        self.supportedBaudRatesUpdated.emit(baud_rates)
+
+    def _handle_set_baud_rate_ack(self, frame: ParsedFrame) -> None:
+        """解码 CMD 0x76：波特率切换应答，accepted 非 0 表示 MCU 即将切换。"""
+        if frame.datalen != 5:
+            return
+        baud_rate, accepted = struct.unpack_from(">IB", frame.data, 0)
+        self.baudRateAckReceived.emit(baud_rate, accepted != 0)
+
+    def _handle_baud_probe_echo(self, frame: ParsedFrame) -> None:
+        """解码 CMD 0x77：探测帧回显，payload 交由协商服务逐字节比对。"""
+        self.baudProbeEchoed.emit(frame.data)
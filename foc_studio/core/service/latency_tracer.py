@@ -0,0 +1,150 @@
+"""LatencyTracer - 遥测端到端延迟追踪。
+
+阶段划分（均为 PC 侧墙钟毫秒，与 QML Date.now() 同一时基）：
+  mcuToRx            MCU 采集时刻（tick_ms 经时钟偏移还原）→ 串口 readyRead；
+                     偏移以首帧校准，因此反映的是相对首帧的附加传输延迟
+  rxToParsed         readyRead → DataProcessor 解析出该帧
+  parsedToDispatched 解析完成 → FrameDispatcher 发出信号且各槽返回（样本写入波形缓冲）
+  dispatchedToRendered  样本入队 → ChartDataProvider.updateSeries 追加到曲线
+  rxToRendered       readyRead → 追加到曲线（端到端）
+
+关闭时各层持有的 tracer 引用为 None，热路径只多一次 None 判断。
+"""
+
+import time
+from array import array
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from core.service.frame_dispatcher import CMD_DQ_COMPONENTS, CMD_MOTOR_CURRENT, CMD_SPEED_FEEDBACK
+
+LATENCY_STAGES: tuple[str, ...] = (
+    "mcuToRx",
+    "rxToParsed",
+    "parsedToDispatched",
+    "dispatchedToRendered",
+    "rxToRendered",
+)
+LATENCY_SAMPLE_CAPACITY = 4096      # 每个阶段保留最近的样本数，用于计算分位数
+LATENCY_PENDING_LIMIT = 8192        # 等待渲染回报的样本上限，页面未激活时防止无限增长
+LATENCY_PUBLISH_INTERVAL_MS = 1000
+LATENCY_PERCENTILES: tuple[int, ...] = (50, 90, 99)
+# 带时间戳的遥测命令 → 其样本写入的波形通道（与 ChartDataProvider 通道名一致），同一 tick 的各通道分别等待回报
+_RENDERED_CHANNELS: dict[int, tuple[str, ...]] = {
+    CMD_SPEED_FEEDBACK: ("speed",),
+    CMD_MOTOR_CURRENT: ("current",),
+    CMD_DQ_COMPONENTS: ("iq", "id"),
+}
+
+
+class _LatencyRing:
+    """定长延迟样本环形缓冲（毫秒）。"""
+
+    __slots__ = ("values", "index", "count")
+
+    def __init__(self) -> None:
+        self.values = array("d", bytes(8 * LATENCY_SAMPLE_CAPACITY))
+        self.index = 0
+        self.count = 0
+
+    def add(self, value_ms: float) -> None:
+        self.values[self.index] = value_ms
+        self.index = (self.index + 1) % LATENCY_SAMPLE_CAPACITY
+        if self.count < LATENCY_SAMPLE_CAPACITY:
+            self.count += 1
+
+    def clear(self) -> None:
+        self.index = 0
+        self.count = 0
+
+    def summary(self) -> dict[str, float]:
+        """返回分位数、最大值与样本数。"""
+        if self.count == 0:
+            return {"count": 0, "max": 0.0, **{f"p{p}": 0.0 for p in LATENCY_PERCENTILES}}
+        ordered = sorted(self.values[:self.count])
+        result: dict[str, float] = {"count": self.count, "max": round(ordered[-1], 3)}
+        for percentile in LATENCY_PERCENTILES:
+            rank = min(self.count - 1, int(self.count * percentile / 100))
+            result[f"p{percentile}"] = round(ordered[rank], 3)
+        return result
+
+
+class LatencyTracer(QObject):
+    """在接收流水线各节点打点，汇总各阶段延迟分位数。"""
+
+    statsChanged = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._rings = {stage: _LatencyRing() for stage in LATENCY_STAGES}
+        self._chunk_rx_wall_ms = 0.0
+        self._chunk_rx_perf = 0.0
+        self._parsed_perf = 0.0
+        # (通道, pc_ts) → (readyRead 墙钟, 入队墙钟)，等待 QML 渲染回报；
+        # 转速、电流、dq 帧常带同一 tick，只按时间戳登记会相互覆盖
+        self._pending: OrderedDict[tuple[str, float], tuple[float, float]] = OrderedDict()
+        self._stats: dict[str, dict[str, float]] = {}
+
+        self._publish_timer = QTimer(self)
+        self._publish_timer.setInterval(LATENCY_PUBLISH_INTERVAL_MS)
+        self._publish_timer.timeout.connect(self._publish)
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """返回最近一次发布的各阶段延迟统计。"""
+        return self._stats
+
+    def start(self) -> None:
+        """清空历史样本并开始周期发布。"""
+        for ring in self._rings.values():
+            ring.clear()
+        self._pending.clear()
+        self._publish()
+        self._publish_timer.start()
+
+    def stop(self) -> None:
+        """停止周期发布（保留最后一次统计供查看）。"""
+        self._publish_timer.stop()
+        self._pending.clear()
+
+    def chunk_received(self) -> None:
+        """传输层 readyRead：记录本数据块到达时刻。"""
+        self._chunk_rx_perf = time.perf_counter()
+        self._chunk_rx_wall_ms = time.time() * 1000.0
+
+    def frame_parsed(self) -> None:
+        """解析层得到一帧：记录 readyRead → 解析完成。"""
+        self._parsed_perf = time.perf_counter()
+        self._rings["rxToParsed"].add((self._parsed_perf - self._chunk_rx_perf) * 1000.0)
+
+    def frame_dispatched(self, cmd: int, sample_timestamp_ms: float | None) -> None:
+        """分发层信号处理完毕；带 MCU 时间戳的波形遥测帧按通道登记等待渲染回报。"""
+        now_perf = time.perf_counter()
+        self._rings["parsedToDispatched"].add((now_perf - self._parsed_perf) * 1000.0)
+        if sample_timestamp_ms is None:
+            return
+        self._rings["mcuToRx"].add(max(self._chunk_rx_wall_ms - sample_timestamp_ms, 0.0))
+        dispatched_wall_ms = self._chunk_rx_wall_ms + (now_perf - self._chunk_rx_perf) * 1000.0
+        pending = self._pending
+        for channel in _RENDERED_CHANNELS.get(cmd, ()):
+            pending[(channel, sample_timestamp_ms)] = (self._chunk_rx_wall_ms, dispatched_wall_ms)
+        while len(pending) > LATENCY_PENDING_LIMIT:
+            pending.popitem(last=False)
+
+    def samples_rendered(self, channel: str, sample_timestamps_ms: list) -> None:
+        """该通道这些时间戳的样本已追加到曲线：计算入队 → 渲染与端到端延迟。"""
+        now_wall_ms = time.time() * 1000.0
+        pending = self._pending
+        for sample_timestamp_ms in sample_timestamps_ms:
+            stamps = pending.pop((channel, sample_timestamp_ms), None)
+            if stamps is None:
+                continue
+            rx_wall_ms, dispatched_wall_ms = stamps
+            self._rings["dispatchedToRendered"].add(now_wall_ms - dispatched_wall_ms)
+            self._rings["rxToRendered"].add(now_wall_ms - rx_wall_ms)
+
+    def _publish(self) -> None:
+        """汇总各阶段分位数并通知上层。"""
+        self._stats = {stage: ring.summary() for stage, ring in self._rings.items()}
+        self.statsChanged.emit()
@@ -0,0 +1,560 @@
+"""LogSearch - MCU 日志检索：级别 / 时间范围过滤，子串与正则匹配，增量倒排索引。
+
+检索语料由若干段（LogSegment）组成，每段维护 token -> 行号 的倒排表：
+
+  实时段   到达的日志直接追加到尾段，后台线程每秒把新增行分词写入倒排表；尾段满
+           LOG_SEARCH_SEGMENT_ROWS 行后封存，实时段总行数超过 LOG_SEARCH_LIVE_ROWS 时淘汰最早的段
+  归档段   启用遥测归档时，后台线程在检索时读取归档文件中早于实时段的日志块建段，文件未变化时复用
+
+子串查询先用查询中的词在各段词表里取候选行，再逐行校验；正则查询在段的拼接文本上
+整体匹配，只对命中行做校验。检索在后台线程执行，结果按页回填到 LOG 页面。
+"""
+
+import bisect
+import os
+import re
+import time
+from array import array
+from typing import NamedTuple
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QModelIndex, QObject, QThread, QTimer, Property, Signal, Slot
+
+from core.service.log_store import (
+    LOG_LEVEL_PREFIXES,
+    LOG_ROLE_DISPLAY,
+    LOG_ROLE_LEVEL,
+    LOG_ROLE_LINE,
+    LOG_ROLE_MESSAGE,
+    LOG_ROLE_TIME_TEXT,
+    format_log_time,
+)
+
+LOG_SEARCH_SEGMENT_ROWS = 65536
+LOG_SEARCH_LIVE_ROWS = 500_000
+# 归档段最多加载的行数（从最新文件往前）
+LOG_SEARCH_ARCHIVE_MAX_ROWS = 2_000_000
+LOG_SEARCH_INDEX_INTERVAL_MS = 1000
+LOG_SEARCH_MAX_RESULTS = 10_000
+LOG_SEARCH_PAGE_ROWS = 200
+LOG_LEVEL_MASK_ALL = 0b111
+
+# 索引词：含字母的 ASCII 词（纯数字词不建索引，避免数值把词表撑大）或单个 CJK 字符
+_TOKEN_RE = re.compile(r"[a-z0-9_]*[a-z][a-z0-9_]*|[\u4e00-\u9fff]")
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+class LogSegment:
+    """一段日志的列存储与倒排表。
+
+    行只追加、写入后不再修改：GUI 线程追加行，检索线程读取快照行数以内的行；
+    倒排表与拼接文本缓存只由检索线程构建和读取。
+    """
+
+    __slots__ = ("timestamps_ms", "levels", "messages", "postings", "indexed_rows", "_text", "_line_starts")
+
+    def __init__(self) -> None:
+        self.timestamps_ms = array("d")
+        self.levels = array("b")
+        self.messages: list[str] = []
+        self.postings: dict[str, array] = {}
+        self.indexed_rows = 0
+        # 封存段的拼接文本缓存，供正则整体匹配
+        self._text: str | None = None
+        self._line_starts: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def append(self, timestamp_ms: float, level: int, message: str) -> None:
+        self.timestamps_ms.append(timestamp_ms)
+        self.levels.append(level)
+        self.messages.append(message)
+
+    def index_to(self, row_count: int) -> None:
+        """把 indexed_rows 到 row_count 之间的新行分词写入倒排表。"""
+        postings = self.postings
+        messages = self.messages
+        for row in range(self.indexed_rows, row_count):
+            for token in _tokens(messages[row]):
+                rows = postings.get(token)
+                if rows is None:
+                    rows = postings[token] = array("I")
+                rows.append(row)
+        self.indexed_rows = max(self.indexed_rows, row_count)
+
+    def line(self, row: int) -> str:
+        return "%s %s%s" % (
+            format_log_time(self.timestamps_ms[row] / 1000.0),
+            LOG_LEVEL_PREFIXES[self.levels[row]],
+            self.messages[row],
+        )
+
+    def text_blob(self, row_count: int, cache: bool) -> tuple[str, array]:
+        """返回前 row_count 行以换行拼接的文本及各行起始偏移；cache 为真时缓存（仅用于封存段）。"""
+        if self._text is not None and len(self._line_starts) == row_count:
+            return self._text, self._line_starts
+        lines = [message.replace("\n", " ") for message in self.messages[:row_count]]
+        starts = array("q", bytes(8 * row_count))
+        position = 0
+        for row, line in enumerate(lines):
+            starts[row] = position
+            position += len(line) + 1
+        text = "\n".join(lines)
+        if cache:
+            self._text, self._line_starts = text, starts
+        return text, starts
+
+
+class LogQuery(NamedTuple):
+    text: str
+    regex: bool
+    level_mask: int
+    start_ms: float
+    end_ms: float
+
+
+class LogSearchResult(NamedTuple):
+    hits: list                # [(LogSegment, row), ...]，按时间由新到旧
+    truncated: bool
+    scanned_rows: int
+    elapsed_ms: float
+
+
+class _SearchCancelled(Exception):
+    pass
+
+
+class LogSearchWorker(QObject):
+    """检索工作对象，运行在后台线程中：加载归档段并执行查询。"""
+
+    searchFinished = Signal(int, object)    # generation, LogSearchResult
+    searchFailed = Signal(int, str)         # generation, 错误信息
+
+    def __init__(self) -> None:
+        super().__init__()
+        # GUI 线程写入的最新请求序号；执行中的旧查询据此提前放弃
+        self.latest_generation = 0
+        # 归档文件路径 -> (所含日志块的签名, LogSegment)
+        self._archive_segments: dict[str, tuple[tuple, LogSegment]] = {}
+
+    @Slot(object)
+    def index(self, live_segments: tuple) -> None:
+        """增量索引：live_segments 为 GUI 线程提交的 (段, 行数) 快照。"""
+        for segment, row_count in live_segments:
+            segment.index_to(row_count)
+
+    @Slot(int, object, object, str)
+    def search(self, generation: int, query: LogQuery, live_segments: tuple, archive_directory: str) -> None:
+        """live_segments 为 (段, 行数) 快照，由旧到新；archive_directory 为空时只检索实时段。"""
+        started_at = time.perf_counter()
+        try:
+            live_oldest_ms = float("inf")
+            for segment, row_count in live_segments:
+                if row_count:
+                    live_oldest_ms = segment.timestamps_ms[0]
+                    break
+            # 实时段从新到旧，之后是早于实时段的归档段
+            segments = [(segment, row_count) for segment, row_count in reversed(live_segments)]
+            archive_segments = self._load_archive_segments(archive_directory, live_oldest_ms)
+            segments += [(segment, len(segment)) for segment in archive_segments]
+            hits, truncated, scanned_rows = self._run_query(generation, query, segments)
+        except _SearchCancelled:
+            return
+        except (OSError, ValueError, re.error) as exc:
+            self.searchFailed.emit(generation, str(exc))
+            return
+        elapsed_ms = (time.perf_counter() - started_at) * 1000.0
+        self.searchFinished.emit(generation, LogSearchResult(hits, truncated, scanned_rows, elapsed_ms))
+
+    def _load_archive_segments(self, directory: str, cutoff_ms: float) -> list[LogSegment]:
+        """返回归档中早于 cutoff_ms 的日志段（由新到旧）；文件内容未变的段直接复用。"""
+        from core.service.telemetry_archive import ARCHIVE_FILE_SUFFIX, BLOCK_KIND_LOG, read_archive, read_index
+
+        if not directory or not os.path.isdir(directory):
+            return []
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(ARCHIVE_FILE_SUFFIX)]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        segments = []
+        loaded: dict[str, tuple[tuple, LogSegment]] = {}
+        total_rows = 0
+        for path in paths:
+            if total_rows >= LOG_SEARCH_ARCHIVE_MAX_ROWS:
+                break
+            try:
+                entries = [
+                    entry for entry in read_index(path)
+                    if entry.kind == BLOCK_KIND_LOG and entry.first_ms < cutoff_ms
+                ]
+            except (OSError, ValueError):
+                continue
+            if not entries:
+                continue
+            signature = (len(entries), entries[-1].offset, min(entries[-1].last_ms, cutoff_ms))
+            cached = self._archive_segments.get(path)
+            if cached is not None and cached[0] == signature:
+                segment = cached[1]
+            else:
+                segment = LogSegment()
+                try:
+                    for block in read_archive(path, end_ms=cutoff_ms, kind=BLOCK_KIND_LOG):
+                        for timestamp_ms, level, message in zip(block.timestamps_ms, block.levels, block.messages):
+                            if timestamp_ms < cutoff_ms:
+                                segment.append(timestamp_ms, level, message)
+                except (OSError, ValueError) as exc:
+                    print(f"[LogSearchWorker] failed to read {path}: {exc}", flush=True)
+                    continue
+                segment.index_to(len(segment))
+                segment.text_blob(len(segment), cache=True)
+            loaded[path] = (signature, segment)
+            segments.append(segment)
+            total_rows += len(segment)
+        # 只保留本次仍在范围内的文件，被轮转删除或超出行数上限的段随之释放
+        self._archive_segments = loaded
+        return segments
+
+    def _run_query(self, generation: int, query: LogQuery, segments: list) -> tuple[list, bool, int]:
+        flags = re.IGNORECASE
+        pattern_text = query.text if query.regex else re.escape(query.text)
+        pattern = re.compile(pattern_text, flags)
+        blob_pattern = re.compile(pattern_text, flags | re.MULTILINE)
+        # 子串查询可借助倒排表缩小候选；正则或查询中没有可索引词时整段匹配
+        words = [] if query.regex else sorted(_tokens(query.text), key=len, reverse=True)
+        match_all = not query.text
+        hits: list = []
+        scanned_rows = 0
+        for segment, row_count in segments:
+            if generation != self.latest_generation:
+                raise _SearchCancelled()
+            if not row_count:
+                continue
+            timestamps = segment.timestamps_ms
+            if timestamps[row_count - 1] < query.start_ms or timestamps[0] > query.end_ms:
+                continue
+            scanned_rows += row_count
+            if match_all:
+                rows = range(row_count - 1, -1, -1)
+            elif words:
+                segment.index_to(row_count)
+                rows = self._candidate_rows(segment, row_count, words)
+            else:
+                rows = self._blob_rows(segment, row_count, blob_pattern)
+            verify = not match_all
+            for row in rows:
+                if not query.level_mask >> segment.levels[row] & 1:
+                    continue
+                timestamp_ms = timestamps[row]
+                if timestamp_ms < query.start_ms or timestamp_ms > query.end_ms:
+                    continue
+                if verify and pattern.search(segment.messages[row]) is None:
+                    continue
+                hits.append((segment, row))
+                if len(hits) >= LOG_SEARCH_MAX_RESULTS:
+                    return hits, True, scanned_rows
+        return hits, False, scanned_rows
+
+    @staticmethod
+    def _candidate_rows(segment: LogSegment, row_count: int, words: list[str]) -> list[int]:
+        """各查询词在本段词表中取“包含该词”的词项并集，再求交集；返回行号（由新到旧）。"""
+        candidates: set[int] | None = None
+        for word in words:
+            rows: set[int] = set()
+            for token, token_rows in segment.postings.items():
+                if word in token:
+                    rows.update(token_rows)
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return []
+        return sorted((row for row in candidates if row < row_count), reverse=True)
+
+    @staticmethod
+    def _blob_rows(segment: LogSegment, row_count: int, blob_pattern: re.Pattern) -> list[int]:
+        """在拼接文本上整体匹配，每行至多命中一次；返回行号（由新到旧）。"""
+        text, starts = segment.text_blob(row_count, cache=row_count == len(segment) and row_count >= LOG_SEARCH_SEGMENT_ROWS)
+        rows = []
+        position = 0
+        text_length = len(text)
+        while position <= text_length:
+            match = blob_pattern.search(text, position)
+            if match is None:
+                break
+            row = bisect.bisect_right(starts, match.start()) - 1
+            rows.append(row)
+            position = starts[row + 1] if row + 1 < row_count else text_length + 1
+        rows.reverse()
+        return rows
+
+
+class LogSearchResultModel(QAbstractListModel):
+    """检索结果的当前页；角色与 LogListModel 一致，LOG 页面可复用同一委托。"""
+
+    countChanged = Signal()
+
+    def __init__(self, search: "LogSearch") -> None:
+        super().__init__(search)
+        self._search = search
+        self._rows: list = []
+
+    def roleNames(self) -> dict[int, QByteArray]:
+        return {
+            LOG_ROLE_LEVEL: QByteArray(b"level"),
+            LOG_ROLE_TIME_TEXT: QByteArray(b"timeText"),
+            LOG_ROLE_MESSAGE: QByteArray(b"message"),
+            LOG_ROLE_LINE: QByteArray(b"line"),
+        }
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = LOG_ROLE_DISPLAY):
+        row = index.row()
+        if not 0 <= row < len(self._rows):
+            return None
+        segment, segment_row = self._rows[row]
+        if role == LOG_ROLE_MESSAGE:
+            return segment.messages[segment_row]
+        if role == LOG_ROLE_LEVEL:
+            return segment.levels[segment_row]
+        if role == LOG_ROLE_TIME_TEXT:
+            return format_log_time(segment.timestamps_ms[segment_row] / 1000.0)
+        if role in (LOG_ROLE_LINE, LOG_ROLE_DISPLAY):
+            return segment.line(segment_row)
+        return None
+
+    @Property(int, notify=countChanged)  # type: ignore
+    def count(self) -> int:
+        """QML 只读属性：当前页行数。"""
+        return len(self._rows)
+
+    def set_rows(self, rows: list) -> None:
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+        self.countChanged.emit()
+
+    @Slot()
+    def clear(self) -> None:
+        """清空检索结果（LOG 页面的“清除”按钮）。"""
+        self._search.clearResults()
+
+    @Slot(result=str)
+    def text(self) -> str:
+        """返回当前页全部行的纯文本（换行分隔），用于复制。"""
+        return "\n".join(segment.line(row) for segment, row in self._rows)
+
+    @Slot()
+    def copyToClipboard(self) -> None:
+        """把当前页复制到系统剪贴板。"""
+        from PySide6.QtGui import QGuiApplication
+
+        QGuiApplication.clipboard().setText(self.text())
+
+
+class LogSearch(QObject):
+    """MCU 日志检索服务。
+
+    职责：
+    - 接收 FrameDispatcher.logMessageReceived，按秒批量写入实时段的倒排索引
+    - 把查询连同实时段快照交给后台线程执行，只采用最新一次查询的结果
+    - 按页把结果填入 resultModel
+    """
+
+    busyChanged = Signal()
+    resultsChanged = Signal()
+    pageChanged = Signal()
+    _searchRequested = Signal(int, object, object, str)  # 内部信号：跨线程触发 worker.search（队列连接）
+    _indexRequested = Signal(object)                     # 内部信号：跨线程触发 worker.index
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._segments: list[LogSegment] = [LogSegment()]
+        self._live_rows = 0
+        self._index_timer = QTimer(self)
+        self._index_timer.setSingleShot(True)
+        self._index_timer.setInterval(LOG_SEARCH_INDEX_INTERVAL_MS)
+        self._index_timer.timeout.connect(self._on_index_timer)
+
+        self._result_model = LogSearchResultModel(self)
+        self._hits: list = []
+        self._truncated = False
+        self._scanned_rows = 0
+        self._elapsed_ms = 0.0
+        self._error_text = ""
+        self._page_index = 0
+        self._busy = False
+        self._generation = 0
+        self._archive_directory = ""
+        # 后台线程在首条日志到达或首次检索时才创建
+        self._thread: QThread | None = None
+        self._worker: LogSearchWorker | None = None
+
+    @Property(QObject, constant=True)  # type: ignore
+    def resultModel(self) -> LogSearchResultModel:
+        """QML 只读属性：当前页的检索结果。"""
+        return self._result_model
+
+    @Property(bool, notify=busyChanged)  # type: ignore
+    def busy(self) -> bool:
+        """QML 只读属性：是否有检索正在后台执行。"""
+        return self._busy
+
+    @Property(int, notify=resultsChanged)  # type: ignore
+    def resultCount(self) -> int:
+        """QML 只读属性：命中行数（超过上限时截断）。"""
+        return len(self._hits)
+
+    @Property(bool, notify=resultsChanged)  # type: ignore
+    def truncated(self) -> bool:
+        """QML 只读属性：命中行数是否达到 LOG_SEARCH_MAX_RESULTS 而截断。"""
+        return self._truncated
+
+    @Property(int, notify=resultsChanged)  # type: ignore
+    def scannedLines(self) -> int:
+        """QML 只读属性：本次检索覆盖的日志行数（时间范围外的段不计）。"""
+        return self._scanned_rows
+
+    @Property(float, notify=resultsChanged)  # type: ignore
+    def elapsedMs(self) -> float:
+        """QML 只读属性：本次检索耗时（毫秒）。"""
+        return round(self._elapsed_ms, 1)
+
+    @Property(str, notify=resultsChanged)  # type: ignore
+    def errorText(self) -> str:
+        """QML 只读属性：正则无效或归档读取失败时的错误信息。"""
+        return self._error_text
+
+    @Property(int, notify=pageChanged)  # type: ignore
+    def pageIndex(self) -> int:
+        """QML 只读属性：当前页序号（从 0 开始，第 0 页为最新的结果）。"""
+        return self._page_index
+
+    @Property(int, notify=resultsChanged)  # type: ignore
+    def pageCount(self) -> int:
+        """QML 只读属性：结果总页数。"""
+        return (len(self._hits) + LOG_SEARCH_PAGE_ROWS - 1) // LOG_SEARCH_PAGE_ROWS
+
+    @Slot(int, str)
+    def onLogMessageReceived(self, level: int, message: str) -> None:
+        """追加到实时尾段，分词留给后台线程按秒批量完成。"""
+        segment = self._segments[-1]
+        if len(segment) >= LOG_SEARCH_SEGMENT_ROWS:
+            segment = LogSegment()
+            self._segments.append(segment)
+            while self._live_rows > LOG_SEARCH_LIVE_ROWS - LOG_SEARCH_SEGMENT_ROWS and len(self._segments) > 1:
+                self._live_rows -= len(self._segments.pop(0))
+        segment.append(time.time() * 1000.0, level, message)
+        self._live_rows += 1
+        if not self._index_timer.isActive():
+            self._index_timer.start()
+
+    def setArchiveDirectory(self, directory: str) -> None:
+        """启用归档检索：之后的检索同时覆盖该目录中早于实时段的日志。"""
+        self._archive_directory = directory
+
+    @Slot(str, bool, int, float, float)
+    def search(self, text: str, regex: bool, level_mask: int, start_ms: float, end_ms: float) -> None:
+        """按条件检索实时日志与归档；end_ms <= 0 表示不限结束时间。结果经 resultsChanged 通知。"""
+        if regex:
+            try:
+                re.compile(text)
+            except re.error as exc:
+                self._set_results([], False, 0, 0.0, f"正则无效: {exc}")
+                return
+        query = LogQuery(text, regex, level_mask & LOG_LEVEL_MASK_ALL, start_ms, end_ms if end_ms > 0 else float("inf"))
+        # 只把已写入的行数交给后台线程，之后追加的行不在本次检索范围内
+        live_segments = self._live_snapshot()
+        self._generation += 1
+        self._ensure_worker()
+        self._worker.latest_generation = self._generation
+        self._set_busy(True)
+        self._searchRequested.emit(self._generation, query, live_segments, self._archive_directory)
+
+    @Slot(int)
+    def setPage(self, page_index: int) -> None:
+        """切换到指定页。"""
+        page_index = min(max(page_index, 0), max(self.pageCount - 1, 0))
+        if page_index == self._page_index:
+            return
+        self._page_index = page_index
+        self._fill_page()
+        self.pageChanged.emit()
+
+    @Slot()
+    def clearResults(self) -> None:
+        """清除检索结果，并放弃尚未完成的检索。"""
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.latest_generation = self._generation
+        self._set_busy(False)
+        self._set_results([], False, 0, 0.0, "")
+
+    @Slot()
+    def shutdown(self) -> None:
+        """安全退出后台线程，应在应用退出前调用。"""
+        self._index_timer.stop()
+        if self._worker is not None:
+            self._worker.latest_generation = -1
+        if self._thread is not None and self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = QThread(self)
+        self._thread.setObjectName("LogSearchThread")
+        self._worker = LogSearchWorker()
+        self._worker.moveToThread(self._thread)
+        # worker 位于后台线程，跨线程连接自动采用队列方式
+        self._searchRequested.connect(self._worker.search)
+        self._indexRequested.connect(self._worker.index)
+        self._worker.searchFinished.connect(self._on_search_finished)
+        self._worker.searchFailed.connect(self._on_search_failed)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+
+    def _live_snapshot(self) -> tuple:
+        return tuple((segment, len(segment)) for segment in self._segments)
+
+    @Slot()
+    def _on_index_timer(self) -> None:
+        self._ensure_worker()
+        self._indexRequested.emit(self._live_snapshot())
+
+    @Slot(int, object)
+    def _on_search_finished(self, generation: int, result: LogSearchResult) -> None:
+        if generation != self._generation:
+            return
+        self._set_busy(False)
+        self._set_results(result.hits, result.truncated, result.scanned_rows, result.elapsed_ms, "")
+
+    @Slot(int, str)
+    def _on_search_failed(self, generation: int, message: str) -> None:
+        if generation != self._generation:
+            return
+        self._set_busy(False)
+        self._set_results([], False, 0, 0.0, message)
+
+    def _set_busy(self, busy: bool) -> None:
+        if busy != self._busy:
+            self._busy = busy
+            self.busyChanged.emit()
+
+    def _set_results(self, hits: list, truncated: bool, scanned_rows: int, elapsed_ms: float, error_text: str) -> None:
+        self._hits = hits
+        self._truncated = truncated
+        self._scanned_rows = scanned_rows
+        self._elapsed_ms = elapsed_ms
+        self._error_text = error_text
+        self._page_index = 0
+        self._fill_page()
+        self.resultsChanged.emit()
+        self.pageChanged.emit()
+
+    def _fill_page(self) -> None:
+        start = self._page_index * LOG_SEARCH_PAGE_ROWS
+        self._result_model.set_rows(self._hits[start:start + LOG_SEARCH_PAGE_ROWS])
@@ -0,0 +1,268 @@
+"""LogStore - MCU 日志（CMD 0x73）的 Python 侧环形存储与分级列表模型。
+
+日志到达时只追加到待刷新队列；LOG 页面在共享刷新节拍上调用 flush，
+一次性写入固定容量的环形缓冲，再按批通知各分级视图（LogListModel）。
+
+  环形缓冲   按全局序号 seq 存放 level / 时间戳 / 文本，槽位 = seq % capacity，淘汰为 O(1)
+  分级视图   INFO 与 WARN/ERROR 各自保存最近 maxRows 条日志的序号，供 ListView 虚拟化显示
+
+时间戳文本在 data() 中按需格式化，只有可见行才产生字符串开销。
+"""
+
+import time
+from array import array
+from collections import deque
+
+from PySide6.QtCore import QAbstractListModel, QByteArray, QModelIndex, QObject, Property, Signal, Slot
+
+LOG_LEVEL_INFO = 0
+LOG_LEVEL_WARN = 1
+LOG_LEVEL_ERROR = 2
+LOG_LEVEL_PREFIXES: tuple[str, ...] = ("", "[WARN] ", "[ERROR] ")
+# 环形缓冲容量：保留最近的日志供两个视图与后续检索使用
+LOG_STORE_CAPACITY = 20000
+# 每个视图默认显示的最大行数
+LOG_VIEW_MAX_ROWS = 500
+
+# 角色编号直接使用 Qt::DisplayRole(0) / Qt::UserRole(0x0100) 的数值：
+# 首次访问 Qt 命名空间会构建其全部枚举（约 25 ms），LogStore 在启动阶段创建，不为此付出代价
+LOG_ROLE_DISPLAY = 0
+LOG_ROLE_LEVEL = 0x0100 + 1
+LOG_ROLE_TIME_TEXT = 0x0100 + 2
+LOG_ROLE_MESSAGE = 0x0100 + 3
+LOG_ROLE_LINE = 0x0100 + 4
+
+
+def format_log_time(timestamp_s: float) -> str:
+    """格式化为 hh:mm:ss.zzz（本地时间）。"""
+    return time.strftime("%H:%M:%S", time.localtime(timestamp_s)) + ".%03d" % (int(timestamp_s * 1000.0) % 1000)
+
+
+class LogListModel(QAbstractListModel):
+    """日志分级视图：只保存所属级别日志的全局序号，行数据从 LogStore 环形缓冲读取。"""
+
+    countChanged = Signal()
+    maxRowsChanged = Signal()
+
+    def __init__(self, store: "LogStore", levels: frozenset[int], max_rows: int = LOG_VIEW_MAX_ROWS) -> None:
+        super().__init__(store)
+        self._store = store
+        self._levels = levels
+        self._max_rows = max_rows
+        # 本视图各行对应的全局序号，头部淘汰与尾部追加均为 O(1)
+        self._seqs: deque[int] = deque()
+        # 清除时记录的序号下限：小于它的日志（含尚未刷新的）不再进入本视图
+        self._floor_seq = 0
+
+    def roleNames(self) -> dict[int, QByteArray]:
+        return {
+            LOG_ROLE_LEVEL: QByteArray(b"level"),
+            LOG_ROLE_TIME_TEXT: QByteArray(b"timeText"),
+            LOG_ROLE_MESSAGE: QByteArray(b"message"),
+            LOG_ROLE_LINE: QByteArray(b"line"),
+        }
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._seqs)
+
+    def data(self, index: QModelIndex, role: int = LOG_ROLE_DISPLAY):
+        row = index.row()
+        if not 0 <= row < len(self._seqs):
+            return None
+        seq = self._seqs[row]
+        if role == LOG_ROLE_MESSAGE:
+            return self._store.message(seq)
+        if role == LOG_ROLE_LEVEL:
+            return self._store.level(seq)
+        if role == LOG_ROLE_TIME_TEXT:
+            return format_log_time(self._store.timestamp(seq))
+        if role in (LOG_ROLE_LINE, LOG_ROLE_DISPLAY):
+            return self._store.line(seq)
+        return None
+
+    @Property(int, notify=countChanged)  # type: ignore
+    def count(self) -> int:
+        """QML 只读属性：当前行数。"""
+        return len(self._seqs)
+
+    @Property(int, notify=maxRowsChanged)  # type: ignore
+    def maxRows(self) -> int:
+        """QML 只读属性：最大行数，超出时淘汰最早的行。"""
+        return self._max_rows
+
+    @Slot(int)
+    def setMaxRows(self, max_rows: int) -> None:
+        """调整最大行数；缩小时立即淘汰多余的旧行。"""
+        max_rows = max(1, max_rows)
+        if max_rows == self._max_rows:
+            return
+        self._max_rows = max_rows
+        self._evict(0)
+        self.maxRowsChanged.emit()
+
+    def accepts(self, level: int, seq: int) -> bool:
+        return level in self._levels and seq >= self._floor_seq
+
+    def append_seqs(self, seqs: list[int]) -> None:
+        """LogStore.flush 调用：批量追加新日志，随后淘汰超出上限或已被环形缓冲覆盖的旧行。"""
+        if not seqs:
+            self._evict(0)
+            return
+        if len(seqs) >= self._max_rows:
+            # 一批就超过上限（日志风暴）：直接重置为最近 maxRows 行，避免先插入再删除
+            self.beginResetModel()
+            self._seqs = deque(seqs[-self._max_rows:])
+            self.endResetModel()
+            self.countChanged.emit()
+            return
+        first_row = len(self._seqs)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(seqs) - 1)
+        self._seqs.extend(seqs)
+        self.endInsertRows()
+        self._evict(len(seqs))
+
+    def _evict(self, inserted: int) -> None:
+        """从头部淘汰超出 maxRows 或早于环形缓冲最早序号的行。"""
+        oldest_seq = self._store.oldestSeq
+        overflow = len(self._seqs) - self._max_rows
+        expired = 0
+        for seq in self._seqs:
+            if seq >= oldest_seq:
+                break
+            expired += 1
+        remove_count = max(overflow, expired, 0)
+        if remove_count > 0:
+            self.beginRemoveRows(QModelIndex(), 0, remove_count - 1)
+            for _ in range(remove_count):
+                self._seqs.popleft()
+            self.endRemoveRows()
+        if inserted or remove_count:
+            self.countChanged.emit()
+
+    @Slot()
+    def clear(self) -> None:
+        """清空本视图，并丢弃同级别尚未刷新的日志，避免清除后旧日志又被补回。"""
+        self._floor_seq = self._store.nextSeq
+        if not self._seqs:
+            return
+        self.beginResetModel()
+        self._seqs.clear()
+        self.endResetModel()
+        self.countChanged.emit()
+
+    @Slot(result=str)
+    def text(self) -> str:
+        """返回本视图全部行的纯文本（换行分隔），用于复制。"""
+        return "\n".join(self._store.line(seq) for seq in self._seqs)
+
+    @Slot()
+    def copyToClipboard(self) -> None:
+        """把本视图全部行复制到系统剪贴板。"""
+        from PySide6.QtGui import QGuiApplication
+
+        QGuiApplication.clipboard().setText(self.text())
+
+
+class LogStore(QObject):
+    """MCU 日志环形存储。
+
+    职责：
+    - 接收 FrameDispatcher.logMessageReceived，记录到达时刻并放入待刷新队列
+    - flush 时批量写入环形缓冲并更新 INFO / WARN·ERROR 两个视图
+    - 页面隐藏期间待刷新队列同样按容量封顶，只保留最近的日志
+    """
+
+    # 每个刷新周期最多通知一次，日志本身留在 Python 侧
+    logsAvailable = Signal()
+
+    def __init__(self, parent=None, capacity: int = LOG_STORE_CAPACITY) -> None:
+        super().__init__(parent)
+        self._capacity = capacity
+        self._levels = array("b", bytes(capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._messages: list[str] = [""] * capacity
+        # 已写入环形缓冲的下一个序号；待刷新队列中的日志已预先分配序号
+        self._stored_seq = 0
+        self._next_seq = 0
+        self._pending: deque[tuple[int, int, float, str]] = deque(maxlen=capacity)
+        self._notified = False
+        self._info_model = LogListModel(self, frozenset({LOG_LEVEL_INFO}))
+        self._warn_error_model = LogListModel(self, frozenset({LOG_LEVEL_WARN, LOG_LEVEL_ERROR}))
+        self._views = (self._info_model, self._warn_error_model)
+
+    @Property(QObject, constant=True)  # type: ignore
+    def infoModel(self) -> LogListModel:
+        """QML 只读属性：INFO 日志视图。"""
+        return self._info_model
+
+    @Property(QObject, constant=True)  # type: ignore
+    def warnErrorModel(self) -> LogListModel:
+        """QML 只读属性：WARN / ERROR 日志视图。"""
+        return self._warn_error_model
+
+    @property
+    def oldestSeq(self) -> int:
+        """返回环形缓冲中仍保留的最早序号。"""
+        return max(0, self._stored_seq - self._capacity)
+
+    @property
+    def nextSeq(self) -> int:
+        """返回下一条到达日志将分配的序号（含待刷新队列）。"""
+        return self._next_seq
+
+    def level(self, seq: int) -> int:
+        return self._levels[seq % self._capacity]
+
+    def timestamp(self, seq: int) -> float:
+        return self._timestamps[seq % self._capacity]
+
+    def message(self, seq: int) -> str:
+        return self._messages[seq % self._capacity]
+
+    def line(self, seq: int) -> str:
+        """返回 hh:mm:ss.zzz + 级别前缀 + 文本 的完整一行。"""
+        slot = seq % self._capacity
+        return "%s %s%s" % (
+            format_log_time(self._timestamps[slot]),
+            LOG_LEVEL_PREFIXES[self._levels[slot]],
+            self._messages[slot],
+        )
+
+    @Slot(int, str)
+    def onLogMessageReceived(self, level: int, message: str) -> None:
+        """记录到达时刻并放入待刷新队列（超过容量时丢弃最早的）。"""
+        self._pending.append((self._next_seq, level, time.time(), message))
+        self._next_seq += 1
+        if not self._notified:
+            self._notified = True
+            self.logsAvailable.emit()
+
+    @Slot(result=bool)
+    def hasPendingLogs(self) -> bool:
+        """返回是否有尚未刷新到视图的日志。"""
+        return bool(self._pending)
+
+    @Slot(result=int)
+    def flush(self) -> int:
+        """把待刷新日志写入环形缓冲并批量通知各视图，返回本次刷新的条数。"""
+        self._notified = False
+        pending = self._pending
+        if not pending:
+            return 0
+        self._pending = deque(maxlen=self._capacity)
+        capacity = self._capacity
+        view_seqs: list[list[int]] = [[] for _ in self._views]
+        for seq, level, timestamp_s, message in pending:
+            slot = seq % capacity
+            self._levels[slot] = level
+            self._timestamps[slot] = timestamp_s
+            self._messages[slot] = message
+            for view, seqs in zip(self._views, view_seqs):
+                if view.accepts(level, seq):
+                    seqs.append(seq)
+        self._stored_seq = pending[-1][0] + 1
+        for view, seqs in zip(self._views, view_seqs):
+            view.append_seqs(seqs)
+        return len(pending)
@@ -0,0 +1,199 @@
+"""MetricsServer - 本地 Prometheus 指标端点。
+
+用于测试台无人值守运行时的健康监控：
+  - GUI 线程按固定周期采集各设备统计、最新遥测、解析耗时与事件循环延迟，
+    生成不可变快照后整体替换引用（单次赋值，无锁）
+  - HTTP 服务运行在独立后台线程，抓取时只读取当前快照并渲染为 Prometheus 文本格式，
+    不会阻塞串口接收与解析
+默认只监听 127.0.0.1。
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PySide6.QtCore import QObject, QTimer, Slot
+
+METRICS_COLLECT_INTERVAL_MS = 1000
+METRICS_DEFAULT_HOST = "127.0.0.1"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 统计快照字段 → (指标名, 类型, 说明)
+_STATISTICS_METRICS: tuple[tuple[str, str, str, str], ...] = (
+    ("txFrameCountTotal", "foc_serial_tx_frames_total", "counter", "Complete frames written to the link."),
+    ("rxFrameCountTotal", "foc_serial_rx_frames_total", "counter", "Valid frames parsed from the link."),
+    ("txBytesTotal", "foc_serial_tx_bytes_total", "counter", "Bytes written to the link."),
+    ("rxBytesTotal", "foc_serial_rx_bytes_total", "counter", "Raw bytes received from the link."),
+    ("txBytesPerSec", "foc_serial_tx_bytes_per_second", "gauge", "Transmit byte rate (EWMA)."),
+    ("rxBytesPerSec", "foc_serial_rx_bytes_per_second", "gauge", "Receive byte rate (EWMA)."),
+    ("rxCrcErrorCount", "foc_serial_rx_crc_errors_total", "counter", "Frames dropped due to CRC mismatch."),
+    ("rxInvalidFrameCount", "foc_serial_rx_invalid_frames_total", "counter", "Resynchronisations after invalid data."),
+    ("linkUtilization", "foc_serial_link_utilization_percent", "gauge", "Busiest direction as percent of baud rate."),
+)
+
+# 一个指标族：(指标名, 类型, 说明, ((标签, 数值), ...))
+MetricFamily = tuple[str, str, str, tuple[tuple[tuple[tuple[str, str], ...], float], ...]]
+
+
+def _escape_label_value(value: str) -> str:
+    """按 Prometheus 文本格式转义标签值。"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """整数按整数输出，其余按 repr 输出，避免精度丢失。"""
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(families: tuple[MetricFamily, ...]) -> str:
+    """把指标族渲染为 Prometheus 文本格式。"""
+    lines: list[str] = []
+    for name, metric_type, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            sample_name = name
+            # summary 的 _sum/_count 样本通过伪标签 __suffix__ 携带后缀
+            label_items = []
+            for key, label_value in labels:
+                if key == "__suffix__":
+                    sample_name = name + label_value
+                else:
+                    label_items.append(f'{key}="{_escape_label_value(label_value)}"')
+            label_text = "{" + ",".join(label_items) + "}" if label_items else ""
+            lines.append(f"{sample_name}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """只响应 GET /metrics（以及 /），其余路径返回 404。"""
+
+    server_version = "FOCStudioMetrics/1.0"
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler 约定的方法名
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_prometheus(self.server.metrics_source.families).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, _format: str, *_args) -> None:
+        """抓取频繁，不输出访问日志。"""
+
+
+class MetricsServer(QObject):
+    """本地指标端点：GUI 线程采集快照，后台线程提供 HTTP 抓取。"""
+
+    def __init__(self, session_manager, port: int, parent=None, host: str = METRICS_DEFAULT_HOST) -> None:
+        super().__init__(parent)
+        self._session_manager = session_manager
+        self._host = host
+        self._port = port
+        self._http_server: ThreadingHTTPServer | None = None
+        self._http_thread: threading.Thread | None = None
+        # 当前快照；后台线程只读取该引用，GUI 线程每次采集后整体替换
+        self.families: tuple[MetricFamily, ...] = ()
+
+        # 事件循环延迟探针由 SessionManager 全局共享
+        self._lag_probe = session_manager.eventLoopProbe
+        self._collect_timer = QTimer(self)
+        self._collect_timer.setInterval(METRICS_COLLECT_INTERVAL_MS)
+        self._collect_timer.timeout.connect(self._collect)
+
+    @property
+    def port(self) -> int:
+        """返回实际监听端口（传入 0 时由系统分配）。"""
+        return self._port
+
+    def start(self) -> bool:
+        """启动 HTTP 后台线程与周期采集，端口被占用等错误时返回 False。"""
+        try:
+            self._http_server = ThreadingHTTPServer((self._host, self._port), _MetricsRequestHandler)
+        except OSError as exc:
+            print(f"[MetricsServer] failed to listen on {self._host}:{self._port}: {exc}", flush=True)
+            return False
+        self._http_server.daemon_threads = True
+        self._http_server.metrics_source = self
+        self._port = self._http_server.server_address[1]
+
+        self._collect()
+        self._collect_timer.start()
+        self._http_thread = threading.Thread(
+            target=self._http_server.serve_forever, name="foc-metrics-http", daemon=True
+        )
+        self._http_thread.start()
+        print(f"[MetricsServer] serving http://{self._host}:{self._port}/metrics", flush=True)
+        return True
+
+    @Slot()
+    def shutdown(self) -> None:
+        """停止采集并关闭 HTTP 服务线程。"""
+        self._collect_timer.stop()
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._http_thread is not None:
+            self._http_thread.join(timeout=1.0)
+            self._http_thread = None
+
+    def _collect(self) -> None:
+        """在 GUI 线程读取各服务状态，生成新的不可变快照。"""
+        stat_samples: dict[str, list] = {metric[1]: [] for metric in _STATISTICS_METRICS}
+        command_samples: list = []
+        connected_samples: list = []
+        busy_samples: list = []
+        chunk_samples: list = []
+        telemetry_samples: dict[str, list] = {}
+
+        for index, backend in enumerate(self._session_manager.backends):
+            labels = (("device", str(index + 1)), ("port", backend.portName))
+            statistics = backend.statistics
+            for key, metric_name, _type, _help in _STATISTICS_METRICS:
+                stat_samples[metric_name].append((labels, statistics.get(key, 0)))
+            for command in statistics.get("commandStats", ()):
+                command_samples.append((labels + (("cmd", command["cmd"]),), command["count"]))
+            connected_samples.append((labels, 1 if backend.isConnected else 0))
+            busy_samples.append((labels, backend.pipelineBusyTimeSec))
+            chunk_samples.append((labels, backend.pipelineChunkCount))
+            for key, value in backend.latestTelemetry.items():
+                telemetry_samples.setdefault(key, []).append((labels, value))
+
+        families: list[MetricFamily] = [
+            ("foc_device_connected", "gauge", "Whether the device link is open.", tuple(connected_samples)),
+        ]
+        families.extend(
+            (metric_name, metric_type, help_text, tuple(stat_samples[metric_name]))
+            for _key, metric_name, metric_type, help_text in _STATISTICS_METRICS
+        )
+        families.append((
+            "foc_serial_command_frames_total", "counter", "Valid frames parsed per command byte.",
+            tuple(command_samples),
+        ))
+        families.extend(
+            (f"foc_telemetry_{key}", "gauge", f"Latest telemetry value {key}.", tuple(samples))
+            for key, samples in sorted(telemetry_samples.items())
+        )
+        families.extend((
+            ("foc_parser_busy_seconds_total", "counter", "Time spent parsing and dispatching received data.",
+             tuple(busy_samples)),
+            ("foc_parser_chunks_total", "counter", "Received data chunks processed by the parser.",
+             tuple(chunk_samples)),
+            ("foc_event_loop_lag_seconds", "summary", "GUI event-loop timer lateness.", (
+                ((("__suffix__", "_sum"),), self._lag_probe.lagSumSec),
+                ((("__suffix__", "_count"),), self._lag_probe.sampleCount),
+            )),
+            ("foc_event_loop_lag_max_seconds", "gauge", "Worst event-loop lag within the last collection period.",
+             (((), self._lag_probe.takeMaxLagSec()),)),
+            ("foc_event_loop_stalls_total", "counter", "GUI thread stalls detected by the watchdog.",
+             (((), self._session_manager.eventLoopStallCount),)),
+            ("foc_metrics_collected_timestamp_seconds", "gauge", "Unix time of the current snapshot.",
+             (((), time.time()),)),
+        ))
+        self.families = tuple(families)
@@ -0,0 +1,138 @@
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+# 首次重连等待时间与退避上限：USB 适配器复位通常在几十毫秒内重新枚举
+RECONNECT_INITIAL_DELAY_MS = 50
+RECONNECT_MAX_DELAY_MS = 2000
+# 接收静默超时：MCU 遥测持续上报，超过心跳窗口仍无数据视为链路失效
+RX_SILENCE_TIMEOUT_MS = 2000
+# 静默检测采用周期轮询，避免每个接收块都重启一次定时器
+RX_SILENCE_CHECK_INTERVAL_MS = 250
+
+
+class ReconnectManager(QObject):
+    """链路恢复服务：检测接收静默与链路中断，按指数退避请求传输层重连。"""
+
+    linkResetRequested = Signal(str)  # 接收静默超时，请求传输层关闭当前链路（携带原因）
+    reopenRequested = Signal()        # 退避结束，请求传输层按原参数重新打开
+    reconnectingChanged = Signal()
+
+    def __init__(self, parent=None) -> None:
+        """初始化退避与静默检测状态，定时器仅在连接期间运行。"""
+        super().__init__(parent)
+        self._enabled = True
+        self._connected = False
+        self._reconnecting = False
+        self._next_delay_ms = RECONNECT_INITIAL_DELAY_MS
+        self._attempt_count = 0
+        # 仅在本次会话收到过数据后才启用静默检测，避免静默设备被反复重连
+        self._rx_seen = False
+        self._last_rx_monotonic = 0.0
+
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._on_retry_timer)
+
+        self._silence_timer = QTimer(self)
+        self._silence_timer.setInterval(RX_SILENCE_CHECK_INTERVAL_MS)
+        self._silence_timer.timeout.connect(self._on_silence_timer)
+
+    @property
+    def isReconnecting(self) -> bool:
+        """返回当前是否处于链路中断后的自动重连阶段。"""
+        return self._reconnecting
+
+    @property
+    def attemptCount(self) -> int:
+        """返回本轮重连已尝试的次数。"""
+        return self._attempt_count
+
+    def setEnabled(self, enabled: bool) -> None:
+        """开启或关闭自动重连；关闭时立即停止进行中的重连与静默检测。"""
+        self._enabled = enabled
+        if not enabled:
+            self._retry_timer.stop()
+            self._silence_timer.stop()
+            self._set_reconnecting(False)
+        elif self._connected:
+            self._silence_timer.start()
+
+    @Slot(bool, str)
+    def onConnectionStatusChanged(self, connected: bool, _message: str) -> None:
+        """用户主动连接/断开：连接时开始静默检测，断开时结束任何重连流程。"""
+        self._connected = connected
+        self._retry_timer.stop()
+        self._set_reconnecting(False)
+        self._reset_backoff()
+        self._rx_seen = False
+        if connected and self._enabled:
+            self._silence_timer.start()
+        else:
+            self._silence_timer.stop()
+
+    @Slot(bytes)
+    def onDataReceived(self, _data: bytes) -> None:
+        """记录最近一次收到数据的时刻，热路径只做一次时间戳赋值。"""
+        self._rx_seen = True
+        self._last_rx_monotonic = time.monotonic()
+
+    @Slot(str)
+    def onLinkLost(self, _reason: str) -> None:
+        """传输层报告链路中断：停止静默检测并按退避节奏安排重连。"""
+        self._connected = False
+        self._silence_timer.stop()
+        if not self._enabled:
+            return
+        self._set_reconnecting(True)
+        self._schedule_retry()
+
+    @Slot(str)
+    def onLinkRestored(self, _port_name: str) -> None:
+        """链路恢复：重置退避，重新开始静默检测。"""
+        self._connected = True
+        self._retry_timer.stop()
+        self._reset_backoff()
+        self._set_reconnecting(False)
+        self._rx_seen = False
+        if self._enabled:
+            self._silence_timer.start()
+
+    @Slot(str)
+    def onReopenFailed(self, _error: str) -> None:
+        """本次重连失败：退避时间翻倍（有上限）后再次尝试。"""
+        if not self._reconnecting:
+            return
+        self._next_delay_ms = min(self._next_delay_ms * 2, RECONNECT_MAX_DELAY_MS)
+        self._schedule_retry()
+
+    def _schedule_retry(self) -> None:
+        """按当前退避时间启动下一次重连。"""
+        self._retry_timer.start(self._next_delay_ms)
+
+    def _reset_backoff(self) -> None:
+        """恢复初始退避时间，并清零尝试次数。"""
+        self._next_delay_ms = RECONNECT_INITIAL_DELAY_MS
+        self._attempt_count = 0
+
+    def _set_reconnecting(self, reconnecting: bool) -> None:
+        """更新重连状态，并在变化时通知上层。"""
+        if self._reconnecting != reconnecting:
+            self._reconnecting = reconnecting
+            self.reconnectingChanged.emit()
+
+    def _on_retry_timer(self) -> None:
+        """退避时间到：请求传输层重新打开串口。"""
+        if not self._reconnecting:
+            return
+        self._attempt_count += 1
+        self.reopenRequested.emit()
+
+    def _on_silence_timer(self) -> None:
+        """周期检查接收静默时长，超时则请求传输层复位链路。"""
+        if not self._connected or not self._rx_seen:
+            return
+        silence_ms = (time.monotonic() - self._last_rx_monotonic) * 1000.0
+        if silence_ms > RX_SILENCE_TIMEOUT_MS:
+            self._rx_seen = False
+            self.linkResetRequested.emit(f"no data received for {silence_ms:.0f} ms")
@@ -0,0 +1,184 @@
+"""RefreshScheduler - 各页面共享的自适应刷新节拍。
+
+CHT / QD / LOG 页面不再各自运行 Timer：有待刷新数据时调用 requestRefresh，
+由调度器在统一的单次定时器上按期发出 refreshDue(client)。
+
+刷新周期在 REFRESH_INTERVAL_MIN_MS ~ REFRESH_INTERVAL_MAX_MS 之间自适应：
+  - 测量每次 refreshDue 处理（Python 取样 + QML 更新曲线/文本）的实际耗时，
+    平滑后按 REFRESH_BUSY_BUDGET 折算目标周期，使刷新占 GUI 线程的比例有上限
+  - 事件循环探针测得的延迟（含场景图同步阶段等渲染开销）超过阈值时成倍退避，
+    负载下降后逐步回落到目标周期
+隐藏页面通过 setClientActive(False) 暂停，请求被丢弃、不再收到节拍。
+"""
+
+import math
+import time
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Property, QTimer, Signal, Slot
+
+if TYPE_CHECKING:
+    from core.service.event_loop_monitor import EventLoopLagProbe
+
+REFRESH_INTERVAL_MIN_MS = 16
+REFRESH_INTERVAL_MAX_MS = 200
+REFRESH_INTERVAL_DEFAULT_MS = 50
+# 刷新处理最多占用 GUI 线程的比例：耗时 5 ms 对应约 16 ms 周期，耗时 40 ms 对应 200 ms
+REFRESH_BUSY_BUDGET = 0.25
+# 刷新耗时的指数平滑系数
+REFRESH_COST_SMOOTHING = 0.2
+# 事件循环延迟超过该值视为过载，周期乘以退避系数；否则每次探测按恢复系数向目标回落
+REFRESH_LAG_THRESHOLD_MS = 40.0
+REFRESH_BACKOFF_FACTOR = 1.5
+REFRESH_RECOVER_FACTOR = 0.9
+# 粗精度定时器可能提前约 5% 触发，到期判断留出同等余量，避免提前唤醒后空转重排
+REFRESH_TIMER_SLACK_RATIO = 0.05
+
+
+class _RefreshClient:
+    """单个页面的注册信息与调度状态。"""
+
+    __slots__ = ("min_interval_ms", "active", "pending", "last_refresh_at", "cost_ms")
+
+    def __init__(self, min_interval_ms: int) -> None:
+        self.min_interval_ms = min_interval_ms
+        self.active = False
+        self.pending = False
+        self.last_refresh_at = 0.0
+        self.cost_ms = 0.0
+
+
+class RefreshScheduler(QObject):
+    """页面刷新调度器（全进程共享，所有页面运行在同一 GUI 线程）。"""
+
+    refreshDue = Signal(str)          # client 名称，收到后页面执行一次批量刷新
+    intervalChanged = Signal()
+    statsChanged = Signal()
+
+    def __init__(self, parent=None, lag_probe: "EventLoopLagProbe | None" = None) -> None:
+        super().__init__(parent)
+        self._lag_probe = lag_probe
+        self._clients: dict[str, _RefreshClient] = {}
+        self._interval_ms = float(REFRESH_INTERVAL_DEFAULT_MS)
+        self._cost_ms = 0.0
+        self._refresh_count = 0
+        # 探针每 100 ms 才更新一次，同一次探测结果只参与一次退避判断
+        self._probe_sample_count = 0
+        self._timer_slack_s = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @Property(int, notify=intervalChanged)  # type: ignore
+    def intervalMs(self) -> int:
+        """QML 只读属性：当前自适应刷新周期（毫秒）。"""
+        return round(self._interval_ms)
+
+    @Property("QVariantMap", notify=statsChanged)  # type: ignore
+    def stats(self) -> dict:
+        """QML 只读属性：平滑刷新耗时与各页面最近一次刷新耗时（毫秒）。"""
+        return {
+            "intervalMs": round(self._interval_ms),
+            "costMs": round(self._cost_ms, 2),
+            "refreshCount": self._refresh_count,
+            "clients": {name: round(client.cost_ms, 2) for name, client in self._clients.items()},
+        }
+
+    @Slot(str, int)
+    def registerClient(self, name: str, min_interval_ms: int = 0) -> None:
+        """注册页面；min_interval_ms 为该页面的最短刷新周期（如日志页不必逐帧刷新）。"""
+        client = self._clients.get(name)
+        if client is None:
+            self._clients[name] = _RefreshClient(min_interval_ms)
+        else:
+            client.min_interval_ms = min_interval_ms
+
+    @Slot(str, bool)
+    def setClientActive(self, name: str, active: bool) -> None:
+        """页面切入/切出；隐藏页面暂停，未执行的刷新请求一并丢弃。"""
+        client = self._client(name)
+        client.active = active
+        if not active:
+            client.pending = False
+
+    @Slot(str)
+    def requestRefresh(self, name: str) -> None:
+        """页面有新数据待刷新；同一周期内的多次请求合并为一次 refreshDue。"""
+        client = self._client(name)
+        if not client.active or client.pending:
+            return
+        client.pending = True
+        self._schedule()
+
+    @Slot(str)
+    def cancelRefresh(self, name: str) -> None:
+        """撤销页面尚未执行的刷新请求（如进入回看模式或重置曲线）。"""
+        client = self._clients.get(name)
+        if client is not None:
+            client.pending = False
+
+    def _client(self, name: str) -> _RefreshClient:
+        client = self._clients.get(name)
+        if client is None:
+            # 未注册的页面按无额外下限处理
+            client = self._clients[name] = _RefreshClient(0)
+        return client
+
+    def _due_at(self, client: _RefreshClient) -> float:
+        return client.last_refresh_at + max(self._interval_ms, client.min_interval_ms) / 1000.0
+
+    def _schedule(self) -> None:
+        """按最早到期的待刷新页面启动单次定时器；无待刷新页面时定时器保持停止，不空转。"""
+        due_times = [self._due_at(client) for client in self._clients.values() if client.pending]
+        if not due_times:
+            self._timer.stop()
+            return
+        delay_ms = max(0, math.ceil((min(due_times) - time.perf_counter()) * 1000.0))
+        if not self._timer.isActive() or self._timer.remainingTime() > delay_ms:
+            self._timer_slack_s = delay_ms * REFRESH_TIMER_SLACK_RATIO / 1000.0
+            self._timer.start(delay_ms)
+
+    @Slot()
+    def _on_timeout(self) -> None:
+        """向已到期的页面依次发出 refreshDue，测量处理耗时后调整周期。"""
+        now = time.perf_counter() + self._timer_slack_s
+        total_cost_ms = 0.0
+        refreshed = False
+        for name, client in list(self._clients.items()):
+            if not client.pending or self._due_at(client) > now:
+                continue
+            client.pending = False
+            started_at = time.perf_counter()
+            # QML 连接为直接调用，emit 返回时页面刷新已完成
+            self.refreshDue.emit(name)
+            finished_at = time.perf_counter()
+            client.cost_ms = (finished_at - started_at) * 1000.0
+            client.last_refresh_at = finished_at
+            total_cost_ms += client.cost_ms
+            refreshed = True
+        if refreshed:
+            self._refresh_count += 1
+            self._adapt_interval(total_cost_ms)
+            self.statsChanged.emit()
+        self._schedule()
+
+    def _adapt_interval(self, cost_ms: float) -> None:
+        """按平滑耗时折算目标周期；事件循环过载时退避，恢复后逐步回落。"""
+        self._cost_ms += (cost_ms - self._cost_ms) * REFRESH_COST_SMOOTHING
+        target_ms = self._cost_ms / REFRESH_BUSY_BUDGET
+        interval_ms = self._interval_ms
+        if self._lag_probe is None:
+            interval_ms *= REFRESH_RECOVER_FACTOR
+        elif self._lag_probe.sampleCount != self._probe_sample_count:
+            # 退避与回落都按探测次数而不是刷新次数计，两者节奏一致，刷新更频繁时也不会抵消退避
+            self._probe_sample_count = self._lag_probe.sampleCount
+            if self._lag_probe.lastLagSec * 1000.0 > REFRESH_LAG_THRESHOLD_MS:
+                interval_ms *= REFRESH_BACKOFF_FACTOR
+            else:
+                interval_ms *= REFRESH_RECOVER_FACTOR
+        interval_ms = min(max(interval_ms, target_ms, REFRESH_INTERVAL_MIN_MS), REFRESH_INTERVAL_MAX_MS)
+        previous_ms = round(self._interval_ms)
+        self._interval_ms = interval_ms
+        if round(interval_ms) != previous_ms:
+            self.intervalChanged.emit()
@@ -1,110 +1,205 @@
-from PySide6.QtCore import QObject, QTimer, Signal, SignalInstance, Slot
+import math
+import time
+from bisect import bisect_right
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from core.service.statistics_history import HISTORY_SAMPLE_INTERVAL_S, StatisticsHistory
+
+# 帧到达间隔直方图的固定对数刻度桶边界（毫秒），共 len + 1 个桶
+INTERVAL_BUCKET_EDGES_MS: tuple[float, ...] = (
+    0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0,
+)
+INTERVAL_BUCKET_LABELS: tuple[str, ...] = (
+    ("<0.1",)
+    + tuple(
+        f"{low:g}-{high:g}"
+        for low, high in zip(INTERVAL_BUCKET_EDGES_MS, INTERVAL_BUCKET_EDGES_MS[1:])
+    )
+    + (f">={INTERVAL_BUCKET_EDGES_MS[-1]:g}",)
+)
+_CMD_SPACE = 256  # 命令字取值范围 0x00 ~ 0xFF，按命令字直接索引，避免字典查找
+
+# 吞吐估计的 EWMA 时间常数：突发流量在约 0.5 秒内体现在速率上，又不会随单个 USB 批次剧烈跳动
+RATE_EWMA_TAU_S = 0.5
+# 统计快照默认发布周期；只影响 UI 刷新频率，不影响计数精度
+STATISTICS_PUBLISH_INTERVAL_MS = 1000
+STATISTICS_PUBLISH_INTERVAL_MIN_MS = 100
+# UART 8N1 每字节占用 10 个比特时间（起始位 + 8 数据位 + 停止位），用于换算链路占用率
+UART_BITS_PER_BYTE = 10
+
+
+class _Counters:
+    """会话累计计数器：固定槽位，热路径上只做整数加法。"""
+
+    __slots__ = (
+        "tx_frames", "rx_frames", "tx_bytes", "rx_bytes", "rx_crc_errors", "rx_invalid_frames",
+    )
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """全部计数清零。"""
+        self.tx_frames = 0
+        self.rx_frames = 0
+        self.tx_bytes = 0
+        self.rx_bytes = 0
+        self.rx_crc_errors = 0
+        self.rx_invalid_frames = 0
+
+
+class _EwmaRate:
+    """按时间衰减的速率估计器。
+
+    热路径只累加 pending，读取时才按距上次读取的时间间隔一次性衰减并并入，
+    等价于对每次到达做连续时间 EWMA，且结果与读取频率无关。
+    """
+
+    __slots__ = ("pending", "_rate", "_peak", "_last_at")
+
+    def __init__(self) -> None:
+        self.pending = 0
+        self._rate = 0.0
+        self._peak = 0.0
+        self._last_at = time.perf_counter()
+
+    def reset(self) -> None:
+        """清零速率与峰值，从当前时刻重新开始估计。"""
+        self.pending = 0
+        self._rate = 0.0
+        self._peak = 0.0
+        self._last_at = time.perf_counter()
+
+    def rate(self) -> float:
+        """返回当前时刻的速率估计（单位/秒），同时更新峰值。"""
+        now = time.perf_counter()
+        dt = now - self._last_at
+        if dt <= 0.0:
+            return self._rate
+        decay = math.exp(-dt / RATE_EWMA_TAU_S)
+        self._rate = self._rate * decay + self.pending * (1.0 - decay) / dt
+        self.pending = 0
+        self._last_at = now
+        if self._rate > self._peak:
+            self._peak = self._rate
+        return self._rate
+
+    def peak(self) -> float:
+        """返回本会话出现过的最大速率估计。"""
+        self.rate()
+        return self._peak
 
 
 class SerialStatisticsService(QObject):
-    """串口统计服务，负责维护当前连接会话的收发与错误统计。"""
-
-    txFrameCountTotalChanged = Signal()
-    rxFrameCountTotalChanged = Signal()
-    txBytesTotalChanged = Signal()
-    rxBytesTotalChanged = Signal()
-    txBytesPerSecChanged = Signal()
-    rxBytesPerSecChanged = Signal()
-    rxCrcErrorCountChanged = Signal()
-    rxInvalidFrameCountChanged = Signal()
-
-    def __init__(self, parent=None) -> None:
-        """初始化统计状态，并启动 1 秒速率统计定时器。"""
-        super().__init__(parent)
+    """串口统计服务，负责维护当前连接会话的收发与错误统计。
 
-        self._tx_frame_count_total = 0
-        self._rx_frame_count_total = 0
-        self._tx_bytes_total = 0
-        self._rx_bytes_total = 0
-        self._tx_bytes_per_sec = 0
-        self._rx_bytes_per_sec = 0
-        self._rx_crc_error_count = 0
-        self._rx_invalid_frame_count = 0
+    热路径（每个接收块 / 每帧）只更新计数器，不发信号；由发布节拍统一生成快照，
+    内容变化时通过 statisticsChanged 一次性推送给上层。
+    """
 
-        self._tx_window_bytes = 0
-        self._rx_window_bytes = 0
+    statisticsChanged = Signal(dict)  # 统计快照，字段见 _build_snapshot
+    historyChanged = Signal()         # 历史环形缓冲新增了一个采样点
 
-        # 仅在发布给 UI 时保留一份快照，避免高频串口统计持续触发 QML 重绘。
-        self._published_tx_frame_count_total = 0
-        self._published_rx_frame_count_total = 0
-        self._published_tx_bytes_total = 0
-        self._published_rx_bytes_total = 0
-        self._published_tx_bytes_per_sec = 0
-        self._published_rx_bytes_per_sec = 0
-        self._published_rx_crc_error_count = 0
-        self._published_rx_invalid_frame_count = 0
+    def __init__(
+        self,
+        parent=None,
+        use_internal_timer: bool = True,
+        publish_interval_ms: int = STATISTICS_PUBLISH_INTERVAL_MS,
+    ) -> None:
+        """初始化统计状态，并按发布周期启动快照定时器。
 
-        self._rate_timer = QTimer(self)
-        self._rate_timer.setInterval(1000)
-        self._rate_timer.timeout.connect(self._on_rate_timer_timeout)
-        self._rate_timer.start()
+        use_internal_timer 为 False 时不启动内部定时器，由外部共享节拍调用 onRateTick。
+        """
+        super().__init__(parent)
 
-    @property
-    def txFrameCountTotal(self) -> int:
-        """返回当前会话累计发送完整帧数。"""
-        return self._tx_frame_count_total
+        self._counters = _Counters()
+        # 吞吐速率按时间衰减估计，热路径只做一次整数累加，读取时才计算
+        self._tx_byte_rate = _EwmaRate()
+        self._rx_byte_rate = _EwmaRate()
+        self._tx_frame_rate = _EwmaRate()
+        self._rx_frame_rate = _EwmaRate()
+        self._baud_rate = 0
 
-    @property
-    def rxFrameCountTotal(self) -> int:
-        """返回当前会话累计接收有效帧数。"""
-        return self._rx_frame_count_total
+        # 按命令字统计：累计帧数、本窗口帧数、上次到达时刻、窗口内到达间隔和与平方和、会话直方图
+        self._cmd_frame_counts = [0] * _CMD_SPACE
+        self._cmd_window_counts = [0] * _CMD_SPACE
+        self._cmd_last_arrival = [0.0] * _CMD_SPACE
+        self._cmd_interval_sum_ms = [0.0] * _CMD_SPACE
+        self._cmd_interval_sq_sum_ms = [0.0] * _CMD_SPACE
+        self._cmd_interval_count = [0] * _CMD_SPACE
+        self._cmd_histograms = [[0] * (len(INTERVAL_BUCKET_EDGES_MS) + 1) for _ in range(_CMD_SPACE)]
+        self._window_started_at = time.perf_counter()
+        self._command_stats: list[dict] = []
 
-    @property
-    def txBytesTotal(self) -> int:
-        """返回当前会话累计发送字节数。"""
-        return self._tx_bytes_total
+        # 仅在发布给 UI 时保留一份快照，避免高频串口统计持续触发 QML 重绘。
+        self._snapshot = self._build_snapshot()
 
-    @property
-    def rxBytesTotal(self) -> int:
-        """返回当前会话累计接收原始字节数。"""
-        return self._rx_bytes_total
+        # 链路健康历史：与发布周期无关，固定每秒采样一次，跨重连保留
+        self._history = StatisticsHistory()
+        self._last_history_at = time.monotonic()
 
-    @property
-    def txBytesPerSec(self) -> int:
-        """返回最近 1 秒发送字节速率。"""
-        return self._tx_bytes_per_sec
+        self._rate_timer = QTimer(self)
+        self._rate_timer.setInterval(max(publish_interval_ms, STATISTICS_PUBLISH_INTERVAL_MIN_MS))
+        self._rate_timer.timeout.connect(self.onRateTick)
+        if use_internal_timer:
+            self._rate_timer.start()
 
     @property
-    def rxBytesPerSec(self) -> int:
-        """返回最近 1 秒接收字节速率。"""
-        return self._rx_bytes_per_sec
+    def statistics(self) -> dict:
+        """返回最近一次发布的统计快照。"""
+        return self._snapshot
 
     @property
-    def rxCrcErrorCount(self) -> int:
-        """返回当前会话累计 CRC 错误次数。"""
-        return self._rx_crc_error_count
+    def history(self) -> StatisticsHistory:
+        """返回统计历史环形缓冲。"""
+        return self._history
 
     @property
-    def rxInvalidFrameCount(self) -> int:
-        """返回当前会话累计无效帧恢复次数。"""
-        return self._rx_invalid_frame_count
+    def publishIntervalMs(self) -> int:
+        """返回内部发布定时器周期（毫秒）。"""
+        return self._rate_timer.interval()
+
+    @Slot(int)
+    def setPublishIntervalMs(self, interval_ms: int) -> None:
+        """调整快照发布周期；使用外部共享节拍时仅记录，不启动内部定时器。"""
+        self._rate_timer.setInterval(max(interval_ms, STATISTICS_PUBLISH_INTERVAL_MIN_MS))
+
+    @Slot(int)
+    def setBaudRate(self, baud_rate: int) -> None:
+        """设置当前链路波特率，用于计算链路占用率；网络传输等无波特率场景传 0。"""
+        self._baud_rate = baud_rate
 
     @Slot()
     def reset(self) -> None:
         """在新连接建立时清零当前会话统计。"""
-        self._tx_frame_count_total = 0
-        self._rx_frame_count_total = 0
-        self._tx_bytes_total = 0
-        self._rx_bytes_total = 0
-        self._tx_bytes_per_sec = 0
-        self._rx_bytes_per_sec = 0
-        self._rx_crc_error_count = 0
-        self._rx_invalid_frame_count = 0
-        self._tx_window_bytes = 0
-        self._rx_window_bytes = 0
+        self._counters.clear()
+        self._tx_byte_rate.reset()
+        self._rx_byte_rate.reset()
+        self._tx_frame_rate.reset()
+        self._rx_frame_rate.reset()
+        self._reset_command_stats()
         self._publish_snapshot()
 
-    def _publish_if_changed(self, published_attr: str, value: int, signal: SignalInstance) -> None:
-        """仅在对外快照变化时发出通知，保持属性值与 notify 语义一致。"""
-        if getattr(self, published_attr) == value:
-            return
-        setattr(self, published_attr, value)
-        signal.emit()
+    def _reset_command_stats(self) -> None:
+        """清零按命令字统计与直方图。"""
+        for cmd in range(_CMD_SPACE):
+            self._cmd_frame_counts[cmd] = 0
+            self._cmd_last_arrival[cmd] = 0.0
+            histogram = self._cmd_histograms[cmd]
+            for bucket in range(len(histogram)):
+                histogram[bucket] = 0
+        self._reset_command_window()
+        self._command_stats = []
+
+    def _reset_command_window(self) -> None:
+        """开始新的统计窗口：清零窗口帧数与到达间隔累计量。"""
+        for cmd in range(_CMD_SPACE):
+            self._cmd_window_counts[cmd] = 0
+            self._cmd_interval_sum_ms[cmd] = 0.0
+            self._cmd_interval_sq_sum_ms[cmd] = 0.0
+            self._cmd_interval_count[cmd] = 0
+        self._window_started_at = time.perf_counter()
 
     @Slot(int, bool)
     def onDataWritten(self, bytes_written: int, frame_complete: bool) -> None:
@@ -112,114 +207,149 @@ class SerialStatisticsService(QObject):
         if bytes_written <= 0:
             return
 
-        self._tx_window_bytes += bytes_written
-        self._tx_bytes_total += bytes_written
-        self._publish_if_changed(
-            "_published_tx_bytes_total",
-            self._tx_bytes_total,
-            self.txBytesTotalChanged,
-        )
-
+        self._counters.tx_bytes += bytes_written
+        self._tx_byte_rate.pending += bytes_written
         if frame_complete:
-            self._tx_frame_count_total += 1
-            self._publish_if_changed(
-                "_published_tx_frame_count_total",
-                self._tx_frame_count_total,
-                self.txFrameCountTotalChanged,
-            )
+            self._counters.tx_frames += 1
+            self._tx_frame_rate.pending += 1
 
     @Slot(bytes)
     def onDataReceived(self, data: bytes) -> None:
         """统计串口层收到的原始字节数。"""
-        if not data:
-            return
-
         received_len = len(data)
-        self._rx_window_bytes += received_len
-        self._rx_bytes_total += received_len
-        self._publish_if_changed(
-            "_published_rx_bytes_total",
-            self._rx_bytes_total,
-            self.rxBytesTotalChanged,
-        )
+        self._counters.rx_bytes += received_len
+        self._rx_byte_rate.pending += received_len
 
     @Slot(object)
-    def onFrameParsed(self, _frame) -> None:
-        """统计协议层成功解析出的有效帧。"""
-        self._rx_frame_count_total += 1
-        self._publish_if_changed(
-            "_published_rx_frame_count_total",
-            self._rx_frame_count_total,
-            self.rxFrameCountTotalChanged,
-        )
+    def onFrameParsed(self, frame) -> None:
+        """统计协议层成功解析出的有效帧，并按命令字累计帧数与到达间隔（O(1)）。"""
+        self._counters.rx_frames += 1
+        self._rx_frame_rate.pending += 1
+
+        cmd = frame.cmd
+        now = time.perf_counter()
+        self._cmd_frame_counts[cmd] += 1
+        self._cmd_window_counts[cmd] += 1
+        last_arrival = self._cmd_last_arrival[cmd]
+        self._cmd_last_arrival[cmd] = now
+        if last_arrival > 0.0:
+            # 到达间隔为 PC 侧解析时刻之差，反映 MCU 发送节奏与 USB 批量传输的叠加效果
+            interval_ms = (now - last_arrival) * 1000.0
+            self._cmd_interval_sum_ms[cmd] += interval_ms
+            self._cmd_interval_sq_sum_ms[cmd] += interval_ms * interval_ms
+            self._cmd_interval_count[cmd] += 1
+            # 桶边界数量固定，bisect 的开销与流量无关
+            self._cmd_histograms[cmd][bisect_right(INTERVAL_BUCKET_EDGES_MS, interval_ms)] += 1
 
     @Slot()
     def onCrcErrorDetected(self) -> None:
         """统计协议层识别出的 CRC 错误帧。"""
-        self._rx_crc_error_count += 1
-        self._publish_if_changed(
-            "_published_rx_crc_error_count",
-            self._rx_crc_error_count,
-            self.rxCrcErrorCountChanged,
-        )
+        self._counters.rx_crc_errors += 1
 
     @Slot()
     def onInvalidFrameDetected(self) -> None:
         """统计协议层为恢复同步而丢弃无效数据的次数。"""
-        self._rx_invalid_frame_count += 1
-        self._publish_if_changed(
-            "_published_rx_invalid_frame_count",
-            self._rx_invalid_frame_count,
-            self.rxInvalidFrameCountChanged,
-        )
+        self._counters.rx_invalid_frames += 1
 
-    def _on_rate_timer_timeout(self) -> None:
-        """每秒固化一次当前窗口吞吐，并清空窗口计数。"""
-        self._tx_bytes_per_sec = self._tx_window_bytes
-        self._rx_bytes_per_sec = self._rx_window_bytes
-        self._tx_window_bytes = 0
-        self._rx_window_bytes = 0
+    @Slot()
+    def onRateTick(self) -> None:
+        """发布节拍：固化按命令字统计窗口，读取速率估计并合并发布快照。"""
+        self._update_command_stats()
         self._publish_snapshot()
+        now = time.monotonic()
+        # 定时器节拍存在毫秒级抖动，留少量余量避免恰好早到的节拍被跳过
+        if now - self._last_history_at >= HISTORY_SAMPLE_INTERVAL_S * 0.95:
+            self._last_history_at = now
+            self._sample_history()
 
-    def _publish_snapshot(self) -> None:
-        """将最近一段时间的统计变化合并发布给上层。"""
-        self._publish_if_changed(
-            "_published_tx_frame_count_total",
-            self._tx_frame_count_total,
-            self.txFrameCountTotalChanged,
-        )
-        self._publish_if_changed(
-            "_published_rx_frame_count_total",
-            self._rx_frame_count_total,
-            self.rxFrameCountTotalChanged,
-        )
-        self._publish_if_changed(
-            "_published_tx_bytes_total",
-            self._tx_bytes_total,
-            self.txBytesTotalChanged,
-        )
-        self._publish_if_changed(
-            "_published_rx_bytes_total",
-            self._rx_bytes_total,
-            self.rxBytesTotalChanged,
-        )
-        self._publish_if_changed(
-            "_published_tx_bytes_per_sec",
-            self._tx_bytes_per_sec,
-            self.txBytesPerSecChanged,
-        )
-        self._publish_if_changed(
-            "_published_rx_bytes_per_sec",
-            self._rx_bytes_per_sec,
-            self.rxBytesPerSecChanged,
-        )
-        self._publish_if_changed(
-            "_published_rx_crc_error_count",
-            self._rx_crc_error_count,
-            self.rxCrcErrorCountChanged,
-        )
-        self._publish_if_changed(
-            "_published_rx_invalid_frame_count",
-            self._rx_invalid_frame_count,
-            self.rxInvalidFrameCountChanged,
+    def _sample_history(self) -> None:
+        """把当前快照写入历史环形缓冲。"""
+        counters = self._counters
+        self._history.append(
+            time.time(),
+            self._snapshot,
+            {"rxCrcErrors": counters.rx_crc_errors, "rxInvalidFrames": counters.rx_invalid_frames},
+            self._cmd_frame_counts,
         )
+        self.historyChanged.emit()
+
+    @Slot()
+    def clearHistory(self) -> None:
+        """清空链路健康历史。"""
+        self._history.clear()
+        self.historyChanged.emit()
+
+    def exportHistoryCsv(self, path: str) -> bool:
+        """把历史导出为 CSV 文件，成功返回 True。"""
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as stream:
+                rows = self._history.write_csv(stream)
+        except OSError as exc:
+            print(f"[SerialStatisticsService] export history failed: {exc}", flush=True)
+            return False
+        print(f"[SerialStatisticsService] exported {rows} history rows to {path}", flush=True)
+        return True
+
+    def _update_command_stats(self) -> None:
+        """固化本窗口的按命令字帧率、平均间隔与抖动，并开始新窗口。"""
+        elapsed_s = time.perf_counter() - self._window_started_at
+        command_stats: list[dict] = []
+        for cmd in range(_CMD_SPACE):
+            frame_count = self._cmd_frame_counts[cmd]
+            if frame_count == 0:
+                continue
+            interval_count = self._cmd_interval_count[cmd]
+            mean_interval_ms = 0.0
+            jitter_ms = 0.0
+            if interval_count > 0:
+                mean_interval_ms = self._cmd_interval_sum_ms[cmd] / interval_count
+                # 抖动取窗口内到达间隔的标准差
+                variance = self._cmd_interval_sq_sum_ms[cmd] / interval_count - mean_interval_ms ** 2
+                jitter_ms = max(variance, 0.0) ** 0.5
+            command_stats.append({
+                "cmd": f"0x{cmd:02X}",
+                "count": frame_count,
+                "framesPerSec": round(self._cmd_window_counts[cmd] / elapsed_s, 1) if elapsed_s > 0 else 0.0,
+                "meanIntervalMs": round(mean_interval_ms, 2),
+                "jitterMs": round(jitter_ms, 2),
+                "histogram": list(self._cmd_histograms[cmd]),
+            })
+        self._reset_command_window()
+        self._command_stats = command_stats
+
+    def _link_utilization(self, tx_bytes_per_sec: float, rx_bytes_per_sec: float) -> float:
+        """链路占用率（%）：取收发中较忙的方向，按 UART 8N1 比特时间折算；未知波特率时为 0。"""
+        if self._baud_rate <= 0:
+            return 0.0
+        busiest_bytes_per_sec = max(tx_bytes_per_sec, rx_bytes_per_sec)
+        return round(busiest_bytes_per_sec * UART_BITS_PER_BYTE * 100.0 / self._baud_rate, 1)
+
+    def _build_snapshot(self) -> dict:
+        """读取计数器与速率估计，生成对外快照。"""
+        counters = self._counters
+        tx_bytes_per_sec = self._tx_byte_rate.rate()
+        rx_bytes_per_sec = self._rx_byte_rate.rate()
+        return {
+            "txFrameCountTotal": counters.tx_frames,
+            "rxFrameCountTotal": counters.rx_frames,
+            "txBytesTotal": counters.tx_bytes,
+            "rxBytesTotal": counters.rx_bytes,
+            "txBytesPerSec": round(tx_bytes_per_sec),
+            "rxBytesPerSec": round(rx_bytes_per_sec),
+            "txFramesPerSec": round(self._tx_frame_rate.rate()),
+            "rxFramesPerSec": round(self._rx_frame_rate.rate()),
+            "txPeakBytesPerSec": round(self._tx_byte_rate.peak()),
+            "rxPeakBytesPerSec": round(self._rx_byte_rate.peak()),
+            "linkUtilization": self._link_utilization(tx_bytes_per_sec, rx_bytes_per_sec),
+            "rxCrcErrorCount": counters.rx_crc_errors,
+            "rxInvalidFrameCount": counters.rx_invalid_frames,
+            "commandStats": self._command_stats,
+        }
+
+    def _publish_snapshot(self) -> None:
+        """生成新快照，仅在内容变化时发出一次 statisticsChanged。"""
+        snapshot = self._build_snapshot()
+        if snapshot == self._snapshot:
+            return
+        self._snapshot = snapshot
+        self.statisticsChanged.emit(snapshot)
@@ -0,0 +1,447 @@
+"""SessionRecorder - 测试台运行记录：遥测、控制参数、MCU 版本与错误码写入 SQLite。
+
+每次串口连接为一次运行（sessions 表一行）。GUI 线程把样本按通道追加到列缓冲，
+每 SESSION_RECORDER_FLUSH_INTERVAL_MS 封成一个批次放入有界队列（put_nowait，不等待）；
+同一数据库的各设备共用一个 SessionRecorderWriter（由 SessionManager 创建并注入），
+其后台线程持有唯一的写连接（WAL 模式），每个批次一个事务，各通道 executemany 批量插入。
+队列满时批次中的样本整体丢弃并计入 droppedSamples，运行起止、版本、错误码与参数事件
+保留到下一批次重试，保证运行记录完整。
+
+表结构：
+  sessions                 id, device, port, started_at_ms, ended_at_ms, mcu_version
+  telemetry_<channel>      session_id, t_ms, value          （各通道一张表，按 (session_id, t_ms) 建索引）
+  mcu_versions             session_id, t_ms, version
+  error_codes              session_id, t_ms, code           （仅记录变化）
+  control_params           session_id, t_ms, params(JSON)   （仅记录变化）
+
+SessionDatabase 提供只读查询（运行列表、按时间范围读取通道并可按像素列降采样、事件）。
+"""
+
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from collections import deque
+from itertools import repeat
+
+from PySide6.QtCore import Property, QObject, QTimer, Signal, Slot
+
+from core.service.telemetry_history import HISTORY_CHANNELS
+
+SESSION_RECORDER_CHANNELS: tuple[str, ...] = HISTORY_CHANNELS
+SESSION_RECORDER_FLUSH_INTERVAL_MS = 500
+SESSION_RECORDER_QUEUE_BATCHES = 64
+SESSION_RECORDER_BUSY_TIMEOUT_MS = 5000
+SESSION_RECORDER_STOP_TIMEOUT_S = 5.0
+EVENT_TABLES: tuple[str, ...] = ("mcu_versions", "error_codes", "control_params")
+_EVENT_COLUMNS = {"mcu_versions": "version TEXT", "error_codes": "code INTEGER", "control_params": "params TEXT"}
+
+
+def _channel_table(channel: str) -> str:
+    return f"telemetry_{channel}"
+
+
+def _create_schema(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        "id INTEGER PRIMARY KEY, device TEXT, port TEXT, "
+        "started_at_ms REAL NOT NULL, ended_at_ms REAL, mcu_version TEXT)"
+    )
+    for channel in SESSION_RECORDER_CHANNELS:
+        table = _channel_table(channel)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (session_id INTEGER NOT NULL, t_ms REAL NOT NULL, value REAL NOT NULL)"
+        )
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_time ON {table} (session_id, t_ms)")
+    for table in EVENT_TABLES:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (session_id INTEGER NOT NULL, t_ms REAL NOT NULL, {_EVENT_COLUMNS[table]})"
+        )
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_time ON {table} (session_id, t_ms)")
+    connection.commit()
+
+
+class _RecordBatch:
+    """GUI 线程封好的批次：可选的运行开始、各通道样本、事件、可选的运行结束（按此顺序写入）。"""
+
+    __slots__ = ("owner", "begin", "timestamps_ms", "values", "events", "end_ms")
+
+    def __init__(self, owner: str) -> None:
+        self.owner = owner                                   # 所属设备标签，写库线程按此区分各设备的当前运行
+        self.begin: tuple[float, str, str] | None = None     # started_at_ms, device, port
+        self.timestamps_ms = [array("d") for _ in SESSION_RECORDER_CHANNELS]
+        self.values = [array("d") for _ in SESSION_RECORDER_CHANNELS]
+        self.events: list[tuple[str, float, object]] = []  # table, t_ms, value
+        self.end_ms: float | None = None
+
+    def sample_count(self) -> int:
+        return sum(len(timestamps) for timestamps in self.timestamps_ms)
+
+    def drop_samples(self) -> int:
+        count = self.sample_count()
+        self.timestamps_ms = [array("d") for _ in SESSION_RECORDER_CHANNELS]
+        self.values = [array("d") for _ in SESSION_RECORDER_CHANNELS]
+        return count
+
+    def is_empty(self) -> bool:
+        return self.begin is None and self.end_ms is None and not self.events and not self.sample_count()
+
+
+class SessionRecorderWriter:
+    """写库线程：持有该数据库唯一的 SQLite 写连接，各设备的批次共用一个队列，每个批次一个事务。
+
+    计数器只由写库线程修改，GUI 线程按设备标签读取快照，无需加锁。
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.batches: queue.Queue = queue.Queue(maxsize=SESSION_RECORDER_QUEUE_BATCHES)
+        self._thread: threading.Thread | None = None
+        self._connection: sqlite3.Connection | None = None
+        # 设备标签 → 当前运行 id / 已写入行数
+        self._session_ids: dict[str, int] = {}
+        self._written_rows: dict[str, int] = {}
+        self.lastCommitMs = 0.0
+        self.lastError = ""
+
+    def session_id(self, owner: str) -> int:
+        """返回该设备正在写入的运行 id（无运行时为 0）。"""
+        return self._session_ids.get(owner, 0)
+
+    def written_rows(self, owner: str) -> int:
+        """返回该设备累计写入的行数。"""
+        return self._written_rows.get(owner, 0)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="foc-session-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """写完队列中剩余的批次并关闭连接；超时后放弃（daemon 线程随进程退出）。"""
+        if self._thread is None:
+            return
+        try:
+            self.batches.put(None, timeout=SESSION_RECORDER_STOP_TIMEOUT_S)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=SESSION_RECORDER_STOP_TIMEOUT_S)
+        self._thread = None
+
+    def _run(self) -> None:
+        try:
+            self._connection = sqlite3.connect(self.path, timeout=SESSION_RECORDER_BUSY_TIMEOUT_MS / 1000.0)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            _create_schema(self._connection)
+        except sqlite3.Error as exc:
+            self.lastError = str(exc)
+            print(f"[SessionRecorderWriter] failed to open {self.path}: {exc}", flush=True)
+            self._connection = None
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            if self._connection is None:
+                continue
+            try:
+                started_at = time.perf_counter()
+                with self._connection:
+                    self._write_batch(batch)
+                self.lastCommitMs = (time.perf_counter() - started_at) * 1000.0
+            except sqlite3.Error as exc:
+                # 数据库被锁超时、磁盘写满等：本批次回滚，记录错误后继续处理后续批次
+                self.lastError = str(exc)
+                print(f"[SessionRecorderWriter] write failed: {exc}", flush=True)
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _write_batch(self, batch: _RecordBatch) -> None:
+        connection = self._connection
+        if batch.begin is not None:
+            started_at_ms, device, port = batch.begin
+            cursor = connection.execute(
+                "INSERT INTO sessions (device, port, started_at_ms) VALUES (?, ?, ?)", (device, port, started_at_ms)
+            )
+            self._session_ids[batch.owner] = cursor.lastrowid
+        session_id = self._session_ids.get(batch.owner, 0)
+        if session_id:
+            rows = 0
+            for channel, timestamps, values in zip(SESSION_RECORDER_CHANNELS, batch.timestamps_ms, batch.values):
+                if timestamps:
+                    connection.executemany(
+                        f"INSERT INTO {_channel_table(channel)} (session_id, t_ms, value) VALUES (?, ?, ?)",
+                        zip(repeat(session_id), timestamps, values),
+                    )
+                    rows += len(timestamps)
+            for table, timestamp_ms, value in batch.events:
+                column = _EVENT_COLUMNS[table].split()[0]
+                connection.execute(
+                    f"INSERT INTO {table} (session_id, t_ms, {column}) VALUES (?, ?, ?)", (session_id, timestamp_ms, value)
+                )
+                if table == "mcu_versions":
+                    connection.execute("UPDATE sessions SET mcu_version = ? WHERE id = ?", (value, session_id))
+            self._written_rows[batch.owner] = self._written_rows.get(batch.owner, 0) + rows + len(batch.events)
+        if batch.end_ms is not None and session_id:
+            connection.execute("UPDATE sessions SET ended_at_ms = ? WHERE id = ?", (batch.end_ms, session_id))
+            self._session_ids[batch.owner] = 0
+
+
+class SessionDatabase:
+    """只读查询：WAL 模式下与写库线程并发读取互不阻塞。连接只能在创建它的线程中使用。"""
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, timeout=SESSION_RECORDER_BUSY_TIMEOUT_MS / 1000.0
+        )
+        self._connection.row_factory = sqlite3.Row
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def list_sessions(self, device: str = "") -> list[dict]:
+        """返回运行列表（由新到旧）；device 非空时只列该设备。"""
+        sql = "SELECT id, device, port, started_at_ms, ended_at_ms, mcu_version FROM sessions"
+        parameters: tuple = ()
+        if device:
+            sql += " WHERE device = ?"
+            parameters = (device,)
+        return [dict(row) for row in self._connection.execute(sql + " ORDER BY id DESC", parameters)]
+
+    def read_channel(
+        self,
+        session_id: int,
+        channel: str,
+        start_ms: float = -math.inf,
+        end_ms: float = math.inf,
+        max_points: int = 0,
+    ) -> tuple[list[float], list[float]]:
+        """按时间范围读取通道样本。
+
+        max_points > 0 且样本更多时按 max_points // 2 个时间桶聚合（max_points 小于 2 时按 2 计），
+        每桶输出最小值与最大值所在的样本（按时间先后，同一样本只输出一次），与图表的 min/max
+        降采样一致，长时间运行也能快速载入，返回点数不超过 max_points。
+        """
+        if channel not in SESSION_RECORDER_CHANNELS:
+            raise ValueError(f"unknown channel: {channel}")
+        table = _channel_table(channel)
+        where = "session_id = ? AND t_ms >= ? AND t_ms <= ?"
+        parameters = (session_id, start_ms, end_ms)
+        if max_points > 0:
+            first_ms, last_ms, count = self._connection.execute(
+                f"SELECT MIN(t_ms), MAX(t_ms), COUNT(*) FROM {table} WHERE {where}", parameters
+            ).fetchone()
+            if count > max_points and last_ms > first_ms:
+                bucket_count = max(1, max_points // 2)
+                # 末样本落在第 bucket_count 桶，并入最后一桶，保证桶数不超过 bucket_count
+                bucket = f"MIN(CAST((t_ms - ?) / ? AS INTEGER), {bucket_count - 1})"
+                bucket_parameters = (first_ms, (last_ms - first_ms) / bucket_count)
+                # 只含一个 MIN / MAX 聚合时，SQLite 的裸列 t_ms 取自极值所在行
+                minima = self._connection.execute(
+                    f"SELECT {bucket}, t_ms, MIN(value) FROM {table} WHERE {where} GROUP BY 1 ORDER BY 1",
+                    bucket_parameters + parameters,
+                ).fetchall()
+                maxima = self._connection.execute(
+                    f"SELECT {bucket}, t_ms, MAX(value) FROM {table} WHERE {where} GROUP BY 1 ORDER BY 1",
+                    bucket_parameters + parameters,
+                ).fetchall()
+                timestamps: list[float] = []
+                values: list[float] = []
+                for (_bucket, min_ms, minimum), (_bucket, max_ms, maximum) in zip(minima, maxima):
+                    if min_ms == max_ms:
+                        timestamps.append(min_ms)
+                        values.append(minimum)
+                    elif min_ms < max_ms:
+                        timestamps += (min_ms, max_ms)
+                        values += (minimum, maximum)
+                    else:
+                        timestamps += (max_ms, min_ms)
+                        values += (maximum, minimum)
+                return timestamps, values
+        rows = self._connection.execute(f"SELECT t_ms, value FROM {table} WHERE {where} ORDER BY t_ms", parameters)
+        timestamps = []
+        values = []
+        for timestamp_ms, value in rows:
+            timestamps.append(timestamp_ms)
+            values.append(value)
+        return timestamps, values
+
+    def read_events(self, session_id: int) -> dict[str, list[dict]]:
+        """读取一次运行的 MCU 版本、错误码与控制参数变化记录（按时间排序）。"""
+        events: dict[str, list[dict]] = {}
+        for table in EVENT_TABLES:
+            column = _EVENT_COLUMNS[table].split()[0]
+            rows = self._connection.execute(
+                f"SELECT t_ms, {column} FROM {table} WHERE session_id = ? ORDER BY t_ms", (session_id,)
+            )
+            if table == "control_params":
+                events[table] = [{"t_ms": t_ms, "params": json.loads(params)} for t_ms, params in rows]
+            else:
+                events[table] = [{"t_ms": t_ms, column: value} for t_ms, value in rows]
+        return events
+
+
+class SessionRecorder(QObject):
+    """单设备运行记录：GUI 线程缓冲并封批，交给共用的 SessionRecorderWriter 在后台写库。"""
+
+    statsChanged = Signal()
+
+    def __init__(self, writer: SessionRecorderWriter, device: str, parent=None) -> None:
+        super().__init__(parent)
+        self._path = writer.path
+        self._device = device
+        self._batch = _RecordBatch(device)
+        # 队列已满时暂存的批次（样本已丢弃，只剩运行起止与事件），下次封批时按序重试
+        self._backlog: deque[_RecordBatch] = deque()
+        self._recording = False
+        self._dropped_samples = 0
+        self._last_error_code: int | None = None
+        self._last_params_json = ""
+        self._stats: dict = {}
+        self._reader: SessionDatabase | None = None
+        self._writer = writer
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(SESSION_RECORDER_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._on_flush_timer)
+        self._flush_timer.start()
+
+    @Property("QVariantMap", notify=statsChanged)  # type: ignore
+    def stats(self) -> dict:
+        """QML 只读属性：数据库路径、当前运行 id、已写入行数、丢弃样本数、队列积压与最近错误。"""
+        return self._stats
+
+    def begin_run(self, port: str) -> None:
+        """串口连接建立：开始一次新的运行记录。"""
+        if self._recording:
+            self.end_run()
+        self._seal()
+        self._batch.begin = (time.time() * 1000.0, self._device, port)
+        self._recording = True
+        self._last_error_code = None
+        self._last_params_json = ""
+
+    def end_run(self) -> None:
+        """串口断开：结束当前运行记录并立即提交。"""
+        if not self._recording:
+            return
+        self._batch.end_ms = time.time() * 1000.0
+        self._recording = False
+        self._seal()
+
+    @Slot(str)
+    def onMcuVersionUpdated(self, version: str) -> None:
+        if self._recording:
+            self._batch.events.append(("mcu_versions", time.time() * 1000.0, version))
+
+    @Slot(int)
+    def onErrorCodeUpdated(self, code: int) -> None:
+        """错误码帧周期上报，只记录变化。"""
+        if self._recording and code != self._last_error_code:
+            self._last_error_code = code
+            self._batch.events.append(("error_codes", time.time() * 1000.0, code))
+
+    def record_control_params(self, params: dict) -> None:
+        """记录一组控制参数（与上一组相同时忽略）。"""
+        params_json = json.dumps(params, sort_keys=True)
+        if self._recording and params_json != self._last_params_json:
+            self._last_params_json = params_json
+            self._batch.events.append(("control_params", time.time() * 1000.0, params_json))
+
+    def append_sample(self, channel: int, timestamp_ms: float, value: float) -> None:
+        """TelemetryFanOut 记录端：channel 为 HISTORY_CHANNELS 下标；不在运行中时丢弃。"""
+        if self._recording:
+            self._batch.timestamps_ms[channel].append(timestamp_ms)
+            self._batch.values[channel].append(value)
+
+    def _seal(self) -> None:
+        """封存当前批次并非阻塞入队；队列满时丢弃样本，运行起止与事件留待下次重试。"""
+        batch = self._batch
+        if not batch.is_empty():
+            self._batch = _RecordBatch(self._device)
+            self._backlog.append(batch)
+        while self._backlog:
+            try:
+                self._writer.batches.put_nowait(self._backlog[0])
+            except queue.Full:
+                for pending in self._backlog:
+                    self._dropped_samples += pending.drop_samples()
+                return
+            self._backlog.popleft()
+
+    @Slot()
+    def _on_flush_timer(self) -> None:
+        self._seal()
+        self._publish_stats()
+
+    def _publish_stats(self) -> None:
+        writer = self._writer
+        stats = {
+            "path": self._path,
+            "sessionId": writer.session_id(self._device),
+            "recording": self._recording,
+            "writtenRows": writer.written_rows(self._device),
+            "droppedSamples": self._dropped_samples,
+            "queuedBatches": writer.batches.qsize() + len(self._backlog),
+            "lastCommitMs": round(writer.lastCommitMs, 2),
+            "lastError": writer.lastError,
+        }
+        if stats != self._stats:
+            self._stats = stats
+            self.statsChanged.emit()
+
+    def _database(self) -> SessionDatabase:
+        if self._reader is None:
+            self._reader = SessionDatabase(self._path)
+        return self._reader
+
+    @Slot(result=list)
+    def listSessions(self) -> list:
+        """返回本设备的历史运行列表（由新到旧）。"""
+        try:
+            return self._database().list_sessions(self._device)
+        except sqlite3.Error as exc:
+            print(f"[SessionRecorder] query failed: {exc}", flush=True)
+            return []
+
+    @Slot(int, str, float, float, int, result="QVariantMap")
+    def readChannel(self, session_id: int, channel: str, start_ms: float, end_ms: float, max_points: int) -> dict:
+        """按时间范围读取一次运行的通道样本；end_ms <= 0 表示不限，max_points > 0 时按 min/max 降采样。"""
+        try:
+            timestamps, values = self._database().read_channel(
+                session_id, channel, start_ms, end_ms if end_ms > 0 else math.inf, max_points
+            )
+        except (sqlite3.Error, ValueError) as exc:
+            print(f"[SessionRecorder] query failed: {exc}", flush=True)
+            return {"timestamps": [], "values": []}
+        return {"timestamps": timestamps, "values": values}
+
+    @Slot(int, result="QVariantMap")
+    def readEvents(self, session_id: int) -> dict:
+        """读取一次运行的 MCU 版本、错误码与控制参数变化记录。"""
+        try:
+            return self._database().read_events(session_id)
+        except sqlite3.Error as exc:
+            print(f"[SessionRecorder] query failed: {exc}", flush=True)
+            return {}
+
+    @Slot()
+    def stop(self) -> None:
+        """结束当前运行，把剩余批次交给写库线程（写库线程由创建方停止）。"""
+        self._flush_timer.stop()
+        self.end_run()
+        self._seal()
+        while self._backlog:
+            try:
+                self._writer.batches.put(self._backlog.popleft(), timeout=SESSION_RECORDER_STOP_TIMEOUT_S)
+            except queue.Full:
+                break
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        self._publish_stats()
@@ -0,0 +1,127 @@
+import time
+from array import array
+from typing import TextIO
+
+# 历史采样周期与容量：每秒一点，保留最近 4 小时，用于事后对照 CRC 突发与电机事件
+HISTORY_SAMPLE_INTERVAL_S = 1.0
+HISTORY_CAPACITY = 4 * 3600
+
+# 每点记录的速率类序列（取自统计快照）
+RATE_SERIES: tuple[str, ...] = (
+    "txBytesPerSec",
+    "rxBytesPerSec",
+    "txFramesPerSec",
+    "rxFramesPerSec",
+    "linkUtilization",
+)
+# 每点记录的增量类序列：由累计计数差分得到本采样周期内新增的次数
+DELTA_SERIES: tuple[str, ...] = (
+    "rxCrcErrors",
+    "rxInvalidFrames",
+)
+SERIES_NAMES: tuple[str, ...] = RATE_SERIES + DELTA_SERIES
+
+
+class StatisticsHistory:
+    """统计历史环形缓冲。
+
+    各序列预先分配为定长 array('d')，写入时覆盖最旧的点，内存占用与运行时长无关；
+    按命令字的帧数序列在命令首次出现时才分配。
+    """
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY) -> None:
+        self._capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._series = {name: array("d", bytes(8 * capacity)) for name in SERIES_NAMES}
+        self._cmd_series: dict[int, array] = {}
+        self._write_index = 0
+        self._count = 0
+        # 上一采样点的累计值，用于计算增量；统计复位后累计值变小时从 0 开始差分
+        self._last_totals = {name: 0 for name in DELTA_SERIES}
+        self._last_cmd_totals = [0] * 256
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """返回最多保留的采样点数。"""
+        return self._capacity
+
+    def clear(self) -> None:
+        """清空全部历史。
+
+        保留上一采样点的累计值：服务侧计数并未复位，清零会把整个会话的累计量当作下一秒的增量记入。
+        """
+        self._cmd_series.clear()
+        self._write_index = 0
+        self._count = 0
+
+    def append(
+        self,
+        timestamp_s: float,
+        rates: dict,
+        totals: dict[str, int],
+        cmd_totals: list[int],
+    ) -> None:
+        """写入一个采样点。
+
+        rates 为统计快照（读取 RATE_SERIES 字段）；totals 为 DELTA_SERIES 对应的累计计数；
+        cmd_totals 为按命令字索引的累计帧数。
+        """
+        index = self._write_index
+        self._timestamps[index] = timestamp_s
+        for name in RATE_SERIES:
+            self._series[name][index] = rates[name]
+        for name in DELTA_SERIES:
+            total = totals[name]
+            last = self._last_totals[name]
+            self._series[name][index] = total - last if total >= last else total
+            self._last_totals[name] = total
+
+        for cmd, total in enumerate(cmd_totals):
+            last = self._last_cmd_totals[cmd]
+            if total == last:
+                if cmd in self._cmd_series:
+                    self._cmd_series[cmd][index] = 0
+                continue
+            self._last_cmd_totals[cmd] = total
+            series = self._cmd_series.get(cmd)
+            if series is None:
+                series = self._cmd_series[cmd] = array("I", bytes(4 * self._capacity))
+            series[index] = total - last if total >= last else total
+
+        self._write_index = (index + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def _ordered_indices(self, last_n: int | None = None) -> range | list[int]:
+        """返回按时间先后排列的环形缓冲下标。"""
+        count = self._count if last_n is None else min(last_n, self._count)
+        start = (self._write_index - count) % self._capacity
+        if start + count <= self._capacity:
+            return range(start, start + count)
+        return list(range(start, self._capacity)) + list(range(0, start + count - self._capacity))
+
+    def series(self, name: str, last_n: int | None = None) -> list[float]:
+        """返回指定序列最近 last_n 个点（时间升序），供 QML 火花线使用。"""
+        values = self._series[name]
+        return [values[i] for i in self._ordered_indices(last_n)]
+
+    def write_csv(self, stream: TextIO) -> int:
+        """以 CSV 写出全部历史，返回写出的行数（不含表头）。"""
+        cmds = sorted(self._cmd_series)
+        header = ["timestamp", "time"] + list(SERIES_NAMES) + [f"cmd_0x{cmd:02X}" for cmd in cmds]
+        stream.write(",".join(header) + "\n")
+        rows = 0
+        for i in self._ordered_indices():
+            timestamp_s = self._timestamps[i]
+            fields = [
+                f"{timestamp_s:.3f}",
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp_s)),
+            ]
+            fields.extend(f"{self._series[name][i]:g}" for name in SERIES_NAMES)
+            fields.extend(str(self._cmd_series[cmd][i]) for cmd in cmds)
+            stream.write(",".join(fields) + "\n")
+            rows += 1
+        return rows
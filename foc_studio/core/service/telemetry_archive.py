@@ -0,0 +1,493 @@
+"""TelemetryArchive - 遥测与 MCU 日志的滚动归档（后台线程写盘）。
+
+GUI 线程只把样本追加到各通道的列缓冲（array），每秒或缓冲满 ARCHIVE_BLOCK_SAMPLES
+条时封成一个块，放入有界队列（put_nowait，不等待）；写盘线程取出后压缩写入文件。
+队列满说明磁盘跟不上，该块整体丢弃并计入 droppedSamples，GUI 线程从不阻塞在磁盘上。
+
+文件格式（小端）：
+
+  文件头   FILE_MAGIC, 版本 u16, 创建时刻 f64(Unix 秒), 通道数 u8, 各通道名(u8 长度 + ASCII)
+  数据块   BLOCK_MAGIC, 类型 u8, 通道 u8, 条数 u32, 首/末时间戳 f64(ms), 载荷长度 u32, CRC32 u32,
+           载荷（zlib 压缩的列数据）
+             遥测   f32[n] 相对首时间戳的偏移(ms) + f32[n] 数值
+             日志   f32[n] 偏移(ms) + u8[n] 级别 + u16[n] 文本字节数 + UTF-8 文本拼接
+  索引     INDEX_MAGIC, 块数 u32, 每块 (类型, 通道, 条数, 首/末时间戳, 文件偏移 u64)
+  文件尾   索引偏移 u64 + FOOTER_MAGIC
+
+文件按大小或时长滚动，关闭时写入索引；异常退出留下的文件没有索引，
+read_index 会退回顺序扫描块头。目录内只保留最近 ARCHIVE_MAX_FILES 个文件。
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Iterator, NamedTuple
+
+from PySide6.QtCore import Property, QObject, QTimer, Signal, Slot
+
+from core.service.telemetry_history import HISTORY_CHANNELS
+
+ARCHIVE_CHANNELS: tuple[str, ...] = HISTORY_CHANNELS
+ARCHIVE_FILE_SUFFIX = ".fca"
+ARCHIVE_FLUSH_INTERVAL_MS = 1000
+ARCHIVE_BLOCK_SAMPLES = 8192
+# 有界队列：按每秒每通道一个块计约 30 秒的积压
+ARCHIVE_QUEUE_BLOCKS = 256
+ARCHIVE_MAX_FILE_BYTES = 64 * 1024 * 1024
+ARCHIVE_MAX_FILE_AGE_S = 3600.0
+ARCHIVE_MAX_FILES = 48
+ARCHIVE_COMPRESS_LEVEL = 1
+ARCHIVE_STOP_TIMEOUT_S = 2.0
+
+BLOCK_KIND_TELEMETRY = 1
+BLOCK_KIND_LOG = 2
+# 日志块的通道号固定为 0xFF
+LOG_CHANNEL = 0xFF
+
+FILE_MAGIC = b"FOCARC01"
+FILE_VERSION = 1
+BLOCK_MAGIC = b"BLK1"
+INDEX_MAGIC = b"IDX1"
+FOOTER_MAGIC = b"FOCIDX01"
+_FILE_HEADER = struct.Struct("<8sHdB")
+_BLOCK_HEADER = struct.Struct("<4sBBIddII")
+_INDEX_HEADER = struct.Struct("<4sI")
+_INDEX_ENTRY = struct.Struct("<BBIddQ")
+_FOOTER = struct.Struct("<Q8s")
+
+
+class ArchiveIndexEntry(NamedTuple):
+    kind: int
+    channel: int
+    count: int
+    first_ms: float
+    last_ms: float
+    offset: int
+
+
+class ArchiveBlock(NamedTuple):
+    """解码后的数据块；遥测块 levels/messages 为空，日志块 values 为空。"""
+
+    kind: int
+    channel: str
+    timestamps_ms: list[float]
+    values: list[float]
+    levels: list[int]
+    messages: list[str]
+
+
+class _PendingBlock(NamedTuple):
+    """GUI 线程封好的块，交给写盘线程编码。"""
+
+    kind: int
+    channel: int
+    timestamps_ms: array
+    values: array | None
+    levels: array | None
+    messages: list[str] | None
+
+
+def _encode_payload(block: _PendingBlock) -> bytes:
+    first_ms = block.timestamps_ms[0]
+    offsets = array("f", [timestamp_ms - first_ms for timestamp_ms in block.timestamps_ms])
+    if block.kind == BLOCK_KIND_TELEMETRY:
+        payload = offsets.tobytes() + array("f", block.values).tobytes()
+    else:
+        encoded = [message.encode("utf-8")[:0xFFFF] for message in block.messages]
+        lengths = array("H", [len(text) for text in encoded])
+        payload = offsets.tobytes() + block.levels.tobytes() + lengths.tobytes() + b"".join(encoded)
+    return zlib.compress(payload, ARCHIVE_COMPRESS_LEVEL)
+
+
+def _decode_payload(kind: int, count: int, first_ms: float, payload: bytes) -> tuple:
+    data = zlib.decompress(payload)
+    offsets = array("f")
+    offsets.frombytes(data[:4 * count])
+    timestamps = [first_ms + offset for offset in offsets]
+    position = 4 * count
+    if kind == BLOCK_KIND_TELEMETRY:
+        values = array("f")
+        values.frombytes(data[position:position + 4 * count])
+        return timestamps, values.tolist(), [], []
+    levels = array("B")
+    levels.frombytes(data[position:position + count])
+    position += count
+    lengths = array("H")
+    lengths.frombytes(data[position:position + 2 * count])
+    position += 2 * count
+    messages = []
+    for length in lengths:
+        messages.append(data[position:position + length].decode("utf-8", errors="replace"))
+        position += length
+    return timestamps, [], levels.tolist(), messages
+
+
+def _read_file_header(handle) -> tuple[str, ...]:
+    magic, _version, _created_s, channel_count = _FILE_HEADER.unpack(handle.read(_FILE_HEADER.size))
+    if magic != FILE_MAGIC:
+        raise ValueError("not a telemetry archive")
+    names = []
+    for _ in range(channel_count):
+        length = handle.read(1)[0]
+        names.append(handle.read(length).decode("ascii"))
+    return tuple(names)
+
+
+def read_index(path: str) -> list[ArchiveIndexEntry]:
+    """读取文件尾部索引；文件未正常关闭（无索引）时顺序扫描块头重建。"""
+    with open(path, "rb") as handle:
+        _read_file_header(handle)
+        data_start = handle.tell()
+        handle.seek(0, os.SEEK_END)
+        file_size = handle.tell()
+        if file_size - data_start >= _FOOTER.size:
+            handle.seek(file_size - _FOOTER.size)
+            index_offset, footer_magic = _FOOTER.unpack(handle.read(_FOOTER.size))
+            if footer_magic == FOOTER_MAGIC:
+                handle.seek(index_offset)
+                index_magic, entry_count = _INDEX_HEADER.unpack(handle.read(_INDEX_HEADER.size))
+                if index_magic == INDEX_MAGIC:
+                    return [
+                        ArchiveIndexEntry(*_INDEX_ENTRY.unpack(handle.read(_INDEX_ENTRY.size)))
+                        for _ in range(entry_count)
+                    ]
+        entries = []
+        handle.seek(data_start)
+        while True:
+            offset = handle.tell()
+            header = handle.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                break
+            magic, kind, channel, count, first_ms, last_ms, payload_length, _crc = _BLOCK_HEADER.unpack(header)
+            if magic != BLOCK_MAGIC or offset + _BLOCK_HEADER.size + payload_length > file_size:
+                # 索引区或写到一半的尾块
+                break
+            entries.append(ArchiveIndexEntry(kind, channel, count, first_ms, last_ms, offset))
+            handle.seek(payload_length, os.SEEK_CUR)
+        return entries
+
+
+def read_archive(
+    path: str,
+    start_ms: float = float("-inf"),
+    end_ms: float = float("inf"),
+    kind: int | None = None,
+) -> Iterator[ArchiveBlock]:
+    """按索引读取与 [start_ms, end_ms] 有交集的数据块，kind 非空时只读该类型（CRC 不符的块跳过）。"""
+    entries = read_index(path)
+    with open(path, "rb") as handle:
+        channel_names = _read_file_header(handle)
+        for entry in entries:
+            if entry.last_ms < start_ms or entry.first_ms > end_ms:
+                continue
+            if kind is not None and entry.kind != kind:
+                continue
+            handle.seek(entry.offset)
+            _magic, block_kind, channel, count, first_ms, _last_ms, payload_length, crc = _BLOCK_HEADER.unpack(
+                handle.read(_BLOCK_HEADER.size)
+            )
+            payload = handle.read(payload_length)
+            if zlib.crc32(payload) != crc:
+                continue
+            timestamps, values, levels, messages = _decode_payload(block_kind, count, first_ms, payload)
+            name = "log" if channel == LOG_CHANNEL else channel_names[channel]
+            yield ArchiveBlock(block_kind, name, timestamps, values, levels, messages)
+
+
+class ArchiveWriter:
+    """归档写盘线程：从有界队列取块，编码压缩后写入滚动文件。
+
+    计数器只由写盘线程修改，GUI 线程读取整数快照，无需加锁。
+    """
+
+    def __init__(self, directory: str, channel_names: tuple[str, ...] = ARCHIVE_CHANNELS) -> None:
+        self._directory = directory
+        self._channel_names = channel_names
+        self.blocks: queue.Queue = queue.Queue(maxsize=ARCHIVE_QUEUE_BLOCKS)
+        self._thread: threading.Thread | None = None
+        self._handle = None
+        self._file_opened_at = 0.0
+        self._index: list[ArchiveIndexEntry] = []
+        self.currentPath = ""
+        self.writtenSamples = 0
+        self.writtenBytes = 0
+        self.fileCount = 0
+        self.lastError = ""
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="foc-archive-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """写完队列中剩余的块并关闭文件；超时后放弃（daemon 线程随进程退出）。"""
+        if self._thread is None:
+            return
+        try:
+            self.blocks.put(None, timeout=ARCHIVE_STOP_TIMEOUT_S)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=ARCHIVE_STOP_TIMEOUT_S)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            block = self.blocks.get()
+            if block is None:
+                break
+            try:
+                self._write_block(block)
+            except OSError as exc:
+                # 磁盘写满、目录被删等：记录错误并关闭当前文件，下一块重新打开
+                self.lastError = str(exc)
+                print(f"[ArchiveWriter] write failed: {exc}", flush=True)
+                self._close_file(write_index=False)
+        try:
+            self._close_file(write_index=True)
+        except OSError as exc:
+            self.lastError = str(exc)
+
+    def _write_block(self, block: _PendingBlock) -> None:
+        if self._handle is not None and (
+            self._handle.tell() >= ARCHIVE_MAX_FILE_BYTES
+            or time.time() - self._file_opened_at >= ARCHIVE_MAX_FILE_AGE_S
+        ):
+            self._close_file(write_index=True)
+        if self._handle is None:
+            self._open_file()
+        payload = _encode_payload(block)
+        count = len(block.timestamps_ms)
+        first_ms = block.timestamps_ms[0]
+        last_ms = block.timestamps_ms[-1]
+        offset = self._handle.tell()
+        self._handle.write(_BLOCK_HEADER.pack(
+            BLOCK_MAGIC, block.kind, block.channel, count, first_ms, last_ms, len(payload), zlib.crc32(payload)
+        ))
+        self._handle.write(payload)
+        self._index.append(ArchiveIndexEntry(block.kind, block.channel, count, first_ms, last_ms, offset))
+        self.writtenSamples += count
+        self.writtenBytes += _BLOCK_HEADER.size + len(payload)
+
+    def _open_file(self) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        self._file_opened_at = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._file_opened_at))
+        stamp += "%03d" % (int(self._file_opened_at * 1000.0) % 1000)
+        path = os.path.join(self._directory, f"foc-{stamp}{ARCHIVE_FILE_SUFFIX}")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self._directory, f"foc-{stamp}-{suffix}{ARCHIVE_FILE_SUFFIX}")
+            suffix += 1
+        self._handle = open(path, "wb")
+        header = bytearray(_FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, self._file_opened_at, len(self._channel_names)))
+        for name in self._channel_names:
+            encoded = name.encode("ascii")
+            header += bytes((len(encoded),)) + encoded
+        self._handle.write(header)
+        self._index = []
+        self.currentPath = path
+        self.fileCount += 1
+        self._prune_old_files()
+
+    def _close_file(self, write_index: bool) -> None:
+        handle = self._handle
+        if handle is None:
+            return
+        self._handle = None
+        try:
+            if write_index:
+                index_offset = handle.tell()
+                handle.write(_INDEX_HEADER.pack(INDEX_MAGIC, len(self._index)))
+                handle.write(b"".join(_INDEX_ENTRY.pack(*entry) for entry in self._index))
+                handle.write(_FOOTER.pack(index_offset, FOOTER_MAGIC))
+        finally:
+            handle.close()
+            self._index = []
+
+    def _prune_old_files(self) -> None:
+        """只保留最近 ARCHIVE_MAX_FILES 个归档文件（按修改时间，同一秒内滚动的文件名不可排序）。"""
+        paths = [
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory)
+            if name.endswith(ARCHIVE_FILE_SUFFIX)
+        ]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - ARCHIVE_MAX_FILES)]:
+            if path == self.currentPath:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class _ColumnBuffer:
+    """单通道待封块的列缓冲。"""
+
+    __slots__ = ("timestamps_ms", "values")
+
+    def __init__(self) -> None:
+        self.timestamps_ms = array("d")
+        self.values = array("d")
+
+
+class TelemetryArchive(QObject):
+    """单设备归档：GUI 线程按通道缓冲样本并封块，ArchiveWriter 在后台写盘。"""
+
+    statsChanged = Signal()
+
+    def __init__(self, directory: str, parent=None) -> None:
+        super().__init__(parent)
+        self._directory = directory
+        self._columns = [_ColumnBuffer() for _ in ARCHIVE_CHANNELS]
+        self._log_timestamps_ms = array("d")
+        self._log_levels = array("B")
+        self._log_messages: list[str] = []
+        self._dropped_samples = 0
+        self._stats: dict = {}
+        self._writer = ArchiveWriter(directory)
+        self._writer.start()
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(ARCHIVE_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._on_flush_timer)
+        self._flush_timer.start()
+
+    @Property("QVariantMap", notify=statsChanged)  # type: ignore
+    def stats(self) -> dict:
+        """QML 只读属性：归档目录、当前文件、已写入/丢弃样本数、队列积压与最近错误。"""
+        return self._stats
+
+    @Slot(int, str)
+    def onLogMessageReceived(self, level: int, message: str) -> None:
+        self._log_timestamps_ms.append(time.time() * 1000.0)
+        self._log_levels.append(level)
+        self._log_messages.append(message)
+        if len(self._log_messages) >= ARCHIVE_BLOCK_SAMPLES:
+            self._seal_logs()
+
+    def append_sample(self, channel: int, timestamp_ms: float, value: float) -> None:
+        """TelemetryFanOut 记录端：channel 为 ARCHIVE_CHANNELS（即 HISTORY_CHANNELS）下标。"""
+        column = self._columns[channel]
+        column.timestamps_ms.append(timestamp_ms)
+        column.values.append(value)
+        if len(column.timestamps_ms) >= ARCHIVE_BLOCK_SAMPLES:
+            self._seal_column(channel)
+
+    def _submit(self, block: _PendingBlock) -> None:
+        """非阻塞入队；队列满时整块丢弃并计数。"""
+        try:
+            self._writer.blocks.put_nowait(block)
+        except queue.Full:
+            self._dropped_samples += len(block.timestamps_ms)
+
+    def _seal_column(self, channel: int) -> None:
+        column = self._columns[channel]
+        if not column.timestamps_ms:
+            return
+        self._columns[channel] = _ColumnBuffer()
+        self._submit(_PendingBlock(BLOCK_KIND_TELEMETRY, channel, column.timestamps_ms, column.values, None, None))
+
+    def _seal_logs(self) -> None:
+        if not self._log_messages:
+            return
+        block = _PendingBlock(
+            BLOCK_KIND_LOG, LOG_CHANNEL, self._log_timestamps_ms, None, self._log_levels, self._log_messages
+        )
+        self._log_timestamps_ms = array("d")
+        self._log_levels = array("B")
+        self._log_messages = []
+        self._submit(block)
+
+    def _seal_all(self) -> None:
+        for channel in range(len(self._columns)):
+            self._seal_column(channel)
+        self._seal_logs()
+
+    @Slot()
+    def _on_flush_timer(self) -> None:
+        self._seal_all()
+        self._publish_stats()
+
+    def _publish_stats(self) -> None:
+        writer = self._writer
+        stats = {
+            "directory": self._directory,
+            "currentFile": writer.currentPath,
+            "fileCount": writer.fileCount,
+            "writtenSamples": writer.writtenSamples,
+            "writtenBytes": writer.writtenBytes,
+            "droppedSamples": self._dropped_samples,
+            "queuedBlocks": writer.blocks.qsize(),
+            "lastError": writer.lastError,
+        }
+        if stats != self._stats:
+            self._stats = stats
+            self.statsChanged.emit()
+
+    @Slot()
+    def stop(self) -> None:
+        """封存剩余样本，等待写盘线程写完并关闭文件。"""
+        self._flush_timer.stop()
+        self._seal_all()
+        self._writer.stop()
+        self._publish_stats()
+
+
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    print("=== telemetry_archive 自测 ===\n")
+    directory = tempfile.mkdtemp(prefix="foc-archive-")
+    try:
+        print("[1] 写入遥测块 + 日志块 + 遥测块")
+        writer = ArchiveWriter(directory)
+        writer.start()
+        writer.blocks.put(_PendingBlock(
+            BLOCK_KIND_TELEMETRY, 0, array("d", [1000.0, 1001.0, 1002.0]), array("d", [1.5, 2.5, 3.5]), None, None
+        ))
+        writer.blocks.put(_PendingBlock(
+            BLOCK_KIND_LOG, LOG_CHANNEL, array("d", [1000.5, 1001.5]), None, array("B", [1, 3]), ["boot", "过流保护"]
+        ))
+        writer.blocks.put(_PendingBlock(
+            BLOCK_KIND_TELEMETRY, 2, array("d", [1003.0, 1004.0]), array("d", [-0.25, 0.75]), None, None
+        ))
+        writer.stop()
+        path = writer.currentPath
+        assert writer.lastError == "", writer.lastError
+        assert writer.writtenSamples == 7, writer.writtenSamples
+        print(f"    {os.path.basename(path)}: {writer.writtenSamples} 样本 / {writer.writtenBytes} 字节\n")
+
+        print("[2] 不带 kind 过滤读回全部块")
+        blocks = list(read_archive(path))
+        assert [block.kind for block in blocks] == [BLOCK_KIND_TELEMETRY, BLOCK_KIND_LOG, BLOCK_KIND_TELEMETRY]
+        assert blocks[0].channel == ARCHIVE_CHANNELS[0] and blocks[2].channel == ARCHIVE_CHANNELS[2]
+        assert blocks[0].timestamps_ms == [1000.0, 1001.0, 1002.0] and blocks[0].values == [1.5, 2.5, 3.5]
+        assert blocks[1].channel == "log" and blocks[1].levels == [1, 3]
+        assert blocks[1].messages == ["boot", "过流保护"] and blocks[1].values == []
+        assert blocks[2].values == [-0.25, 0.75]
+        print(f"    {len(blocks)} 块，类型与数据一致\n")
+
+        print("[3] kind / 时间窗过滤")
+        assert [block.kind for block in read_archive(path, kind=BLOCK_KIND_LOG)] == [BLOCK_KIND_LOG]
+        assert len(list(read_archive(path, kind=BLOCK_KIND_TELEMETRY))) == 2
+        assert [block.channel for block in read_archive(path, start_ms=1002.5)] == [ARCHIVE_CHANNELS[2]]
+        print("    过滤结果正确\n")
+
+        print("[4] 截掉尾部索引后顺序扫描")
+        with open(path, "rb") as handle:
+            data = handle.read()
+        index_offset, _magic = _FOOTER.unpack(data[-_FOOTER.size:])
+        with open(path, "wb") as handle:
+            handle.write(data[:index_offset])
+        assert [block.kind for block in read_archive(path)] == [block.kind for block in blocks]
+        print("    扫描重建索引后读回一致\n")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print("所有自测通过。")
@@ -0,0 +1,72 @@
+"""TelemetryFanOut - 分发层遥测信号到各记录端的扇出。
+
+长时间历史、磁盘归档、运行记录都按 HISTORY_CHANNELS 的通道顺序记录同样六路遥测。
+本对象只连接一次 FrameDispatcher 的遥测信号：dq 帧拆成 iq / id 两路，不带时间戳的
+温度帧补上到达时刻（PC 墙钟，与其他通道同一时间基准），再以
+(通道下标, 时间戳毫秒, 数值) 依次调用登记的记录端。
+
+记录端是普通可调用对象，在 GUI 线程同步执行，每样本只多一次 Python 调用。
+"""
+
+import time
+from typing import Callable
+
+from PySide6.QtCore import QObject, Slot
+
+from core.service.telemetry_history import HISTORY_CHANNELS
+
+# 各遥测通道在 HISTORY_CHANNELS 中的下标，记录端以此索引各自的列缓冲
+CHANNEL_SPEED = HISTORY_CHANNELS.index("speed")
+CHANNEL_CURRENT = HISTORY_CHANNELS.index("current")
+CHANNEL_IQ = HISTORY_CHANNELS.index("iq")
+CHANNEL_ID = HISTORY_CHANNELS.index("id")
+CHANNEL_MOTOR_TEMP = HISTORY_CHANNELS.index("motor_temp")
+CHANNEL_MOS_TEMP = HISTORY_CHANNELS.index("mos_temp")
+
+# 记录端签名：(通道下标, 时间戳毫秒, 数值)
+TelemetrySink = Callable[[int, float, float], None]
+
+
+class TelemetryFanOut(QObject):
+    """把 FrameDispatcher 的六路遥测信号按通道下标分发给各记录端。"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._sinks: list[TelemetrySink] = []
+
+    def connect_dispatcher(self, dispatcher) -> None:
+        """连接分发层的遥测信号（每个分发器只需调用一次）。"""
+        dispatcher.speedUpdated.connect(self.onSpeedUpdated)
+        dispatcher.motorCurrentUpdated.connect(self.onMotorCurrentUpdated)
+        dispatcher.dqComponentsUpdated.connect(self.onDqComponentsUpdated)
+        dispatcher.motorTempUpdated.connect(self.onMotorTempUpdated)
+        dispatcher.mosTempUpdated.connect(self.onMosTempUpdated)
+
+    def add_sink(self, sink: TelemetrySink) -> None:
+        """登记一个记录端，此后的样本都会交给它。"""
+        self._sinks.append(sink)
+
+    def _emit(self, channel: int, timestamp_ms: float, value: float) -> None:
+        for sink in self._sinks:
+            sink(channel, timestamp_ms, value)
+
+    @Slot(int, float)
+    def onSpeedUpdated(self, rpm: int, timestamp_ms: float) -> None:
+        self._emit(CHANNEL_SPEED, timestamp_ms, float(rpm))
+
+    @Slot(float, float)
+    def onMotorCurrentUpdated(self, amps: float, timestamp_ms: float) -> None:
+        self._emit(CHANNEL_CURRENT, timestamp_ms, amps)
+
+    @Slot(float, float, float, float, float)
+    def onDqComponentsUpdated(self, iq: float, id_: float, _uq: float, _ud: float, timestamp_ms: float) -> None:
+        self._emit(CHANNEL_IQ, timestamp_ms, iq)
+        self._emit(CHANNEL_ID, timestamp_ms, id_)
+
+    @Slot(float)
+    def onMotorTempUpdated(self, celsius: float) -> None:
+        self._emit(CHANNEL_MOTOR_TEMP, time.time() * 1000.0, celsius)
+
+    @Slot(float)
+    def onMosTempUpdated(self, celsius: float) -> None:
+        self._emit(CHANNEL_MOS_TEMP, time.time() * 1000.0, celsius)
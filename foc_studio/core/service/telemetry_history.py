@@ -0,0 +1,417 @@
+"""TelemetryHistory - 长时间遥测历史的多分辨率金字塔。
+
+图表页只保留 timeWindowMs 的实时窗口；温升、漂移排查需要回看数小时数据，
+因此每个通道按分层方式保存：
+
+  raw      最近的原始样本环（定长）
+  level N  按绝对时间对齐的聚合桶环，每桶保存首样本时刻与 min / max / sum / count，
+           桶宽逐级放大（默认 10 ms → 100 ms → 1 s → 10 s），容量定长
+
+写入时原始样本只累加到第 0 级的当前桶，某级桶关闭时再折叠进下一级，
+每个样本摊还 O(1)。查询 [start, end] 时按 (end - start) / 像素列数 选出
+不丢分辨率的最粗一层（覆盖不到起点则退到更粗的层），再按像素列折叠，
+Python 层循环次数与像素列数成正比，与时间跨度、遥测速率无关。
+
+内存上限由 HistoryConfig 决定（原始环容量 + 各级环容量），与运行时长无关；
+可通过环境变量 FOC_STUDIO_HISTORY_MB 按预算整体缩放各层容量。
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from typing import NamedTuple
+
+from PySide6.QtCore import Property, QObject, Signal, Slot
+
+HISTORY_CHANNELS: tuple[str, ...] = ("speed", "current", "iq", "id", "motor_temp", "mos_temp")
+HISTORY_MEMORY_ENV = "FOC_STUDIO_HISTORY_MB"
+# 原始样本每条 2 个 double，聚合桶每条 6 个 double（起始时刻、首样本时刻、min、max、sum、count）
+_RAW_SAMPLE_BYTES = 16
+_BUCKET_BYTES = 48
+
+
+class HistoryConfig(NamedTuple):
+    """单通道的分层容量配置；level_bucket_ms 须逐级整除。"""
+
+    raw_capacity: int = 32768
+    level_bucket_ms: tuple[float, ...] = (10.0, 100.0, 1000.0, 10000.0)
+    level_capacity: int = 8192
+
+    @property
+    def channel_bytes(self) -> int:
+        """单通道占用的数组字节数。"""
+        return self.raw_capacity * _RAW_SAMPLE_BYTES + len(self.level_bucket_ms) * self.level_capacity * _BUCKET_BYTES
+
+    def scaled_to(self, total_bytes: int, channel_count: int) -> "HistoryConfig":
+        """按总内存预算等比例缩放原始环与各级环容量（每层至少保留 1024 条）。"""
+        ratio = total_bytes / (self.channel_bytes * channel_count)
+        return self._replace(
+            raw_capacity=max(1024, int(self.raw_capacity * ratio)),
+            level_capacity=max(1024, int(self.level_capacity * ratio)),
+        )
+
+    @classmethod
+    def from_env(cls, environ, channel_count: int) -> "HistoryConfig":
+        """读取 FOC_STUDIO_HISTORY_MB（全部通道合计的 MB 数）；未设置或非法时使用默认容量。"""
+        config = cls()
+        budget_text = environ.get(HISTORY_MEMORY_ENV, "").strip()
+        if not budget_text:
+            return config
+        try:
+            budget_mb = float(budget_text)
+        except ValueError:
+            print(f"[TelemetryHistory] invalid {HISTORY_MEMORY_ENV}: {budget_text}", flush=True)
+            return config
+        if budget_mb <= 0:
+            return config
+        return config.scaled_to(int(budget_mb * 1024 * 1024), channel_count)
+
+
+def _ring_slice(values: array, capacity: int, start: int, stop: int) -> array:
+    """返回环中序号区间 [start, stop) 的连续副本（跨越环尾时拼接两段）。"""
+    begin = start % capacity
+    end = begin + (stop - start)
+    if end <= capacity:
+        return values[begin:end]
+    return values[begin:] + values[:end - capacity]
+
+
+class _RawTier:
+    """最近原始样本环：序号单调递增，序号对容量取模即为数组下标。"""
+
+    __slots__ = ("capacity", "timestamps", "values", "total")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.total = 0
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.total - self.capacity)
+
+    def append(self, timestamp_ms: float, value: float) -> None:
+        index = self.total % self.capacity
+        self.timestamps[index] = timestamp_ms
+        self.values[index] = value
+        self.total += 1
+
+    def first_timestamp_ms(self) -> float:
+        return self.timestamps[self.oldest % self.capacity] if self.total else math.inf
+
+    def seq_at_or_after(self, timestamp_ms: float) -> int:
+        """返回首个时间戳不早于 timestamp_ms 的样本序号（二分查找）。"""
+        capacity = self.capacity
+        timestamps = self.timestamps
+        return bisect_left(
+            range(self.oldest, self.total), timestamp_ms, key=lambda seq: timestamps[seq % capacity]
+        ) + self.oldest
+
+
+class _LevelTier:
+    """聚合桶环：已关闭的桶写入环，当前桶的累加值保存在 open_* 字段。
+
+    starts 为按桶宽对齐的起始时刻（定位与折叠用），firsts 为桶内首个真实样本的时刻（报告保留范围用）。
+    """
+
+    __slots__ = (
+        "bucket_ms", "capacity", "starts", "firsts", "mins", "maxs", "sums", "counts", "total",
+        "open_start", "open_first", "open_min", "open_max", "open_sum", "open_count",
+    )
+
+    def __init__(self, bucket_ms: float, capacity: int) -> None:
+        self.bucket_ms = bucket_ms
+        self.capacity = capacity
+        self.starts = array("d", bytes(8 * capacity))
+        self.firsts = array("d", bytes(8 * capacity))
+        self.mins = array("d", bytes(8 * capacity))
+        self.maxs = array("d", bytes(8 * capacity))
+        self.sums = array("d", bytes(8 * capacity))
+        self.counts = array("d", bytes(8 * capacity))
+        self.total = 0
+        self._reset_open(math.nan)
+
+    def _reset_open(self, start_ms: float) -> None:
+        self.open_start = start_ms
+        self.open_first = start_ms
+        self.open_min = math.inf
+        self.open_max = -math.inf
+        self.open_sum = 0.0
+        self.open_count = 0.0
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.total - self.capacity)
+
+    def first_timestamp_ms(self) -> float:
+        if self.total:
+            return self.starts[self.oldest % self.capacity]
+        return self.open_start if self.open_count else math.inf
+
+    def first_sample_ms(self) -> float:
+        """保留的最早真实样本时刻（桶起始时刻按桶宽向下取整，可能早于实际样本）。"""
+        if self.total:
+            return self.firsts[self.oldest % self.capacity]
+        return self.open_first if self.open_count else math.inf
+
+    def bucket_start(self, timestamp_ms: float) -> float:
+        return math.floor(timestamp_ms / self.bucket_ms) * self.bucket_ms
+
+    def close_open(self) -> tuple[float, float, float, float, float, float]:
+        """把当前桶写入环并返回 (起始时刻, 首样本时刻, min, max, sum, count)，供下一级折叠。"""
+        closed = (self.open_start, self.open_first, self.open_min, self.open_max, self.open_sum, self.open_count)
+        index = self.total % self.capacity
+        (self.starts[index], self.firsts[index], self.mins[index], self.maxs[index], self.sums[index],
+         self.counts[index]) = closed
+        self.total += 1
+        return closed
+
+    def seq_at_or_after(self, timestamp_ms: float) -> int:
+        """返回首个起始时刻不早于 timestamp_ms 的桶序号（二分查找）。"""
+        capacity = self.capacity
+        starts = self.starts
+        return bisect_left(
+            range(self.oldest, self.total), timestamp_ms, key=lambda seq: starts[seq % capacity]
+        ) + self.oldest
+
+
+class HistoryPyramid:
+    """单通道多分辨率历史：原始环 + 逐级加粗的 min/max/mean 聚合环。"""
+
+    def __init__(self, config: HistoryConfig) -> None:
+        previous_ms = 0.0
+        for bucket_ms in config.level_bucket_ms:
+            if bucket_ms <= previous_ms or (previous_ms and bucket_ms % previous_ms):
+                raise ValueError(f"level bucket widths must increase and divide evenly: {config.level_bucket_ms}")
+            previous_ms = bucket_ms
+        self._config = config
+        self._raw = _RawTier(config.raw_capacity)
+        self._levels = [_LevelTier(bucket_ms, config.level_capacity) for bucket_ms in config.level_bucket_ms]
+
+    @property
+    def config(self) -> HistoryConfig:
+        return self._config
+
+    @property
+    def sample_count(self) -> int:
+        """累计写入的原始样本数（含已被覆盖的样本）。"""
+        return self._raw.total
+
+    def clear(self) -> None:
+        self._raw = _RawTier(self._config.raw_capacity)
+        self._levels = [_LevelTier(bucket_ms, self._config.level_capacity) for bucket_ms in self._config.level_bucket_ms]
+
+    def append(self, timestamp_ms: float, value: float) -> None:
+        """写入一个样本；时间戳须单调不减（早于当前桶的样本并入当前桶）。"""
+        self._raw.append(timestamp_ms, value)
+        level = self._levels[0] if self._levels else None
+        if level is None:
+            return
+        if not level.open_count:
+            level.open_start = level.bucket_start(timestamp_ms)
+            level.open_first = timestamp_ms
+        elif timestamp_ms >= level.open_start + level.bucket_ms:
+            self._cascade(0, level.close_open())
+            level._reset_open(level.bucket_start(timestamp_ms))
+            level.open_first = timestamp_ms
+        if value < level.open_min:
+            level.open_min = value
+        if value > level.open_max:
+            level.open_max = value
+        level.open_sum += value
+        level.open_count += 1.0
+
+    def _cascade(self, level_index: int, closed: tuple[float, float, float, float, float, float]) -> None:
+        """把第 level_index 级刚关闭的桶折叠进下一级；下一级桶随之关闭时继续向上传递。"""
+        while level_index + 1 < len(self._levels):
+            upper = self._levels[level_index + 1]
+            start_ms, first_ms = closed[0], closed[1]
+            if not upper.open_count:
+                upper.open_start = upper.bucket_start(start_ms)
+                upper.open_first = first_ms
+            elif start_ms >= upper.open_start + upper.bucket_ms:
+                next_closed = upper.close_open()
+                upper._reset_open(upper.bucket_start(start_ms))
+                upper.open_first = first_ms
+                self._fold_into(upper, closed)
+                closed = next_closed
+                level_index += 1
+                continue
+            self._fold_into(upper, closed)
+            return
+
+    @staticmethod
+    def _fold_into(level: _LevelTier, closed: tuple[float, float, float, float, float, float]) -> None:
+        _start_ms, _first_ms, min_value, max_value, value_sum, value_count = closed
+        if min_value < level.open_min:
+            level.open_min = min_value
+        if max_value > level.open_max:
+            level.open_max = max_value
+        level.open_sum += value_sum
+        level.open_count += value_count
+
+    def time_range(self) -> tuple[float, float]:
+        """返回仍保留的最早与最新样本时间戳；无样本时返回 (0, 0)。"""
+        raw = self._raw
+        if raw.total == 0:
+            return 0.0, 0.0
+        if raw.total <= raw.capacity:
+            first_ms = raw.first_timestamp_ms()
+        else:
+            # 原始环已覆盖旧样本，最早数据保存在聚合层；取桶内首个真实样本，回看不会平移到无数据区间
+            first_ms = min([raw.first_timestamp_ms()] + [level.first_sample_ms() for level in self._levels])
+        return first_ms, raw.timestamps[(raw.total - 1) % raw.capacity]
+
+    def memory_bytes(self) -> int:
+        return self._config.channel_bytes
+
+    def query(self, start_ms: float, end_ms: float, columns: int) -> list[tuple[float, float, float, float]]:
+        """返回 [start_ms, end_ms) 内按像素列折叠的 (时刻, min, max, mean) 列表，按时间排序。
+
+        原始层样本不多于 2 × columns 时原样返回每个样本（min = max = mean）；
+        空列不输出，调用方据此得到与像素数成正比的点数。
+        """
+        columns = max(1, int(columns))
+        if end_ms <= start_ms or self._raw.total == 0:
+            return []
+        column_ms = (end_ms - start_ms) / columns
+        tier = self._select_tier(start_ms, column_ms)
+        if tier is self._raw:
+            return self._query_raw(start_ms, end_ms, columns, column_ms)
+        return self._query_level(tier, start_ms, end_ms, column_ms)
+
+    def _select_tier(self, start_ms: float, column_ms: float) -> "_RawTier | _LevelTier":
+        """选出覆盖 start_ms 且桶宽不超过像素列宽的最粗一层。
+
+        没有这样的层时取覆盖 start_ms 的最细一层；各层都已丢弃 start_ms 附近的数据时取保留最早的层。
+        """
+        tiers: list["_RawTier | _LevelTier"] = [self._raw, *self._levels]
+        # 尚未发生覆盖的层保存着全部历史，同样视为覆盖 start_ms
+        covering = [tier for tier in tiers if tier.total <= tier.capacity or tier.first_timestamp_ms() <= start_ms]
+        fine_enough = [tier for tier in covering if getattr(tier, "bucket_ms", 0.0) <= column_ms]
+        if fine_enough:
+            return fine_enough[-1]
+        if covering:
+            return covering[0]
+        return min(tiers, key=lambda tier: tier.first_timestamp_ms())
+
+    def _query_raw(
+        self, start_ms: float, end_ms: float, columns: int, column_ms: float
+    ) -> list[tuple[float, float, float, float]]:
+        raw = self._raw
+        first = raw.seq_at_or_after(start_ms)
+        stop = raw.seq_at_or_after(end_ms)
+        if stop <= first:
+            return []
+        timestamps = _ring_slice(raw.timestamps, raw.capacity, first, stop)
+        values = _ring_slice(raw.values, raw.capacity, first, stop)
+        if len(values) <= 2 * columns:
+            return [(timestamp_ms, value, value, value) for timestamp_ms, value in zip(timestamps, values)]
+        return self._fold_columns(timestamps, values, values, values, None, start_ms, column_ms)
+
+    def _query_level(
+        self, level: _LevelTier, start_ms: float, end_ms: float, column_ms: float
+    ) -> list[tuple[float, float, float, float]]:
+        # 从包含 start_ms 的桶开始，避免左边缘缺一列
+        first = level.seq_at_or_after(level.bucket_start(start_ms))
+        stop = level.seq_at_or_after(end_ms)
+        capacity = level.capacity
+        starts = _ring_slice(level.starts, capacity, first, stop)
+        mins = _ring_slice(level.mins, capacity, first, stop)
+        maxs = _ring_slice(level.maxs, capacity, first, stop)
+        sums = _ring_slice(level.sums, capacity, first, stop)
+        counts = _ring_slice(level.counts, capacity, first, stop)
+        tail_start = self._open_tail_start(level)
+        if tail_start is not None and tail_start < end_ms:
+            # 尚未关闭的桶（本级及更细各级的当前桶合在一起）补在末尾，保证查询到最新数据
+            tail_min, tail_max, tail_sum, tail_count = self._open_tail(level)
+            starts.append(max(tail_start, start_ms))
+            mins.append(tail_min)
+            maxs.append(tail_max)
+            sums.append(tail_sum)
+            counts.append(tail_count)
+        if not starts:
+            return []
+        return self._fold_columns(starts, mins, maxs, sums, counts, start_ms, column_ms)
+
+    def _open_tail_start(self, level: _LevelTier) -> float | None:
+        open_starts = [lower.open_start for lower in self._levels_up_to(level) if lower.open_count]
+        return min(open_starts) if open_starts else None
+
+    def _levels_up_to(self, level: _LevelTier) -> list[_LevelTier]:
+        return self._levels[:self._levels.index(level) + 1]
+
+    def _open_tail(self, level: _LevelTier) -> tuple[float, float, float, float]:
+        """合并第 0 级至 level 的当前桶：各级当前桶互不重叠，并集即 level 当前桶起的全部样本。"""
+        tail_min = math.inf
+        tail_max = -math.inf
+        tail_sum = 0.0
+        tail_count = 0.0
+        for lower in self._levels_up_to(level):
+            if not lower.open_count:
+                continue
+            tail_min = min(tail_min, lower.open_min)
+            tail_max = max(tail_max, lower.open_max)
+            tail_sum += lower.open_sum
+            tail_count += lower.open_count
+        return tail_min, tail_max, tail_sum, tail_count
+
+    @staticmethod
+    def _fold_columns(
+        starts: array, mins: array, maxs: array, sums: array, counts: array | None, start_ms: float, column_ms: float
+    ) -> list[tuple[float, float, float, float]]:
+        """按像素列折叠：列边界二分查找、列内 min/max/sum 均在 C 层完成，循环次数不超过列数。"""
+        result: list[tuple[float, float, float, float]] = []
+        count = len(starts)
+        index = 0
+        while index < count:
+            column = max(0, math.floor((starts[index] - start_ms) / column_ms))
+            column_end_ms = start_ms + (column + 1) * column_ms
+            end = max(bisect_left(starts, column_end_ms, index, count), index + 1)
+            value_count = sum(counts[index:end]) if counts is not None else float(end - index)
+            mean = sum(sums[index:end]) / value_count if value_count else 0.0
+            result.append((start_ms + (column + 0.5) * column_ms, min(mins[index:end]), max(maxs[index:end]), mean))
+            index = end
+        return result
+
+
+class TelemetryHistory(QObject):
+    """各遥测通道的长时间历史；由 BackendFacade 创建后常驻，会话期间持续记录。"""
+
+    cleared = Signal()
+
+    def __init__(self, config: HistoryConfig | None = None, parent=None) -> None:
+        super().__init__(parent)
+        self._config = config or HistoryConfig()
+        self._pyramids = {channel: HistoryPyramid(self._config) for channel in HISTORY_CHANNELS}
+        # 按 HISTORY_CHANNELS 顺序排列，供 append_sample 按通道下标直接索引
+        self._pyramid_list = [self._pyramids[channel] for channel in HISTORY_CHANNELS]
+
+    def pyramid(self, channel: str) -> HistoryPyramid:
+        return self._pyramids[channel]
+
+    def append_sample(self, channel: int, timestamp_ms: float, value: float) -> None:
+        """TelemetryFanOut 记录端：channel 为 HISTORY_CHANNELS 下标。"""
+        self._pyramid_list[channel].append(timestamp_ms, value)
+
+    @Slot()
+    def clear(self) -> None:
+        for pyramid in self._pyramids.values():
+            pyramid.clear()
+        self.cleared.emit()
+
+    @Slot(str, result=list)
+    def timeRange(self, channel: str) -> list:
+        """返回通道保留的 [最早, 最新] 时间戳（毫秒）；无样本时返回 [0, 0]。"""
+        return list(self._pyramids[channel].time_range())
+
+    @Slot(str, float, float, int, result=list)
+    def query(self, channel: str, start_ms: float, end_ms: float, columns: int) -> list:
+        """返回按像素列折叠的 [[时刻, min, max, mean], ...]，供非曲线场景（如温度统计）使用。"""
+        return [list(column) for column in self._pyramids[channel].query(start_ms, end_ms, columns)]
+
+    @Property(int, constant=True)  # type: ignore
+    def memoryBytes(self) -> int:
+        """QML 只读属性：全部通道预分配的数组字节数（历史内存上限）。"""
+        return self._config.channel_bytes * len(self._pyramids)
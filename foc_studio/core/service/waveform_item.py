@@ -0,0 +1,250 @@
+"""WaveformItem - 由场景图直接绘制的高密度波形折线。
+
+LineSeries 每次刷新都要逐点 append / removeMultiple 并由 QtGraphs 重新生成几何；
+本控件直接读取 ChartDataProvider 的环形缓冲，按像素列做 min/max 抽取后把顶点
+整块写入同一个 QSGGeometryNode（DrawLineStrip），不新建节点、不逐点创建对象。
+
+顶点保存为数据坐标（X 为相对 origin 的秒数，Y 为样本值），挂在 QSGTransformNode 下：
+横轴平滑滚动、Y 轴缩放只改变换矩阵；只有页面经 refresh 通知新样本到达（或缩放、
+原点变化）时才重建顶点。
+
+后端差异：
+  RHI（D3D / Vulkan / Metal / OpenGL，含软件光栅化的 OpenGL 与 WARP）  使用 QSGGeometryNode
+  software 场景图后端（不支持自定义几何节点）  由子项 QQuickPaintedItem 用 QPainter 绘制，纹理由 Qt 缓存，
+                                              只在顶点、尺寸或坐标范围变化时重绘
+
+实例由 ChartDataProvider.createWaveform 创建并挂到页面提供的宿主 Item 下。
+"""
+
+import ctypes
+from array import array
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QPointF, Slot
+from PySide6.QtGui import QColor, QMatrix4x4, QPainter, QPen, QPolygonF, QTransform
+from PySide6.QtQuick import (
+    QQuickItem,
+    QQuickPaintedItem,
+    QQuickWindow,
+    QSGFlatColorMaterial,
+    QSGGeometry,
+    QSGGeometryNode,
+    QSGNode,
+    QSGTransformNode,
+)
+
+from core.service.chart_data_provider import minmax_indices
+
+if TYPE_CHECKING:
+    from core.service.chart_data_provider import ChartDataProvider
+
+# Point2D 顶点为两个 float
+_VERTEX_BYTES = 8
+
+
+class _WaveformNode(QSGTransformNode):
+    """变换节点及其唯一的折线子节点。
+
+    appendChildNode / setMaterial 不转移 Python 包装对象的所有权，局部创建的子节点
+    在函数返回后会被回收；由本节点（updatePaintNode 返回后归场景图所有，Python 对象
+    随 C++ 节点存活）持有子节点与材质，随节点在渲染线程析构时一并释放。
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        geometry = QSGGeometry(QSGGeometry.defaultAttributes_Point2D(), 0)
+        geometry.setDrawingMode(QSGGeometry.DrawingMode.DrawLineStrip)
+        geometry.setLineWidth(1)
+        self.material = QSGFlatColorMaterial()
+        self.geometry_node = QSGGeometryNode()
+        # 几何经 setGeometry 交给子节点；子节点与材质由本对象释放，不能再由父节点或子节点删除
+        self.geometry_node.setGeometry(geometry)
+        self.geometry_node.setFlag(QSGNode.OwnsGeometry)
+        self.geometry_node.setFlag(QSGNode.OwnedByParent, False)
+        self.geometry_node.setMaterial(self.material)
+        self.appendChildNode(self.geometry_node)
+
+
+class _SoftwareWaveformPainter(QQuickPaintedItem):
+    """software 后端的绘制子项：paint 同样在同步阶段调用（GUI 线程阻塞），委托给所属 WaveformItem。"""
+
+    def __init__(self, waveform: "WaveformItem") -> None:
+        super().__init__(waveform)
+        self._waveform = waveform
+
+    def paint(self, painter: QPainter) -> None:
+        self._waveform._paint_software(painter)
+
+
+class WaveformItem(QQuickItem):
+    """单通道波形：坐标范围由页面经 setViewport 给出，新样本到达后调用 refresh。"""
+
+    def __init__(self, source: "ChartDataProvider", channel: str, host: QQuickItem) -> None:
+        super().__init__(host)
+        self._host = host
+        self._source = source
+        self._channel = channel
+        self._color = QColor("#0731ee")
+        self._color_dirty = True
+        self._origin_ms = 0.0
+        self._x_min_s = 0.0
+        self._x_max_s = 1.0
+        self._y_min = -1.0
+        self._y_max = 1.0
+        # 数据坐标顶点 [x0, y0, x1, y1, ...] 及其生成时的原点与横轴跨度
+        self._vertices = array("f")
+        self._vertices_origin_ms = 0.0
+        self._vertices_span_s = 0.0
+        self._vertices_width = 0
+        self._data_dirty = True
+        # software 后端复用的数据坐标折线
+        self._polygon: QPolygonF | None = None
+        # 已上传到几何节点的顶点数组（与 _vertices 不是同一对象时需重新上传）
+        self._vertices_uploaded: array | None = None
+        # 最近一次重建的顶点数，便于对比 LineSeries 的点数
+        self.vertex_count = 0
+        # 实例创建时窗口已存在，静态查询即可得到实际使用的场景图后端，不依赖 window() 的包装类型
+        self._software_painter: _SoftwareWaveformPainter | None = None
+        if QQuickWindow.sceneGraphBackend() == "software":
+            self._software_painter = _SoftwareWaveformPainter(self)
+        else:
+            self.setFlag(QQuickItem.ItemHasContents, True)
+        self.setClip(True)
+        self._follow_host_size()
+        host.widthChanged.connect(self._follow_host_size)
+        host.heightChanged.connect(self._follow_host_size)
+
+    def _request_paint(self) -> None:
+        if self._software_painter is not None:
+            self._software_painter.update()
+        else:
+            self.update()
+
+    @Slot()
+    def _follow_host_size(self) -> None:
+        self.setWidth(self._host.width())
+        self.setHeight(self._host.height())
+        if self._software_painter is not None:
+            self._software_painter.setWidth(self.width())
+            self._software_painter.setHeight(self.height())
+        self._request_paint()
+
+    @Slot(QColor)
+    def setColor(self, color: QColor) -> None:
+        if color == self._color:
+            return
+        self._color = QColor(color)
+        self._color_dirty = True
+        self._request_paint()
+
+    @Slot(float, float, float, float, float)
+    def setViewport(self, origin_ms: float, x_min_s: float, x_max_s: float, y_min: float, y_max: float) -> None:
+        """设置坐标范围；只平移或改变 Y 范围时下一帧仅更新变换矩阵，范围未变时不请求重绘。"""
+        viewport = (origin_ms, x_min_s, x_max_s, y_min, y_max)
+        if viewport == (self._origin_ms, self._x_min_s, self._x_max_s, self._y_min, self._y_max):
+            return
+        self._origin_ms, self._x_min_s, self._x_max_s, self._y_min, self._y_max = viewport
+        self._request_paint()
+
+    @Slot()
+    def refresh(self) -> None:
+        """通知有新样本（或通道已清空），下一帧重建顶点。"""
+        self._data_dirty = True
+        self._request_paint()
+
+    def _needs_rebuild(self, width: int) -> bool:
+        return (
+            self._data_dirty
+            or width != self._vertices_width
+            or self._origin_ms != self._vertices_origin_ms
+            or abs((self._x_max_s - self._x_min_s) - self._vertices_span_s) > 1e-9
+        )
+
+    def _rebuild_vertices(self, width: int) -> None:
+        """按当前横轴范围取样本，超过 2 × 像素列数时按像素列抽取最小/最大值，顶点数只与宽度有关。"""
+        self._data_dirty = False
+        self._vertices_width = width
+        self._vertices_origin_ms = self._origin_ms
+        self._vertices_span_s = self._x_max_s - self._x_min_s
+        self._polygon = None
+        start_ms = self._origin_ms + self._x_min_s * 1000.0
+        end_ms = self._origin_ms + self._x_max_s * 1000.0
+        if width <= 0 or end_ms <= start_ms:
+            self._vertices = array("f")
+            self.vertex_count = 0
+            return
+        timestamps, values = self._source.window_slices(self._channel, start_ms, end_ms)
+        if len(timestamps) > 2 * width:
+            kept = minmax_indices(timestamps, values, (end_ms - start_ms) / width)
+            timestamps = [timestamps[index] for index in kept]
+            values = array("d", [values[index] for index in kept])
+        origin_ms = self._origin_ms
+        vertices = array("f", bytes(_VERTEX_BYTES * len(timestamps)))
+        vertices[0::2] = array("f", [(timestamp_ms - origin_ms) / 1000.0 for timestamp_ms in timestamps])
+        vertices[1::2] = array("f", values)
+        self._vertices = vertices
+        self.vertex_count = len(timestamps)
+
+    def _scale(self) -> tuple[float, float]:
+        """数据坐标到像素的缩放系数 (X 每秒像素, Y 每单位像素)。"""
+        x_span = max(self._x_max_s - self._x_min_s, 1e-9)
+        y_span = max(self._y_max - self._y_min, 1e-12)
+        return self.width() / x_span, self.height() / y_span
+
+    def updatePaintNode(self, node, _data):
+        """渲染线程同步阶段调用（GUI 线程阻塞），可安全读取环形缓冲。"""
+        width = int(self.width())
+        if self._needs_rebuild(width):
+            self._rebuild_vertices(width)
+        return self._update_geometry_node(node)
+
+    def _update_geometry_node(self, node):
+        if node is None:
+            node = _WaveformNode()
+            self._color_dirty = True
+            # 新节点需要写入当前顶点
+            self._vertices_uploaded = None
+        if self._color_dirty:
+            node.material.setColor(self._color)
+            self._color_dirty = False
+            node.geometry_node.markDirty(QSGNode.DirtyMaterial)
+        if self._vertices_uploaded is not self._vertices:
+            vertex_count = len(self._vertices) // 2
+            geometry = node.geometry_node.geometry()
+            geometry.allocate(vertex_count)
+            if vertex_count:
+                # 顶点布局与 array('f') 的交错 x/y 一致，整块拷贝，避免逐点创建 Point2D 对象
+                address, _length = self._vertices.buffer_info()
+                ctypes.memmove(int(geometry.vertexData()), address, vertex_count * _VERTEX_BYTES)
+            node.geometry_node.markDirty(QSGNode.DirtyGeometry)
+            self._vertices_uploaded = self._vertices
+        x_scale, y_scale = self._scale()
+        node.setMatrix(QMatrix4x4(
+            x_scale, 0.0, 0.0, -self._x_min_s * x_scale,
+            0.0, -y_scale, 0.0, self._y_max * y_scale,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0,
+        ))
+        return node
+
+    def _paint_software(self, painter: QPainter) -> None:
+        """software 后端：折线经变换画到绘制子项的图像上（图像已按透明色清空）。"""
+        width = int(self.width())
+        if self._needs_rebuild(width):
+            self._rebuild_vertices(width)
+        vertices = self._vertices
+        if len(vertices) < 4:
+            return
+        if self._polygon is None:
+            self._polygon = QPolygonF([
+                QPointF(vertices[index], vertices[index + 1]) for index in range(0, len(vertices), 2)
+            ])
+        x_scale, y_scale = self._scale()
+        pen = QPen(self._color, 1)
+        pen.setCosmetic(True)
+        # 与 QQuickPaintedItem 预置的设备像素比缩放叠加
+        painter.setTransform(QTransform(
+            x_scale, 0.0, 0.0, -y_scale, -self._x_min_s * x_scale, self._y_max * y_scale
+        ), True)
+        painter.setPen(pen)
+        painter.drawPolyline(self._polygon)
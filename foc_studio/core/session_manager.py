@@ -0,0 +1,298 @@
+import os
+import time
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Property, QTimer, Signal, Slot
+
+from core.backend_facade import BackendFacade
+from core.service.event_loop_monitor import EventLoopLagProbe, EventLoopWatchdog
+from core.service.refresh_scheduler import RefreshScheduler
+from core.service.serial_statistics_service import (
+    STATISTICS_PUBLISH_INTERVAL_MIN_MS,
+    STATISTICS_PUBLISH_INTERVAL_MS,
+)
+from core.transport.port_discovery import PortDiscoveryService
+
+if TYPE_CHECKING:
+    from core.service.session_recorder import SessionRecorderWriter
+
+# 共享统计节拍周期，默认与单设备 SerialStatisticsService 的快照发布周期一致
+SESSION_TICK_INTERVAL_MS = STATISTICS_PUBLISH_INTERVAL_MS
+# 事件循环探针与看门狗在启动后延迟开启：QML 编译与首帧渲染期间的阻塞不计入延迟统计与卡顿告警
+EVENT_LOOP_MONITOR_START_DELAY_MS = 1000
+
+
+class SessionManager(QObject):
+    """多设备会话管理器。
+
+    职责：
+    - 为每台驱动器托管一套独立的 Transport → Service → Dispatcher 流水线（BackendFacade）
+    - 共享串口发现线程与 1 秒统计节拍，避免设备数增加时线程和定时器成倍增长
+    - 记录 QML 当前选中的设备，并按设备统计接收流水线 CPU 占用
+    - 监测 GUI 事件循环延迟与卡顿，可选在卡顿期间由看门狗线程代发保活帧
+    - 为各页面提供共享的自适应刷新节拍
+    """
+
+    sessionsChanged = Signal()
+    activeIndexChanged = Signal()
+    activeBackendChanged = Signal(QObject)  # 当前设备切换后发出，携带新的 BackendFacade
+    statisticsPublishIntervalChanged = Signal()
+    eventLoopLagChanged = Signal()
+    stallKeepaliveEnabledChanged = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._port_discovery = PortDiscoveryService(self)
+        self._sessions: list[BackendFacade] = []
+        self._active_index = -1
+        # 每个设备上一次节拍时的累计耗时，用于计算本周期 CPU 占用
+        self._last_busy_time_s: list[float] = []
+        self._cpu_percent: list[float] = []
+        self._session_infos: list[dict] = []
+        # 事件循环延迟探针与看门狗为全进程共享：所有设备运行在同一 GUI 线程
+        self._lag_probe = EventLoopLagProbe(self)
+        self._watchdog = EventLoopWatchdog(self._lag_probe)
+        self._event_loop_lag: dict = {}
+        self._stall_keepalive_enabled = False
+        # 页面刷新节拍按刷新耗时与事件循环延迟自适应，同样全进程共享
+        self._refresh_scheduler = RefreshScheduler(self, self._lag_probe)
+        # 每台设备的持久化标签 deviceN：序号只增不减，移除设备后新增的设备不会续写已移除设备的归档或运行记录
+        self._device_labels: dict[BackendFacade, str] = {}
+        self._device_count = 0
+        # 遥测归档根目录（空表示不启用）
+        self._archive_directory = ""
+        # 运行记录写库线程：所有设备写同一个数据库，共用一个写连接（None 表示不启用）
+        self._session_writer: "SessionRecorderWriter | None" = None
+
+        self._tick_timer = QTimer(self)
+        self._tick_timer.setInterval(SESSION_TICK_INTERVAL_MS)
+        self._tick_timer.timeout.connect(self._on_tick)
+        self._last_tick_monotonic = time.monotonic()
+        self._tick_timer.start()
+        QTimer.singleShot(EVENT_LOOP_MONITOR_START_DELAY_MS, self, self._start_event_loop_monitor)
+
+        self._port_discovery.requestScan()
+
+    @property
+    def backends(self) -> tuple[BackendFacade, ...]:
+        """返回当前托管的全部设备流水线。"""
+        return tuple(self._sessions)
+
+    @Property(list, notify=sessionsChanged)  # type: ignore
+    def sessions(self) -> list:
+        """QML 只读属性：设备列表，每项包含 name / portName / connected / cpuPercent。"""
+        return self._session_infos
+
+    @Property(int, notify=activeIndexChanged)  # type: ignore
+    def activeIndex(self) -> int:
+        """QML 只读属性：当前选中的设备序号。"""
+        return self._active_index
+
+    @Property(QObject, notify=activeBackendChanged)  # type: ignore
+    def activeBackend(self) -> BackendFacade | None:
+        """QML 只读属性：当前选中设备的 BackendFacade。"""
+        if 0 <= self._active_index < len(self._sessions):
+            return self._sessions[self._active_index]
+        return None
+
+    @property
+    def eventLoopProbe(self) -> EventLoopLagProbe:
+        """返回共享的事件循环延迟探针，供指标端点读取。"""
+        return self._lag_probe
+
+    @property
+    def eventLoopStallCount(self) -> int:
+        """返回看门狗累计检测到的 GUI 卡顿次数。"""
+        return self._watchdog.stallCount
+
+    @Property(QObject, constant=True)  # type: ignore
+    def refreshScheduler(self) -> RefreshScheduler:
+        """QML 只读属性：CHT / QD / LOG 页面共享的刷新调度器。"""
+        return self._refresh_scheduler
+
+    @Property("QVariantMap", notify=eventLoopLagChanged)  # type: ignore
+    def eventLoopLag(self) -> dict:
+        """QML 只读属性：最近约 1 分钟的事件循环延迟分位数（毫秒）与累计卡顿次数。"""
+        return self._event_loop_lag
+
+    @Property(bool, notify=stallKeepaliveEnabledChanged)  # type: ignore
+    def stallKeepaliveEnabled(self) -> bool:
+        """QML 只读属性：GUI 卡顿期间是否由看门狗线程代发保活帧。"""
+        return self._stall_keepalive_enabled
+
+    @Slot(bool)
+    def setStallKeepaliveEnabled(self, enabled: bool) -> None:
+        """开启或关闭卡顿保活（仅 POSIX 串口生效）。"""
+        if enabled == self._stall_keepalive_enabled:
+            return
+        self._stall_keepalive_enabled = enabled
+        for session in self._sessions:
+            self._register_stall_keepalive(session, enabled)
+        self.stallKeepaliveEnabledChanged.emit()
+
+    @Property(int, notify=statisticsPublishIntervalChanged)  # type: ignore
+    def statisticsPublishIntervalMs(self) -> int:
+        """QML 只读属性：共享统计节拍周期（毫秒），即各设备统计快照的发布周期。"""
+        return self._tick_timer.interval()
+
+    @Slot(int)
+    def setStatisticsPublishInterval(self, interval_ms: int) -> None:
+        """调整共享统计节拍周期；CPU 占用按实际经过时间折算，不受周期影响。"""
+        interval_ms = max(interval_ms, STATISTICS_PUBLISH_INTERVAL_MIN_MS)
+        if interval_ms == self._tick_timer.interval():
+            return
+        self._tick_timer.setInterval(interval_ms)
+        for session in self._sessions:
+            session.setStatisticsPublishInterval(interval_ms)
+        self.statisticsPublishIntervalChanged.emit()
+
+    @Slot(result=int)
+    def addSession(self) -> int:
+        """新增一台设备会话，返回其序号；首台设备自动成为当前设备。"""
+        session = BackendFacade(self, self._port_discovery, self._tick_timer.timeout)
+        session.setStatisticsPublishInterval(self._tick_timer.interval())
+        self._register_stall_keepalive(session, self._stall_keepalive_enabled)
+        # 连接状态变化时刷新设备列表，便于 QML 显示各设备的串口与在线状态
+        session.connectionStatusChanged.connect(self._refresh_session_infos)
+        session.isReconnectingChanged.connect(self._refresh_session_infos)
+        self._device_count += 1
+        self._device_labels[session] = f"device{self._device_count}"
+        self._start_session_archive(session)
+        self._start_session_recorder(session)
+        self._sessions.append(session)
+        self._last_busy_time_s.append(session.pipelineBusyTimeSec)
+        self._cpu_percent.append(0.0)
+        self._refresh_session_infos()
+
+        index = len(self._sessions) - 1
+        if self._active_index < 0:
+            self.setActiveIndex(index)
+        return index
+
+    @Slot(int)
+    def removeSession(self, index: int) -> None:
+        """断开并移除指定设备会话；至少保留一台设备。"""
+        if len(self._sessions) <= 1 or not 0 <= index < len(self._sessions):
+            return
+
+        session = self._sessions.pop(index)
+        del self._device_labels[session]
+        del self._last_busy_time_s[index]
+        del self._cpu_percent[index]
+        self._register_stall_keepalive(session, False)
+        session.disconnectSerial()
+        session.shutdown()
+        session.deleteLater()
+
+        if self._active_index >= len(self._sessions) or index == self._active_index:
+            # 当前设备被移除时回退到相邻设备
+            self._active_index = -1
+            self.setActiveIndex(min(index, len(self._sessions) - 1))
+        elif index < self._active_index:
+            self._active_index -= 1
+            self.activeIndexChanged.emit()
+        self._refresh_session_infos()
+
+    @Slot(int)
+    def setActiveIndex(self, index: int) -> None:
+        """切换 QML 当前操作的设备。"""
+        if index == self._active_index or not 0 <= index < len(self._sessions):
+            return
+        self._active_index = index
+        # 先切换 backend：main.py 据此重新注入上下文属性，QML 随后重建的页面才会读到新设备
+        self.activeBackendChanged.emit(self._sessions[index])
+        self.activeIndexChanged.emit()
+
+    def setArchiveDirectory(self, directory: str) -> None:
+        """启用遥测与日志归档：已有设备与之后新增的设备都写入 directory 下各自的子目录。"""
+        if self._archive_directory:
+            return
+        self._archive_directory = directory
+        for session in self._sessions:
+            self._start_session_archive(session)
+
+    def setSessionDatabase(self, path: str) -> None:
+        """启用运行记录：已有设备与之后新增的设备都写入同一个 SQLite 数据库，按设备标签区分。"""
+        if self._session_writer is not None:
+            return
+        from core.service.session_recorder import SessionRecorderWriter
+
+        self._session_writer = SessionRecorderWriter(path)
+        self._session_writer.start()
+        for session in self._sessions:
+            self._start_session_recorder(session)
+
+    def _start_session_archive(self, session: BackendFacade) -> None:
+        if self._archive_directory:
+            session.startArchive(os.path.join(self._archive_directory, self._device_labels[session]))
+
+    def _start_session_recorder(self, session: BackendFacade) -> None:
+        if self._session_writer is not None:
+            session.startSessionRecorder(self._session_writer, self._device_labels[session])
+
+    @Slot()
+    def shutdown(self) -> None:
+        """应用退出前停止所有设备流水线与共享串口发现线程。"""
+        self._tick_timer.stop()
+        self._watchdog.stop()
+        self._lag_probe.stop()
+        for session in self._sessions:
+            session.shutdown()
+        # 各设备的剩余批次已入队，最后停止共用的写库线程
+        if self._session_writer is not None:
+            self._session_writer.stop()
+        self._port_discovery.shutdown()
+
+    def _on_tick(self) -> None:
+        """共享节拍：按设备计算本周期接收流水线的 CPU 占用百分比（相对单核）。"""
+        now = time.monotonic()
+        elapsed_s = now - self._last_tick_monotonic
+        self._last_tick_monotonic = now
+        if elapsed_s <= 0.0:
+            return
+
+        for index, session in enumerate(self._sessions):
+            busy_time_s = session.pipelineBusyTimeSec
+            self._cpu_percent[index] = round(
+                (busy_time_s - self._last_busy_time_s[index]) / elapsed_s * 100.0, 1
+            )
+            self._last_busy_time_s[index] = busy_time_s
+        self._refresh_session_infos()
+
+        event_loop_lag = self._lag_probe.lagPercentilesMs()
+        event_loop_lag["stallCount"] = self._watchdog.stallCount
+        if event_loop_lag != self._event_loop_lag:
+            self._event_loop_lag = event_loop_lag
+            self.eventLoopLagChanged.emit()
+
+    @Slot()
+    def _start_event_loop_monitor(self) -> None:
+        """启动事件循环探针与看门狗；已关闭（节拍定时器已停止）时不再启动。"""
+        if not self._tick_timer.isActive():
+            return
+        self._lag_probe.start()
+        self._watchdog.start()
+
+    def _register_stall_keepalive(self, session: BackendFacade, enabled: bool) -> None:
+        """向看门狗注册或注销指定设备的卡顿保活发送器。"""
+        on_stall = session.stallKeepalive.on_stall
+        if enabled:
+            self._watchdog.addStallListener(on_stall)
+        else:
+            self._watchdog.removeStallListener(on_stall)
+
+    @Slot()
+    def _refresh_session_infos(self) -> None:
+        """重建设备列表快照，仅在内容变化时通知 QML。"""
+        session_infos = [
+            {
+                "name": f"设备 {index + 1}",
+                "portName": session.portName,
+                "connected": session.isConnected,
+                "cpuPercent": self._cpu_percent[index],
+            }
+            for index, session in enumerate(self._sessions)
+        ]
+        if session_infos != self._session_infos:
+            self._session_infos = session_infos
+            self.sessionsChanged.emit()
@@ -0,0 +1,52 @@
+"""StartupTimer - 启动耗时里程碑。
+
+main.py 在各阶段结束时打点，首帧呈现后打印一行汇总，用于跟踪启动耗时回退：
+  imports     进程入口 → PySide6 与后端模块导入完成
+  app         QGuiApplication 创建
+  backend     SessionManager 与首台设备流水线创建
+  engine      QML 引擎创建与上下文属性注入
+  qml         Main.qml 及首屏页面编译与实例化
+  firstFrame  窗口首帧呈现
+"""
+
+import time
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+
+class StartupTimer(QObject):
+    """记录启动里程碑，首帧后输出各阶段耗时。"""
+
+    firstFrameShown = Signal()
+
+    def __init__(self, start_perf: float, parent=None) -> None:
+        super().__init__(parent)
+        self._last_perf = start_perf
+        self._start_perf = start_perf
+        self._milestones: list[tuple[str, float]] = []
+        self._window = None
+
+    @property
+    def milestones(self) -> tuple[tuple[str, float], ...]:
+        """返回 (里程碑, 本阶段耗时毫秒) 列表。"""
+        return tuple(self._milestones)
+
+    def mark(self, name: str) -> None:
+        """记录一个里程碑：本阶段耗时为距上一个里程碑的时间。"""
+        now = time.perf_counter()
+        self._milestones.append((name, (now - self._last_perf) * 1000.0))
+        self._last_perf = now
+
+    def watchFirstFrame(self, window) -> None:
+        """等待窗口首帧呈现后记录 firstFrame 并打印汇总。"""
+        self._window = window
+        window.frameSwapped.connect(self._on_first_frame)
+
+    @Slot()
+    def _on_first_frame(self) -> None:
+        self._window.frameSwapped.disconnect(self._on_first_frame)
+        self.mark("firstFrame")
+        summary = " | ".join(f"{name} {elapsed_ms:.1f} ms" for name, elapsed_ms in self._milestones)
+        total_ms = (self._last_perf - self._start_perf) * 1000.0
+        print(f"[Startup] {summary} | total {total_ms:.1f} ms", flush=True)
+        self.firstFrameShown.emit()
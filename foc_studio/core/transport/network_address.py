@@ -0,0 +1,30 @@
+"""
+Transport 层：网络串口桥地址解析
+
+纯函数，不依赖 QtNetwork：BackendFacade 只需判断端口名类型时不必加载网络模块。
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+NETWORK_SCHEME_TCP = "tcp"
+NETWORK_SCHEME_UDP = "udp"
+
+
+def is_network_port_name(port_name: str) -> bool:
+    """判断端口名是否为网络地址（tcp:// 或 udp://）。"""
+    return port_name.startswith((f"{NETWORK_SCHEME_TCP}://", f"{NETWORK_SCHEME_UDP}://"))
+
+
+def parse_network_port_name(port_name: str) -> tuple[str, str, int, int]:
+    """解析网络地址，返回 (scheme, host, port, local_port)。
+
+    Raises:
+        ValueError: 地址格式非法或缺少端口。
+    """
+    parts = urlsplit(port_name)
+    if parts.scheme not in (NETWORK_SCHEME_TCP, NETWORK_SCHEME_UDP):
+        raise ValueError(f"unsupported scheme: {parts.scheme}")
+    if not parts.hostname or parts.port is None:
+        raise ValueError(f"missing host or port: {port_name}")
+    local_port = int(parse_qs(parts.query).get("local", ["0"])[0])
+    return parts.scheme, parts.hostname, parts.port, local_port
@@ -0,0 +1,332 @@
+"""
+Transport 层：网络串口桥（TCP / UDP）
+
+职责：
+    - 通过串口转以太网模块与 MCU 通讯，对上层提供与 mySerial 相同的信号与槽
+    - TCP：原始字节流，与串口一样交给 DataProcessor 做增量解析
+    - UDP：每个数据报携带完整帧，收到后按字节流原样上报
+    - 同一事件循环轮次内的多次发送合并为一次写入，减少小包数量
+
+地址格式（复用串口名参数传入）：
+    tcp://192.168.1.10:4001
+    udp://192.168.1.10:4001?local=4001   （local 为本地绑定端口，缺省由系统分配）
+"""
+
+from PySide6.QtCore import QObject, Property, QTimer, Signal, Slot
+from PySide6.QtNetwork import QAbstractSocket, QHostAddress, QTcpSocket, QUdpSocket
+
+from core.transport.network_address import (  # noqa: F401 - 保持原有导入路径可用
+    NETWORK_SCHEME_TCP,
+    NETWORK_SCHEME_UDP,
+    is_network_port_name,
+    parse_network_port_name,
+)
+
+
+class NetworkTransport(QObject):
+    """网络传输对象：接口与 mySerial 保持一致，BackendFacade 可按端口名透明切换。"""
+
+    connectionStatusChanged = Signal(bool, str)
+    isConnectedChanged = Signal()
+    dataReceived = Signal(bytes)       # 发射接收到的数据
+    dataWritten = Signal(int, bool)    # 发送后回传写入字节数与是否写入完整帧
+    linkLost = Signal(str)             # 远端断开或网络错误，携带原因
+    linkRestored = Signal(str)         # reopenPort 成功恢复链路，携带地址
+    reopenFailed = Signal(str)         # reopenPort 本次尝试失败，携带错误描述
+
+    def __init__(self, parent=None, low_delay: bool = True) -> None:
+        """low_delay 为 True 时关闭 Nagle 算法，控制帧立即发出。"""
+        super().__init__(parent)
+        self._socket: QAbstractSocket | None = None
+        self._scheme = ""
+        self._port_name = ""
+        self._low_delay = low_delay
+        self._is_connected = False
+        self._link_lost = False
+        # 当前连接尝试属于重连流程时为 True，结果分别走 linkRestored / reopenFailed
+        self._reopening = False
+        self._latency_tracer = None  # 延迟追踪开启时由上层注入，在 readyRead 处打点
+
+        # 发送合并：同一轮事件循环内的多帧拼成一次写入，帧长列表用于逐帧回报统计
+        self._pending_tx = bytearray()
+        self._pending_frame_sizes: list[int] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self._flush_pending_tx)
+
+    @Property(bool, notify=isConnectedChanged)  # type: ignore
+    def isConnected(self) -> bool:
+        """QML可读取的连接状态属性"""
+        return self._is_connected
+
+    @property
+    def portName(self) -> str:
+        """返回当前会话使用的网络地址；未连接且不在重连中时返回空字符串。"""
+        if self._is_connected or self._link_lost:
+            return self._port_name
+        return ""
+
+    def setLatencyTracer(self, tracer) -> None:
+        """设置延迟追踪器（None 关闭）：每次收到 TCP / UDP 数据记录数据块到达时刻。"""
+        self._latency_tracer = tracer
+
+    def setLowDelay(self, enabled: bool) -> None:
+        """开启或关闭 TCP_NODELAY（关闭 Nagle 算法），已连接时立即生效。"""
+        self._low_delay = enabled
+        if isinstance(self._socket, QTcpSocket):
+            self._socket.setSocketOption(QAbstractSocket.SocketOption.LowDelayOption, int(enabled))
+
+    @Slot(str, int)
+    def openPort(self, port_name: str, _baud_rate: int = 0) -> None:
+        """连接网络地址；波特率由串口转以太网模块自身配置，此处忽略。"""
+        if self._is_connected or self._link_lost:
+            self.closePort()
+
+        try:
+            scheme, _host, _port, _local_port = parse_network_port_name(port_name)
+        except ValueError as error:
+            self.connectionStatusChanged.emit(False, f"open failed: {port_name} ({error})")
+            return
+
+        self._scheme = scheme
+        self._port_name = port_name
+        self._reopening = False
+        print(f"[NetworkTransport] try to open: {port_name}", flush=True)
+        self._start_connect()
+
+    @Slot()
+    def reopenPort(self) -> None:
+        """按最近一次的地址重新连接，结果通过 linkRestored / reopenFailed 通知。"""
+        if not self._link_lost or self._is_connected:
+            return
+        self._reopening = True
+        self._start_connect()
+
+    @Slot(str)
+    def dropLink(self, reason: str) -> None:
+        """上层检测到链路失效时调用：关闭套接字但保留重连参数。"""
+        if not self._is_connected:
+            return
+        self._mark_link_lost(reason)
+
+    @Slot()
+    def closePort(self) -> None:
+        """关闭网络连接"""
+        was_active = self._is_connected or self._link_lost
+        self._is_connected = False
+        self._link_lost = False
+        self._reopening = False
+        self._discard_socket()
+        if was_active:
+            self.isConnectedChanged.emit()
+            print("[NetworkTransport] Port closed", flush=True)
+            self.connectionStatusChanged.emit(False, "Port closed")
+
+    @Slot(bytes)
+    def sendData(self, data: bytes) -> None:
+        """缓存待发送帧，在本轮事件循环结束时合并写出。"""
+        if not self._is_connected or self._socket is None:
+            print("[NetworkTransport] Cannot send: port not connected", flush=True)
+            return
+        self._pending_tx.extend(data)
+        self._pending_frame_sizes.append(len(data))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def shutdown(self) -> None:
+        """退出前关闭套接字。"""
+        self._flush_timer.stop()
+        self._discard_socket()
+
+    def _start_connect(self) -> None:
+        """按当前 scheme 创建套接字并发起连接。"""
+        self._discard_socket()
+        _scheme, host, port, local_port = parse_network_port_name(self._port_name)
+
+        if self._scheme == NETWORK_SCHEME_TCP:
+            socket = QTcpSocket(self)
+            socket.readyRead.connect(self._on_tcp_ready_read)
+        else:
+            socket = QUdpSocket(self)
+            socket.readyRead.connect(self._on_udp_ready_read)
+        socket.connected.connect(self._on_socket_connected)
+        # 先于 bind 连接错误回调，_discard_socket 断开的始终是已连接的槽
+        socket.errorOccurred.connect(self._on_socket_error)
+        self._socket = socket
+        if isinstance(socket, QUdpSocket):
+            # UDP 需要先绑定本地端口，串口服务器回包才能送达；
+            # 绑定失败时 errorOccurred 已同步按连接失败处理，套接字仍在时才需要补报
+            if not socket.bind(QHostAddress(QHostAddress.SpecialAddress.AnyIPv4), local_port):
+                if self._socket is socket:
+                    self._on_connect_failed(socket.errorString())
+                return
+        # connectToHost 为异步操作，结果经 connected / errorOccurred 回调
+        socket.connectToHost(host, port)
+
+    def _discard_socket(self) -> None:
+        """断开并释放当前套接字，同时丢弃未发送的合并缓冲。"""
+        self._flush_timer.stop()
+        self._pending_tx.clear()
+        self._pending_frame_sizes.clear()
+        socket = self._socket
+        self._socket = None
+        if socket is None:
+            return
+        socket.errorOccurred.disconnect(self._on_socket_error)
+        socket.abort()
+        socket.deleteLater()
+
+    def _on_socket_connected(self) -> None:
+        """套接字连接建立：区分首次连接与重连，分别通知上层。"""
+        if isinstance(self._socket, QTcpSocket) and self._scheme == NETWORK_SCHEME_TCP:
+            self._socket.setSocketOption(
+                QAbstractSocket.SocketOption.LowDelayOption, int(self._low_delay)
+            )
+        self._is_connected = True
+        self.isConnectedChanged.emit()
+        if self._reopening:
+            self._reopening = False
+            self._link_lost = False
+            print(f"[NetworkTransport] link restored: {self._port_name}", flush=True)
+            self.linkRestored.emit(self._port_name)
+            return
+        success_msg = f"open successfully: {self._port_name}"
+        print(f"[NetworkTransport] {success_msg}", flush=True)
+        self.connectionStatusChanged.emit(True, success_msg)
+
+    def _on_connect_failed(self, error_detail: str) -> None:
+        """连接尝试失败：重连流程发 reopenFailed，首次连接发连接失败状态。"""
+        self._discard_socket()
+        if self._reopening:
+            self.reopenFailed.emit(error_detail)
+            return
+        error_msg = f"open failed: {self._port_name}"
+        print(f"[NetworkTransport] {error_msg}: {error_detail}", flush=True)
+        self.connectionStatusChanged.emit(False, error_msg)
+
+    def _on_socket_error(self, _error: QAbstractSocket.SocketError) -> None:
+        """套接字错误：连接前视为连接失败，连接后视为链路中断。"""
+        if self._socket is None:
+            return
+        error_detail = self._socket.errorString()
+        if self._is_connected:
+            self._mark_link_lost(error_detail)
+        else:
+            self._on_connect_failed(error_detail)
+
+    def _mark_link_lost(self, reason: str) -> None:
+        """关闭失效套接字，进入等待重连状态，并通知上层。"""
+        self._is_connected = False
+        self._link_lost = True
+        self._discard_socket()
+        self.isConnectedChanged.emit()
+        print(f"[NetworkTransport] link lost: {reason}", flush=True)
+        self.linkLost.emit(reason)
+
+    def _on_tcp_ready_read(self) -> None:
+        """TCP 字节流：一次读出全部可用数据，交给上层增量解析。"""
+        if self._socket is None:
+            return
+        if self._latency_tracer is not None:
+            self._latency_tracer.chunk_received()
+        data = self._socket.readAll().data()
+        if data:
+            self.dataReceived.emit(data)
+
+    def _on_udp_ready_read(self) -> None:
+        """UDP 数据报：每个数据报携带完整帧，逐个上报。"""
+        socket = self._socket
+        if not isinstance(socket, QUdpSocket):
+            return
+        while socket.hasPendingDatagrams():
+            if self._latency_tracer is not None:
+                self._latency_tracer.chunk_received()
+            datagram = socket.receiveDatagram()
+            data = datagram.data().data()
+            if data:
+                self.dataReceived.emit(data)
+
+    def _flush_pending_tx(self) -> None:
+        """写出合并缓冲，并按帧回报写入结果供统计层计数。"""
+        if self._socket is None or not self._pending_tx:
+            return
+        payload = bytes(self._pending_tx)
+        frame_sizes = self._pending_frame_sizes
+        self._pending_tx = bytearray()
+        self._pending_frame_sizes = []
+
+        written = self._socket.write(payload)
+        if written < 0:
+            print(f"[NetworkTransport] Write failed: {self._socket.errorString()}", flush=True)
+            return
+        # TCP 写入进入套接字缓冲即视为完整；按帧长依次扣减，部分写入的尾帧标记为不完整
+        remaining = written
+        for frame_size in frame_sizes:
+            frame_written = min(frame_size, remaining)
+            remaining -= frame_written
+            self.dataWritten.emit(frame_written, frame_written == frame_size)
+
+
+# ── 自测：本地回环回显服务器 ─────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import sys
+
+    from PySide6.QtCore import QCoreApplication
+    from PySide6.QtNetwork import QTcpServer
+
+    app = QCoreApplication(sys.argv)
+    print("=== NetworkTransport 自测 ===\n")
+
+    # TCP 回显服务器：原样返回收到的字节
+    server = QTcpServer()
+    server.listen(QHostAddress(QHostAddress.SpecialAddress.LocalHost), 0)
+    clients: list[QTcpSocket] = []
+
+    def _on_new_connection() -> None:
+        client = server.nextPendingConnection()
+        clients.append(client)
+        client.readyRead.connect(lambda: client.write(client.readAll()))
+
+    server.newConnection.connect(_on_new_connection)
+
+    # UDP 回显服务器
+    udp_server = QUdpSocket()
+    udp_server.bind(QHostAddress(QHostAddress.SpecialAddress.LocalHost), 0)
+
+    def _on_udp_echo() -> None:
+        while udp_server.hasPendingDatagrams():
+            datagram = udp_server.receiveDatagram()
+            udp_server.writeDatagram(datagram.data(), datagram.senderAddress(), datagram.senderPort())
+
+    udp_server.readyRead.connect(_on_udp_echo)
+
+    frames = [b"\xAA\xBB\x02\x00\x41\x00", b"\xAA\xBB\x03\x00\x81\x40"]
+    received: dict[str, bytearray] = {"tcp": bytearray(), "udp": bytearray()}
+
+    tcp_transport = NetworkTransport()
+    tcp_transport.dataReceived.connect(received["tcp"].extend)
+    tcp_transport.connectionStatusChanged.connect(
+        lambda ok, _msg: ok and [tcp_transport.sendData(frame) for frame in frames]
+    )
+    tcp_transport.openPort(f"tcp://127.0.0.1:{server.serverPort()}")
+
+    udp_transport = NetworkTransport()
+    udp_transport.dataReceived.connect(received["udp"].extend)
+    udp_transport.connectionStatusChanged.connect(
+        lambda ok, _msg: ok and [udp_transport.sendData(frame) for frame in frames]
+    )
+    udp_transport.openPort(f"udp://127.0.0.1:{udp_server.localPort()}")
+
+    QTimer.singleShot(500, app.quit)
+    app.exec()
+
+    expected = b"".join(frames)
+    assert bytes(received["tcp"]) == expected, received["tcp"]
+    assert bytes(received["udp"]) == expected, received["udp"]
+    print(f"    TCP 回显: {bytes(received['tcp']).hex(' ').upper()}")
+    print(f"    UDP 回显: {bytes(received['udp']).hex(' ').upper()}\n")
+    tcp_transport.closePort()
+    udp_transport.closePort()
+    print("所有自测通过。")
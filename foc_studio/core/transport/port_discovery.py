@@ -0,0 +1,168 @@
+"""
+Transport 层：异步串口发现
+
+职责：
+    - 在独立工作线程中枚举系统串口，避免 QSerialPortInfo 阻塞 GUI 线程
+    - 缓存最近一次枚举结果，供上层同步读取
+    - Linux 下监听 /dev 目录变化，仅在串口设备节点增删时触发重新枚举
+"""
+
+import os
+import sys
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QThread, QTimer, Signal, Slot
+from PySide6.QtSerialPort import QSerialPortInfo
+
+# /dev 目录变化后的去抖时间：USB 转串口插拔时会连续产生多次目录事件，合并为一次处理
+HOTPLUG_DEBOUNCE_MS = 300
+# Linux / macOS 下常见的串口设备节点前缀，用于从 /dev 变化中筛选出与串口相关的事件
+SERIAL_DEV_PREFIXES: tuple[str, ...] = (
+    "ttyUSB",
+    "ttyACM",
+    "ttyS",
+    "ttyAMA",
+    "ttyCH",
+    "rfcomm",
+    "tty.",
+    "cu.",
+)
+
+
+def _list_serial_dev_nodes(dev_dir: str) -> frozenset[str]:
+    """列出 dev_dir 下与串口相关的设备节点名；目录不可读时返回空集合。"""
+    try:
+        entries = os.listdir(dev_dir)
+    except OSError:
+        return frozenset()
+    return frozenset(name for name in entries if name.startswith(SERIAL_DEV_PREFIXES))
+
+
+class PortDiscoveryWorker(QObject):
+    """串口枚举工作对象，运行在后台线程中，只负责调用 QSerialPortInfo。"""
+
+    portsDiscovered = Signal(list)  # 枚举完成时发出，携带 [{"portName", "description"}, ...]
+
+    @Slot()
+    def scan(self) -> None:
+        """枚举一次系统串口，并将结果以普通 dict 列表形式回传。"""
+        ports = [
+            {"portName": port.portName(), "description": port.description()}
+            for port in QSerialPortInfo.availablePorts()
+        ]
+        self.portsDiscovered.emit(ports)
+
+
+class PortDiscoveryService(QObject):
+    """异步串口发现服务：后台线程枚举、结果缓存、Linux 热插拔监听。"""
+
+    portsDiscovered = Signal(list)  # 缓存更新后发出，携带最新串口列表
+    _scanRequested = Signal()       # 内部信号：跨线程触发 worker.scan（队列连接）
+
+    def __init__(self, parent=None, dev_dir: str = "/dev") -> None:
+        super().__init__(parent)
+        self._cached_ports: list[dict[str, str]] = []
+        # 当前是否有一次枚举在后台执行，以及执行期间是否又收到了新的请求
+        self._scan_in_flight = False
+        self._rescan_pending = False
+        # 拔出裁剪计数：枚举开始后若发生过裁剪，结果可能仍含已拔出的串口，需丢弃重扫
+        self._prune_generation = 0
+        self._scan_prune_generation = 0
+
+        self._thread = QThread(self)
+        self._thread.setObjectName("PortDiscoveryThread")
+        self._worker = PortDiscoveryWorker()
+        self._worker.moveToThread(self._thread)
+        # worker 位于后台线程，跨线程连接自动采用队列方式，scan 在后台执行
+        self._scanRequested.connect(self._worker.scan)
+        self._worker.portsDiscovered.connect(self._on_worker_ports_discovered)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+
+        # Linux 热插拔：监听 /dev 目录，去抖后比较串口节点集合，只有变化时才重新枚举
+        self._dev_dir = dev_dir
+        self._dev_nodes: frozenset[str] = frozenset()
+        self._dev_watcher: QFileSystemWatcher | None = None
+        self._hotplug_timer = QTimer(self)
+        self._hotplug_timer.setSingleShot(True)
+        self._hotplug_timer.setInterval(HOTPLUG_DEBOUNCE_MS)
+        self._hotplug_timer.timeout.connect(self._on_hotplug_timer)
+        if sys.platform.startswith("linux") and os.path.isdir(dev_dir):
+            self._dev_nodes = _list_serial_dev_nodes(dev_dir)
+            self._dev_watcher = QFileSystemWatcher([dev_dir], self)
+            self._dev_watcher.directoryChanged.connect(self._on_dev_dir_changed)
+
+    @property
+    def cachedPorts(self) -> list[dict[str, str]]:
+        """返回最近一次枚举结果的副本。"""
+        return [dict(port) for port in self._cached_ports]
+
+    @Slot()
+    def requestScan(self) -> None:
+        """请求一次后台枚举；已有枚举在执行时合并为一次补扫。"""
+        if not self._thread.isRunning():
+            return
+        if self._scan_in_flight:
+            self._rescan_pending = True
+            return
+        self._scan_in_flight = True
+        self._scan_prune_generation = self._prune_generation
+        self._scanRequested.emit()
+
+    @Slot()
+    def shutdown(self) -> None:
+        """停止热插拔监听并安全退出后台线程，应在应用退出前调用。"""
+        self._hotplug_timer.stop()
+        if self._dev_watcher is not None:
+            self._dev_watcher.directoryChanged.disconnect(self._on_dev_dir_changed)
+            self._dev_watcher = None
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait()
+
+    @Slot(list)
+    def _on_worker_ports_discovered(self, ports: list) -> None:
+        """后台枚举完成：更新缓存并通知上层；期间若有新请求则立即补扫一次。"""
+        self._scan_in_flight = False
+        if self._scan_prune_generation != self._prune_generation:
+            # 枚举期间有设备拔出并已裁剪缓存，这次结果可能把它重新发布出来，丢弃后重新枚举
+            self._rescan_pending = False
+            self.requestScan()
+            return
+
+        # 发现服务由各设备共享，新串口在这里统一打印，一次热插拔只输出一行
+        known_names = {port["portName"] for port in self._cached_ports}
+        for port in ports:
+            if port["portName"] not in known_names:
+                print(f"[PortDiscoveryService] find: {port['portName']} - {port['description']}", flush=True)
+        self._cached_ports = ports
+        self.portsDiscovered.emit(self.cachedPorts)
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self.requestScan()
+
+    @Slot(str)
+    def _on_dev_dir_changed(self, _path: str) -> None:
+        """/dev 目录发生变化，启动（或重启）去抖定时器。"""
+        self._hotplug_timer.start()
+
+    def _on_hotplug_timer(self) -> None:
+        """去抖结束：节点被移除时直接裁剪缓存，出现新节点时才触发完整枚举。"""
+        dev_nodes = _list_serial_dev_nodes(self._dev_dir)
+        if dev_nodes == self._dev_nodes:
+            return
+
+        added = dev_nodes - self._dev_nodes
+        removed = self._dev_nodes - dev_nodes
+        self._dev_nodes = dev_nodes
+
+        if added:
+            # 新设备需要通过 QSerialPortInfo 获取描述信息，交给后台线程枚举
+            self.requestScan()
+            return
+
+        # 仅有设备拔出时，无需重新枚举，直接从缓存中剔除对应串口
+        self._prune_generation += 1
+        self._cached_ports = [
+            port for port in self._cached_ports if port["portName"] not in removed
+        ]
+        self.portsDiscovered.emit(self.cachedPorts)
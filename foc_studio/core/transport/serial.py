@@ -2,7 +2,9 @@ import sys
 from typing import Dict, List
 from typing import Optional, Callable
 from PySide6.QtCore import QObject, Signal, Slot, Property
-from PySide6.QtSerialPort import QSerialPort, QSerialPortInfo
+from PySide6.QtSerialPort import QSerialPort
+
+from core.transport.port_discovery import PortDiscoveryService
 
 class mySerial(QObject):
     connectionStatusChanged = Signal(bool, str)
@@ -11,14 +13,35 @@ class mySerial(QObject):
     dataReceived = Signal(bytes)       # 发射接收到的数据
     
     dataWritten = Signal(int, bool)    # 发送后回传写入字节数与是否写入完整帧
+    linkLost = Signal(str)             # 链路意外中断（设备拔出/资源错误/上层请求复位），携带原因
+    linkRestored = Signal(str)         # reopenPort 成功恢复链路，携带串口名
+    reopenFailed = Signal(str)         # reopenPort 本次尝试失败，携带错误描述
+    aboutToClosePort = Signal()        # 即将关闭串口（fd 随后失效），直连的槽在 close 前同步执行
 
-    def __init__(self, parent=None) -> None:
+    def __init__(self, parent=None, port_discovery: PortDiscoveryService | None = None) -> None:
+        """port_discovery 为空时自建串口发现服务；多设备场景下由上层传入共享实例。"""
         super().__init__(parent)
         self._serial_port = QSerialPort(self) # create serial port object
         self._is_connected = False
         self._ports_list = [] # available ports list
+        self._manual_ports = [] # 手动添加的串口，异步扫描结果回来后需要保留
+        # 最近一次成功打开的串口参数，链路中断后按原参数重连
+        self._last_port_name = ""
+        self._last_baud_rate = 9600
+        self._link_lost = False  # True 表示链路意外中断、等待重连，区别于用户主动断开
+        self._latency_tracer = None  # 延迟追踪开启时由上层注入，在 readyRead 处打点
         self._serial_port.readyRead.connect(self.On_Data_Ready) # 关键！当串口有数据，自动调用回调函数_on_data_ready
-        self.Scan_Ports()  # 初始化时扫描串口
+        # USB 适配器复位或拔出时 QSerialPort 上报 ResourceError，转为 linkLost 交给上层重连
+        self._serial_port.errorOccurred.connect(self._on_error_occurred)
+        # 串口枚举放到后台线程执行，结果就绪后经 portsListChanged 发布给 QML
+        self._owns_port_discovery = port_discovery is None
+        self._port_discovery = port_discovery if port_discovery is not None else PortDiscoveryService(self)
+        self._port_discovery.portsDiscovered.connect(self._on_ports_discovered)
+        if self._owns_port_discovery:
+            self.Scan_Ports()  # 初始化时发起异步扫描，不阻塞启动路径
+        else:
+            # 共享发现服务已有缓存时直接复用，避免每新增一个设备都重新枚举
+            self._ports_list = self._port_discovery.cachedPorts
 
     @Property(bool, notify=isConnectedChanged)  # type: ignore
     def isConnected(self) -> bool:
@@ -30,23 +53,44 @@ class mySerial(QObject):
         """QML可读取的串口列表属性"""
         return self._ports_list
 
+    @property
+    def portName(self) -> str:
+        """返回当前会话使用的串口名；未连接且不在重连中时返回空字符串。"""
+        if self._is_connected or self._link_lost:
+            return self._last_port_name
+        return ""
+
     def Scan_Ports(self) -> None:
-        available_ports = QSerialPortInfo.availablePorts() # search available serial ports
-        
-        # Clear existing list before rescanning
-        self._ports_list.clear()
-        
-        # Scan and print available ports (now supports all platforms including macOS)
-        for port in available_ports:
-            port_name = port.portName()
-            # Remove COM-only restriction to support macOS (/dev/tty.*, /dev/cu.*) and Linux (/dev/ttyUSB*, etc.)
-            self._ports_list.append({"portName": port_name, "description": port.description()})
-            print(f"[mySerial] find: {port_name} - {port.description()}", flush=True)
-
-        #print(f"[mySerial] scanning completed，{len(self._ports_list)} ports found", flush=True)
-        #print(f"[mySerial] Current ports list: {self._ports_list}", flush=True)
+        """请求后台线程重新枚举串口，结果通过 portsListChanged 异步发布。"""
+        self._port_discovery.requestScan()
+
+    @Slot(list)
+    def _on_ports_discovered(self, ports: list) -> None:
+        """后台枚举结果就绪：合并手动添加的串口后发布给 QML（新串口由发现服务统一打印）。"""
+        discovered_names = {port["portName"] for port in ports}
+        # Remove COM-only restriction to support macOS (/dev/tty.*, /dev/cu.*) and Linux (/dev/ttyUSB*, etc.)
+        self._ports_list = ports + [
+            port for port in self._manual_ports if port["portName"] not in discovered_names
+        ]
         self.portsListChanged.emit(self._ports_list)  # 发射串口列表给QML
 
+    def setLatencyTracer(self, tracer) -> None:
+        """设置延迟追踪器（None 关闭）：每次 readyRead 记录数据块到达时刻。"""
+        self._latency_tracer = tracer
+
+    def nativeHandle(self) -> int | None:
+        """返回已打开串口的 POSIX 文件描述符，供卡顿保活线程直接写入；
+        未连接或 Windows（句柄不是 fd）时返回 None。"""
+        if sys.platform == "win32" or not self._is_connected or not self._serial_port.isOpen():
+            return None
+        handle = int(self._serial_port.handle())
+        return handle if handle >= 0 else None
+
+    def shutdown(self) -> None:
+        """退出前停止后台串口发现线程；共享实例由其创建者负责停止。"""
+        if self._owns_port_discovery:
+            self._port_discovery.shutdown()
+
     @Slot(str)
     def addManualPort(self, port_name: str) -> None:
         """手动添加串口到列表
@@ -66,7 +110,9 @@ class mySerial(QObject):
                 return
         
         # Add port to list with manual description
-        self._ports_list.append({"portName": port_name, "description": "手动添加"})
+        manual_port = {"portName": port_name, "description": "手动添加"}
+        self._manual_ports.append(manual_port)
+        self._ports_list.append(dict(manual_port))
         print(f"[mySerial] Manually added port: {port_name}", flush=True)
         self.portsListChanged.emit(self._ports_list)  # 发射更新后的串口列表给QML
 
@@ -80,33 +126,14 @@ class mySerial(QObject):
         if self._is_connected:
             print(f"[mySerial] {port_name} is already open, closing it first", flush=True)
             self.closePort()
+        # 用户主动打开新串口时放弃之前中断链路的重连状态
+        self._link_lost = False
 
-        # Serial port settings
-        self._serial_port.setPortName(port_name)
-        
         print(f"[mySerial] try to open: {port_name}, baud rate: {baud_rate}", flush=True)
-        
-        # Try to open port first (for pseudo-terminals, setting parameters before opening may fail)
-        if self._serial_port.open(QSerialPort.ReadWrite): # type: ignore
-            # Port opened successfully, now try to configure parameters
-            # For pseudo-terminals (PTY), these operations might fail, but port is still usable
-            params_ok = True
-            params_ok &= self._serial_port.setBaudRate(baud_rate)
-            params_ok &= self._serial_port.setDataBits(QSerialPort.Data8)  # type: ignore   
-            params_ok &= self._serial_port.setParity(QSerialPort.NoParity) # type: ignore    
-            params_ok &= self._serial_port.setStopBits(QSerialPort.OneStop) # type: ignore
-            params_ok &= self._serial_port.setFlowControl(QSerialPort.NoFlowControl) # type: ignore
-            
-            if params_ok:
-                print(f"[mySerial] Port parameters set: baud_rate:{baud_rate}, data_bit:8, Parity:no, stop_bit:1", flush=True)
-            else:
-                # Parameters setting failed (common for pseudo-terminals/virtual ports), but port is open
-                print(f"[mySerial] Warning: Could not set all port parameters (likely a virtual/pseudo port)", flush=True)
-                print(f"[mySerial] Port is still usable for data transfer", flush=True)
-
-            # 连接建立后先清空驱动层收发缓冲，避免把连接瞬间的残留字节计入新会话
-            self._serial_port.clear(QSerialPort.AllDirections)  # type: ignore
-            
+
+        if self._open_and_configure(port_name, baud_rate):
+            self._last_port_name = port_name
+            self._last_baud_rate = baud_rate
             self._is_connected = True
             self.isConnectedChanged.emit()
             success_msg = f"open successfully: {port_name}"
@@ -118,12 +145,109 @@ class mySerial(QObject):
             print(f"[mySerial] {error_msg}: {error_detail}", flush=True)
             self.connectionStatusChanged.emit(False, error_msg)
 
+    @Slot()
+    def reopenPort(self) -> None:
+        """按最近一次的串口参数重新打开中断的链路，成功发 linkRestored，失败发 reopenFailed。"""
+        if not self._link_lost or self._is_connected:
+            return
+
+        if self._open_and_configure(self._last_port_name, self._last_baud_rate):
+            self._link_lost = False
+            self._is_connected = True
+            self.isConnectedChanged.emit()
+            print(f"[mySerial] link restored: {self._last_port_name}", flush=True)
+            self.linkRestored.emit(self._last_port_name)
+        else:
+            self.reopenFailed.emit(self._serial_port.errorString())
+
+    @Slot(int)
+    def setBaudRate(self, baud_rate: int) -> bool:
+        """在不重开串口的情况下切换波特率，并作为后续重连的波特率；返回是否设置成功。"""
+        self._last_baud_rate = baud_rate
+        if not self._serial_port.isOpen():
+            return True
+        # 切换前清空驱动缓冲，避免旧波特率下的半帧在新波特率下被误读
+        self._serial_port.clear(QSerialPort.AllDirections)  # type: ignore
+        ok = self._serial_port.setBaudRate(baud_rate)
+        print(f"[mySerial] baud rate -> {baud_rate}: {'ok' if ok else 'failed'}", flush=True)
+        return ok
+
+    @Slot(str)
+    def dropLink(self, reason: str) -> None:
+        """上层检测到链路失效（如接收静默）时调用：关闭串口但保留重连参数。"""
+        if not self._is_connected:
+            return
+        self._mark_link_lost(reason)
+
+    def _open_and_configure(self, port_name: str, baud_rate: int) -> bool:
+        """打开串口并设置通信参数，返回是否打开成功。"""
+        # Serial port settings
+        self._serial_port.setPortName(port_name)
+
+        # Try to open port first (for pseudo-terminals, setting parameters before opening may fail)
+        if not self._serial_port.open(QSerialPort.ReadWrite): # type: ignore
+            return False
+
+        # Port opened successfully, now try to configure parameters
+        # For pseudo-terminals (PTY), these operations might fail, but port is still usable
+        params_ok = True
+        params_ok &= self._serial_port.setBaudRate(baud_rate)
+        params_ok &= self._serial_port.setDataBits(QSerialPort.Data8)  # type: ignore   
+        params_ok &= self._serial_port.setParity(QSerialPort.NoParity) # type: ignore    
+        params_ok &= self._serial_port.setStopBits(QSerialPort.OneStop) # type: ignore
+        params_ok &= self._serial_port.setFlowControl(QSerialPort.NoFlowControl) # type: ignore
+
+        if params_ok:
+            print(f"[mySerial] Port parameters set: baud_rate:{baud_rate}, data_bit:8, Parity:no, stop_bit:1", flush=True)
+        else:
+            # Parameters setting failed (common for pseudo-terminals/virtual ports), but port is open
+            print(f"[mySerial] Warning: Could not set all port parameters (likely a virtual/pseudo port)", flush=True)
+            print(f"[mySerial] Port is still usable for data transfer", flush=True)
+
+        # 连接建立后先清空驱动层收发缓冲，避免把连接瞬间的残留字节计入新会话
+        self._serial_port.clear(QSerialPort.AllDirections)  # type: ignore
+        return True
+
+    def _mark_link_lost(self, reason: str) -> None:
+        """关闭已失效的串口，进入等待重连状态，并通知上层。"""
+        # 先切换状态再关闭，避免 close 过程中再次上报的错误重入本方法
+        self._is_connected = False
+        self._link_lost = True
+        if self._serial_port.isOpen():
+            self.aboutToClosePort.emit()
+            self._serial_port.close()
+        self.isConnectedChanged.emit()
+        print(f"[mySerial] link lost: {reason}", flush=True)
+        self.linkLost.emit(reason)
+
+    def _on_error_occurred(self, error: QSerialPort.SerialPortError) -> None:
+        """串口错误回调：设备拔出/资源错误视为链路中断，其余错误仅打印。"""
+        if error == QSerialPort.SerialPortError.NoError:
+            return
+        if not self._is_connected:
+            return
+        if error in (
+            QSerialPort.SerialPortError.ResourceError,
+            QSerialPort.SerialPortError.PermissionError,
+            QSerialPort.SerialPortError.DeviceNotFoundError,
+        ):
+            self._mark_link_lost(self._serial_port.errorString())
+            return
+        print(f"[mySerial] Serial error: {self._serial_port.errorString()}", flush=True)
+
     @Slot()
     def closePort(self) -> None:
         """关闭串口"""
+        if self._link_lost:
+            # 链路中断期间用户主动断开：结束重连状态，并按正常断开流程通知上层
+            self._link_lost = False
+            print("[mySerial] Port closed", flush=True)
+            self.connectionStatusChanged.emit(False, "Port closed")
+            return
         if self._is_connected and self._serial_port.isOpen():
             # 关闭前清空驱动层缓冲，避免半帧残留到下一次连接
             self._serial_port.clear(QSerialPort.AllDirections)  # type: ignore
+            self.aboutToClosePort.emit()
             self._serial_port.close()
             self._is_connected = False
             self.isConnectedChanged.emit()  # 触发属性变化信号
@@ -153,6 +277,8 @@ class mySerial(QObject):
         """
         if self._serial_port.bytesAvailable() > 0:
             # Read all available bytes at once (more efficient than reading one by one)
+            if self._latency_tracer is not None:
+                self._latency_tracer.chunk_received()
             data = self._serial_port.readAll()
 
             bytesData = data.data() # QByteArray to bytes
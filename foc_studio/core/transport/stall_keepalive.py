@@ -0,0 +1,61 @@
+"""
+Transport 层：GUI 卡顿期间的保活发送
+
+职责：
+    - 由事件循环看门狗线程在 GUI 线程卡顿时回调，直接向串口文件描述符写入
+      预先生成的心跳/电机控制帧，避免 MCU 因 PC 心跳或电机指令超时而停机
+    - 帧内容与目标 fd 由 GUI 线程在状态变化时整体替换；写入与替换 fd 通过锁互斥，
+      保证串口关闭后不会再写入旧 fd
+    - 仅支持 POSIX 串口；网络传输与 Windows 串口不启用
+"""
+
+import os
+import threading
+import time
+
+# 卡顿期间的代发周期，与电机控制定时器周期一致
+STALL_KEEPALIVE_INTERVAL_S = 0.5
+
+
+class StallKeepalive:
+    """卡顿保活发送器：看门狗线程调用 on_stall，GUI 线程调用 set_target / set_frames。"""
+
+    def __init__(self, interval_s: float = STALL_KEEPALIVE_INTERVAL_S) -> None:
+        self._interval_s = interval_s
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._frames: tuple[bytes, ...] = ()
+        self._last_sent_at = 0.0
+        self._sent_count = 0
+
+    @property
+    def sentCount(self) -> int:
+        """返回累计代发的帧数。"""
+        return self._sent_count
+
+    def set_target(self, fd: int | None) -> None:
+        """设置写入目标 fd；传 None 停止代发（串口关闭前必须调用）。"""
+        with self._lock:
+            self._fd = fd
+
+    def set_frames(self, frames: tuple[bytes, ...]) -> None:
+        """整体替换卡顿期间要代发的帧。"""
+        self._frames = frames
+
+    def on_stall(self, _stalled_s: float) -> None:
+        """看门狗线程回调：距上次代发满一个周期时写出全部帧。"""
+        now = time.perf_counter()
+        if now - self._last_sent_at < self._interval_s:
+            return
+        frames = self._frames
+        with self._lock:
+            if self._fd is None or not frames:
+                return
+            self._last_sent_at = now
+            try:
+                for frame in frames:
+                    os.write(self._fd, frame)
+                    self._sent_count += 1
+            except OSError as exc:
+                print(f"[StallKeepalive] write failed: {exc}", flush=True)
+                self._fd = None
@@ -1,7 +1,17 @@
+import time
+
+# 启动计时起点：须早于其余导入，StartupTimer 以此计算 imports 阶段耗时
+_STARTUP_PERF = time.perf_counter()
+
 import os
 import sys
 from pathlib import Path
 
+from core.import_profiler import IMPORT_PROFILE_ENV, ImportProfiler
+
+# 可选的导入耗时统计，须在 PySide6 与后端模块导入之前安装
+_IMPORT_PROFILER = ImportProfiler.install_from_env(os.environ)
+
 
 def _binary_dir() -> Path:
     """返回当前解释器或已编译程序所在目录。"""
@@ -65,11 +75,18 @@ def _configure_runtime_environment() -> None:
 
 _configure_runtime_environment()
 
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    # 无界面模式：只构建后端流水线，不导入 QtGui / QtQml
+    from core.headless_runner import main as headless_main
+
+    sys.exit(headless_main(sys.argv[1:]))
+
 from PySide6.QtCore import QUrl
 from PySide6.QtGui import QGuiApplication, QIcon
 from PySide6.QtQml import QQmlApplicationEngine
 
-from core.backend_facade import BackendFacade
+from core.session_manager import SessionManager
+from core.startup_timing import StartupTimer
 
 
 def _main_qml_path() -> Path:
@@ -80,6 +97,52 @@ def _application_icon_path() -> Path:
     return _application_base_dir() / "ui" / "assets" / "app.ico"
 
 
+def _metrics_port() -> int | None:
+    """读取可选的本地指标端口（环境变量 FOC_STUDIO_METRICS_PORT），未设置或非法时不启用。"""
+    port_text = os.environ.get("FOC_STUDIO_METRICS_PORT", "").strip()
+    if not port_text:
+        return None
+    try:
+        port = int(port_text)
+    except ValueError:
+        print(f"Invalid FOC_STUDIO_METRICS_PORT: {port_text}", file=sys.stderr)
+        return None
+    return port if 0 <= port <= 65535 else None
+
+
+def _archive_directory() -> str | None:
+    """读取可选的遥测归档目录（环境变量 FOC_STUDIO_ARCHIVE_DIR），未设置时不启用。"""
+    directory = os.environ.get("FOC_STUDIO_ARCHIVE_DIR", "").strip()
+    return os.path.abspath(os.path.expanduser(directory)) if directory else None
+
+
+def _session_database_path() -> str | None:
+    """读取可选的运行记录数据库路径（环境变量 FOC_STUDIO_SESSION_DB），未设置时不启用。"""
+    path = os.environ.get("FOC_STUDIO_SESSION_DB", "").strip()
+    if not path:
+        return None
+    path = os.path.abspath(os.path.expanduser(path))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def _configure_qml_disk_cache(base_dir: Path) -> None:
+    """QML 编译缓存放在应用目录下（可写时），免安装包在车间电脑上清理用户缓存后也无需重新编译。
+
+    Qt 6 以文件绝对路径为键缓存编译结果，不读取源文件旁的 .qmlc，因此无法在打包时预生成，
+    首次运行编译一次后即可复用。
+    """
+    if "QML_DISK_CACHE_PATH" in os.environ:
+        return
+    cache_dir = base_dir / "qmlcache"
+    try:
+        cache_dir.mkdir(exist_ok=True)
+    except OSError:
+        return
+    if os.access(cache_dir, os.W_OK):
+        os.environ["QML_DISK_CACHE_PATH"] = str(cache_dir)
+
+
 def _report_qml_warnings(warnings: list) -> None:
     for warning in warnings:
         print(warning.toString(), file=sys.stderr)
@@ -92,19 +155,49 @@ if __name__ == "__main__":
         print(f"Missing QML entry file: {qml_path}", file=sys.stderr)
         sys.exit(-1)
 
+    startup_timer = StartupTimer(_STARTUP_PERF)
+    startup_timer.mark("imports")
+    _configure_qml_disk_cache(base_dir)
     app = QGuiApplication(sys.argv)
+    startup_timer.mark("app")
     icon_path = _application_icon_path()
     if icon_path.is_file():
         # 设置运行时窗口图标，避免标题栏和任务栏回退到默认 PySide 图标
         app.setWindowIcon(QIcon(str(icon_path)))
+
+    # 创建多设备会话管理器，默认托管一台设备（每台设备内部完成对象创建与信号连接）
+    session_manager = SessionManager()
+    session_manager.addSession()
+    # 可选：把遥测样本与 MCU 日志持续归档到磁盘（后台线程写入，按大小/时长滚动）
+    archive_directory = _archive_directory()
+    if archive_directory is not None:
+        session_manager.setArchiveDirectory(archive_directory)
+    # 可选：测试台运行记录，每次连接的遥测、控制参数、MCU 版本与错误码写入 SQLite
+    session_database_path = _session_database_path()
+    if session_database_path is not None:
+        session_manager.setSessionDatabase(session_database_path)
+    # 应用退出前停止后端后台线程，避免 QThread 在运行中被销毁
+    app.aboutToQuit.connect(session_manager.shutdown)
+    startup_timer.mark("backend")
+
     engine = QQmlApplicationEngine()
     engine.warnings.connect(_report_qml_warnings)
 
-    # 创建系统控制中心（内部完成对象创建与信号连接）
-    backend = BackendFacade()
+    # 测试台无人值守时可开启本地 Prometheus 指标端点
+    metrics_port = _metrics_port()
+    if metrics_port is not None:
+        from core.service.metrics_server import MetricsServer
+
+        metrics_server = MetricsServer(session_manager, metrics_port)
+        if metrics_server.start():
+            app.aboutToQuit.connect(metrics_server.shutdown)
 
-    # 暴露给QML
-    engine.rootContext().setContextProperty("backend", backend)
+    # 暴露给QML：backend 始终指向当前选中的设备，切换设备时重新注入
+    engine.rootContext().setContextProperty("sessionManager", session_manager)
+    engine.rootContext().setContextProperty("backend", session_manager.activeBackend)
+    session_manager.activeBackendChanged.connect(
+        lambda active_backend: engine.rootContext().setContextProperty("backend", active_backend)
+    )
 
     # Ensure bundled Qt QML modules and local components resolve in deployed builds.
     engine.addImportPath(str(qml_path.parent))
@@ -112,11 +205,24 @@ if __name__ == "__main__":
     if bundled_qml_dir.is_dir():
         engine.addImportPath(str(bundled_qml_dir))
 
+    startup_timer.mark("engine")
+
     # 加载QML文件
     engine.load(QUrl.fromLocalFile(str(qml_path)))
 
     if not engine.rootObjects():
         print(f"Failed to load root QML object from: {qml_path}", file=sys.stderr)
         sys.exit(-1)
+    startup_timer.mark("qml")
+    startup_timer.watchFirstFrame(engine.rootObjects()[0])
+    if _IMPORT_PROFILER is not None:
+        # 首帧之后的导入不影响启动耗时，汇总后卸载计时 finder
+        profile_target = os.environ[IMPORT_PROFILE_ENV].strip()
+
+        def _report_import_profile() -> None:
+            _IMPORT_PROFILER.uninstall()
+            _IMPORT_PROFILER.report(profile_target if profile_target.lower().endswith(".csv") else None)
+
+        startup_timer.firstFrameShown.connect(_report_import_profile)
 
     sys.exit(app.exec())
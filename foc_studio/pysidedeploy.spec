@@ -10,8 +10,8 @@ packages = Nuitka==2.7.11
 python_path = C:\Users\wallace.zhang\.pyenv\pyenv-win\versions\3.10.11\python.exe
 
 [qt]
-qml_files = ui/QMLFiles/CAN.qml,ui/QMLFiles/CHT.qml,ui/QMLFiles/Main.qml,ui/QMLFiles/MOT.qml,ui/QMLFiles/SYS.qml,ui/QMLFiles/TUNE.qml
-modules = Core,Graphs,Gui,Qml,SerialPort
+qml_files = ui/QMLFiles/CAN.qml,ui/QMLFiles/CHT.qml,ui/QMLFiles/HALL.qml,ui/QMLFiles/LOG.qml,ui/QMLFiles/Main.qml,ui/QMLFiles/MOT.qml,ui/QMLFiles/QD.qml,ui/QMLFiles/SYS.qml,ui/QMLFiles/TUNE.qml,ui/QMLFiles/qmldir
+modules = Core,Graphs,Gui,Network,Qml,SerialPort
 plugins = accessiblebridge,egldeviceintegrations,generic,iconengines,imageformats,platforminputcontexts,platforms,platforms/darwin,platformthemes,qmllint,qmltooling,xcbglintegrations
 
 [nuitka]
@@ -14,19 +14,27 @@ Rectangle {
     property bool isPageActive: false
     property int currentSpeed: 0
     property real currentCurrent: 0.0
-    property int chartRefreshIntervalMs: 50
-    property int axisRefreshIntervalMs: 250
+    // 刷新节拍由全进程共享的调度器给出，周期随刷新耗时与事件循环负载在 16~200 ms 间自适应
+    property var refreshScheduler: sessionManager ? sessionManager.refreshScheduler : null
+    readonly property string refreshClientName: "CHT"
     property int axisIdleGraceMs: 200
     property int timeWindowMs: 5000
-    property var speedSamples: []
-    property var currentSamples: []
-    property var pendingSpeedSamples: []
-    property var pendingCurrentSamples: []
+    // 波形样本缓存在 Python 侧环形缓冲，页面只在刷新节拍上让它批量同步曲线
+    property var chartData: backend ? backend.chartData : null
+    // 长时间历史由 Python 侧多分辨率金字塔保存；滚轮缩放或拖拽曲线进入回看模式
+    // traceRenderer 为 sceneGraph 时实时曲线改由 WaveformItem 直接从环形缓冲绘制，回看模式仍使用 LineSeries
+    readonly property bool sceneGraphTraces: chartData ? chartData.traceRenderer === "sceneGraph" : false
+    property var speedWave: null
+    property var currentWave: null
+    property var telemetryHistory: backend ? backend.telemetryHistory : null
+    property bool historyMode: false
+    property double historyEndMs: 0
+    property double historySpanMs: timeWindowMs
+    property int historyMinSpanMs: 500
     property int speedSampleCount: 0
     property int currentSampleCount: 0
     property double chartStartTimestampMs: 0
     property double latestTimestampMs: 0
-    property double lastAxisRefreshTimestampMs: 0
     property double _smoothAxisMs: 0.0
     property real axisMinSeconds: 0.0
     property real axisMaxSeconds: timeWindowMs / 1000.0
@@ -40,32 +48,13 @@ Rectangle {
         return (timestampMs - root.chartStartTimestampMs) / 1000.0
     }
 
-    // 将待刷新的样本增量追加到曲线尾部，避免 clear + append 全量重建
-    function appendPendingSamples(samples, pendingSamples, series) {
-        if (pendingSamples.length === 0)
-            return false
-
-        for (var index = 0; index < pendingSamples.length; index += 1) {
-            var sample = pendingSamples[index]
-            sample.xValue = root.sampleToXValue(sample.timestamp)
-            samples.push(sample)
-            series.append(sample.xValue, sample.value)
-        }
-        return true
-    }
-
-    // 仅从历史窗口头部移除过期点，保持图表更新复杂度与新增样本数一致
-    function trimSeriesHead(samples, series, minTimestamp) {
-        var removeCount = 0
-
-        while (removeCount < samples.length && samples[removeCount].timestamp < minTimestamp)
-            removeCount += 1
-
-        if (removeCount <= 0)
-            return
-
-        samples.splice(0, removeCount)
-        series.removeMultiple(0, removeCount)
+    // 取两个通道中较早的有效时间戳作为曲线 X 轴原点（0 表示通道无样本）
+    function earliestTimestamp(firstMs, secondMs) {
+        if (firstMs <= 0)
+            return secondMs
+        if (secondMs <= 0)
+            return firstMs
+        return Math.min(firstMs, secondMs)
     }
 
     // X 轴改为独立时钟平滑滑动，避免跟随样本批量到达而偶发跳动
@@ -81,12 +70,42 @@ Rectangle {
         var axisMax = Math.max(windowSeconds, latestSeconds)
         root.axisMinSeconds = Math.max(0.0, axisMax - windowSeconds)
         root.axisMaxSeconds = axisMax
+        root.syncWaveforms()
+    }
+
+    // 首次使用场景图绘制时在各曲线绘图区上创建 WaveformItem
+    function ensureWaveforms() {
+        if (!root.sceneGraphTraces || !root.chartData || root.speedWave)
+            return
+        root.speedWave = root.chartData.createWaveform(speedTraceHost, "speed")
+        root.speedWave.setColor(speedSeries.color)
+        root.currentWave = root.chartData.createWaveform(currentTraceHost, "current")
+        root.currentWave.setColor(currentSeries.color)
+    }
+
+    // 新样本到达或曲线清空后通知 WaveformItem 重建顶点
+    function refreshWaveforms() {
+        if (!root.speedWave)
+            return
+        root.speedWave.refresh()
+        root.currentWave.refresh()
+        root.syncWaveforms()
+    }
+
+    // 把当前坐标范围交给 WaveformItem：只平移/缩放时下一帧仅更新变换矩阵
+    function syncWaveforms() {
+        if (!root.speedWave)
+            return
+        root.speedWave.setViewport(root.chartStartTimestampMs, root.axisMinSeconds, root.axisMaxSeconds,
+                                   root.speedAxisMinValue, root.speedAxisMaxValue)
+        root.currentWave.setViewport(root.chartStartTimestampMs, root.axisMinSeconds, root.axisMaxSeconds,
+                                     root.currentAxisMinValue, root.currentAxisMaxValue)
     }
 
     // 使用帧时间（frameTime）平滑推进横轴，避免 Date.now() 在 Windows 上
     // 约 15ms 步进精度导致的轴标签跳动；若遥测停止则冻结窗口。
     function tickAxisWindow() {
-        if (!root.isPageActive || root.chartStartTimestampMs <= 0 || root.latestTimestampMs <= 0) {
+        if (!root.isPageActive || root.historyMode || root.chartStartTimestampMs <= 0 || root.latestTimestampMs <= 0) {
             root._smoothAxisMs = 0.0
             axisFrameAnimation.stop()
             return
@@ -119,237 +138,153 @@ Rectangle {
         }
     }
 
-    // 当前值超出坐标轴时立即重算，正常情况下按较低频率更新 Y 轴
-    function shouldRefreshAxis(latestValue, axisMin, axisMax) {
-        return latestValue < axisMin || latestValue > axisMax
+    // 历史中速度/电流两个通道合并后的 [最早, 最新] 时间戳；无历史时返回 null
+    function historyTimeRange() {
+        if (!root.telemetryHistory)
+            return null
+        var speedRange = root.telemetryHistory.timeRange("speed")
+        var currentRange = root.telemetryHistory.timeRange("current")
+        var latestMs = Math.max(speedRange[1], currentRange[1])
+        if (latestMs <= 0)
+            return null
+        return [root.earliestTimestamp(speedRange[0], currentRange[0]), latestMs]
     }
 
-    // 将 Y 轴的全量扫描降到低频执行，减少图表布局与重绘抖动
-    function maybeRefreshAxisRanges(forceRefresh) {
-        if (root.latestTimestampMs <= 0) {
-            root.updateSpeedAxisRange([])
-            root.updateCurrentAxisRange([])
-            return
-        }
+    // 停止实时刷新，从当前实时窗口开始回看
+    function enterHistoryMode() {
+        if (root.historyMode)
+            return true
+        var range = root.historyTimeRange()
+        if (!range || !root.chartData)
+            return false
+        root.cancelFlushPendingTelemetry()
+        axisFrameAnimation.stop()
+        root.historyMode = true
+        root.historyEndMs = range[1]
+        root.historySpanMs = root.timeWindowMs
+        return true
+    }
 
-        var shouldRefresh = forceRefresh
-                            || root.lastAxisRefreshTimestampMs <= 0
-                            || root.latestTimestampMs - root.lastAxisRefreshTimestampMs >= root.axisRefreshIntervalMs
-                            || root.shouldRefreshAxis(root.currentSpeed, root.speedAxisMinValue, root.speedAxisMaxValue)
-                            || root.shouldRefreshAxis(root.currentCurrent, root.currentAxisMinValue, root.currentAxisMaxValue)
-        if (!shouldRefresh)
+    // 按回看窗口向 Python 侧查询历史，X 轴为相对回看窗口右端的秒数（负值表示更早）
+    function renderHistory() {
+        var range = root.historyTimeRange()
+        if (!range)
             return
+        var maxSpanMs = Math.max(range[1] - range[0], root.timeWindowMs)
+        root.historySpanMs = Math.min(Math.max(root.historySpanMs, root.historyMinSpanMs), maxSpanMs)
+        root.historyEndMs = Math.max(Math.min(root.historyEndMs, range[1]),
+                                     Math.min(range[1], range[0] + root.historySpanMs))
+        var startMs = root.historyEndMs - root.historySpanMs
+        root.axisMinSeconds = -root.historySpanMs / 1000.0
+        root.axisMaxSeconds = 0.0
+        root.chartData.fillHistorySeries("speed", speedSeries, startMs, root.historyEndMs,
+                                         root.historyEndMs, speedGraph.width)
+        root.chartData.fillHistorySeries("current", currentSeries, startMs, root.historyEndMs,
+                                         root.historyEndMs, currentGraph.width)
+    }
 
-        root.updateSpeedAxisRange(root.speedSamples)
-        root.updateCurrentAxisRange(root.currentSamples)
-        root.lastAxisRefreshTimestampMs = root.latestTimestampMs
+    // 以指针所在位置为锚点缩放回看时间跨度
+    function zoomHistory(factor, anchorFraction) {
+        if (!root.enterHistoryMode())
+            return
+        var anchorMs = root.historyEndMs - root.historySpanMs * (1.0 - anchorFraction)
+        root.historySpanMs = root.historySpanMs * factor
+        root.historyEndMs = anchorMs + root.historySpanMs * (1.0 - anchorFraction)
+        root.renderHistory()
     }
 
-    // 将高频遥测先缓存成批，等下一次定时刷新时统一并入曲线
-    function enqueueTelemetry(isSpeedSample, value, timestampMs) {
-        var sample = { "timestamp": timestampMs, "value": value }
-        if (isSpeedSample)
-            root.pendingSpeedSamples.push(sample)
-        else
-            root.pendingCurrentSamples.push(sample)
+    // 拖拽平移：向右拖动查看更早的数据
+    function panHistory(deltaPx, widthPx) {
+        if (widthPx <= 0 || !root.enterHistoryMode())
+            return
+        root.historyEndMs -= deltaPx / widthPx * root.historySpanMs
+        root.renderHistory()
+    }
 
-        root.scheduleFlushPendingTelemetry()
+    // 退出回看：清空曲线后由下一批遥测重新开始实时显示
+    function returnToLive() {
+        root.resetCharts()
     }
 
-    // 仅在存在新遥测时启动刷新定时器，避免图表页前台空转。
+    // 仅在存在新遥测时向调度器申请刷新，避免图表页前台空转。
     function scheduleFlushPendingTelemetry() {
-        if (root.isPageActive && !chartRefreshTimer.running)
-            chartRefreshTimer.start()
+        if (root.isPageActive && root.refreshScheduler)
+            root.refreshScheduler.requestRefresh(root.refreshClientName)
     }
 
-    // 固定刷新频率读取最近一次遥测值，把高频信号收敛为可控的 UI 刷新节奏
-    function flushPendingTelemetry() {
-        if (!root.isPageActive)
-            return
-
-        var latestTimestampMs = root.latestTimestampMs
-        var hasNewSamples = false
-
-        if (root.pendingSpeedSamples.length > 0) {
-            latestTimestampMs = Math.max(
-                        latestTimestampMs,
-                        root.pendingSpeedSamples[root.pendingSpeedSamples.length - 1].timestamp)
-            hasNewSamples = true
-        }
-
-        if (root.pendingCurrentSamples.length > 0) {
-            latestTimestampMs = Math.max(
-                        latestTimestampMs,
-                        root.pendingCurrentSamples[root.pendingCurrentSamples.length - 1].timestamp)
-            hasNewSamples = true
-        }
-
-        if (!hasNewSamples) {
-            chartRefreshTimer.stop()
-            return
-        }
-
-        if (root.chartStartTimestampMs <= 0) {
-            var earliestTimestampMs = latestTimestampMs
-            if (root.pendingSpeedSamples.length > 0)
-                earliestTimestampMs = Math.min(earliestTimestampMs, root.pendingSpeedSamples[0].timestamp)
-            if (root.pendingCurrentSamples.length > 0)
-                earliestTimestampMs = Math.min(earliestTimestampMs, root.pendingCurrentSamples[0].timestamp)
-            root.chartStartTimestampMs = earliestTimestampMs
-        }
-
-        root.appendPendingSamples(root.speedSamples, root.pendingSpeedSamples, speedSeries)
-        root.appendPendingSamples(root.currentSamples, root.pendingCurrentSamples, currentSeries)
-        root.pendingSpeedSamples = []
-        root.pendingCurrentSamples = []
-        root.latestTimestampMs = latestTimestampMs
-        var minTimestamp = root.latestTimestampMs - root.timeWindowMs
-        root.trimSeriesHead(root.speedSamples, speedSeries, minTimestamp)
-        root.trimSeriesHead(root.currentSamples, currentSeries, minTimestamp)
-        root.speedSampleCount = root.speedSamples.length
-        root.currentSampleCount = root.currentSamples.length
-        root.ensureAxisScrollRunning()
-        root.maybeRefreshAxisRanges(false)
-        chartRefreshTimer.stop()
+    // 撤销尚未执行的刷新（进入回看、页面切换）
+    function cancelFlushPendingTelemetry() {
+        if (root.refreshScheduler)
+            root.refreshScheduler.cancelRefresh(root.refreshClientName)
     }
 
-    // 根据最近 5 秒转速样本自适应 Y 轴，兼顾低速电机与高速电机的显示分辨率
-    function updateSpeedAxisRange(samples) {
-        if (samples.length === 0) {
-            root.speedAxisMinValue = -3000.0
-            root.speedAxisMaxValue = 3000.0
+    // 在共享刷新节拍上把 Python 侧新增样本批量并入曲线，把高频信号收敛为可控的 UI 刷新节奏
+    function flushPendingTelemetry() {
+        if (!root.isPageActive || !root.chartData || root.historyMode)
             return
-        }
-
-        var minValue = samples[0].value
-        var maxValue = samples[0].value
-        for (var index = 1; index < samples.length; index += 1) {
-            var sampleValue = samples[index].value
-            minValue = Math.min(minValue, sampleValue)
-            maxValue = Math.max(maxValue, sampleValue)
-        }
-
-        var axisMin = minValue
-        var axisMax = maxValue
-
-        if (axisMin >= 0)
-            axisMin = 0
-        else if (axisMax <= 0)
-            axisMax = 0
-
-        var span = axisMax - axisMin
-        var minimumSpan = 200.0
-        if (span < minimumSpan) {
-            if (axisMin >= 0) {
-                axisMax = axisMin + minimumSpan
-            } else if (axisMax <= 0) {
-                axisMin = axisMax - minimumSpan
-            } else {
-                var centerValue = (axisMin + axisMax) / 2.0
-                axisMin = centerValue - minimumSpan / 2.0
-                axisMax = centerValue + minimumSpan / 2.0
-            }
-            span = axisMax - axisMin
-        }
-
-        var padding = Math.max(span * 0.15, 30.0)
-        if (axisMin >= 0)
-            axisMin = Math.max(0, axisMin - padding)
-        else
-            axisMin = axisMin - padding
-
-        if (axisMax <= 0)
-            axisMax = Math.min(0, axisMax + padding)
-        else
-            axisMax = axisMax + padding
 
-        root.speedAxisMinValue = axisMin
-        root.speedAxisMaxValue = axisMax
-    }
-
-    // 根据最近 5 秒电流样本自适应 Y 轴，兼顾 0A 基线与小电流可读性
-    function updateCurrentAxisRange(samples) {
-        if (samples.length === 0) {
-            root.currentAxisMinValue = 0.0
-            root.currentAxisMaxValue = 0.3
+        var chartData = root.chartData
+        if (!chartData.hasPendingSamples("speed") && !chartData.hasPendingSamples("current"))
             return
-        }
 
-        var minValue = samples[0].value
-        var maxValue = samples[0].value
-        for (var index = 1; index < samples.length; index += 1) {
-            var sampleValue = samples[index].value
-            minValue = Math.min(minValue, sampleValue)
-            maxValue = Math.max(maxValue, sampleValue)
+        if (root.chartStartTimestampMs <= 0) {
+            root.chartStartTimestampMs = root.earliestTimestamp(chartData.firstTimestampMs("speed"),
+                                                                chartData.firstTimestampMs("current"))
         }
 
-        var axisMin = minValue
-        var axisMax = maxValue
-
-        if (axisMin >= 0)
-            axisMin = 0
-        else if (axisMax <= 0)
-            axisMax = 0
-
-        var span = axisMax - axisMin
-        var minimumSpan = 0.4
-        if (span < minimumSpan) {
-            if (axisMin >= 0) {
-                axisMax = axisMin + minimumSpan
-            } else if (axisMax <= 0) {
-                axisMin = axisMax - minimumSpan
-            } else {
-                var centerValue = (axisMin + axisMax) / 2.0
-                axisMin = centerValue - minimumSpan / 2.0
-                axisMax = centerValue + minimumSpan / 2.0
-            }
-            span = axisMax - axisMin
+        if (root.sceneGraphTraces) {
+            // WaveformItem 在下一帧直接读取环形缓冲，这里只推进窗口与坐标轴
+            root.ensureWaveforms()
+            root.speedSampleCount = chartData.advanceWindow("speed", root.timeWindowMs)
+            root.currentSampleCount = chartData.advanceWindow("current", root.timeWindowMs)
+        } else {
+            // 传入曲线宽度：样本密度超过像素列数时由 Python 侧降采样，点数只随宽度增长
+            root.speedSampleCount = chartData.updateSeries("speed", speedSeries, root.chartStartTimestampMs,
+                                                           root.timeWindowMs, speedGraph.width)
+            root.currentSampleCount = chartData.updateSeries("current", currentSeries, root.chartStartTimestampMs,
+                                                             root.timeWindowMs, currentGraph.width)
         }
-
-        var padding = Math.max(span * 0.15, 0.1)
-        if (axisMin >= 0)
-            axisMin = Math.max(0, axisMin - padding)
-        else
-            axisMin = axisMin - padding
-
-        if (axisMax <= 0)
-            axisMax = Math.min(0, axisMax + padding)
-        else
-            axisMax = axisMax + padding
-
-        root.currentAxisMinValue = axisMin
-        root.currentAxisMaxValue = axisMax
+        root.currentSpeed = chartData.latestValue("speed")
+        root.currentCurrent = chartData.latestValue("current")
+        root.latestTimestampMs = Math.max(root.latestTimestampMs,
+                                          chartData.latestTimestampMs("speed"),
+                                          chartData.latestTimestampMs("current"))
+        root.ensureAxisScrollRunning()
+        root.refreshWaveforms()
     }
 
     // 断开串口后清空控制输入与波形缓存，避免显示旧会话数据
     function resetCharts() {
-        root.speedSamples = []
-        root.currentSamples = []
-        root.pendingSpeedSamples = []
-        root.pendingCurrentSamples = []
+        if (root.chartData) {
+            root.chartData.clearChannel("speed")
+            root.chartData.clearChannel("current")
+        }
+        root.historyMode = false
         root.speedSampleCount = 0
         root.currentSampleCount = 0
         root.chartStartTimestampMs = 0
         root.latestTimestampMs = 0
-        root.lastAxisRefreshTimestampMs = 0
         root._smoothAxisMs = 0.0
         root.axisMinSeconds = 0.0
         root.axisMaxSeconds = root.timeWindowMs / 1000.0
         root.speedAxisMinValue = -3000.0
         root.speedAxisMaxValue = 3000.0
         root.currentAxisMinValue = 0.0
-        root.currentAxisMaxValue = 0.4
+        root.currentAxisMaxValue = 0.3
         speedSeries.clear()
         currentSeries.clear()
         axisFrameAnimation.stop()
+        root.refreshWaveforms()
     }
 
-    Timer {
-        id: chartRefreshTimer
-        interval: root.chartRefreshIntervalMs
-        repeat: false
-        running: false
-        onTriggered: root.flushPendingTelemetry()
+    Connections {
+        target: root.refreshScheduler
+        enabled: root.refreshScheduler !== null
+
+        function onRefreshDue(client) {
+            if (client === root.refreshClientName)
+                root.flushPendingTelemetry()
+        }
     }
 
     FrameAnimation {
@@ -367,18 +302,26 @@ Rectangle {
         }
     }
 
+    // 切出页面时重置曲线；切回时不再清空，后台期间进入环形缓冲的样本随即刷新到曲线
     onIsPageActiveChanged: {
+        if (root.refreshScheduler)
+            root.refreshScheduler.setClientActive(root.refreshClientName, root.isPageActive)
         if (!root.isPageActive) {
-            chartRefreshTimer.stop()
+            root.cancelFlushPendingTelemetry()
             root.resetCharts()
             return
         }
 
         root.ensureAxisScrollRunning()
-        if (root.pendingSpeedSamples.length > 0 || root.pendingCurrentSamples.length > 0)
+        if (root.chartData && (root.chartData.hasPendingSamples("speed") || root.chartData.hasPendingSamples("current")))
             root.scheduleFlushPendingTelemetry()
     }
 
+    Component.onCompleted: {
+        if (root.refreshScheduler)
+            root.refreshScheduler.setClientActive(root.refreshClientName, root.isPageActive)
+    }
+
     // 输入框组件：用于目标速度输入
     component InputField: Rectangle {
         id: control
@@ -455,6 +398,30 @@ Rectangle {
         }
     }
 
+    // 历史回看手势：滚轮以指针为锚点缩放时间跨度，水平拖拽平移；首次操作即进入回看模式
+    component HistoryNavigator: Item {
+        id: navigator
+        property real lastTranslationX: 0
+
+        WheelHandler {
+            target: null
+            onWheel: function(event) {
+                root.zoomHistory(event.angleDelta.y > 0 ? 0.8 : 1.25,
+                                 Math.min(Math.max(event.x / Math.max(1, navigator.width), 0.0), 1.0))
+            }
+        }
+
+        DragHandler {
+            target: null
+            yAxis.enabled: false
+            onActiveChanged: navigator.lastTranslationX = 0
+            onTranslationChanged: {
+                root.panHistory(translation.x - navigator.lastTranslationX, navigator.width)
+                navigator.lastTranslationX = translation.x
+            }
+        }
+    }
+
     // 波形卡片组件：统一标题、当前值和波形容器外观
     component GraphPanel: Rectangle {
         id: panel
@@ -570,6 +537,23 @@ Rectangle {
                     Layout.fillWidth: true
                 }
 
+                Text {
+                    visible: root.historyMode
+                    text: "回看 " + (root.historySpanMs / 1000.0).toFixed(1) + " s"
+                    font.pixelSize: 12
+                    color: "#7f8c8d"
+                    Layout.alignment: Qt.AlignVCenter
+                }
+
+                ActionButton {
+                    text: "实时"
+                    visible: root.historyMode
+                    Layout.alignment: Qt.AlignVCenter
+                    normalColor: "#2980b9"
+                    pressedColor: "#1f618d"
+                    onClicked: root.returnToLive()
+                }
+
                 ActionButton {
                     text: "启动"
                     Layout.alignment: Qt.AlignVCenter
@@ -600,6 +584,7 @@ Rectangle {
                               : "--"
 
             GraphsView {
+                id: speedGraph
                 anchors.fill: parent
                 theme: GraphsTheme {
                     colorScheme: GraphsTheme.ColorScheme.Dark
@@ -624,8 +609,23 @@ Rectangle {
                 LineSeries {
                     id: speedSeries
                     color: '#0731ee'
+                    visible: !root.sceneGraphTraces || root.historyMode
                 }
             }
+
+            // WaveformItem 宿主：与绘图区重合
+            Item {
+                id: speedTraceHost
+                x: speedGraph.x + speedGraph.plotArea.x
+                y: speedGraph.y + speedGraph.plotArea.y
+                width: speedGraph.plotArea.width
+                height: speedGraph.plotArea.height
+                visible: root.sceneGraphTraces && !root.historyMode
+            }
+
+            HistoryNavigator {
+                anchors.fill: speedGraph
+            }
         }
 
         GraphPanel {
@@ -638,6 +638,7 @@ Rectangle {
                               : "--"
 
             GraphsView {
+                id: currentGraph
                 anchors.fill: parent
                 theme: GraphsTheme {
                     colorScheme: GraphsTheme.ColorScheme.Dark
@@ -662,24 +663,45 @@ Rectangle {
                 LineSeries {
                     id: currentSeries
                     color: '#dff708'
+                    visible: !root.sceneGraphTraces || root.historyMode
                 }
             }
+
+            Item {
+                id: currentTraceHost
+                x: currentGraph.x + currentGraph.plotArea.x
+                y: currentGraph.y + currentGraph.plotArea.y
+                width: currentGraph.plotArea.width
+                height: currentGraph.plotArea.height
+                visible: root.sceneGraphTraces && !root.historyMode
+            }
+
+            HistoryNavigator {
+                anchors.fill: currentGraph
+            }
         }
     }
 
     Connections {
-        target: backend
-        enabled: backend !== null && root.isPageActive
+        target: root.chartData
+        enabled: root.chartData !== null && root.isPageActive
 
-        // 后端信号驱动页面状态与曲线刷新，保持 UI 不接触协议层
-        function onSpeedUpdated(rpm, timestampMs) {
-            root.currentSpeed = rpm
-            root.enqueueTelemetry(true, rpm, timestampMs)
+        // 每个刷新周期每个通道最多通知一次，样本本身留在 Python 侧
+        function onSamplesAvailable(channel) {
+            if (!root.historyMode && (channel === "speed" || channel === "current"))
+                root.scheduleFlushPendingTelemetry()
         }
 
-        function onMotorCurrentUpdated(amps, timestampMs) {
-            root.currentCurrent = amps
-            root.enqueueTelemetry(false, amps, timestampMs)
+        // Y 轴范围由 Python 侧单调队列维护窗口极值后给出，超出坐标轴立即扩展、收缩按固定间隔
+        function onAxisRangeChanged(axis, minValue, maxValue) {
+            if (axis === "speed") {
+                root.speedAxisMinValue = minValue
+                root.speedAxisMaxValue = maxValue
+            } else if (axis === "current") {
+                root.currentAxisMinValue = minValue
+                root.currentAxisMaxValue = maxValue
+            }
+            root.syncWaveforms()
         }
     }
 }
@@ -12,163 +12,239 @@ Rectangle {
     property bool isSerialConnected: false
     property bool isPageActive: false
     property int maxLogLines: 500
-    property int maxPendingLogCount: 200
+    // 日志刷新挂在共享调度器上，logFlushIntervalMs 为本页最短刷新周期（自适应周期更长时以其为准）
     property int logFlushIntervalMs: 150
-    property bool infoAutoScroll: true
-    property bool warnErrorAutoScroll: true
-    property var pendingLogs: []
-    property int infoLineCount: 0
-    property int warnErrorLineCount: 0
-
-    // HTML 特殊字符转义，防止日志内容破坏 RichText 解析
-    function escapeHtml(text) {
-        return String(text)
-            .replace(/&/g, "&amp;")
-            .replace(/</g, "&lt;")
-            .replace(/>/g, "&gt;")
-    }
+    property var refreshScheduler: sessionManager ? sessionManager.refreshScheduler : null
+    readonly property string refreshClientName: "LOG"
+    // 日志保存在 Python 侧环形缓冲，两个 ListView 只为可见行创建委托
+    property var logStore: backend ? backend.logStore : null
+    property alias infoAutoScroll: infoPanel.autoScroll
+    property alias warnErrorAutoScroll: warnErrorPanel.autoScroll
+    readonly property int infoLineCount: infoPanel.lineCount
+    readonly property int warnErrorLineCount: warnErrorPanel.lineCount
+    // 日志检索（实时日志 + 归档），结果分页显示；检索期间隐藏两个实时日志框
+    property var logSearch: backend ? backend.logSearch : null
+    property bool searchActive: false
+    readonly property var searchTimeRanges: [
+        { title: "全部时间", spanMs: 0 },
+        { title: "最近 10 分钟", spanMs: 600000 },
+        { title: "最近 1 小时", spanMs: 3600000 },
+        { title: "最近 24 小时", spanMs: 86400000 },
+    ]
+
+    // 在刷新节拍上把积压日志批量写入两个分级视图，并把自动滚动收敛成每批最多一次
+    function flushPendingLogs() {
+        if (!root.isPageActive || !root.logStore)
+            return
 
-    // 以 HTML 行的形式批量追加到 TextArea，超出上限时按行裁剪头部
-    function appendHtmlLines(textArea, htmlLines, currentCount) {
-        if (htmlLines.length === 0)
-            return currentCount
+        if (root.logStore.flush() === 0)
+            return
 
-        for (var i = 0; i < htmlLines.length; i += 1) {
-            textArea.append(htmlLines[i])
-        }
+        infoPanel.followTail()
+        warnErrorPanel.followTail()
+    }
 
-        var newCount = currentCount + htmlLines.length
-        var overflow = newCount - root.maxLogLines
-
-        if (overflow > 0) {
-            var plain = textArea.getText(0, textArea.length)
-            var cutIndex = 0
-            for (var j = 0; j < overflow; j += 1) {
-                var nl = plain.indexOf("\n", cutIndex)
-                if (nl < 0) {
-                    cutIndex = plain.length
-                    break
-                }
-                cutIndex = nl + 1
-            }
-            if (cutIndex > 0)
-                textArea.remove(0, cutIndex)
-            newCount = Math.max(0, newCount - overflow)
-        }
+    function runSearch() {
+        if (!root.logSearch)
+            return
+        var levelMask = (infoLevelCheck.checked ? 1 : 0) | (warnLevelCheck.checked ? 2 : 0) | (errorLevelCheck.checked ? 4 : 0)
+        var spanMs = root.searchTimeRanges[timeRangeCombo.currentIndex].spanMs
+        root.logSearch.search(searchField.text, regexCheck.checked, levelMask, spanMs > 0 ? Date.now() - spanMs : 0, 0)
+        root.searchActive = true
+    }
 
-        return newCount
+    function closeSearch() {
+        root.searchActive = false
+        if (root.logSearch)
+            root.logSearch.clearResults()
     }
 
-    // 先把高频日志积压到短队列，交给定时器批量刷入视图，降低主线程抖动
-    function enqueueLog(level, message) {
-        pendingLogs.push({
-            level: level,
-            message: message,
-            timestampText: Qt.formatDateTime(new Date(), "hh:mm:ss.zzz")
-        })
+    function searchStatusText() {
+        var search = root.logSearch
+        if (!search)
+            return ""
+        if (search.busy)
+            return "搜索中…"
+        if (search.errorText)
+            return search.errorText
+        return "共 " + search.resultCount + " 条" + (search.truncated ? "（已达上限，请缩小范围）" : "")
+               + "  检索 " + search.scannedLines + " 行，用时 " + search.elapsedMs + " ms"
+    }
 
-        if (root.isPageActive && pendingLogs.length >= maxPendingLogCount) {
-            root.flushPendingLogs()
+    function applyMaxLogLines() {
+        if (!root.logStore)
             return
+        root.logStore.infoModel.setMaxRows(root.maxLogLines)
+        root.logStore.warnErrorModel.setMaxRows(root.maxLogLines)
+    }
+
+    onMaxLogLinesChanged: root.applyMaxLogLines()
+    onLogStoreChanged: root.applyMaxLogLines()
+
+    Connections {
+        target: root.refreshScheduler
+        enabled: root.refreshScheduler !== null
+
+        function onRefreshDue(client) {
+            if (client === root.refreshClientName)
+                root.flushPendingLogs()
         }
+    }
 
-        if (!root.isPageActive) {
-            var overflowCount = pendingLogs.length - maxPendingLogCount
-            if (overflowCount > 0)
-                pendingLogs.splice(0, overflowCount)
+    // 隐藏时暂停节拍，切回后把后台积压的日志刷入视图
+    onIsPageActiveChanged: {
+        if (!root.refreshScheduler)
             return
-        }
+        root.refreshScheduler.setClientActive(root.refreshClientName, root.isPageActive)
+        if (root.isPageActive && root.logStore && root.logStore.hasPendingLogs())
+            root.refreshScheduler.requestRefresh(root.refreshClientName)
+    }
 
-        if (!logFlushTimer.running)
-            logFlushTimer.start()
+    onLogFlushIntervalMsChanged: {
+        if (root.refreshScheduler)
+            root.refreshScheduler.registerClient(root.refreshClientName, root.logFlushIntervalMs)
     }
 
-    // 清除时同步丢弃同类待刷新的日志，避免"清除"后旧队列又被补回界面
-    function clearLogs(targetLevel) {
-        if (targetLevel === 0) {
-            infoTextArea.clear()
-            root.infoLineCount = 0
-        } else {
-            warnErrorTextArea.clear()
-            root.warnErrorLineCount = 0
-        }
+    Component.onCompleted: {
+        root.applyMaxLogLines()
+        if (!root.refreshScheduler)
+            return
+        root.refreshScheduler.registerClient(root.refreshClientName, root.logFlushIntervalMs)
+        root.refreshScheduler.setClientActive(root.refreshClientName, root.isPageActive)
+    }
 
-        var remainingLogs = []
-        for (var index = 0; index < pendingLogs.length; index += 1) {
-            var item = pendingLogs[index]
-            var matchesInfo = targetLevel === 0 && item.level === 0
-            var matchesWarnError = targetLevel !== 0 && item.level !== 0
-            if (!matchesInfo && !matchesWarnError)
-                remainingLogs.push(item)
+    Connections {
+        target: root.logStore
+        enabled: root.logStore !== null
+
+        // 每个刷新周期最多通知一次，日志本身留在 Python 侧
+        function onLogsAvailable() {
+            if (root.refreshScheduler)
+                root.refreshScheduler.requestRefresh(root.refreshClientName)
         }
-        pendingLogs = remainingLogs
     }
 
-    // 批量刷新视图，并把自动滚动收敛成每批最多一次
-    function flushPendingLogs() {
-        if (!root.isPageActive) {
-            logFlushTimer.stop()
-            return
+    // 日志框：标题栏（自动滚动 / 复制 / 清除）+ 虚拟化列表
+    component LogPanel: Rectangle {
+        id: panel
+        property string title: ""
+        property color titleColor: "#ffffff"
+        property string emptyText: ""
+        property var logModel: null
+        property bool autoScroll: true
+        property bool showAutoScroll: true
+        readonly property int lineCount: logModel ? logModel.count : 0
+
+        function followTail() {
+            if (panel.autoScroll && logView.count > 0)
+                logView.positionViewAtEnd()
         }
 
-        if (pendingLogs.length === 0) {
-            logFlushTimer.stop()
-            return
-        }
+        Layout.fillWidth: true
+        Layout.fillHeight: true
+        color: "#1e2b37"
+        radius: 6
+
+        ColumnLayout {
+            anchors.fill: parent
+            anchors.margins: 6
+            spacing: 4
+
+            // 标题栏
+            RowLayout {
+                Layout.fillWidth: true
+
+                Text {
+                    text: panel.title
+                    color: panel.titleColor
+                    font.pixelSize: 12
+                    font.bold: true
+                }
 
-        var logsToFlush = pendingLogs
-        pendingLogs = []
-        var infoLines = []
-        var warnErrorLines = []
-
-        for (var index = 0; index < logsToFlush.length; index += 1) {
-            var item = logsToFlush[index]
-            var prefix = item.level === 0 ? "" : (item.level === 1 ? "[WARN] " : "[ERROR] ")
-            var color = item.level === 0 ? "#ffffff" : (item.level === 1 ? "#f1c40f" : "#e74c3c")
-            var plainLine = item.timestampText + " " + prefix + item.message
-            var htmlLine = "<span style=\"color:" + color + ";\">" + root.escapeHtml(plainLine) + "</span>"
-            if (item.level === 0)
-                infoLines.push(htmlLine)
-            else
-                warnErrorLines.push(htmlLine)
-        }
+                Item { Layout.fillWidth: true }
 
-        root.infoLineCount = root.appendHtmlLines(infoTextArea, infoLines, root.infoLineCount)
-        root.warnErrorLineCount = root.appendHtmlLines(warnErrorTextArea, warnErrorLines, root.warnErrorLineCount)
+                Text {
+                    visible: panel.showAutoScroll
+                    text: "自动滚动"
+                    color: panel.titleColor
+                    font.pixelSize: 12
+                    font.bold: true
+                    verticalAlignment: Text.AlignVCenter
+                }
 
-        if (root.isPageActive && root.infoAutoScroll && infoLines.length > 0) {
-            infoTextArea.cursorPosition = infoTextArea.length
-        }
-        if (root.isPageActive && root.warnErrorAutoScroll && warnErrorLines.length > 0) {
-            warnErrorTextArea.cursorPosition = warnErrorTextArea.length
-        }
+                Switch {
+                    visible: panel.showAutoScroll
+                    checked: panel.autoScroll
+                    onCheckedChanged: {
+                        panel.autoScroll = checked
+                        panel.followTail()
+                    }
+                }
 
-        logFlushTimer.stop()
-    }
+                Button {
+                    text: "复制"
+                    implicitWidth: 50
+                    implicitHeight: 22
+                    font.pixelSize: 11
+                    enabled: panel.lineCount > 0
+                    onClicked: panel.logModel.copyToClipboard()
+                }
 
-    Timer {
-        id: logFlushTimer
-        interval: root.logFlushIntervalMs
-        repeat: false
-        running: false
-        onTriggered: root.flushPendingLogs()
-    }
+                Button {
+                    text: "清除"
+                    implicitWidth: 50
+                    implicitHeight: 22
+                    font.pixelSize: 11
+                    onClicked: {
+                        if (panel.logModel)
+                            panel.logModel.clear()
+                    }
+                }
+            }
 
-    onIsPageActiveChanged: {
-        if (!root.isPageActive) {
-            logFlushTimer.stop()
-            return
-        }
+            // 分隔线
+            Rectangle {
+                Layout.fillWidth: true
+                height: 1
+                color: "#2c3e50"
+            }
 
-        if (pendingLogs.length > 0 && !logFlushTimer.running)
-            logFlushTimer.start()
-    }
+            // 日志显示：只为可见行创建委托，整框内容经“复制”按钮写入剪贴板
+            ListView {
+                id: logView
+                Layout.fillWidth: true
+                Layout.fillHeight: true
+                clip: true
+                model: panel.logModel
+                boundsBehavior: Flickable.StopAtBounds
+                // 日志风暴时每批新行都会把可见行整体挤出视口，复用委托避免反复创建
+                reuseItems: true
+                ScrollBar.vertical: ScrollBar {}
+
+                delegate: Text {
+                    required property int level
+                    required property string line
+
+                    width: ListView.view.width
+                    text: line
+                    wrapMode: Text.WrapAnywhere
+                    textFormat: Text.PlainText
+                    color: level === 0 ? "#ffffff" : (level === 1 ? "#f1c40f" : "#e74c3c")
+                    font.pixelSize: 12
+                    font.family: "Courier New"
+                    font.bold: true
+                }
 
-    Connections {
-        target: backend
-        enabled: backend !== null
-        function onLogMessageReceived(level, message) {
-            root.enqueueLog(level, message)
+                Text {
+                    anchors.top: parent.top
+                    anchors.left: parent.left
+                    visible: logView.count === 0
+                    text: panel.emptyText
+                    color: "#5a6a7a"
+                    font.pixelSize: 12
+                    font.family: "Courier New"
+                }
+            }
         }
     }
 
@@ -177,180 +253,123 @@ Rectangle {
         anchors.margins: 8
         spacing: 8
 
-        // INFO 日志框（上半部分）
+        // 检索栏：子串或正则，按级别与时间范围过滤
         Rectangle {
             Layout.fillWidth: true
-            Layout.fillHeight: true
-            color: "#1e2b37"
+            implicitHeight: searchColumn.implicitHeight + 12
+            color: "white"
             radius: 6
+            border.color: "#bdc3c7"
+            border.width: 1
 
             ColumnLayout {
+                id: searchColumn
                 anchors.fill: parent
                 anchors.margins: 6
                 spacing: 4
 
-                // 标题栏
                 RowLayout {
                     Layout.fillWidth: true
+                    spacing: 6
 
-                    Text {
-                        text: "INFO"
-                        color: "#ffffff"
+                    TextField {
+                        id: searchField
+                        Layout.fillWidth: true
+                        placeholderText: "搜索日志（回车执行，留空匹配全部）"
                         font.pixelSize: 12
-                        font.bold: true
+                        selectByMouse: true
+                        onAccepted: root.runSearch()
                     }
 
-                    Item { Layout.fillWidth: true }
+                    CheckBox { id: regexCheck; text: "正则" }
+                    CheckBox { id: infoLevelCheck; text: "INFO"; checked: true }
+                    CheckBox { id: warnLevelCheck; text: "WARN"; checked: true }
+                    CheckBox { id: errorLevelCheck; text: "ERROR"; checked: true }
 
-                    Text {
-                        text: "自动滚动"
-                        color: "#ffffff"
-                        font.pixelSize: 12
-                        font.bold: true
-                        verticalAlignment: Text.AlignVCenter
-                    }
-
-                    Switch {
-                        id: infoAutoScrollSwitch
-                        checked: root.infoAutoScroll
-                        onCheckedChanged: {
-                            root.infoAutoScroll = checked
-                            if (checked)
-                                infoTextArea.cursorPosition = infoTextArea.length
-                        }
+                    ComboBox {
+                        id: timeRangeCombo
+                        implicitWidth: 130
+                        model: root.searchTimeRanges
+                        textRole: "title"
                     }
 
                     Button {
-                        text: "清除"
-                        implicitWidth: 50
-                        implicitHeight: 22
-                        font.pixelSize: 11
-                        onClicked: root.clearLogs(0)
+                        text: "搜索"
+                        enabled: root.logSearch !== null
+                        onClicked: root.runSearch()
                     }
-                }
 
-                // 分隔线
-                Rectangle {
-                    Layout.fillWidth: true
-                    height: 1
-                    color: "#2c3e50"
-                }
-
-                // 日志显示（可跨行选择/复制）
-                ScrollView {
-                    id: infoScrollView
-                    Layout.fillWidth: true
-                    Layout.fillHeight: true
-                    clip: true
-
-                    TextArea {
-                        id: infoTextArea
-                        readOnly: true
-                        selectByMouse: true
-                        selectByKeyboard: true
-                        persistentSelection: true
-                        wrapMode: TextEdit.WrapAnywhere
-                        textFormat: TextEdit.RichText
-                        color: "#ffffff"
-                        font.pixelSize: 12
-                        font.family: "Courier New"
-                        font.bold: true
-                        background: null
-                        selectionColor: "#3b5770"
-                        selectedTextColor: "#ffffff"
-                        placeholderText: root.isSerialConnected ? "暂无 INFO 日志" : "串口未连接"
-                        placeholderTextColor: "#5a6a7a"
+                    Button {
+                        text: "返回实时日志"
+                        visible: root.searchActive
+                        onClicked: root.closeSearch()
                     }
                 }
-            }
-        }
 
-        // WARN/ERROR 日志框（下半部分）
-        Rectangle {
-            Layout.fillWidth: true
-            Layout.fillHeight: true
-            color: "#1e2b37"
-            radius: 6
-
-            ColumnLayout {
-                anchors.fill: parent
-                anchors.margins: 6
-                spacing: 4
-
-                // 标题栏
+                // 检索状态与翻页（第 1 页为最新的结果）
                 RowLayout {
                     Layout.fillWidth: true
+                    visible: root.searchActive
 
                     Text {
-                        text: "WARN / ERROR"
-                        color: "#f1c40f"
+                        Layout.fillWidth: true
+                        text: root.searchActive ? root.searchStatusText() : ""
+                        color: root.logSearch && root.logSearch.errorText ? "#e74c3c" : "#2c3e50"
                         font.pixelSize: 12
-                        font.bold: true
+                        elide: Text.ElideRight
                     }
 
-                    Item { Layout.fillWidth: true }
+                    Button {
+                        text: "上一页"
+                        enabled: root.logSearch !== null && root.logSearch.pageIndex > 0
+                        onClicked: root.logSearch.setPage(root.logSearch.pageIndex - 1)
+                    }
 
                     Text {
-                        text: "自动滚动"
-                        color: "#f1c40f"
+                        text: root.logSearch ? "第 " + (root.logSearch.pageCount > 0 ? root.logSearch.pageIndex + 1 : 0)
+                                               + " / " + root.logSearch.pageCount + " 页" : ""
+                        color: "#2c3e50"
                         font.pixelSize: 12
-                        font.bold: true
-                        verticalAlignment: Text.AlignVCenter
-                    }
-
-                    Switch {
-                        id: warnErrorAutoScrollSwitch
-                        checked: root.warnErrorAutoScroll
-                        onCheckedChanged: {
-                            root.warnErrorAutoScroll = checked
-                            if (checked)
-                                warnErrorTextArea.cursorPosition = warnErrorTextArea.length
-                        }
                     }
 
                     Button {
-                        text: "清除"
-                        implicitWidth: 50
-                        implicitHeight: 22
-                        font.pixelSize: 11
-                        onClicked: root.clearLogs(1)
+                        text: "下一页"
+                        enabled: root.logSearch !== null && root.logSearch.pageIndex + 1 < root.logSearch.pageCount
+                        onClicked: root.logSearch.setPage(root.logSearch.pageIndex + 1)
                     }
                 }
+            }
+        }
 
-                // 分隔线
-                Rectangle {
-                    Layout.fillWidth: true
-                    height: 1
-                    color: "#2c3e50"
-                }
+        // 检索结果（按时间由新到旧）
+        LogPanel {
+            id: searchPanel
+            visible: root.searchActive
+            title: "搜索结果"
+            titleColor: "#5dade2"
+            showAutoScroll: false
+            logModel: root.logSearch ? root.logSearch.resultModel : null
+            emptyText: root.logSearch && root.logSearch.busy ? "搜索中…" : "无匹配日志"
+        }
 
-                // 日志显示（可跨行选择/复制）
-                ScrollView {
-                    id: warnErrorScrollView
-                    Layout.fillWidth: true
-                    Layout.fillHeight: true
-                    clip: true
+        // INFO 日志框（上半部分）
+        LogPanel {
+            id: infoPanel
+            visible: !root.searchActive
+            title: "INFO"
+            titleColor: "#ffffff"
+            logModel: root.logStore ? root.logStore.infoModel : null
+            emptyText: root.isSerialConnected ? "暂无 INFO 日志" : "串口未连接"
+        }
 
-                    TextArea {
-                        id: warnErrorTextArea
-                        readOnly: true
-                        selectByMouse: true
-                        selectByKeyboard: true
-                        persistentSelection: true
-                        wrapMode: TextEdit.WrapAnywhere
-                        textFormat: TextEdit.RichText
-                        color: "#f1c40f"
-                        font.pixelSize: 12
-                        font.family: "Courier New"
-                        font.bold: true
-                        background: null
-                        selectionColor: "#3b5770"
-                        selectedTextColor: "#ffffff"
-                        placeholderText: root.isSerialConnected ? "暂无 WARN / ERROR 日志" : "串口未连接"
-                        placeholderTextColor: "#5a6a7a"
-                    }
-                }
-            }
+        // WARN/ERROR 日志框（下半部分）
+        LogPanel {
+            id: warnErrorPanel
+            visible: !root.searchActive
+            title: "WARN / ERROR"
+            titleColor: "#f1c40f"
+            logModel: root.logStore ? root.logStore.warnErrorModel : null
+            emptyText: root.isSerialConnected ? "暂无 WARN / ERROR 日志" : "串口未连接"
         }
     }
 }
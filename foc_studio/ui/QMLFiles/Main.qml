@@ -27,6 +27,17 @@ ApplicationWindow {
         
     // 串口连接状态 - 绑定到 BackendFacade 属性（backend 从 Python setContextProperty 注入）
     property bool isSerialConnected: backend ? backend.isConnected : false
+    // 链路中断自动重连状态，用于状态指示灯显示橙色
+    property bool isSerialReconnecting: backend ? backend.isReconnecting : false
+
+    // 多设备会话：backend 上下文属性由 main.py 在切换设备后重新注入，随之重建页面栈，让各页面从新的 backend
+    // 重新同步状态。以 backend 本身的变化为准：QML 信号处理先于 Python 槽执行，在 sessionManager 信号里
+    // 重建时页面仍会读到上一台设备；移除其他设备只改变序号，backend 不变，页面状态得以保留
+    property QtObject currentBackend: backend
+    onCurrentBackendChanged: {
+        pageStackLoader.active = false
+        pageStackLoader.active = true
+    }
 
     // 监听串口连接状态变化消息
     Connections {
@@ -66,8 +77,8 @@ ApplicationWindow {
                         height: 25
                         radius: 12.5
                         anchors.centerIn: parent
-                        color: root.isSerialConnected ? "#2ecc71" : "#7f8c8d"  // 绿色:已连接, 灰色:未连接
-                        border.color: root.isSerialConnected ? "#27ae60" : "#5a6469"
+                        color: root.isSerialConnected ? "#2ecc71" : root.isSerialReconnecting ? "#e67e22" : "#7f8c8d"  // 绿色:已连接, 橙色:重连中, 灰色:未连接
+                        border.color: root.isSerialConnected ? "#27ae60" : root.isSerialReconnecting ? "#d35400" : "#5a6469"
                         border.width: 2
 
                         // 性能排查阶段先关闭全局呼吸灯动画，避免与高频图表争抢渲染预算
@@ -291,57 +302,106 @@ ApplicationWindow {
             Layout.fillHeight: true
             color: "#ecf0f1"  // 浅灰色背景
 
-            // 使用 StackLayout 来切换不同的页面
-            StackLayout {
+            // 页面栈放在 Loader 中：切换设备时整体重建，避免页面残留上一台设备的缓存数据
+            Loader {
+                id: pageStackLoader
                 anchors.fill: parent
-                currentIndex: root.currentPage === "SYS" ? 0
-                             : root.currentPage === "MOT" ? 1
-                             : root.currentPage === "HALL" ? 2
-                             : root.currentPage === "CHT" ? 3
-                             : root.currentPage === "QD" ? 4
-                             : root.currentPage === "LOG" ? 5
-                             : 6
-
-                // SYS 页面 - 使用独立的组件
-                SYS {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "SYS"
-                }
+                sourceComponent: pageStackComponent
+            }
 
-                // MOT 页面 - 使用独立的组件
-                MOT {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "MOT"
-                }
+            Component {
+                id: pageStackComponent
 
-                // HALL 页面 - 霍尔状态监控
-                HALL {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "HALL"
-                }
+                // 使用 StackLayout 来切换不同的页面；各页面首次访问时才由 Loader 实例化，
+                // 访问过的页面保持加载，切换回来时保留状态
+                StackLayout {
+                    id: pageStack
 
-                // CHT 页面 - 电机控制与实时波形
-                CHT {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "CHT"
-                }
+                    // 已访问过的页面；LOG 页在后台持续收集 MCU 日志，需随页面栈一同创建
+                    property var visitedPages: ["LOG", root.currentPage]
 
-                // QD 页面 - Iq/Id 双曲线同图显示
-                QD {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "QD"
-                }
+                    function pageLoaded(pageName) {
+                        return visitedPages.indexOf(pageName) >= 0
+                    }
 
-                // LOG 页面 - 显示 MCU 上报日志
-                LOG {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "LOG"
-                }
+                    currentIndex: root.currentPage === "SYS" ? 0
+                                 : root.currentPage === "MOT" ? 1
+                                 : root.currentPage === "HALL" ? 2
+                                 : root.currentPage === "CHT" ? 3
+                                 : root.currentPage === "QD" ? 4
+                                 : root.currentPage === "LOG" ? 5
+                                 : 6
+
+                    Connections {
+                        target: root
+                        function onCurrentPageChanged() {
+                            if (!pageStack.pageLoaded(root.currentPage))
+                                pageStack.visitedPages = pageStack.visitedPages.concat([root.currentPage])
+                        }
+                    }
+
+                    // SYS 页面 - 使用独立的组件
+                    Loader {
+                        active: pageStack.pageLoaded("SYS")
+                        sourceComponent: SYS {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "SYS"
+                        }
+                    }
 
-                // TUNE 页面 - 电机参数调试
-                TUNE {
-                    isSerialConnected: root.isSerialConnected
-                    isPageActive: root.currentPage === "TUNE"
+                    // MOT 页面 - 使用独立的组件
+                    Loader {
+                        active: pageStack.pageLoaded("MOT")
+                        sourceComponent: MOT {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "MOT"
+                        }
+                    }
+
+                    // HALL 页面 - 霍尔状态监控
+                    Loader {
+                        active: pageStack.pageLoaded("HALL")
+                        sourceComponent: HALL {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "HALL"
+                        }
+                    }
+
+                    // CHT 页面 - 电机控制与实时波形
+                    Loader {
+                        active: pageStack.pageLoaded("CHT")
+                        sourceComponent: CHT {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "CHT"
+                        }
+                    }
+
+                    // QD 页面 - Iq/Id 双曲线同图显示
+                    Loader {
+                        active: pageStack.pageLoaded("QD")
+                        sourceComponent: QD {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "QD"
+                        }
+                    }
+
+                    // LOG 页面 - 显示 MCU 上报日志
+                    Loader {
+                        active: pageStack.pageLoaded("LOG")
+                        sourceComponent: LOG {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "LOG"
+                        }
+                    }
+
+                    // TUNE 页面 - 电机参数调试
+                    Loader {
+                        active: pageStack.pageLoaded("TUNE")
+                        sourceComponent: TUNE {
+                            isSerialConnected: root.isSerialConnected
+                            isPageActive: root.currentPage === "TUNE"
+                        }
+                    }
                 }
             }
         }
@@ -14,19 +14,21 @@ Rectangle {
     property bool isPageActive: false
     property real currentIq: 0.0
     property real currentId: 0.0
-    property int chartRefreshIntervalMs: 50
-    property int axisRefreshIntervalMs: 250
+    // 刷新节拍由全进程共享的调度器给出，周期随刷新耗时与事件循环负载在 16~200 ms 间自适应
+    property var refreshScheduler: sessionManager ? sessionManager.refreshScheduler : null
+    readonly property string refreshClientName: "QD"
     property int axisIdleGraceMs: 200
     property int timeWindowMs: 5000
-    property var iqSamples: []
-    property var idSamples: []
-    property var pendingIqSamples: []
-    property var pendingIdSamples: []
+    // 波形样本缓存在 Python 侧环形缓冲，页面只在刷新节拍上让它批量同步曲线
+    property var chartData: backend ? backend.chartData : null
+    // traceRenderer 为 sceneGraph 时实时曲线改由 WaveformItem 直接从环形缓冲绘制
+    readonly property bool sceneGraphTraces: chartData ? chartData.traceRenderer === "sceneGraph" : false
+    property var iqWave: null
+    property var idWave: null
     property int iqSampleCount: 0
     property int idSampleCount: 0
     property double chartStartTimestampMs: 0
     property double latestTimestampMs: 0
-    property double lastAxisRefreshTimestampMs: 0
     property double _smoothAxisMs: 0.0
     property real axisMinSeconds: 0.0
     property real axisMaxSeconds: timeWindowMs / 1000.0
@@ -38,32 +40,13 @@ Rectangle {
         return (timestampMs - root.chartStartTimestampMs) / 1000.0
     }
 
-    // 将待刷新的样本增量追加到曲线尾部，避免 clear + append 全量重建
-    function appendPendingSamples(samples, pendingSamples, series) {
-        if (pendingSamples.length === 0)
-            return false
-
-        for (var index = 0; index < pendingSamples.length; index += 1) {
-            var sample = pendingSamples[index]
-            sample.xValue = root.sampleToXValue(sample.timestamp)
-            samples.push(sample)
-            series.append(sample.xValue, sample.value)
-        }
-        return true
-    }
-
-    // 仅从历史窗口头部移除过期点，保持图表更新复杂度与新增样本数一致
-    function trimSeriesHead(samples, series, minTimestamp) {
-        var removeCount = 0
-
-        while (removeCount < samples.length && samples[removeCount].timestamp < minTimestamp)
-            removeCount += 1
-
-        if (removeCount <= 0)
-            return
-
-        samples.splice(0, removeCount)
-        series.removeMultiple(0, removeCount)
+    // 取两个通道中较早的有效时间戳作为曲线 X 轴原点（0 表示通道无样本）
+    function earliestTimestamp(firstMs, secondMs) {
+        if (firstMs <= 0)
+            return secondMs
+        if (secondMs <= 0)
+            return firstMs
+        return Math.min(firstMs, secondMs)
     }
 
     // X 轴改为独立时钟平滑滑动，避免跟随样本批量到达而偶发跳动
@@ -79,6 +62,36 @@ Rectangle {
         var axisMax = Math.max(windowSeconds, latestSeconds)
         root.axisMinSeconds = Math.max(0.0, axisMax - windowSeconds)
         root.axisMaxSeconds = axisMax
+        root.syncWaveforms()
+    }
+
+    // 首次使用场景图绘制时在绘图区上创建 Iq/Id 两条 WaveformItem
+    function ensureWaveforms() {
+        if (!root.sceneGraphTraces || !root.chartData || root.iqWave)
+            return
+        root.iqWave = root.chartData.createWaveform(dqTraceHost, "iq")
+        root.iqWave.setColor(iqSeries.color)
+        root.idWave = root.chartData.createWaveform(dqTraceHost, "id")
+        root.idWave.setColor(idSeries.color)
+    }
+
+    // 新样本到达或曲线清空后通知 WaveformItem 重建顶点
+    function refreshWaveforms() {
+        if (!root.iqWave)
+            return
+        root.iqWave.refresh()
+        root.idWave.refresh()
+        root.syncWaveforms()
+    }
+
+    // 把当前坐标范围交给 WaveformItem：只平移/缩放时下一帧仅更新变换矩阵
+    function syncWaveforms() {
+        if (!root.iqWave)
+            return
+        root.iqWave.setViewport(root.chartStartTimestampMs, root.axisMinSeconds, root.axisMaxSeconds,
+                                root.dqAxisMinValue, root.dqAxisMaxValue)
+        root.idWave.setViewport(root.chartStartTimestampMs, root.axisMinSeconds, root.axisMaxSeconds,
+                                root.dqAxisMinValue, root.dqAxisMaxValue)
     }
 
     // 使用帧时间（frameTime）平滑推进横轴，避免 Date.now() 在 Windows 上
@@ -117,159 +130,63 @@ Rectangle {
         }
     }
 
-    // 当前值超出坐标轴时立即重算，正常情况下按较低频率更新 Y 轴
-    function shouldRefreshAxis(latestValue, axisMin, axisMax) {
-        return latestValue < axisMin || latestValue > axisMax
-    }
-
-    // 将 Y 轴的全量扫描降到低频执行，减少图表布局与重绘抖动
-    function maybeRefreshAxisRanges(forceRefresh) {
-        if (root.latestTimestampMs <= 0) {
-            root.updateDqAxisRange([], [])
-            return
-        }
-
-        var shouldRefresh = forceRefresh
-                            || root.lastAxisRefreshTimestampMs <= 0
-                            || root.latestTimestampMs - root.lastAxisRefreshTimestampMs >= root.axisRefreshIntervalMs
-                            || root.shouldRefreshAxis(root.currentIq, root.dqAxisMinValue, root.dqAxisMaxValue)
-                            || root.shouldRefreshAxis(root.currentId, root.dqAxisMinValue, root.dqAxisMaxValue)
-        if (!shouldRefresh)
-            return
-
-        root.updateDqAxisRange(root.iqSamples, root.idSamples)
-        root.lastAxisRefreshTimestampMs = root.latestTimestampMs
+    // 仅在存在新遥测时向调度器申请刷新，避免图表页前台空转。
+    function scheduleFlushPendingTelemetry() {
+        if (root.isPageActive && root.refreshScheduler)
+            root.refreshScheduler.requestRefresh(root.refreshClientName)
     }
 
-    // 将高频遥测先缓存成批，等下一次定时刷新时统一并入曲线
-    function enqueueTelemetry(seriesKind, value, timestampMs) {
-        var sample = { "timestamp": timestampMs, "value": value }
-        if (seriesKind === "iq")
-            root.pendingIqSamples.push(sample)
-        else
-            root.pendingIdSamples.push(sample)
-
-        root.scheduleFlushPendingTelemetry()
+    // 撤销尚未执行的刷新（进入回看、页面切换）
+    function cancelFlushPendingTelemetry() {
+        if (root.refreshScheduler)
+            root.refreshScheduler.cancelRefresh(root.refreshClientName)
     }
 
-    // 仅在存在新遥测时启动刷新定时器，避免图表页前台空转。
-    function scheduleFlushPendingTelemetry() {
-        if (root.isPageActive && !chartRefreshTimer.running)
-            chartRefreshTimer.start()
-    }
-
-    // 固定刷新频率读取最近一次遥测值，把高频信号收敛为可控的 UI 刷新节奏
+    // 在共享刷新节拍上把 Python 侧新增样本批量并入曲线，把高频信号收敛为可控的 UI 刷新节奏
     function flushPendingTelemetry() {
-        if (!root.isPageActive)
+        if (!root.isPageActive || !root.chartData)
             return
 
-        var latestTimestampMs = root.latestTimestampMs
-        var hasNewSamples = false
-
-        if (root.pendingIqSamples.length > 0) {
-            latestTimestampMs = Math.max(
-                        latestTimestampMs,
-                        root.pendingIqSamples[root.pendingIqSamples.length - 1].timestamp)
-            hasNewSamples = true
-        }
-
-        if (root.pendingIdSamples.length > 0) {
-            latestTimestampMs = Math.max(
-                        latestTimestampMs,
-                        root.pendingIdSamples[root.pendingIdSamples.length - 1].timestamp)
-            hasNewSamples = true
-        }
-
-        if (!hasNewSamples) {
-            chartRefreshTimer.stop()
+        var chartData = root.chartData
+        if (!chartData.hasPendingSamples("iq") && !chartData.hasPendingSamples("id"))
             return
-        }
 
         if (root.chartStartTimestampMs <= 0) {
-            var earliestTimestampMs = latestTimestampMs
-            if (root.pendingIqSamples.length > 0)
-                earliestTimestampMs = Math.min(earliestTimestampMs, root.pendingIqSamples[0].timestamp)
-            if (root.pendingIdSamples.length > 0)
-                earliestTimestampMs = Math.min(earliestTimestampMs, root.pendingIdSamples[0].timestamp)
-            root.chartStartTimestampMs = earliestTimestampMs
-        }
-
-        root.appendPendingSamples(root.iqSamples, root.pendingIqSamples, iqSeries)
-        root.appendPendingSamples(root.idSamples, root.pendingIdSamples, idSeries)
-        root.pendingIqSamples = []
-        root.pendingIdSamples = []
-        root.latestTimestampMs = latestTimestampMs
-        var minTimestamp = root.latestTimestampMs - root.timeWindowMs
-        root.trimSeriesHead(root.iqSamples, iqSeries, minTimestamp)
-        root.trimSeriesHead(root.idSamples, idSeries, minTimestamp)
-        root.iqSampleCount = root.iqSamples.length
-        root.idSampleCount = root.idSamples.length
-        root.ensureAxisScrollRunning()
-        root.maybeRefreshAxisRanges(false)
-        chartRefreshTimer.stop()
-    }
-
-    // 根据最近 5 秒 Iq/Id 样本联合自适应 Y 轴，保证 0 基线始终可见
-    function updateDqAxisRange(iqSamples, idSamples) {
-        var totalLength = iqSamples.length + idSamples.length
-        if (totalLength === 0) {
-            root.dqAxisMinValue = -0.5
-            root.dqAxisMaxValue = 0.5
-            return
-        }
-
-        var minValue = Number.POSITIVE_INFINITY
-        var maxValue = Number.NEGATIVE_INFINITY
-
-        for (var i = 0; i < iqSamples.length; i += 1) {
-            var iqValue = iqSamples[i].value
-            if (iqValue < minValue) minValue = iqValue
-            if (iqValue > maxValue) maxValue = iqValue
-        }
-        for (var j = 0; j < idSamples.length; j += 1) {
-            var idValue = idSamples[j].value
-            if (idValue < minValue) minValue = idValue
-            if (idValue > maxValue) maxValue = idValue
+            root.chartStartTimestampMs = root.earliestTimestamp(chartData.firstTimestampMs("iq"),
+                                                                chartData.firstTimestampMs("id"))
         }
 
-        var axisMin = minValue
-        var axisMax = maxValue
-
-        // 0 基线始终包含在可视区内，便于观察电流符号
-        if (axisMin > 0) axisMin = 0
-        if (axisMax < 0) axisMax = 0
-
-        var span = axisMax - axisMin
-        var minimumSpan = 0.5
-        if (span < minimumSpan) {
-            var centerValue = (axisMin + axisMax) / 2.0
-            axisMin = centerValue - minimumSpan / 2.0
-            axisMax = centerValue + minimumSpan / 2.0
-            // 重新修正 0 基线
-            if (axisMin > 0) axisMin = 0
-            if (axisMax < 0) axisMax = 0
-            span = axisMax - axisMin
+        if (root.sceneGraphTraces) {
+            // WaveformItem 在下一帧直接读取环形缓冲，这里只推进窗口与坐标轴
+            root.ensureWaveforms()
+            root.iqSampleCount = chartData.advanceWindow("iq", root.timeWindowMs)
+            root.idSampleCount = chartData.advanceWindow("id", root.timeWindowMs)
+        } else {
+            // 传入曲线宽度：样本密度超过像素列数时由 Python 侧降采样，点数只随宽度增长
+            root.iqSampleCount = chartData.updateSeries("iq", iqSeries, root.chartStartTimestampMs,
+                                                        root.timeWindowMs, dqGraph.width)
+            root.idSampleCount = chartData.updateSeries("id", idSeries, root.chartStartTimestampMs,
+                                                        root.timeWindowMs, dqGraph.width)
         }
-
-        var padding = Math.max(span * 0.15, 0.1)
-        axisMin = axisMin - padding
-        axisMax = axisMax + padding
-
-        root.dqAxisMinValue = axisMin
-        root.dqAxisMaxValue = axisMax
+        root.currentIq = chartData.latestValue("iq")
+        root.currentId = chartData.latestValue("id")
+        root.latestTimestampMs = Math.max(root.latestTimestampMs,
+                                          chartData.latestTimestampMs("iq"),
+                                          chartData.latestTimestampMs("id"))
+        root.ensureAxisScrollRunning()
+        root.refreshWaveforms()
     }
 
     // 断开串口后清空控制输入与波形缓存，避免显示旧会话数据
     function resetCharts() {
-        root.iqSamples = []
-        root.idSamples = []
-        root.pendingIqSamples = []
-        root.pendingIdSamples = []
+        if (root.chartData) {
+            root.chartData.clearChannel("iq")
+            root.chartData.clearChannel("id")
+        }
         root.iqSampleCount = 0
         root.idSampleCount = 0
         root.chartStartTimestampMs = 0
         root.latestTimestampMs = 0
-        root.lastAxisRefreshTimestampMs = 0
         root._smoothAxisMs = 0.0
         root.axisMinSeconds = 0.0
         root.axisMaxSeconds = root.timeWindowMs / 1000.0
@@ -278,14 +195,17 @@ Rectangle {
         iqSeries.clear()
         idSeries.clear()
         axisFrameAnimation.stop()
+        root.refreshWaveforms()
     }
 
-    Timer {
-        id: chartRefreshTimer
-        interval: root.chartRefreshIntervalMs
-        repeat: false
-        running: false
-        onTriggered: root.flushPendingTelemetry()
+    Connections {
+        target: root.refreshScheduler
+        enabled: root.refreshScheduler !== null
+
+        function onRefreshDue(client) {
+            if (client === root.refreshClientName)
+                root.flushPendingTelemetry()
+        }
     }
 
     FrameAnimation {
@@ -303,18 +223,26 @@ Rectangle {
         }
     }
 
+    // 切出页面时重置曲线；切回时不再清空，后台期间进入环形缓冲的样本随即刷新到曲线
     onIsPageActiveChanged: {
+        if (root.refreshScheduler)
+            root.refreshScheduler.setClientActive(root.refreshClientName, root.isPageActive)
         if (!root.isPageActive) {
-            chartRefreshTimer.stop()
+            root.cancelFlushPendingTelemetry()
             root.resetCharts()
             return
         }
 
         root.ensureAxisScrollRunning()
-        if (root.pendingIqSamples.length > 0 || root.pendingIdSamples.length > 0)
+        if (root.chartData && (root.chartData.hasPendingSamples("iq") || root.chartData.hasPendingSamples("id")))
             root.scheduleFlushPendingTelemetry()
     }
 
+    Component.onCompleted: {
+        if (root.refreshScheduler)
+            root.refreshScheduler.setClientActive(root.refreshClientName, root.isPageActive)
+    }
+
     // 输入框组件：用于目标速度输入
     component InputField: Rectangle {
         id: control
@@ -539,6 +467,7 @@ Rectangle {
                 anchors.fill: parent
 
                 GraphsView {
+                    id: dqGraph
                     anchors.fill: parent
                     theme: GraphsTheme {
                         colorScheme: GraphsTheme.ColorScheme.Dark
@@ -563,14 +492,26 @@ Rectangle {
                     LineSeries {
                         id: iqSeries
                         color: '#f1c40f'
+                        visible: !root.sceneGraphTraces
                     }
 
                     LineSeries {
                         id: idSeries
                         color: '#1abc9c'
+                        visible: !root.sceneGraphTraces
                     }
                 }
 
+                // WaveformItem 宿主：与绘图区重合
+                Item {
+                    id: dqTraceHost
+                    x: dqGraph.x + dqGraph.plotArea.x
+                    y: dqGraph.y + dqGraph.plotArea.y
+                    width: dqGraph.plotArea.width
+                    height: dqGraph.plotArea.height
+                    visible: root.sceneGraphTraces
+                }
+
                 // 图例：标注 Iq/Id 对应的曲线颜色
                 Rectangle {
                     anchors.top: parent.top
@@ -630,15 +571,22 @@ Rectangle {
     }
 
     Connections {
-        target: backend
-        enabled: backend !== null && root.isPageActive
-
-        // 后端 CMD 0x69 解析后通过 dqComponentsUpdated 分发 Iq/Id/Uq/Ud，此处仅用 Iq/Id
-        function onDqComponentsUpdated(iq, id, uq, ud, timestampMs) {
-            root.currentIq = iq
-            root.currentId = id
-            root.enqueueTelemetry("iq", iq, timestampMs)
-            root.enqueueTelemetry("id", id, timestampMs)
+        target: root.chartData
+        enabled: root.chartData !== null && root.isPageActive
+
+        // CMD 0x69 的 Iq/Id 由 Python 侧写入缓冲，每个刷新周期每个通道最多通知一次
+        function onSamplesAvailable(channel) {
+            if (channel === "iq" || channel === "id")
+                root.scheduleFlushPendingTelemetry()
+        }
+
+        // Iq/Id 共用的 Y 轴范围由 Python 侧单调队列维护窗口极值后给出，始终包含 0 基线
+        function onAxisRangeChanged(axis, minValue, maxValue) {
+            if (axis === "dq") {
+                root.dqAxisMinValue = minValue
+                root.dqAxisMaxValue = maxValue
+                root.syncWaveforms()
+            }
         }
     }
 }
@@ -2,6 +2,7 @@
 import QtQuick
 import QtQuick.Controls
 import QtQuick.Layouts
+import QtQuick.Dialogs
 
 Rectangle {
     id: root
@@ -9,256 +10,720 @@ Rectangle {
     
     // qmllint disable unqualified
 
-    // 串口波特率
+    // 串口初始（安全）波特率，连接后由后端协商升级
     readonly property int baudRate: 460800
     readonly property string softwareVersion: "v0.0.0.12"
 
     // 接收串口连接状态
     property bool isSerialConnected: false
     property bool isPageActive: false
+    // 链路意外中断后后端正在自动重连
+    readonly property bool isReconnecting: backend ? backend.isReconnecting : false
     property var portListModel: []  // 存储串口列表
+    // 多设备会话管理器（main.py 注入），未注入时隐藏设备选择区域
+    readonly property var sessionManagerRef: typeof sessionManager !== "undefined" ? sessionManager : null
+
+    // 串口统计快照（后端 statisticsChanged 一次性推送），以下只读属性仅做字段展开
+    property var statistics: ({})
+    readonly property int txFrameCountTotal: statistics.txFrameCountTotal || 0
+    readonly property int rxFrameCountTotal: statistics.rxFrameCountTotal || 0
+    readonly property int txBytesTotal: statistics.txBytesTotal || 0
+    readonly property int rxBytesTotal: statistics.rxBytesTotal || 0
+    readonly property int txBytesPerSec: statistics.txBytesPerSec || 0
+    readonly property int rxBytesPerSec: statistics.rxBytesPerSec || 0
+    readonly property int rxCrcErrorCount: statistics.rxCrcErrorCount || 0
+    readonly property int rxInvalidFrameCount: statistics.rxInvalidFrameCount || 0
+    readonly property int txFramesPerSec: statistics.txFramesPerSec || 0
+    readonly property int rxFramesPerSec: statistics.rxFramesPerSec || 0
+    readonly property int txPeakBytesPerSec: statistics.txPeakBytesPerSec || 0
+    readonly property int rxPeakBytesPerSec: statistics.rxPeakBytesPerSec || 0
+    readonly property real linkUtilization: statistics.linkUtilization || 0
+    readonly property var commandStats: statistics.commandStats || []
+    // 链路健康火花线数据，仅页面激活时从后端读取
+    property var statisticsSparklines: ({})
+    // 各阶段延迟分位数（后端 latencyStats），仅页面激活时同步
+    property var latencyStats: ({})
+    // 遥测归档写盘统计（后端 archiveStats），未启用归档时为空，仅页面激活时同步
+    property var archiveStats: ({})
+    // 运行记录写库统计（后端 sessionRecorderStats），未启用时为空
+    property var sessionRecorderStats: ({})
+    readonly property var latencyStageNames: [
+        { key: "mcuToRx", title: "MCU 采集 → 串口到达" },
+        { key: "rxToParsed", title: "串口到达 → 解析完成" },
+        { key: "parsedToDispatched", title: "解析完成 → 信号分发" },
+        { key: "dispatchedToRendered", title: "信号分发 → 曲线追加" },
+        { key: "rxToRendered", title: "串口到达 → 曲线追加" }
+    ]
+    // 统计发布周期：多设备时由 SessionManager 共享节拍决定
+    readonly property var statisticsPublisher: sessionManagerRef ? sessionManagerRef : backend
+    readonly property int statisticsPublishIntervalMs: statisticsPublisher ? statisticsPublisher.statisticsPublishIntervalMs : 1000
+    readonly property var commandIntervalBucketLabels: backend ? backend.commandIntervalBucketLabels : []
+
+    // 火花线：按序列最大值归一化绘制折线，数据点数较少（≤120），Canvas 重绘开销可忽略
+    component Sparkline: Canvas {
+        property var values: []
+        property color lineColor: "#3498db"
+
+        onValuesChanged: requestPaint()
+        onWidthChanged: requestPaint()
+
+        onPaint: {
+            var ctx = getContext("2d")
+            ctx.clearRect(0, 0, width, height)
+            ctx.fillStyle = "#f8f9fa"
+            ctx.fillRect(0, 0, width, height)
+            if (values.length < 2)
+                return
+            var maxValue = Math.max(1, Math.max.apply(null, values))
+            var stepX = width / (values.length - 1)
+            ctx.strokeStyle = lineColor
+            ctx.lineWidth = 1.5
+            ctx.beginPath()
+            for (var i = 0; i < values.length; ++i) {
+                var y = height - 2 - (height - 4) * values[i] / maxValue
+                if (i === 0)
+                    ctx.moveTo(0, y)
+                else
+                    ctx.lineTo(i * stepX, y)
+            }
+            ctx.stroke()
+        }
+    }
 
-    property int txFrameCountTotal: 0
-    property int rxFrameCountTotal: 0
-    property int txBytesTotal: 0
-    property int rxBytesTotal: 0
-    property int txBytesPerSec: 0
-    property int rxBytesPerSec: 0
-    property int rxCrcErrorCount: 0
-    property int rxInvalidFrameCount: 0
+    // 设备列表项显示文案：名称、串口、在线状态与 CPU 占用
+    function formatSessionText(info) {
+        var portText = info.portName !== "" ? info.portName : "未连接"
+        return info.name + " - " + portText + (info.connected ? " ✓" : "") + " (CPU " + info.cpuPercent + "%)"
+    }
 
-    // 页面激活时批量同步一次统计快照，避免隐藏页持续跟随后端 1 秒统计刷新
+    // 页面激活时同步一次统计快照，避免隐藏页持续跟随后端统计刷新
     function syncStatisticsFromBackend() {
         if (!backend)
             return
 
-        root.txFrameCountTotal = backend.txFrameCountTotal
-        root.rxFrameCountTotal = backend.rxFrameCountTotal
-        root.txBytesTotal = backend.txBytesTotal
-        root.rxBytesTotal = backend.rxBytesTotal
-        root.txBytesPerSec = backend.txBytesPerSec
-        root.rxBytesPerSec = backend.rxBytesPerSec
-        root.rxCrcErrorCount = backend.rxCrcErrorCount
-        root.rxInvalidFrameCount = backend.rxInvalidFrameCount
+        root.statistics = backend.statistics
+        root.statisticsSparklines = backend.statisticsSparklines
+        root.latencyStats = backend.latencyStats
+        root.archiveStats = backend.archiveStats
+        root.sessionRecorderStats = backend.sessionRecorderStats
     }
 
-    ColumnLayout {
+    // 统计面板较多，内容超出窗口高度时整页滚动
+    ScrollView {
+        id: pageScrollView
         anchors.fill: parent
-        anchors.margins: 24
-        spacing: 16
+        padding: 24
+        contentWidth: availableWidth
 
-        Text {
-            font.pixelSize: 24
-            color: "#2c3e50"
-            Layout.alignment: Qt.AlignHCenter
-        }
+        ColumnLayout {
+            width: pageScrollView.availableWidth
+            spacing: 16
 
-        // 串口状态显示
-        Text {
-            text: root.isSerialConnected ? "串口状态: 已连接 ✓" : "串口状态: 未连接"
-            font.pixelSize: 16
-            color: root.isSerialConnected ? "#27ae60" : "#e74c3c"
-            Layout.alignment: Qt.AlignHCenter
-        }
+            Text {
+                font.pixelSize: 24
+                color: "#2c3e50"
+                Layout.alignment: Qt.AlignHCenter
+            }
 
-        Text {
-            text: "软件版本: " + root.softwareVersion
-            font.pixelSize: 14
-            color: "#2c3e50"
-            Layout.alignment: Qt.AlignHCenter
-        }
+            // 串口状态显示
+            Text {
+                text: root.isSerialConnected ? "串口状态: 已连接 ✓"
+                      : root.isReconnecting ? "串口状态: 链路中断，正在重连..." : "串口状态: 未连接"
+                font.pixelSize: 16
+                color: root.isSerialConnected ? "#27ae60" : root.isReconnecting ? "#e67e22" : "#e74c3c"
+                Layout.alignment: Qt.AlignHCenter
+            }
 
-        // 串口选择区域
-        RowLayout {
-            spacing: 10
-            Layout.alignment: Qt.AlignHCenter
+            // 连接后自动协商到双方都支持的最高波特率，这里显示实际生效值
+            Text {
+                visible: root.isSerialConnected && backend && backend.baudRate > 0
+                text: "当前波特率: " + (backend ? backend.baudRate : 0)
+                font.pixelSize: 14
+                color: "#2c3e50"
+                Layout.alignment: Qt.AlignHCenter
+            }
 
             Text {
-                text: "选择串口："
+                text: "软件版本: " + root.softwareVersion
                 font.pixelSize: 14
                 color: "#2c3e50"
+                Layout.alignment: Qt.AlignHCenter
             }
 
-            ComboBox {
-                id: portComboBox
-                width: 450
-                model: root.portListModel
-                textRole: "portName"
-                enabled: !root.isSerialConnected
-                
-                displayText: {
-                    if (root.portListModel.length === 0) {
-                        return "未找到串口"
-                    } else if (currentIndex < 0) {
-                        return "请选择串口"
-                    } else {
-                        return root.portListModel[currentIndex].portName + " - " + root.portListModel[currentIndex].description
+            // 设备选择区域：每台设备对应一套独立的串口流水线
+            RowLayout {
+                spacing: 10
+                Layout.alignment: Qt.AlignHCenter
+                visible: root.sessionManagerRef !== null
+
+                Text {
+                    text: "当前设备："
+                    font.pixelSize: 14
+                    color: "#2c3e50"
+                }
+
+                ComboBox {
+                    id: deviceComboBox
+                    Layout.preferredWidth: 320
+                    model: root.sessionManagerRef ? root.sessionManagerRef.sessions : []
+                    currentIndex: root.sessionManagerRef ? root.sessionManagerRef.activeIndex : -1
+                    // 显示设备名、串口与接收流水线 CPU 占用，评估单机可承载的驱动器数量
+                    displayText: currentIndex >= 0 && currentIndex < model.length
+                                 ? root.formatSessionText(model[currentIndex]) : "无设备"
+                    delegate: ItemDelegate {
+                        width: deviceComboBox.width
+                        text: root.formatSessionText(modelData)
+                        highlighted: deviceComboBox.highlightedIndex === index
                     }
+                    onActivated: function(index) { root.sessionManagerRef.setActiveIndex(index) }
                 }
-                
-                delegate: ItemDelegate {
-                    width: 250
-                    text: modelData.portName + " - " + modelData.description
-                    highlighted: portComboBox.highlightedIndex === index
+
+                Button {
+                    text: "添加设备"
+                    onClicked: root.sessionManagerRef.addSession()
+                }
+
+                Button {
+                    text: "移除设备"
+                    enabled: root.sessionManagerRef !== null && root.sessionManagerRef.sessions.length > 1
+                    onClicked: root.sessionManagerRef.removeSession(root.sessionManagerRef.activeIndex)
                 }
+            }
+
+            // 串口选择区域
+            RowLayout {
+                spacing: 10
+                Layout.alignment: Qt.AlignHCenter
+
+                Text {
+                    text: "选择串口："
+                    font.pixelSize: 14
+                    color: "#2c3e50"
+                }
+
+                ComboBox {
+                    id: portComboBox
+                    width: 450
+                    model: root.portListModel
+                    textRole: "portName"
+                    enabled: !root.isSerialConnected
                 
-                popup: Popup {
-                    width: 250
-                    implicitHeight: contentItem.implicitHeight
-                    padding: 1
-                    
-                    contentItem: ListView {
-                        clip: true
-                        implicitHeight: contentHeight
+                    displayText: {
+                        if (root.portListModel.length === 0) {
+                            return "未找到串口"
+                        } else if (currentIndex < 0) {
+                            return "请选择串口"
+                        } else {
+                            return root.portListModel[currentIndex].portName + " - " + root.portListModel[currentIndex].description
+                        }
+                    }
+                
+                    delegate: ItemDelegate {
                         width: 250
-                        model: portComboBox.popup.visible ? portComboBox.delegateModel : null
-                        currentIndex: portComboBox.highlightedIndex
-                        ScrollIndicator.vertical: ScrollIndicator { }
+                        text: modelData.portName + " - " + modelData.description
+                        highlighted: portComboBox.highlightedIndex === index
                     }
+                
+                    popup: Popup {
+                        width: 250
+                        implicitHeight: contentItem.implicitHeight
+                        padding: 1
+                    
+                        contentItem: ListView {
+                            clip: true
+                            implicitHeight: contentHeight
+                            width: 250
+                            model: portComboBox.popup.visible ? portComboBox.delegateModel : null
+                            currentIndex: portComboBox.highlightedIndex
+                            ScrollIndicator.vertical: ScrollIndicator { }
+                        }
+                    }
+                }
+
+                // 串口扫描在后台线程执行，结果通过 onPortsListChanged 异步回填
+                Button {
+                    text: "刷新"
+                    enabled: !root.isSerialConnected
+                    onClicked: backend.scanPorts()
                 }
             }
-        }
 
-        // 手动添加串口区域
-        RowLayout {
-            spacing: 10
-            Layout.alignment: Qt.AlignHCenter
+            // 手动添加串口区域
+            RowLayout {
+                spacing: 10
+                Layout.alignment: Qt.AlignHCenter
 
-            Text {
-                text: "或手动输入："
-                font.pixelSize: 14
-                color: "#2c3e50"
-            }
+                Text {
+                    text: "或手动输入："
+                    font.pixelSize: 14
+                    color: "#2c3e50"
+                }
 
-            TextField {
-                id: manualPortInput
-                width: 350
-                placeholderText: "例如: /dev/tty.usbserial-0001 或 /dev/ttys001"
-                enabled: !root.isSerialConnected
-                font.pixelSize: 13
+                TextField {
+                    id: manualPortInput
+                    width: 350
+                    placeholderText: "例如: /dev/ttys001 或 tcp://192.168.1.10:4001"
+                    enabled: !root.isSerialConnected
+                    font.pixelSize: 13
                 
-                onAccepted: {
-                    if (text.trim() !== "") {
-                        backend.addManualPort(text.trim())
-                        text = ""  // 清空输入框
+                    onAccepted: {
+                        if (text.trim() !== "") {
+                            backend.addManualPort(text.trim())
+                            text = ""  // 清空输入框
+                        }
                     }
                 }
-            }
 
-            Button {
-                text: "添加"
-                enabled: !root.isSerialConnected && manualPortInput.text.trim() !== ""
-                onClicked: {
-                    if (manualPortInput.text.trim() !== "") {
-                        backend.addManualPort(manualPortInput.text.trim())
-                        manualPortInput.text = ""  // 清空输入框
+                Button {
+                    text: "添加"
+                    enabled: !root.isSerialConnected && manualPortInput.text.trim() !== ""
+                    onClicked: {
+                        if (manualPortInput.text.trim() !== "") {
+                            backend.addManualPort(manualPortInput.text.trim())
+                            manualPortInput.text = ""  // 清空输入框
+                        }
                     }
                 }
             }
-        }
 
-        // 连接/断开按钮
-        RowLayout {
-            spacing: 10
-            Layout.alignment: Qt.AlignHCenter
-
-            Button {
-                text: "连接串口"
-                enabled: !root.isSerialConnected && portComboBox.currentIndex >= 0
-                onClicked: {
-                    var selectedPort = root.portListModel[portComboBox.currentIndex]
-                    backend.connectSerial(selectedPort.portName, root.baudRate)
+            // 连接/断开按钮
+            RowLayout {
+                spacing: 10
+                Layout.alignment: Qt.AlignHCenter
+
+                Button {
+                    text: "连接串口"
+                    enabled: !root.isSerialConnected && !root.isReconnecting && portComboBox.currentIndex >= 0
+                    onClicked: {
+                        var selectedPort = root.portListModel[portComboBox.currentIndex]
+                        backend.connectSerial(selectedPort.portName, root.baudRate)
+                    }
                 }
-            }
 
-            Button {
-                text: "断开串口"
-                enabled: root.isSerialConnected
-                onClicked: {
-                    backend.disconnectSerial()
+                Button {
+                    text: "断开串口"
+                    // 重连期间也允许断开，用于放弃自动重连
+                    enabled: root.isSerialConnected || root.isReconnecting
+                    onClicked: {
+                        backend.disconnectSerial()
+                    }
                 }
             }
-        }
-
-        Rectangle {
-            Layout.fillWidth: true
-            color: "white"
-            radius: 8
-            border.color: "#bdc3c7"
-            border.width: 1
-            implicitHeight: 200
 
-            ColumnLayout {
-                anchors.fill: parent
-                anchors.margins: 16
-                spacing: 12
+            Rectangle {
+                Layout.fillWidth: true
+                color: "white"
+                radius: 8
+                border.color: "#bdc3c7"
+                border.width: 1
+                implicitHeight: 300
+
+                ColumnLayout {
+                    anchors.fill: parent
+                    anchors.margins: 16
+                    spacing: 12
+
+                    RowLayout {
+                        Layout.fillWidth: true
+                        spacing: 12
+
+                        Text {
+                            text: "串口统计"
+                            font.pixelSize: 16
+                            font.bold: true
+                            color: "#2c3e50"
+                        }
+
+                        Item { Layout.fillWidth: true }
+
+                        Text {
+                            text: "刷新周期"
+                            font.pixelSize: 13
+                            color: "#7f8c8d"
+                        }
+
+                        ComboBox {
+                            id: publishIntervalComboBox
+                            readonly property var intervalsMs: [100, 250, 500, 1000]
+                            model: ["100 ms", "250 ms", "500 ms", "1 s"]
+                            currentIndex: Math.max(0, intervalsMs.indexOf(root.statisticsPublishIntervalMs))
+                            Layout.preferredWidth: 100
+                            onActivated: function(index) {
+                                if (root.statisticsPublisher)
+                                    root.statisticsPublisher.setStatisticsPublishInterval(intervalsMs[index])
+                            }
+                        }
+                    }
 
-                Text {
-                    text: "串口统计"
-                    font.pixelSize: 16
-                    font.bold: true
-                    color: "#2c3e50"
+                    GridLayout {
+                        Layout.fillWidth: true
+                        columns: 2
+                        columnSpacing: 32
+                        rowSpacing: 8
+
+                        Text {
+                            text: "发送总帧数: " + root.txFrameCountTotal
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "接收总帧数: " + root.rxFrameCountTotal
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "发送总字节: " + root.txBytesTotal
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "接收总字节: " + root.rxBytesTotal
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "发送速率: " + root.txBytesPerSec + " B/s"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "接收速率: " + root.rxBytesPerSec + " B/s"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "发送帧率: " + root.txFramesPerSec + " 帧/s"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "接收帧率: " + root.rxFramesPerSec + " 帧/s"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "发送峰值: " + root.txPeakBytesPerSec + " B/s"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Text {
+                            text: "接收峰值: " + root.rxPeakBytesPerSec + " B/s"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        // 接近满载时 USB 转串口缓冲开始堆积，延迟与丢帧风险明显上升
+                        Text {
+                            text: "链路占用率: " + root.linkUtilization.toFixed(1) + " %"
+                            font.pixelSize: 13
+                            color: root.linkUtilization >= 80 ? "#e67e22" : "#2c3e50"
+                            Layout.columnSpan: 2
+                        }
+
+                        Text {
+                            text: "CRC错误数: " + root.rxCrcErrorCount
+                            font.pixelSize: 13
+                            color: root.rxCrcErrorCount > 0 ? "#e67e22" : "#2c3e50"
+                        }
+
+                        Text {
+                            text: "无效帧数: " + root.rxInvalidFrameCount
+                            font.pixelSize: 13
+                            color: root.rxInvalidFrameCount > 0 ? "#e74c3c" : "#2c3e50"
+                        }
+                    }
                 }
+            }
 
-                GridLayout {
-                    Layout.fillWidth: true
-                    columns: 2
-                    columnSpacing: 32
-                    rowSpacing: 8
+            // 按命令字统计：帧率、到达间隔与抖动，直方图按对数刻度分桶，用于排查固件调度与链路饱和
+            Rectangle {
+                Layout.fillWidth: true
+                color: "white"
+                radius: 8
+                border.color: "#bdc3c7"
+                border.width: 1
+                implicitHeight: commandStatsColumn.implicitHeight + 32
+
+                ColumnLayout {
+                    id: commandStatsColumn
+                    anchors.fill: parent
+                    anchors.margins: 16
+                    spacing: 6
 
                     Text {
-                        text: "发送总帧数: " + root.txFrameCountTotal
-                        font.pixelSize: 13
+                        text: "命令统计（直方图桶: " + root.commandIntervalBucketLabels.join(" | ") + " ms）"
+                        font.pixelSize: 16
+                        font.bold: true
                         color: "#2c3e50"
+                        wrapMode: Text.WordWrap
+                        Layout.fillWidth: true
                     }
 
                     Text {
-                        text: "接收总帧数: " + root.rxFrameCountTotal
+                        visible: root.commandStats.length === 0
+                        text: "暂无数据"
                         font.pixelSize: 13
-                        color: "#2c3e50"
+                        color: "#7f8c8d"
                     }
 
-                    Text {
-                        text: "发送总字节: " + root.txBytesTotal
-                        font.pixelSize: 13
-                        color: "#2c3e50"
+                    Repeater {
+                        model: root.commandStats
+
+                        RowLayout {
+                            required property var modelData
+                            spacing: 16
+
+                            Text {
+                                text: modelData.cmd
+                                font.pixelSize: 13
+                                font.family: "monospace"
+                                color: "#2c3e50"
+                                Layout.preferredWidth: 40
+                            }
+
+                            Text {
+                                text: modelData.framesPerSec + " 帧/s  间隔 " + modelData.meanIntervalMs
+                                      + " ms  抖动 " + modelData.jitterMs + " ms  累计 " + modelData.count
+                                font.pixelSize: 13
+                                color: "#2c3e50"
+                                Layout.preferredWidth: 360
+                            }
+
+                            // 迷你直方图：柱高按计数取对数，突发与长尾间隔一目了然
+                            Row {
+                                spacing: 1
+                                Layout.preferredHeight: 20
+
+                                Repeater {
+                                    model: modelData.histogram
+
+                                    Rectangle {
+                                        required property int modelData
+                                        width: 6
+                                        height: modelData > 0 ? Math.max(2, Math.min(20, Math.log(modelData + 1) * 3)) : 1
+                                        anchors.bottom: parent.bottom
+                                        color: modelData > 0 ? "#3498db" : "#ecf0f1"
+                                    }
+                                }
+                            }
+                        }
                     }
+                }
+            }
 
-                    Text {
-                        text: "接收总字节: " + root.rxBytesTotal
-                        font.pixelSize: 13
-                        color: "#2c3e50"
+            // 端到端延迟追踪：各阶段延迟分位数，定位样本从串口到曲线的耗时瓶颈
+            Rectangle {
+                Layout.fillWidth: true
+                color: "white"
+                radius: 8
+                border.color: "#bdc3c7"
+                border.width: 1
+                implicitHeight: latencyColumn.implicitHeight + 32
+
+                ColumnLayout {
+                    id: latencyColumn
+                    anchors.fill: parent
+                    anchors.margins: 16
+                    spacing: 6
+
+                    RowLayout {
+                        Layout.fillWidth: true
+
+                        Text {
+                            text: "延迟追踪"
+                            font.pixelSize: 16
+                            font.bold: true
+                            color: "#2c3e50"
+                        }
+
+                        Item { Layout.fillWidth: true }
+
+                        CheckBox {
+                            text: "开启（需在 CHT / QD 页查看曲线）"
+                            checked: backend ? backend.latencyTracingEnabled : false
+                            onToggled: {
+                                if (backend)
+                                    backend.setLatencyTracingEnabled(checked)
+                            }
+                        }
                     }
 
-                    Text {
-                        text: "发送速率: " + root.txBytesPerSec + " B/s"
-                        font.pixelSize: 13
-                        color: "#2c3e50"
+                    Repeater {
+                        model: backend && backend.latencyTracingEnabled ? root.latencyStageNames : []
+
+                        Text {
+                            required property var modelData
+                            readonly property var stage: root.latencyStats[modelData.key] || ({})
+                            text: modelData.title + ":  p50 " + (stage.p50 || 0) + " ms  p90 " + (stage.p90 || 0)
+                                  + " ms  p99 " + (stage.p99 || 0) + " ms  最大 " + (stage.max || 0)
+                                  + " ms  (样本 " + (stage.count || 0) + ")"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
                     }
 
-                    Text {
-                        text: "接收速率: " + root.rxBytesPerSec + " B/s"
-                        font.pixelSize: 13
-                        color: "#2c3e50"
+                    // GUI 事件循环延迟与卡顿（进程级，所有设备共用）
+                    RowLayout {
+                        Layout.fillWidth: true
+                        visible: root.sessionManagerRef !== null
+
+                        Text {
+                            readonly property var lag: root.sessionManagerRef ? root.sessionManagerRef.eventLoopLag : ({})
+                            text: "事件循环延迟:  p50 " + (lag.p50 || 0) + " ms  p90 " + (lag.p90 || 0)
+                                  + " ms  p99 " + (lag.p99 || 0) + " ms  最大 " + (lag.max || 0)
+                                  + " ms  卡顿 " + (lag.stallCount || 0) + " 次"
+                            font.pixelSize: 13
+                            color: "#2c3e50"
+                        }
+
+                        Item { Layout.fillWidth: true }
+
+                        CheckBox {
+                            text: "卡顿期间后台代发保活帧"
+                            checked: root.sessionManagerRef ? root.sessionManagerRef.stallKeepaliveEnabled : false
+                            onToggled: root.sessionManagerRef.setStallKeepaliveEnabled(checked)
+                        }
                     }
 
+                    // 遥测归档（FOC_STUDIO_ARCHIVE_DIR 启用）：写盘跟不上时丢弃计数增长
                     Text {
-                        text: "CRC错误数: " + root.rxCrcErrorCount
+                        Layout.fillWidth: true
+                        visible: root.archiveStats.directory !== undefined
+                        text: "遥测归档:  已写入 " + (root.archiveStats.writtenSamples || 0) + " 条  "
+                              + ((root.archiveStats.writtenBytes || 0) / 1048576).toFixed(1) + " MB  丢弃 "
+                              + (root.archiveStats.droppedSamples || 0) + " 条  文件 "
+                              + (root.archiveStats.currentFile || "-")
+                              + (root.archiveStats.lastError ? "  错误: " + root.archiveStats.lastError : "")
+                        elide: Text.ElideMiddle
                         font.pixelSize: 13
-                        color: root.rxCrcErrorCount > 0 ? "#e67e22" : "#2c3e50"
+                        color: (root.archiveStats.droppedSamples || 0) > 0 || root.archiveStats.lastError ? "#e74c3c" : "#2c3e50"
                     }
 
+                    // 运行记录（FOC_STUDIO_SESSION_DB 启用）：每次连接为一次运行
                     Text {
-                        text: "无效帧数: " + root.rxInvalidFrameCount
+                        Layout.fillWidth: true
+                        visible: root.sessionRecorderStats.path !== undefined
+                        text: "运行记录:  " + (root.sessionRecorderStats.recording ? "记录中（运行 #" + root.sessionRecorderStats.sessionId + "）" : "未连接")
+                              + "  已写入 " + (root.sessionRecorderStats.writtenRows || 0) + " 行  丢弃 "
+                              + (root.sessionRecorderStats.droppedSamples || 0) + " 条  提交 "
+                              + (root.sessionRecorderStats.lastCommitMs || 0) + " ms  " + (root.sessionRecorderStats.path || "")
+                              + (root.sessionRecorderStats.lastError ? "  错误: " + root.sessionRecorderStats.lastError : "")
+                        elide: Text.ElideMiddle
                         font.pixelSize: 13
-                        color: root.rxInvalidFrameCount > 0 ? "#e74c3c" : "#2c3e50"
+                        color: (root.sessionRecorderStats.droppedSamples || 0) > 0 || root.sessionRecorderStats.lastError ? "#e74c3c" : "#2c3e50"
+                    }
+                }
+            }
+
+            // 链路健康历史：最近 2 分钟的每秒采样火花线，完整历史（最近 4 小时）可导出 CSV
+            Rectangle {
+                Layout.fillWidth: true
+                color: "white"
+                radius: 8
+                border.color: "#bdc3c7"
+                border.width: 1
+                implicitHeight: historyColumn.implicitHeight + 32
+
+                ColumnLayout {
+                    id: historyColumn
+                    anchors.fill: parent
+                    anchors.margins: 16
+                    spacing: 8
+
+                    RowLayout {
+                        Layout.fillWidth: true
+                        spacing: 12
+
+                        Text {
+                            text: "链路健康历史"
+                            font.pixelSize: 16
+                            font.bold: true
+                            color: "#2c3e50"
+                        }
+
+                        Item { Layout.fillWidth: true }
+
+                        Text {
+                            id: exportStatusText
+                            font.pixelSize: 12
+                            color: "#7f8c8d"
+                        }
+
+                        Button {
+                            text: "导出 CSV"
+                            onClicked: exportDialog.open()
+                        }
+
+                        Button {
+                            text: "清空"
+                            onClicked: {
+                                if (backend)
+                                    backend.clearStatisticsHistory()
+                            }
+                        }
+                    }
+
+                    GridLayout {
+                        Layout.fillWidth: true
+                        columns: 2
+                        columnSpacing: 24
+                        rowSpacing: 8
+
+                        Repeater {
+                            model: [
+                                { key: "rxBytesPerSec", title: "接收速率 (B/s)", color: "#3498db" },
+                                { key: "linkUtilization", title: "链路占用率 (%)", color: "#27ae60" },
+                                { key: "rxCrcErrors", title: "CRC 错误 (次/s)", color: "#e67e22" },
+                                { key: "rxInvalidFrames", title: "无效帧 (次/s)", color: "#e74c3c" }
+                            ]
+
+                            ColumnLayout {
+                                required property var modelData
+                                readonly property var values: root.statisticsSparklines[modelData.key] || []
+                                Layout.fillWidth: true
+                                spacing: 2
+
+                                Text {
+                                    text: modelData.title + "  当前 " + (values.length > 0 ? values[values.length - 1] : 0)
+                                          + "  最大 " + (values.length > 0 ? Math.max.apply(null, values) : 0)
+                                    font.pixelSize: 12
+                                    color: "#2c3e50"
+                                }
+
+                                Sparkline {
+                                    Layout.fillWidth: true
+                                    Layout.preferredHeight: 36
+                                    values: parent.values
+                                    lineColor: modelData.color
+                                }
+                            }
+                        }
                     }
                 }
             }
         }
+    }
 
-        Item {
-            Layout.fillHeight: true
+    FileDialog {
+        id: exportDialog
+        title: "导出链路健康历史"
+        fileMode: FileDialog.SaveFile
+        nameFilters: ["CSV 文件 (*.csv)"]
+        defaultSuffix: "csv"
+        onAccepted: {
+            if (!backend)
+                return
+            var ok = backend.exportStatisticsHistory(selectedFile.toString())
+            exportStatusText.text = ok ? "已导出" : "导出失败"
         }
     }
 
@@ -266,11 +731,19 @@ Rectangle {
     Connections {
         target: backend
         function onPortsListChanged(portsList) {
+            // 热插拔刷新时尽量保留用户已选中的串口
+            var selectedName = portComboBox.currentIndex >= 0 && portComboBox.currentIndex < root.portListModel.length
+                    ? root.portListModel[portComboBox.currentIndex].portName : ""
             root.portListModel = portsList
-            // 如果有多个串口，不自动选择，让用户手动选择
-            if (portsList.length > 0) {
-                portComboBox.currentIndex = -1  // 不自动选择，显示"请选择串口"
+            var selectedIndex = -1
+            for (var i = 0; i < portsList.length; ++i) {
+                if (portsList[i].portName === selectedName) {
+                    selectedIndex = i
+                    break
+                }
             }
+            // 如果有多个串口，不自动选择，让用户手动选择
+            portComboBox.currentIndex = selectedIndex  // 未选中时显示"请选择串口"
         }
     }
 
@@ -278,14 +751,11 @@ Rectangle {
         target: backend
         enabled: backend !== null && root.isPageActive
 
-        function onTxFrameCountTotalChanged() { root.txFrameCountTotal = backend.txFrameCountTotal }
-        function onRxFrameCountTotalChanged() { root.rxFrameCountTotal = backend.rxFrameCountTotal }
-        function onTxBytesTotalChanged()      { root.txBytesTotal = backend.txBytesTotal }
-        function onRxBytesTotalChanged()      { root.rxBytesTotal = backend.rxBytesTotal }
-        function onTxBytesPerSecChanged()     { root.txBytesPerSec = backend.txBytesPerSec }
-        function onRxBytesPerSecChanged()     { root.rxBytesPerSec = backend.rxBytesPerSec }
-        function onRxCrcErrorCountChanged()   { root.rxCrcErrorCount = backend.rxCrcErrorCount }
-        function onRxInvalidFrameCountChanged() { root.rxInvalidFrameCount = backend.rxInvalidFrameCount }
+        function onStatisticsChanged(snapshot) { root.statistics = snapshot }
+        function onStatisticsHistoryChanged() { root.statisticsSparklines = backend.statisticsSparklines }
+        function onLatencyStatsChanged() { root.latencyStats = backend.latencyStats }
+        function onArchiveStatsChanged() { root.archiveStats = backend.archiveStats }
+        function onSessionRecorderStatsChanged() { root.sessionRecorderStats = backend.sessionRecorderStats }
     }
 
     onIsPageActiveChanged: {